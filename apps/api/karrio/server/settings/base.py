@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/3.0/ref/settings/
 """
 
 import os
+import json
 import importlib
 import dj_database_url
 from pathlib import Path
@@ -386,6 +387,18 @@ STORAGES = {
     },
 }
 
+# Shipment documents (labels, invoices) storage
+DOCUMENT_STORAGE = config("DOCUMENT_STORAGE", default="filesystem")
+DOCUMENT_STORAGE_PATH = config(
+    "DOCUMENT_STORAGE_PATH", default=os.path.join(WORK_DIR, "documents")
+)
+DOCUMENT_STORAGE_BUCKET = config("DOCUMENT_STORAGE_BUCKET", default=None)
+DOCUMENT_STORAGE_PREFIX = config("DOCUMENT_STORAGE_PREFIX", default="")
+DOCUMENT_STORAGE_ENDPOINT_URL = config("DOCUMENT_STORAGE_ENDPOINT_URL", default=None)
+DOCUMENT_STORAGE_ACCESS_KEY = config("DOCUMENT_STORAGE_ACCESS_KEY", default=None)
+DOCUMENT_STORAGE_SECRET_KEY = config("DOCUMENT_STORAGE_SECRET_KEY", default=None)
+DOCUMENT_STORAGE_REGION = config("DOCUMENT_STORAGE_REGION", default=None)
+
 
 # Django REST framework
 AUTHENTICATION_CLASSES = [
@@ -542,6 +555,9 @@ REDOC_SETTINGS = {
     "SPEC_URL": ("schema-json", dict(format=".json")),
 }
 
+# Data export streaming (rows read per database round-trip)
+DATA_EXPORT_CHUNK_SIZE = config("DATA_EXPORT_CHUNK_SIZE", default=500, cast=int)
+
 # Logging configuration
 LOG_LEVEL = "DEBUG" if DEBUG else config("LOG_LEVEL", default="INFO")
 DJANGO_LOG_LEVEL = "INFO" if DEBUG else config("DJANGO_LOG_LEVEL", default="WARNING")
@@ -549,6 +565,15 @@ LOG_FILE_DIR = config("LOG_DIR", default=WORK_DIR)
 LOG_FILE_NAME = os.path.join(LOG_FILE_DIR, "debug.log")
 DRF_TRACKING_ADMIN_LOG_READONLY = True
 
+# API request logs buffering (flush interval in seconds, body size in characters)
+API_LOGS_BUFFERING = config("API_LOGS_BUFFERING", default=False, cast=bool)
+API_LOGS_BATCH_SIZE = config("API_LOGS_BATCH_SIZE", default=100, cast=int)
+API_LOGS_FLUSH_INTERVAL = config("API_LOGS_FLUSH_INTERVAL", default=2.0, cast=float)
+API_LOGS_MAX_BODY_SIZE = config("API_LOGS_MAX_BODY_SIZE", default=0, cast=int)
+API_LOGS_MAX_BUFFER_SIZE = config("API_LOGS_MAX_BUFFER_SIZE", default=10000, cast=int)
+# e.g. '{"/v1/proxy/tracking": 0.1}' to only log 10% of the successful tracking requests
+API_LOGS_SAMPLING = config("API_LOGS_SAMPLING", default="{}", cast=json.loads)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": True,
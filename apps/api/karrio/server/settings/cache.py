@@ -5,11 +5,24 @@ from karrio.server.settings.apm import HEALTH_CHECK_APPS
 
 
 CACHE_TTL = 60 * 15
+RATE_CACHE_TTL = config("RATE_CACHE_TTL", default=0, cast=int)
+RATE_CACHE_STALE_TTL = config("RATE_CACHE_STALE_TTL", default=60, cast=int)
+RATE_CACHE_L1_SIZE = config("RATE_CACHE_L1_SIZE", default=1024, cast=int)
+PAGINATION_COUNT_CACHE_TTL = config("PAGINATION_COUNT_CACHE_TTL", default=0, cast=int)
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = config(
+    "PAGINATION_COUNT_ESTIMATE_THRESHOLD", default=0, cast=int
+)
 REDIS_HOST = config("REDIS_HOST", default=None)
 REDIS_PORT = config("REDIS_PORT", default=None)
 REDIS_PASSWORD = config("REDIS_PASSWORD", default=None)
 REDIS_USERNAME = config("REDIS_USERNAME", default="default")
 REDIS_PREFIX = config("REDIS_PREFIX", default="karrio")
+# gateways cached per process are evicted in the other processes through the
+# shared cache: they are only cached by default when redis is configured.
+GATEWAY_CACHE_SIZE = config(
+    "GATEWAY_CACHE_SIZE", default=256 if REDIS_HOST is not None else 0, cast=int
+)
+GATEWAY_CACHE_TTL = config("GATEWAY_CACHE_TTL", default=300, cast=int)
 
 # karrio server caching setup
 if REDIS_HOST is not None:
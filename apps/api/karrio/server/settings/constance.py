@@ -16,6 +16,11 @@ CONSTANCE_BACKEND = "constance.backends.database.DatabaseBackend"
 CONSTANCE_DATABASE_PREFIX = "constance:core:"
 
 DATA_ARCHIVING_SCHEDULE = config("DATA_ARCHIVING_SCHEDULE", default=168, cast=int)
+# rows deleted per batch and seconds waited between batches
+DATA_ARCHIVING_BATCH_SIZE = config("DATA_ARCHIVING_BATCH_SIZE", default=1000, cast=int)
+DATA_ARCHIVING_BATCH_SLEEP = config(
+    "DATA_ARCHIVING_BATCH_SLEEP", default=0.1, cast=float
+)
 
 GOOGLE_CLOUD_API_KEY = config("GOOGLE_CLOUD_API_KEY", default="")
 CANADAPOST_ADDRESS_COMPLETE_API_KEY = config(
@@ -11,6 +11,51 @@ DEFAULT_SCHEDULER_RUN_INTERVAL = 3600  # value is seconds. so 3600 seconds = 1 H
 DEFAULT_TRACKERS_UPDATE_INTERVAL = decouple.config(
     "TRACKING_PULSE", default=7200, cast=int
 )  # value is seconds. so 10800 seconds = 3 Hours
+TRACKERS_SCHEDULER_INTERVAL = decouple.config(
+    "TRACKING_SCHEDULER_PULSE", default=300, cast=int
+)  # value is seconds. so 300 seconds = 5 minutes
+TRACKERS_UPDATE_MAX_INTERVAL = decouple.config(
+    "TRACKERS_UPDATE_MAX_INTERVAL", default=86400, cast=int
+)  # longest backoff between two updates of an undelivered tracker
+TRACKERS_UPDATE_PAGE_SIZE = decouple.config(
+    "TRACKERS_UPDATE_PAGE_SIZE", default=500, cast=int
+)  # trackers claimed and updated per task
+TRACKERS_UPDATE_CONCURRENCY = decouple.config(
+    "TRACKERS_UPDATE_CONCURRENCY", default=4, cast=int
+)  # carrier accounts queried in parallel per task
+TRACKERS_UPDATE_CARRIER_CONCURRENCY = decouple.config(
+    "TRACKERS_UPDATE_CARRIER_CONCURRENCY", default=2, cast=int
+)  # parallel requests per carrier account per task
+TRACKERS_UPDATE_CARRIER_RATE_LIMIT = decouple.config(
+    "TRACKERS_UPDATE_CARRIER_RATE_LIMIT", default=0, cast=int
+)  # requests per minute per carrier account across workers (0 = unlimited)
+BATCH_SHIPMENTS_SHARD_SIZE = decouple.config(
+    "BATCH_SHIPMENTS_SHARD_SIZE", default=200, cast=int
+)  # shipments processed per task of a batch operation
+BATCH_SHIPMENTS_CONCURRENCY = decouple.config(
+    "BATCH_SHIPMENTS_CONCURRENCY", default=8, cast=int
+)  # shipments rated and purchased in parallel per task
+BATCH_SHIPMENTS_CARRIER_CONCURRENCY = decouple.config(
+    "BATCH_SHIPMENTS_CARRIER_CONCURRENCY", default=4, cast=int
+)  # shipments processed in parallel per carrier per task
+BATCH_SHIPMENTS_CHECKPOINT_SIZE = decouple.config(
+    "BATCH_SHIPMENTS_CHECKPOINT_SIZE", default=25, cast=int
+)  # processed shipments saved together into the batch operation resources
+BATCH_SHIPMENTS_RETRY_DELAY = decouple.config(
+    "BATCH_SHIPMENTS_RETRY_DELAY", default=30, cast=int
+)  # value is seconds. shipments locked by another worker are processed again after
+BATCH_SHIPMENTS_IMPORT_CHUNK_SIZE = decouple.config(
+    "BATCH_SHIPMENTS_IMPORT_CHUNK_SIZE", default=500, cast=int
+)  # shipments inserted together per transaction by a batch import
+BATCH_OPERATIONS_STALE_TIMEOUT = decouple.config(
+    "BATCH_OPERATIONS_STALE_TIMEOUT", default=900, cast=int
+)  # value is seconds. running batch operations without progress are resumed after
+USAGE_STATS_UPDATE_INTERVAL = decouple.config(
+    "USAGE_STATS_PULSE", default=900, cast=int
+)  # value is seconds. so 900 seconds = 15 minutes
+USAGE_STATS_REFRESH_DAYS = decouple.config(
+    "USAGE_STATS_REFRESH_DAYS", default=3, cast=int
+)  # number of recent days recomputed by the usage stats update
 
 WORKER_IMMEDIATE_MODE = decouple.config(
     "WORKER_IMMEDIATE_MODE", default=False, cast=bool
@@ -855,19 +855,12 @@ class Settings(core.Settings):
 #         or collect it from the cache if an unexpired access_token exist.
 #         """
 #         cache_key = f"{self.carrier_name}|{self.client_id}|{self.client_secret}"
-#         now = datetime.datetime.now() + datetime.timedelta(minutes=30)
 
-#         auth = self.connection_cache.get(cache_key) or {}
-#         token = auth.get("access_token")
-#         expiry = lib.to_date(auth.get("expiry"), current_format="%Y-%m-%d %H:%M:%S")
-
-#         if token is not None and expiry is not None and expiry > now:
-#             return token
-
-#         self.connection_cache.set(cache_key, lambda: login(self))
-#         new_auth = self.connection_cache.get(cache_key)
-
-#         return new_auth["access_token"]
+#         return self.connection_cache.thread_safe(
+#             refresh_func=lambda: login(self),
+#             cache_key=cache_key,
+#             buffer_minutes=30,
+#         ).get_token()
 
 # """uncomment the following code block to implement the oauth login."""
 # def login(settings: Settings):
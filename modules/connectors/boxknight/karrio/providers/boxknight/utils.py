@@ -28,19 +28,13 @@ class Settings(core.Settings):
         or collect it from the cache if an unexpired token exist.
         """
         cache_key = f"{self.carrier_name}|{self.username}|{self.password}"
-        auth = self.connection_cache.get(cache_key) or {}
-        token = auth.get("token")
 
-        if token is not None:
-            return token
-
-        self.connection_cache.set(cache_key, lambda: authenticate(self))
-        new_auth = self.connection_cache.get(cache_key)
-
-        if any(self.depot or "") is False:
-            self.depot = new_auth["depot"]
-
-        return new_auth["token"]
+        return self.connection_cache.thread_safe(
+            refresh_func=lambda: authenticate(self),
+            cache_key=cache_key,
+            token_field="token",
+            expirable=False,
+        ).get_token()
 
 
 def authenticate(settings: Settings):
@@ -2,7 +2,6 @@ import karrio.schemas.dpd.Authentication20 as auth
 import karrio.schemas.dpd.LoginServiceV21 as dpd
 
 import jstruct
-import datetime
 import karrio.lib as lib
 import karrio.core as core
 import karrio.core.errors as errors
@@ -62,22 +61,21 @@ class Settings(core.Settings):
         or collect it from the cache if an unexpired token exist.
         """
         cache_key = f"{self.carrier_name}|{self.delis_id}|{self.password}"
-        now = datetime.datetime.now() + datetime.timedelta(minutes=30)
 
-        auth = self.connection_cache.get(cache_key) or {}
-        token = auth.get("token")
-        expiry = lib.to_date(auth.get("expiry"), current_format="%Y-%m-%d %H:%M:%S")
+        def _login():
+            new_auth = login(self)
 
-        if token is not None and expiry is not None and expiry > now:
-            return token
+            if any(self.depot or "") is False:
+                self.depot = new_auth["depot"]
 
-        self.connection_cache.set(cache_key, lambda: login(self))
-        new_auth = self.connection_cache.get(cache_key)
+            return new_auth
 
-        if any(self.depot or "") is False:
-            self.depot = new_auth["depot"]
-
-        return new_auth["token"]
+        return self.connection_cache.thread_safe(
+            refresh_func=_login,
+            cache_key=cache_key,
+            buffer_minutes=30,
+            token_field="token",
+        ).get_token()
 
 
 def login(settings: Settings):
@@ -26,19 +26,13 @@ class Settings(core.Settings):
         or collect it from the cache if an unexpired "token" exist.
         """
         cache_key = f"{self.carrier_name}|{self.principal}|{self.credential}"
-        now = datetime.datetime.now() + datetime.timedelta(minutes=30)
 
-        auth = self.connection_cache.get(cache_key) or {}
-        token = auth.get("token")
-        expiry = lib.to_date(auth.get("expiry"), current_format="%Y-%m-%d %H:%M:%S")
-
-        if token is not None and expiry is not None and expiry > now:
-            return token
-
-        self.connection_cache.set(cache_key, lambda: login(self))
-        new_auth = self.connection_cache.get(cache_key)
-
-        return new_auth["token"]
+        return self.connection_cache.thread_safe(
+            refresh_func=lambda: login(self),
+            cache_key=cache_key,
+            buffer_minutes=30,
+            token_field="token",
+        ).get_token()
 
 
 def login(settings: Settings):
@@ -62,26 +62,16 @@ class Settings(core.Settings):
             )
 
         cache_key = f"{self.carrier_name}|{self.api_key}|{self.secret_key}"
-        now = datetime.datetime.now() + datetime.timedelta(minutes=30)
 
-        auth = self.connection_cache.get(cache_key) or {}
-        token = auth.get("access_token")
-        expiry = lib.to_date(auth.get("expiry"), current_format="%Y-%m-%d %H:%M:%S")
-
-        if token is not None and expiry is not None and expiry > now:
-            return token
-
-        self.connection_cache.set(
-            cache_key,
-            lambda: login(
+        return self.connection_cache.thread_safe(
+            refresh_func=lambda: login(
                 self,
                 client_id=self.api_key,
                 client_secret=self.secret_key,
             ),
-        )
-        new_auth = self.connection_cache.get(cache_key)
-
-        return new_auth["access_token"]
+            cache_key=cache_key,
+            buffer_minutes=30,
+        ).get_token()
 
     @property
     def track_access_token(self):
@@ -94,26 +84,16 @@ class Settings(core.Settings):
             )
 
         cache_key = f"{self.carrier_name}|{self.track_api_key}|{self.track_secret_key}"
-        now = datetime.datetime.now() + datetime.timedelta(minutes=30)
 
-        auth = self.connection_cache.get(cache_key) or {}
-        token = auth.get("access_token")
-        expiry = lib.to_date(auth.get("expiry"), current_format="%Y-%m-%d %H:%M:%S")
-
-        if token is not None and expiry is not None and expiry > now:
-            return token
-
-        self.connection_cache.set(
-            cache_key,
-            lambda: login(
+        return self.connection_cache.thread_safe(
+            refresh_func=lambda: login(
                 self,
                 client_id=self.track_api_key,
                 client_secret=self.track_secret_key,
             ),
-        )
-        new_auth = self.connection_cache.get(cache_key)
-
-        return new_auth["access_token"]
+            cache_key=cache_key,
+            buffer_minutes=30,
+        ).get_token()
 
 
 def login(settings: Settings, client_id: str = None, client_secret: str = None):
@@ -0,0 +1,115 @@
+"""Benchmark of the batch shipments import.
+
+Saves batch shipments (addresses, a parcel with an item and customs with a
+commodity each) in a test database with the per-row `ShipmentSerializer` path
+and with the validated once bulk path of `BatchShipmentData.save_resources`.
+
+Usage (from apps/api):
+    python ../../modules/core/benchmarks/batch_shipments_import.py
+"""
+
+import os
+import copy
+import time
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "karrio.server.settings")
+django.setup()
+
+from django.test.runner import DiscoverRunner
+from django.contrib.auth import get_user_model
+import karrio.server.manager.models as models
+import karrio.server.providers.models as providers
+import karrio.server.manager.serializers as serializers
+from karrio.server.serializers import Context
+from karrio.server.data.serializers.batch_shipments import BatchShipmentData
+
+BATCHES = [1000, 5000]
+ADDRESS = {
+    "address_line1": "5840 Oak St",
+    "person_name": "Jane Doe",
+    "city": "Vancouver",
+    "country_code": "CA",
+    "postal_code": "V6M2V9",
+    "state_code": "BC",
+}
+COMMODITY = {
+    "weight": 1,
+    "weight_unit": "KG",
+    "quantity": 1,
+    "description": "T-shirt",
+    "value_amount": 10,
+    "value_currency": "CAD",
+}
+SHIPMENT_DATA = {
+    "shipper": ADDRESS,
+    "recipient": {**ADDRESS, "city": "Moncton", "postal_code": "E1C4Z8"},
+    "parcels": [
+        {
+            "weight": 1,
+            "weight_unit": "KG",
+            "package_preset": "canadapost_corrugated_small_box",
+            "items": [COMMODITY],
+        }
+    ],
+    "customs": {"content_type": "merchandise", "commodities": [COMMODITY]},
+    "payment": {"currency": "CAD", "paid_by": "sender"},
+    "carrier_ids": ["canadapost"],
+}
+
+
+def save_per_row(rows: list, context: Context):
+    for data in rows:
+        serializers.ShipmentSerializer.map(data=data, context=context).save(
+            fetch_rates=False
+        )
+
+
+def save_bulk(rows: list, context: Context):
+    resources = BatchShipmentData.save_resources(dict(shipments=rows), "batch", context)
+
+    assert all(resource["status"] == "queued" for resource in resources)
+
+
+def timed(count: int, save, context: Context) -> float:
+    models.Shipment.objects.all().delete()
+    rows = [copy.deepcopy(SHIPMENT_DATA) for _ in range(count)]
+
+    start = time.perf_counter()
+    save(rows, context)
+    duration = time.perf_counter() - start
+
+    assert models.Shipment.objects.count() == count
+
+    return duration
+
+
+def main():
+    runner = DiscoverRunner(verbosity=0)
+    databases = runner.setup_databases()
+
+    try:
+        user = get_user_model().objects.create_superuser("admin@example.com", "test")
+        providers.Carrier.objects.create(
+            carrier_code="canadapost",
+            carrier_id="canadapost",
+            test_mode=True,
+            created_by=user,
+            credentials=dict(username="username", password="password"),
+        )
+        context = Context(user, None, True)
+
+        for count in BATCHES:
+            print(f"{count} batch shipments")
+
+            for name, save in [("per row", save_per_row), ("bulk", save_bulk)]:
+                duration = timed(count, save, context)
+                print(
+                    f"    {name:>8}: {duration:>7.2f} s  {count / duration:>8.0f} rows/s"
+                )
+    finally:
+        runner.teardown_databases(databases)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark of the rate request gateways setup overhead.
+
+Creates an org with many carrier connections in a test database and times
+`filter_rate_carrier_compatible_gateways` (as run on every rate request) with
+and without the gateways cache.
+
+Usage (from apps/api):
+    python ../../modules/core/benchmarks/gateway_cache.py
+"""
+
+import os
+import time
+import statistics
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "karrio.server.settings")
+django.setup()
+
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+import karrio.server.core.utils as utils
+import karrio.server.providers.models as providers
+
+CONNECTIONS = 24
+REQUESTS = 50
+CARRIERS = [
+    (
+        "canadapost",
+        dict(
+            username="username",
+            password="password",
+            customer_number="123456789",
+            contract_id="42708517",
+        ),
+    ),
+    (
+        "ups",
+        dict(client_id="test", client_secret="test", account_number="000000"),
+    ),
+    (
+        "fedex",
+        dict(api_key="test", secret_key="test", account_number="000000"),
+    ),
+]
+
+
+def setup_connections():
+    user = get_user_model().objects.create_superuser("admin@example.com", "test")
+
+    for index in range(CONNECTIONS):
+        carrier_code, credentials = CARRIERS[index % len(CARRIERS)]
+        providers.Carrier.objects.create(
+            carrier_code=carrier_code,
+            carrier_id=f"{carrier_code}_{index}",
+            test_mode=True,
+            created_by=user,
+            credentials=credentials,
+            capabilities=["rating"],
+        )
+
+
+def rate_request() -> tuple:
+    carriers = list(providers.Carrier.objects.all())
+
+    connection.queries_log.clear()
+
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        gateways = utils.filter_rate_carrier_compatible_gateways(carriers, [], "CA")
+        duration = time.perf_counter() - start
+
+    assert len(gateways) == CONNECTIONS
+    return duration, len(queries)
+
+
+def main():
+    runner = DiscoverRunner(verbosity=0)
+    databases = runner.setup_databases()
+
+    try:
+        setup_connections()
+        print(f"{CONNECTIONS} carrier connections x {REQUESTS} rate requests")
+
+        for label, maxsize in [("no gateways cache", 0), ("gateways cache", 256)]:
+            providers.GATEWAYS.maxsize = maxsize
+            providers.GATEWAYS.invalidate()
+            results = [rate_request() for _ in range(REQUESTS)]
+            durations = sorted(duration for duration, _ in results)
+            print(
+                f"    {label:<20} p50: {statistics.median(durations) * 1000:>8.2f} ms"
+                f"  p95: {durations[int(len(durations) * 0.95)] * 1000:>8.2f} ms"
+                f"  queries: {results[-1][1]:>4}"
+            )
+    finally:
+        runner.teardown_databases(databases)
+
+
+if __name__ == "__main__":
+    main()
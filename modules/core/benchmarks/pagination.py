@@ -0,0 +1,97 @@
+"""Benchmark of offset vs keyset (cursor) pagination of deep list pages.
+
+Creates trackers in a test database and times fetching a page at increasing
+depths with `queryset[offset:offset + limit]` and with the `(created_at, id)`
+keyset cursor of `karrio.server.core.pagination`.
+
+Usage (from apps/api):
+    python ../../modules/core/benchmarks/pagination.py
+"""
+
+import os
+import time
+import statistics
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "karrio.server.settings")
+django.setup()
+
+from django.test.runner import DiscoverRunner
+from django.contrib.auth import get_user_model
+import karrio.server.manager.models as models
+import karrio.server.providers.models as providers
+import karrio.server.core.pagination as pagination
+
+TRACKERS = 100000
+PAGE = 25
+DEPTHS = [0, 1000, 10000, 90000]
+REQUESTS = 10
+
+
+def create_trackers(user):
+    carrier = providers.Carrier.objects.create(
+        carrier_code="canadapost",
+        carrier_id="canadapost",
+        test_mode=True,
+        created_by=user,
+        credentials=dict(username="username", password="password"),
+    )
+    models.Tracking.objects.bulk_create(
+        [
+            models.Tracking(
+                tracking_number=f"{index:012d}",
+                tracking_carrier=carrier,
+                test_mode=True,
+                created_by=user,
+            )
+            for index in range(TRACKERS)
+        ],
+        batch_size=5000,
+    )
+
+
+def timed(function) -> float:
+    durations = []
+
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+
+    return statistics.median(durations)
+
+
+def main():
+    runner = DiscoverRunner(verbosity=0)
+    databases = runner.setup_databases()
+
+    try:
+        user = get_user_model().objects.create_superuser("admin@example.com", "test")
+        create_trackers(user)
+        queryset = models.Tracking.objects.all()
+        print(f"{TRACKERS} trackers, pages of {PAGE}")
+
+        for depth in DEPTHS:
+            # cursor of the last item before the page.
+            cursor = (
+                pagination.paginate(queryset, first=1, offset=depth - 1).end_cursor
+                if depth > 0
+                else None
+            )
+            offset = timed(lambda: list(queryset[depth : depth + PAGE + 1]))
+            keyset = timed(
+                lambda: pagination.paginate(queryset, first=PAGE, after=cursor)
+            )
+            print(
+                f"    page at {depth:>6}  offset: {offset * 1000:>8.2f} ms"
+                f"  keyset: {keyset * 1000:>8.2f} ms"
+            )
+
+        count = timed(lambda: queryset.count())
+        print(f"    exact count: {count * 1000:>8.2f} ms")
+    finally:
+        runner.teardown_databases(databases)
+
+
+if __name__ == "__main__":
+    main()
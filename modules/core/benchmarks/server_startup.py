@@ -0,0 +1,62 @@
+"""Import-time benchmark of the karrio server startup.
+
+Boots django and loads the url conf in fresh interpreters, with and without
+the carrier extensions manifests, and reports the startup time and the number
+of carrier extensions imported.
+
+Usage (from apps/api):
+    python ../../modules/core/benchmarks/server_startup.py
+"""
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+RUNS = 3
+STARTUP = """
+import os, sys, json, time
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "karrio.server.settings")
+start = time.perf_counter()
+import django
+django.setup()
+import karrio.server.urls
+import karrio.server.core.dataunits
+duration = time.perf_counter() - start
+extensions = {m.split(".")[2] for m in sys.modules if m.startswith("karrio.mappers.")}
+print(json.dumps(dict(duration=duration, extensions=len(extensions))))
+"""
+
+
+def startup(use_manifests: bool) -> dict:
+    env = {**os.environ, "KARRIO_USE_MANIFESTS": str(use_manifests).lower()}
+    output = subprocess.check_output(
+        [sys.executable, "-c", STARTUP], env=env, stderr=subprocess.DEVNULL
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    subprocess.check_call(
+        [
+            sys.executable,
+            "-c",
+            "import karrio.references as r; print(len(r.generate_manifests()), 'manifests generated')",
+        ]
+    )
+
+    for label, use_manifests in [
+        ("eager imports", False),
+        ("extensions manifests", True),
+    ]:
+        results = [startup(use_manifests) for _ in range(RUNS)]
+        duration = statistics.median(result["duration"] for result in results)
+        print(
+            f"    {label:<24} startup: {duration * 1000:>8.1f} ms"
+            f"  extensions imported: {results[-1]['extensions']:>3}"
+        )
+
+
+if __name__ == "__main__":
+    main()
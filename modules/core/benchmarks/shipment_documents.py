@@ -0,0 +1,101 @@
+"""Benchmark of shipment listing with inline vs offloaded label documents.
+
+Creates shipments with a label in a test database and times loading a page of
+shipments. The inline case keeps the base64 label in the shipment row (as the
+former `label` text column did, emulated with a JSON field of the same row);
+the offloaded case keeps only the document store reference on the row.
+
+Usage (from apps/api):
+    python ../../modules/core/benchmarks/shipment_documents.py
+"""
+
+import os
+import time
+import base64
+import statistics
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "karrio.server.settings")
+django.setup()
+
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.contrib.auth import get_user_model
+import karrio.server.manager.models as models
+
+SHIPMENTS = 500
+PAGE = 100
+LABEL_SIZE = 150 * 1024
+REQUESTS = 20
+
+
+def create_shipments(user, inline: bool) -> list:
+    ids = []
+
+    for index in range(SHIPMENTS):
+        label = base64.b64encode(os.urandom(LABEL_SIZE)).decode()
+        address = dict(country_code="CA", created_by=user)
+        shipment = models.Shipment(
+            shipper=models.Address.objects.create(**address),
+            recipient=models.Address.objects.create(**address),
+            created_by=user,
+            test_mode=True,
+            label_type="PDF",
+            tracking_number=f"{index:012d}",
+        )
+
+        if inline:
+            shipment.meta = dict(label=label)
+        else:
+            shipment.label = label
+
+        shipment.save()
+        ids.append(shipment.id)
+
+    return ids
+
+
+def list_shipments(ids: list) -> float:
+    start = time.perf_counter()
+    list(models.Shipment.objects.filter(id__in=ids[:PAGE]))
+    return time.perf_counter() - start
+
+
+def row_bytes(ids: list) -> int:
+    table = models.Shipment._meta.db_table
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT SUM(LENGTH(COALESCE(\"meta\", '')) + LENGTH(COALESCE(\"label_file\", ''))) "
+            f'FROM "{table}" WHERE "id" IN ({",".join(["%s"] * len(ids))})',
+            ids,
+        )
+        return cursor.fetchone()[0] or 0
+
+
+def main():
+    runner = DiscoverRunner(verbosity=0)
+    databases = runner.setup_databases()
+
+    try:
+        user = get_user_model().objects.create_superuser("admin@example.com", "test")
+        print(
+            f"{SHIPMENTS} shipments with {LABEL_SIZE // 1024} KB labels, "
+            f"listing pages of {PAGE}"
+        )
+
+        for label, inline in [("inline label", True), ("offloaded label", False)]:
+            ids = create_shipments(user, inline)
+            list_shipments(ids)  # warm up
+            durations = sorted(list_shipments(ids) for _ in range(REQUESTS))
+            print(
+                f"    {label:<18} p50: {statistics.median(durations) * 1000:>8.2f} ms"
+                f"  p95: {durations[int(len(durations) * 0.95)] * 1000:>8.2f} ms"
+                f"  row data: {row_bytes(ids) / 1024:>10.1f} KB"
+            )
+    finally:
+        runner.teardown_databases(databases)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Benchmark of the persistence of tracker updates.
+
+Creates shipment trackers in a test database and times saving one tracking
+update per tracker with the per-row path (lookup by scan, `save()` and
+shipment save with signals per tracker) and with the bulk path of
+`save_updated_trackers`. Webhook enqueues are counted instead of sent and the worker side
+serialization of the batched notifications is timed separately.
+
+Usage (from apps/api):
+    python ../../modules/core/benchmarks/tracker_updates.py
+"""
+
+import os
+import time
+import django
+from unittest import mock
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "karrio.server.settings")
+django.setup()
+
+from django.test.runner import DiscoverRunner
+from django.contrib.auth import get_user_model
+from karrio.core.models import TrackingDetails, TrackingEvent
+import karrio.server.manager.models as models
+import karrio.server.providers.models as providers
+import karrio.server.manager.serializers as serializers
+import karrio.server.events.task_definitions.base.tracking as tracking
+
+BATCHES = [1000, 10000]
+
+
+def create_trackers(user, carrier, count: int):
+    models.Tracking.objects.all().delete()
+    models.Shipment.objects.all().delete()
+    models.Address.objects.all().delete()
+    addresses = models.Address.objects.bulk_create(
+        [models.Address(country_code="CA", created_by=user) for _ in range(count * 2)],
+        batch_size=5000,
+    )
+    shipments = models.Shipment.objects.bulk_create(
+        [
+            models.Shipment(
+                shipper=addresses[index * 2],
+                recipient=addresses[index * 2 + 1],
+                status="purchased",
+                test_mode=True,
+                created_by=user,
+            )
+            for index in range(count)
+        ],
+        batch_size=5000,
+    )
+    models.Tracking.objects.bulk_create(
+        [
+            models.Tracking(
+                tracking_number=f"{index:012d}",
+                tracking_carrier=carrier,
+                shipment=shipment,
+                test_mode=True,
+                created_by=user,
+            )
+            for index, shipment in enumerate(shipments)
+        ],
+        batch_size=5000,
+    )
+
+    return list(
+        models.Tracking.objects.defer(None).select_related(
+            "tracking_carrier", "shipment"
+        )
+    )
+
+
+def tracking_responses(trackers) -> list:
+    return [
+        (
+            [
+                TrackingDetails(
+                    carrier_id="canadapost",
+                    carrier_name="canadapost",
+                    tracking_number=tracker.tracking_number,
+                    status="in_transit",
+                    events=[
+                        TrackingEvent(
+                            code="IT",
+                            date="2024-01-02",
+                            time="10:00",
+                            description="In transit",
+                        )
+                    ],
+                )
+                for tracker in trackers
+            ],
+            [],
+        )
+    ]
+
+
+def save_per_row(responses, trackers):
+    for tracking_details, _ in responses:
+        for details in tracking_details:
+            for tracker in [
+                t for t in trackers if t.tracking_number == details.tracking_number
+            ]:
+                changes = tracking.apply_tracking_details(tracker, details)
+
+                if any(changes):
+                    tracker.save(update_fields=changes)
+                    serializers.update_shipment_tracker(tracker)
+
+
+def timed(user, carrier, count: int, save) -> tuple:
+    trackers = create_trackers(user, carrier, count)
+    responses = tracking_responses(trackers)
+
+    with mock.patch.object(
+        tracking.tasks, "notify_webhooks"
+    ) as single, mock.patch.object(tracking.tasks, "notify_trackers_updated") as batch:
+        start = time.perf_counter()
+        save(responses, trackers)
+        duration = time.perf_counter() - start
+
+    assert models.Shipment.objects.filter(status="in_transit").count() == count
+
+    return duration, single.call_count + batch.call_count, batch.call_args
+
+
+def timed_notifications(batch_call) -> float:
+    with mock.patch(
+        "karrio.server.events.task_definitions.base.webhook.notify_webhook_subscribers"
+    ) as notify:
+        start = time.perf_counter()
+        tracking.notify_trackers_updates(*batch_call.args)
+        duration = time.perf_counter() - start
+
+    assert notify.call_count == len(batch_call.args[0]) + len(batch_call.args[1])
+
+    return duration
+
+
+def main():
+    runner = DiscoverRunner(verbosity=0)
+    databases = runner.setup_databases()
+
+    try:
+        user = get_user_model().objects.create_superuser("admin@example.com", "test")
+        carrier = providers.Carrier.objects.create(
+            carrier_code="canadapost",
+            carrier_id="canadapost",
+            test_mode=True,
+            created_by=user,
+            credentials=dict(username="username", password="password"),
+        )
+
+        for count in BATCHES:
+            print(f"{count} trackers updates")
+
+            for name, save in [
+                ("per row", save_per_row),
+                ("bulk", tracking.save_updated_trackers),
+            ]:
+                duration, enqueues, batch_call = timed(user, carrier, count, save)
+                print(
+                    f"    {name:>8}: {duration:>7.2f} s"
+                    f"  {count / duration:>8.0f} rows/s  {enqueues:>6} enqueues"
+                )
+
+            duration = timed_notifications(batch_call)
+            print(
+                f"    {'notify':>8}: {duration:>7.2f} s"
+                f"  {count / duration:>8.0f} rows/s  (worker, batch serialization)"
+            )
+    finally:
+        runner.teardown_databases(databases)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,5 +6,7 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         from karrio.server.core.signals import register_signals
+        from karrio.server.core.fields import register_lookups
 
         register_signals()
+        register_lookups()
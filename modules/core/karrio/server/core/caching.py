@@ -0,0 +1,238 @@
+"""Rate quote cache keyed on a canonical fingerprint of the rate request.
+
+Quotes are cached per carrier connection in the Django cache with an
+in-process L1. A quote older than its TTL is still served for the stale
+window while a background refresh fetches a new one.
+
+Settings:
+    RATE_CACHE_TTL: default quote TTL in seconds (0 disables the cache)
+    RATE_CACHE_STALE_TTL: seconds an expired quote is served while refreshing
+    RATE_CACHE_L1_SIZE: max quotes kept in the in-process L1
+
+A connection can override the TTL with the `rate_cache_ttl` config.
+"""
+
+import attr
+import json
+import time
+import typing
+import hashlib
+import logging
+import threading
+import collections
+import django.conf as conf
+import django.core.cache as caching
+
+import karrio
+import karrio.lib as lib
+import karrio.core.models as models
+import karrio.api.gateway as gateway
+from karrio.core.utils import workers
+
+logger = logging.getLogger(__name__)
+RATE_CACHE_KEY = "karrio:rates:{}"
+RATE_CACHE_LOCK_KEY = "karrio:rates:lock:{}"
+IGNORED_FIELDS = ["reference"]
+UNORDERED_FIELDS = ["services", "carrier_ids"]
+
+
+class CachedQuote(typing.NamedTuple):
+    rates: typing.List[models.RateDetails]
+    messages: typing.List[models.Message]
+    stale: bool
+
+
+class RateQuoteCache:
+    """Two-level (in-process L1 + Django cache) carrier rate quotes cache."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._entries: collections.OrderedDict = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = dict(hits=0, stale=0, misses=0, refreshes=0, failures=0)
+
+    @property
+    def metrics(self) -> typing.Dict[str, typing.Any]:
+        with self._lock:
+            served = self._metrics["hits"] + self._metrics["stale"]
+            lookups = served + self._metrics["misses"]
+
+            return {
+                **self._metrics,
+                "size": len(self._entries),
+                "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+            }
+
+    def ttl(self, _gateway: gateway.Gateway) -> int:
+        _config = getattr(_gateway.settings, "config", None) or {}
+        _ttl = _config.get("rate_cache_ttl")
+
+        return int(
+            getattr(conf.settings, "RATE_CACHE_TTL", 0) if _ttl is None else _ttl
+        )
+
+    def key(self, fingerprint: str, carrier, context=None) -> typing.Optional[str]:
+        _gateway_key = carrier.gateway_key(context)
+
+        if _gateway_key is None:
+            return None
+
+        return RATE_CACHE_KEY.format(
+            hashlib.sha256(
+                json.dumps([fingerprint, _gateway_key], default=str).encode()
+            ).hexdigest()
+        )
+
+    def get(self, key: str) -> typing.Optional[CachedQuote]:
+        now = time.time()
+        entry = self._local_get(key, now)
+
+        if entry is None:
+            entry = caching.cache.get(key)
+
+            if entry is not None:
+                self._local_set(key, entry)
+
+        if entry is None or now >= entry["expires"] + entry["stale_ttl"]:
+            self._count("misses")
+            return None
+
+        stale = now >= entry["expires"]
+        self._count("stale" if stale else "hits")
+
+        return CachedQuote(
+            rates=[lib.to_object(models.RateDetails, _) for _ in entry["rates"]],
+            messages=[lib.to_object(models.Message, _) for _ in entry["messages"]],
+            stale=stale,
+        )
+
+    def set(
+        self,
+        key: str,
+        ttl: int,
+        rates: typing.List[models.RateDetails],
+        messages: typing.List[models.Message],
+    ) -> None:
+        # carrier failures are not cached
+        if key is None or ttl <= 0 or not any(rates):
+            return
+
+        stale_ttl = int(getattr(conf.settings, "RATE_CACHE_STALE_TTL", 60))
+        entry = dict(
+            rates=lib.to_dict(rates),
+            messages=lib.to_dict(messages),
+            expires=time.time() + ttl,
+            stale_ttl=stale_ttl,
+        )
+
+        caching.cache.set(key, entry, timeout=ttl + stale_ttl)
+        self._local_set(key, entry)
+
+    def refresh(
+        self,
+        key: str,
+        ttl: int,
+        request: models.RateRequest,
+        _gateway: gateway.Gateway,
+    ) -> None:
+        """Fetch a new quote in the background (once across processes)."""
+        lock_key = RATE_CACHE_LOCK_KEY.format(key)
+
+        if not caching.cache.add(lock_key, True, timeout=60):
+            return
+
+        # the request tracer may be persisted before the refresh completes.
+        _tracer = lib.Tracer()
+        _gateway = attr.evolve(
+            _gateway, tracer=_tracer, proxy=attr.evolve(_gateway.proxy, tracer=_tracer)
+        )
+
+        def _refresh():
+            try:
+                rates, messages = karrio.Rating.fetch(request).from_(_gateway).parse()
+                self.set(key, ttl, rates, messages)
+                self._count("refreshes")
+            except Exception as e:
+                self._count("failures")
+                logger.warning(f"failed to refresh rate quote: {e}")
+            finally:
+                caching.cache.delete(lock_key)
+
+        workers.get_worker_pool().submit(_refresh)
+
+    def clear(self) -> None:
+        """Drop the in-process quotes (the shared cache entries expire on their own)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _local_get(self, key: str, now: float) -> typing.Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            if now >= entry["expires"] + entry["stale_ttl"]:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry
+
+    def _local_set(self, key: str, entry: dict) -> None:
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self._metrics[metric] += 1
+
+
+def fingerprint(payload: dict) -> str:
+    """Return a canonical fingerprint of a rate request payload.
+
+    Empty values are dropped, numbers normalized and unordered lists sorted so
+    equivalent requests share the same fingerprint.
+    """
+    data = {
+        key: (sorted(value or []) if key in UNORDERED_FIELDS else value)
+        for key, value in payload.items()
+        if key not in IGNORED_FIELDS
+    }
+
+    return hashlib.sha256(
+        json.dumps(
+            _canonical(data),
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+def _canonical(value):
+    if isinstance(value, dict):
+        items = ((k, _canonical(v)) for k, v in value.items())
+        return {k: v for k, v in items if not _is_empty(v)}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(_) for _ in value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        return value.strip()
+
+    return value
+
+
+def _is_empty(value) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+RATE_QUOTES = RateQuoteCache(getattr(conf.settings, "RATE_CACHE_L1_SIZE", 1024))
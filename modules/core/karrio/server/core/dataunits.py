@@ -1,4 +1,5 @@
 import typing
+import functools
 from constance import config
 from django.urls import reverse
 from rest_framework.request import Request
@@ -9,8 +10,6 @@ import karrio.core.units as units
 import karrio.references as references
 
 
-PACKAGE_MAPPERS = references.collect_providers_data()
-
 REFERENCE_MODELS = {
     **references.collect_references(),
     "customs_content_type": {c.name: c.value for c in list(units.CustomsContentType)},
@@ -33,6 +32,20 @@ NON_HUBS_CARRIERS = [
 ]
 
 
+def __getattr__(name: str):
+    # PACKAGE_MAPPERS requires importing every carrier extension so it is only
+    # computed on access (the references are served from the extensions manifests).
+    if name == "PACKAGE_MAPPERS":
+        return _package_mappers()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def _package_mappers() -> dict:
+    return references.collect_providers_data()
+
+
 def contextual_metadata(request: Request):
     _host: str = typing.cast(
         str,
@@ -1,5 +1,11 @@
+import json
+import math
+import typing
 from django import forms
-from django.db import models
+from django.db import models, NotSupportedError
+from django.db.models import lookups
+
+import karrio.lib as lib
 
 
 class MultiChoiceField(models.JSONField):
@@ -10,3 +16,146 @@ class MultiChoiceField(models.JSONField):
 
     def validate(self, value, model_instance):
         pass
+
+
+class HasValue(models.Lookup):
+    """Match the JSON objects with a top level value equal to the given value.
+
+    The lookup is compiled to a `@?` jsonpath predicate on Postgres which is
+    served by a GIN index on the field, and to `json_each` and `JSON_CONTAINS`
+    expressions on SQLite and MySQL.
+    """
+
+    lookup_name = "has_value"
+    prepare_rhs = False
+    can_use_none_as_rhs = True
+
+    def candidates(self) -> typing.List[typing.Any]:
+        return [self.rhs]
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError(
+            f"The {self.lookup_name} lookup is not supported on {connection.vendor}."
+        )
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        values = self.candidates()
+
+        # `strict` keeps the values of nested arrays from being unwrapped and
+        # matched as in the lax mode (as `json_each` on the other databases).
+        if all(_is_scalar(value) for value in values):
+            path = "strict $.* ? ({})".format(
+                " || ".join(f"@ == {json.dumps(value)}" for value in values)
+            )
+            return f"{lhs} @? %s::jsonpath", (*lhs_params, path)
+
+        return (
+            "EXISTS (SELECT 1 FROM jsonb_each("
+            f"CASE jsonb_typeof({lhs}) WHEN 'object' THEN {lhs} ELSE '{{}}'::jsonb END"
+            f") AS j WHERE j.value IN ({', '.join(['%s::jsonb'] * len(values))}))"
+        ), (*lhs_params, *lhs_params, *[json.dumps(value) for value in values])
+
+    def as_sqlite(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        conditions = [_sqlite_condition(value) for value in self.candidates()]
+
+        return (
+            f"EXISTS (SELECT 1 FROM json_each({lhs}) AS j "
+            f"WHERE {' OR '.join(sql for sql, _ in conditions)})"
+        ), (*lhs_params, *[param for _, params in conditions for param in params])
+
+    def as_mysql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        values = self.candidates()
+
+        return (
+            "({})".format(
+                " OR ".join(
+                    [f"JSON_CONTAINS(JSON_EXTRACT({lhs}, '$.*'), %s)"] * len(values)
+                )
+            ),
+            tuple(
+                param for value in values for param in (*lhs_params, json.dumps(value))
+            ),
+        )
+
+
+class HasTextValue(HasValue):
+    """Match the JSON objects with a top level value of the given text.
+
+    e.g. `"1"` matches the values `"1"` and `1` and `"True"` the value `true`.
+    """
+
+    lookup_name = "has_text_value"
+
+    def candidates(self) -> typing.List[typing.Any]:
+        text = str(self.rhs)
+        number = lib.failsafe(lambda: json.loads(text))
+        constants = {"True": True, "False": False, "None": None}
+
+        return [
+            text,
+            *(
+                [number]
+                if isinstance(number, (int, float))
+                and not isinstance(number, bool)
+                and math.isfinite(number)
+                else []
+            ),
+            *([constants[text]] if text in constants else []),
+        ]
+
+
+class Matches(models.Lookup):
+    """Match the text containing the given value or all its words by prefix.
+
+    On Postgres the lookup is compiled to an `ILIKE` served by a trigram index
+    and a prefix full text query served by a `to_tsvector('simple', ...)`
+    index. It falls back to `icontains` on the other databases.
+    """
+
+    lookup_name = "matches"
+
+    def as_sql(self, compiler, connection):
+        return lookups.IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        value = str(self.rhs)
+
+        return (
+            f"({lhs} ILIKE %s OR to_tsvector('simple', {lhs}) @@ to_tsquery("
+            "'simple', array_to_string(ARRAY("
+            "SELECT quote_literal(word) || ':*' "
+            "FROM unnest(tsvector_to_array(to_tsvector('simple', %s))) AS word"
+            "), ' & ')))"
+        ), (
+            *lhs_params,
+            f"%{connection.ops.prep_for_like_query(value)}%",
+            *lhs_params,
+            value,
+        )
+
+
+def register_lookups():
+    models.JSONField.register_lookup(HasValue)
+    models.JSONField.register_lookup(HasTextValue)
+    models.TextField.register_lookup(Matches)
+
+
+def _is_scalar(value: typing.Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _sqlite_condition(value: typing.Any) -> typing.Tuple[str, list]:
+    if isinstance(value, bool):
+        return "j.type = %s", ["true" if value else "false"]
+    if value is None:
+        return "j.type = %s", ["null"]
+    if isinstance(value, (int, float)):
+        return "(j.type IN ('integer', 'real') AND j.value = %s)", [value]
+    if isinstance(value, str):
+        return "(j.type = 'text' AND j.value = %s)", [value]
+
+    return "(j.type IN ('object', 'array') AND j.value = json(%s))", [json.dumps(value)]
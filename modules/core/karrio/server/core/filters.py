@@ -106,13 +106,7 @@ class CarrierFilters(filters.FilterSet):
         return queryset.filter(metadata__has_key=value)
 
     def metadata_value_filter(self, queryset, name, value):
-        return queryset.filter(
-            id__in=[
-                o["id"]
-                for o in queryset.values("id", "metadata")
-                if value in (o.get("metadata") or {}).values()
-            ]
-        )
+        return queryset.filter(metadata__has_value=value)
 
 
 class CarrierConnectionFilter(filters.FilterSet):
@@ -181,13 +175,7 @@ class CarrierConnectionFilter(filters.FilterSet):
         return queryset.filter(metadata__has_key=value)
 
     def metadata_value_filter(self, queryset, name, value):
-        return queryset.filter(
-            id__in=[
-                o["id"]
-                for o in queryset.values("id", "metadata")
-                if value in (o.get("metadata") or {}).values()
-            ]
-        )
+        return queryset.filter(metadata__has_value=value)
 
 
 class ShipmentFilters(filters.FilterSet):
@@ -392,71 +380,10 @@ class ShipmentFilters(filters.FilterSet):
         fields: typing.List[str] = []
 
     def address_filter(self, queryset, name, value):
-        if "postgres" in conf.settings.DB_ENGINE:
-            from django.contrib.postgres.search import SearchVector
-
-            return queryset.annotate(
-                search=SearchVector(
-                    "recipient__address_line1",
-                    "recipient__address_line2",
-                    "recipient__postal_code",
-                    "recipient__person_name",
-                    "recipient__company_name",
-                    "recipient__country_code",
-                    "recipient__city",
-                    "recipient__email",
-                    "recipient__phone_number",
-                )
-            ).filter(search=value)
-
-        return queryset.filter(
-            models.Q(id__icontains=value)
-            | models.Q(recipient__address_line1__icontains=value)
-            | models.Q(recipient__address_line2__icontains=value)
-            | models.Q(recipient__postal_code__icontains=value)
-            | models.Q(recipient__person_name__icontains=value)
-            | models.Q(recipient__company_name__icontains=value)
-            | models.Q(recipient__country_code__icontains=value)
-            | models.Q(recipient__city__icontains=value)
-            | models.Q(recipient__email__icontains=value)
-            | models.Q(recipient__phone_number__icontains=value)
-        )
+        return queryset.filter(recipient__search_document__matches=value)
 
     def keyword_filter(self, queryset, name, value):
-        if "postgres" in conf.settings.DB_ENGINE:
-            from django.contrib.postgres.search import SearchVector
-
-            return queryset.annotate(
-                search=SearchVector(
-                    "id",
-                    "reference",
-                    "tracking_number",
-                    "recipient__address_line1",
-                    "recipient__address_line2",
-                    "recipient__postal_code",
-                    "recipient__person_name",
-                    "recipient__company_name",
-                    "recipient__country_code",
-                    "recipient__city",
-                    "recipient__email",
-                    "recipient__phone_number",
-                )
-            ).filter(search=value)
-
-        return queryset.filter(
-            models.Q(id__icontains=value)
-            | models.Q(recipient__address_line1__icontains=value)
-            | models.Q(recipient__address_line2__icontains=value)
-            | models.Q(recipient__postal_code__icontains=value)
-            | models.Q(recipient__person_name__icontains=value)
-            | models.Q(recipient__company_name__icontains=value)
-            | models.Q(recipient__country_code__icontains=value)
-            | models.Q(recipient__city__icontains=value)
-            | models.Q(recipient__email__icontains=value)
-            | models.Q(recipient__phone_number__icontains=value)
-            | models.Q(tracking_number__icontains=value)
-            | models.Q(reference__icontains=value)
-        )
+        return queryset.filter(search_document__matches=value)
 
     def carrier_filter(self, queryset, name, values):
         _filters = [
@@ -476,37 +403,19 @@ class ShipmentFilters(filters.FilterSet):
         return queryset.filter(models.Q(options__has_key=value))
 
     def option_value_filter(self, queryset, name, value):
-        return queryset.filter(
-            id__in=[
-                o["id"]
-                for o in queryset.values("id", "options")
-                if value in (o.get("options") or {}).values()
-            ]
-        )
+        return queryset.filter(options__has_value=value)
 
     def metadata_key_filter(self, queryset, name, value):
         return queryset.filter(metadata__has_key=value)
 
     def metadata_value_filter(self, queryset, name, value):
-        return queryset.filter(
-            id__in=[
-                o["id"]
-                for o in queryset.values("id", "metadata")
-                if value in (o.get("metadata") or {}).values()
-            ]
-        )
+        return queryset.filter(metadata__has_value=value)
 
     def meta_key_filter(self, queryset, name, value):
         return queryset.filter(meta__has_key=value)
 
     def meta_value_filter(self, queryset, name, value):
-        return queryset.filter(
-            id__in=[
-                o["id"]
-                for o in queryset.values("id", "meta")
-                if value in map(str, (o.get("meta") or {}).values())
-            ]
-        )
+        return queryset.filter(meta__has_text_value=value)
 
     def has_tracker_filter(self, queryset, name, value):
         return queryset.filter(shipment_tracker__isnull=not value)
@@ -516,6 +425,10 @@ class ShipmentFilters(filters.FilterSet):
 
 
 class TrackerFilters(filters.FilterSet):
+    keyword = filters.CharFilter(
+        method="keyword_filter",
+        help_text="tracker' keyword and indexes search",
+    )
     tracking_number = filters.CharFilter(
         field_name="tracking_number",
         lookup_expr="icontains",
@@ -549,6 +462,11 @@ class TrackerFilters(filters.FilterSet):
     )
 
     parameters = [
+        openapi.OpenApiParameter(
+            "keyword",
+            type=openapi.OpenApiTypes.STR,
+            location=openapi.OpenApiParameter.QUERY,
+        ),
         openapi.OpenApiParameter(
             "tracking_number",
             type=openapi.OpenApiTypes.STR,
@@ -599,6 +517,9 @@ class TrackerFilters(filters.FilterSet):
 
         return queryset.filter(query)
 
+    def keyword_filter(self, queryset, name, value):
+        return queryset.filter(search_document__matches=value)
+
 
 class LogFilter(filters.FilterSet):
     api_endpoint = filters.CharFilter(field_name="path", lookup_expr="icontains")
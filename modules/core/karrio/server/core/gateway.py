@@ -11,6 +11,7 @@ from rest_framework.exceptions import NotFound
 import karrio
 import karrio.lib as lib
 import karrio.server.core.utils as utils
+import karrio.server.core.caching as caching
 import karrio.server.core.models as core
 import karrio.server.core.datatypes as datatypes
 import karrio.server.core.dataunits as dataunits
@@ -87,13 +88,8 @@ class Carriers:
 
         # Check if a metadata value is provided, to add it to the query
         if "metadata_value" in list_filter:
-            _value = list_filter["metadata_value"]
             _queryset = _queryset.filter(
-                id__in=[
-                    _["id"]
-                    for _ in _queryset.values("id", "metadata")
-                    if _value in (_.get("metadata") or {}).values()
-                ]
+                metadata__has_value=list_filter["metadata_value"]
             )
 
         # Check if a list of carrier_ids are provided, to add the list to the query
@@ -574,10 +570,56 @@ class Rates:
         if raise_on_error and len(gateways) == 0:
             raise NotFound("No active carrier connection found to process the request")
 
-        request = karrio.Rating.fetch(lib.to_object(datatypes.RateRequest, payload))
+        rate_request = lib.to_object(datatypes.RateRequest, payload)
+        request = karrio.Rating.fetch(rate_request)
 
-        # The request call is wrapped in utils.identity to simplify mocking in tests
-        rates, messages = utils.identity(lambda: request.from_(*gateways).parse())
+        # serve the connections quotes from the rate cache when enabled.
+        context = carrier_filters.get("context")
+        connections = {carrier.id: carrier for carrier in carriers}
+        cached_rates, cached_messages, cached_carrier_ids = [], [], set()
+        fingerprint = None
+        pending = []
+
+        for _gateway in gateways:
+            ttl = caching.RATE_QUOTES.ttl(_gateway)
+            carrier = connections.get(_gateway.settings.id)
+            key = None
+
+            if ttl > 0 and carrier is not None:
+                fingerprint = fingerprint or caching.fingerprint(payload)
+                key = caching.RATE_QUOTES.key(fingerprint, carrier, context)
+
+            quote = caching.RATE_QUOTES.get(key) if key is not None else None
+
+            if quote is None:
+                pending.append((_gateway, key, ttl))
+                continue
+
+            if quote.stale:
+                caching.RATE_QUOTES.refresh(key, ttl, rate_request, _gateway)
+
+            cached_rates += quote.rates
+            cached_messages += quote.messages
+            cached_carrier_ids.add(_gateway.settings.carrier_id)
+
+        rates, messages = [], []
+
+        if any(pending) or not any(cached_carrier_ids):
+            # The request call is wrapped in utils.identity to simplify mocking in tests
+            rates, messages = utils.identity(
+                lambda: request.from_(*[_gateway for _gateway, *_ in pending]).parse()
+            )
+
+        for _gateway, key, ttl in pending:
+            caching.RATE_QUOTES.set(
+                key,
+                ttl,
+                [_ for _ in rates if _.carrier_id == _gateway.settings.carrier_id],
+                [_ for _ in messages if _.carrier_id == _gateway.settings.carrier_id],
+            )
+
+        rates = [*cached_rates, *rates]
+        messages = [*cached_messages, *messages]
 
         if raise_on_error and not any(rates) and any(messages):
             raise exceptions.APIException(
@@ -603,6 +645,7 @@ class Rates:
                 "service_name": service_name,
                 "rate_provider": rate_provider,  # TODO: deprecate rate_provider
                 "carrier_connection_id": carrier.id,
+                **({"cached": True} if rate.carrier_id in cached_carrier_ids else {}),
             }
 
             return lib.to_object(
@@ -19,7 +19,7 @@ from karrio.server.core.models.third_party import (
 from karrio.server.core.models.metafield import (
     Metafield,
 )
-from karrio.server.core.models.entity import Entity, OwnedEntity
+from karrio.server.core.models.entity import Entity, OwnedEntity, SearchableEntity
 
 
 def _identity(value: typing.Any):
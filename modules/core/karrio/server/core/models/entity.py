@@ -1,5 +1,9 @@
+import typing
+import functools
 from django.db import models
 from django.conf import settings
+
+import karrio.lib as lib
 from karrio.server.core.models.base import uuid, ControlledAccessModel
 
 
@@ -20,3 +24,33 @@ class OwnedEntity(ControlledAccessModel, Entity):
         abstract = True
 
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+
+
+class SearchableEntity(models.Model):
+    """An entity with a search document of its `SEARCH_FIELDS` values.
+
+    The document is computed on save by the `search_document_saving` signal and
+    queried with the `matches` lookup served by the full text and trigram
+    indexes of the column on Postgres.
+    """
+
+    SEARCH_FIELDS: typing.List[str] = []
+
+    class Meta:
+        abstract = True
+
+    search_document = models.TextField(null=True, blank=True, editable=False)
+
+    def get_search_document(self) -> str:
+        values = [
+            lib.failsafe(lambda: functools.reduce(getattr, field.split("__"), self))
+            for field in self.SEARCH_FIELDS
+        ]
+
+        return "\n".join("" if value is None else str(value) for value in values)
+
+    def update_search_document(self):
+        self.search_document = self.get_search_document()
+        type(self).objects.filter(pk=self.pk).update(
+            search_document=self.search_document
+        )
@@ -0,0 +1,296 @@
+"""Keyset (cursor) pagination and count caching for large list queries.
+
+Querysets ordered by `created_at` (the default ordering of karrio entities)
+are paginated with `(created_at, id)` keyset conditions so deep pages cost the
+same as the first one. Other orderings fall back to offset cursors.
+
+Cursors are opaque (url safe base64) strings.
+
+Settings:
+    PAGINATION_COUNT_CACHE_TTL: seconds exact counts are cached (0 disables caching)
+    PAGINATION_COUNT_ESTIMATE_THRESHOLD: on PostgreSQL, the planner row estimate
+        is returned instead of an exact count above this number of rows (0 disables)
+"""
+
+import json
+import typing
+import base64
+import hashlib
+import binascii
+import datetime
+import dataclasses
+import django.conf as conf
+import django.db as db
+import django.db.models as models
+import django.core.cache as caching
+from django.core.exceptions import EmptyResultSet
+from rest_framework import exceptions, pagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+KEYSET_ORDERINGS = {("-created_at",): True, ("created_at",): False}
+
+
+@dataclasses.dataclass
+class Page:
+    items: list
+    cursors: typing.List[str]
+    has_next_page: bool
+    has_previous_page: bool
+
+    @property
+    def start_cursor(self) -> typing.Optional[str]:
+        return self.cursors[0] if any(self.cursors) else None
+
+    @property
+    def end_cursor(self) -> typing.Optional[str]:
+        return self.cursors[-1] if any(self.cursors) else None
+
+
+def paginate(
+    queryset: models.QuerySet,
+    first: typing.Optional[int] = None,
+    offset: typing.Optional[int] = None,
+    after: typing.Optional[str] = None,
+    before: typing.Optional[str] = None,
+    last: typing.Optional[int] = None,
+    default_limit: int = 25,
+) -> Page:
+    """Return a page of the queryset.
+
+    `after` / `first` paginate forward and `before` / `last` backward.
+    `offset` is only used when no cursor is given.
+    """
+    descending = _keyset_direction(queryset)
+    backward = before is not None or (last is not None and after is None)
+    limit = (last if backward else first) or first or default_limit
+    cursor = before if backward else after
+    start = offset or 0
+
+    if descending is not None:
+        queryset = queryset.order_by(*_keyset_ordering(descending != backward))
+
+        if cursor is not None:
+            created_at, pk = _decode_cursor(cursor, "k")
+            queryset = queryset.filter(
+                _keyset_condition(created_at, pk, descending != backward)
+            )
+        elif not backward:
+            queryset = queryset[start:]
+    else:
+        if cursor is not None:
+            (index,) = _decode_cursor(cursor, "o")
+            start = index + 1 if not backward else max(index - limit, 0)
+            limit = limit if not backward else index - start
+        elif backward:
+            start = max(queryset.count() - limit, 0)
+
+        queryset = queryset[start:]
+
+    items = list(queryset[: limit + 1])
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    if descending is not None:
+        items = items[::-1] if backward else items
+        cursors = [_encode_cursor("k", item.created_at, item.pk) for item in items]
+        has_next_page = before is not None if backward else has_more
+        has_previous_page = has_more if backward else (after is not None or start > 0)
+    else:
+        cursors = [_encode_cursor("o", start + index) for index in range(len(items))]
+        has_next_page = before is not None if backward else has_more
+        has_previous_page = start > 0
+
+    return Page(
+        items=items,
+        cursors=cursors,
+        has_next_page=has_next_page,
+        has_previous_page=has_previous_page,
+    )
+
+
+def count_queryset(queryset: models.QuerySet) -> int:
+    """Return the queryset count.
+
+    Large PostgreSQL results return the planner estimate and exact counts are
+    cached for `PAGINATION_COUNT_CACHE_TTL` seconds.
+    """
+    ttl = getattr(conf.settings, "PAGINATION_COUNT_CACHE_TTL", 0)
+    threshold = getattr(conf.settings, "PAGINATION_COUNT_ESTIMATE_THRESHOLD", 0)
+
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+
+    if threshold > 0 and db.connections[queryset.db].vendor == "postgresql":
+        estimate = _estimate_count(queryset.db, sql, params)
+
+        if estimate >= threshold:
+            return estimate
+
+    if ttl <= 0:
+        return queryset.count()
+
+    key = "pagination:count:{}".format(
+        hashlib.sha256(f"{queryset.db}|{sql}|{params!r}".encode()).hexdigest()
+    )
+    count = caching.cache.get(key)
+
+    if count is None:
+        count = queryset.count()
+        caching.cache.set(key, count, timeout=ttl)
+
+    return count
+
+
+class KeysetPagination(pagination.BasePagination):
+    """REST framework cursor pagination (`limit`, `after`, `before`).
+
+    The `offset` query parameter is still supported when no cursor is given.
+    """
+
+    default_limit = 20
+    max_limit = 100
+    limit_query_param = "limit"
+    offset_query_param = "offset"
+    after_query_param = "after"
+    before_query_param = "before"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.queryset = queryset
+        params = request.query_params
+        limit = min(
+            _positive_int(params.get(self.limit_query_param), self.default_limit),
+            self.max_limit,
+        )
+        before = params.get(self.before_query_param)
+
+        self.page = paginate(
+            queryset,
+            first=limit,
+            last=limit if before else None,
+            offset=_positive_int(params.get(self.offset_query_param), 0),
+            after=params.get(self.after_query_param),
+            before=before,
+        )
+
+        return self.page.items
+
+    def get_paginated_response(self, data):
+        return Response(
+            dict(
+                count=count_queryset(self.queryset),
+                next=self.get_next_link(),
+                previous=self.get_previous_link(),
+                results=data,
+            )
+        )
+
+    def get_next_link(self):
+        if not self.page.has_next_page or self.page.end_cursor is None:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        url = remove_query_param(url, self.before_query_param)
+        return replace_query_param(url, self.after_query_param, self.page.end_cursor)
+
+    def get_previous_link(self):
+        if not self.page.has_previous_page or self.page.start_cursor is None:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        url = remove_query_param(url, self.after_query_param)
+        return replace_query_param(url, self.before_query_param, self.page.start_cursor)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": name,
+                "required": False,
+                "in": "query",
+                "description": description,
+                "schema": {"type": type},
+            }
+            for name, type, description in [
+                (self.limit_query_param, "integer", "Number of results to return."),
+                (self.offset_query_param, "integer", "Initial index of the results."),
+                (self.after_query_param, "string", "Return results after a cursor."),
+                (self.before_query_param, "string", "Return results before a cursor."),
+            ]
+        ]
+
+
+def _keyset_direction(queryset: models.QuerySet) -> typing.Optional[bool]:
+    """Return whether the keyset ordering is descending (None if not keyset paginable)."""
+    if not hasattr(queryset.model, "created_at"):
+        return None
+
+    ordering = tuple(
+        queryset.query.order_by
+        or (queryset.model._meta.ordering if queryset.query.default_ordering else [])
+    )
+
+    return KEYSET_ORDERINGS.get(ordering)
+
+
+def _keyset_ordering(descending: bool) -> typing.List[str]:
+    return ["-created_at", "-pk"] if descending else ["created_at", "pk"]
+
+
+def _keyset_condition(created_at, pk, descending: bool) -> models.Q:
+    lookup = "lt" if descending else "gt"
+
+    # the redundant inclusive bound lets the planner use a `(created_at, id)` index range scan.
+    return models.Q(**{f"created_at__{lookup}e": created_at}) & (
+        models.Q(**{f"created_at__{lookup}": created_at})
+        | models.Q(created_at=created_at, **{f"pk__{lookup}": pk})
+    )
+
+
+def _encode_cursor(kind: str, *values) -> str:
+    content = json.dumps(
+        [
+            kind,
+            *[v.isoformat() if isinstance(v, datetime.datetime) else v for v in values],
+        ],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(content.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, kind: str) -> list:
+    try:
+        content = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        )
+
+        if kind == "k" and content[0] == kind:
+            return [datetime.datetime.fromisoformat(content[1]), content[2]]
+        if kind == "o" and content[0] == kind:
+            return [int(content[1])]
+    except (binascii.Error, ValueError, TypeError, IndexError, KeyError):
+        pass
+
+    raise exceptions.ValidationError(dict(cursor=["Invalid pagination cursor"]))
+
+
+def _estimate_count(alias: str, sql: str, params) -> int:
+    with db.connections[alias].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _positive_int(value, default: int) -> int:
+    try:
+        return max(int(value), 0) if value not in (None, "") else default
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,257 @@
+"""Buffered API request logging.
+
+With `API_LOGS_BUFFERING` enabled, `LoggingMixin` enqueues the request logs
+in process instead of saving them in the request path. A background thread
+persists them with `bulk_create` every `API_LOGS_FLUSH_INTERVAL` seconds or
+as soon as `API_LOGS_BATCH_SIZE` logs are pending, and the buffer is flushed
+on shutdown. The SDK tracing records of a buffered request are saved with its
+log so they stay linked to the log id.
+
+Logs of a failing batch are saved one by one and the ones still failing are
+put back in the buffer to be retried with the next flush.
+
+Settings:
+    API_LOGS_MAX_BUFFER_SIZE: logs kept for a retry (the oldest are dropped beyond)
+    API_LOGS_MAX_BODY_SIZE: request and response bodies longer than this number
+        of characters are stored truncated with the hash of the full body (0 disables)
+    API_LOGS_SAMPLING: `{path prefix: rate}` sampling rates of successful requests
+"""
+
+import json
+import atexit
+import random
+import typing
+import hashlib
+import logging
+import threading
+import dataclasses
+import django.db as db
+import django.db.transaction as transaction
+from django.conf import settings
+
+import karrio.lib as lib
+import karrio.server.core.utils as utils
+import karrio.server.core.models as models
+import karrio.server.serializers as serializers
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class LogEntry:
+    log: models.APILogIndex
+    context: serializers.Context
+    tracer: typing.Optional[lib.Tracer] = None
+    schema: typing.Optional[str] = None
+
+
+class LogBuffer:
+    def __init__(self):
+        self._entries: typing.List[LogEntry] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+
+    def put(self, entry: LogEntry):
+        with self._lock:
+            self._entries.append(entry)
+            full = len(self._entries) >= getattr(settings, "API_LOGS_BATCH_SIZE", 100)
+
+        if _flush_interval() > 0:
+            self._start()
+
+            if full:
+                self._wakeup.set()
+        elif full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Persist the pending logs and return their number."""
+        with self._flush_lock:
+            with self._lock:
+                entries, self._entries = self._entries, []
+
+            if not any(entries):
+                return 0
+
+            try:
+                save_logs(entries)
+                return len(entries)
+            except Exception as e:
+                logger.exception(e)
+
+            # a single invalid log shouldn't drop the whole batch.
+            failed = [entry for entry in entries if not _try_save_log(entry)]
+            self._requeue(failed)
+
+            return len(entries) - len(failed)
+
+    def _requeue(self, entries: typing.List[LogEntry]):
+        max_size = getattr(settings, "API_LOGS_MAX_BUFFER_SIZE", 10000)
+
+        with self._lock:
+            self._entries = [*entries, *self._entries]
+            dropped = len(self._entries) - max_size
+
+            if dropped > 0:
+                self._entries = self._entries[dropped:]
+                logger.warning(f"> {dropped} request logs dropped...")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self._run, name="api-logs-buffer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(_flush_interval())
+            self._wakeup.clear()
+
+            try:
+                db.close_old_connections()
+                self.flush()
+            except Exception as e:
+                logger.exception(e)
+
+
+def should_log(path: typing.Optional[str], status_code: typing.Optional[int]) -> bool:
+    """Return whether a request log is kept given the sampling rate of its path.
+
+    Failed requests are always logged.
+    """
+    sampling: dict = getattr(settings, "API_LOGS_SAMPLING", None) or {}
+
+    if (status_code or 0) >= 400 or not any(sampling):
+        return True
+
+    rate = next(
+        (
+            rate
+            for prefix, rate in sorted(sampling.items(), key=lambda _: -len(_[0]))
+            if (path or "").startswith(prefix)
+        ),
+        1.0,
+    )
+
+    return rate >= 1 or random.random() < rate
+
+
+def truncate_body(body: typing.Any) -> typing.Any:
+    """Return the body or its truncated preview if larger than `API_LOGS_MAX_BODY_SIZE`."""
+    max_size = getattr(settings, "API_LOGS_MAX_BODY_SIZE", 0)
+
+    if not max_size or not isinstance(body, str) or len(body) <= max_size:
+        return body
+
+    return json.dumps(
+        dict(
+            truncated=True,
+            size=len(body),
+            sha256=hashlib.sha256(body.encode("utf-8", "replace")).hexdigest(),
+            preview=body[:max_size],
+        )
+    )
+
+
+def save_logs(entries: typing.List[LogEntry]):
+    schemas: typing.Dict[typing.Optional[str], typing.List[LogEntry]] = {}
+
+    for entry in entries:
+        schemas.setdefault(entry.schema, []).append(entry)
+
+    for schema, group in schemas.items():
+        _save_logs(group, schema=schema)
+
+
+def _try_save_log(entry: LogEntry) -> bool:
+    try:
+        save_logs([entry])
+        return True
+    except Exception as e:
+        logger.exception(e)
+        return False
+
+
+@utils.tenant_aware
+def _save_logs(entries: typing.List[LogEntry], **kwargs):
+    from karrio.server.tracing.models import TracingRecord
+    from karrio.server.tracing.utils import request_tracing_records
+
+    logs = [entry.log for entry in entries]
+    records: typing.List[TracingRecord] = []
+    links: typing.Dict[tuple, tuple] = {}
+
+    # saved atomically so a failing batch can be retried without duplicates.
+    with transaction.atomic():
+        _bulk_create_logs(logs)
+
+        for entry in entries:
+            entry_records = []
+
+            if entry.tracer is not None and getattr(
+                settings, "PERSIST_SDK_TRACING", True
+            ):
+                entry.tracer.add_context(dict(request_log_id=entry.log.id))
+                entry_records = request_tracing_records(
+                    entry.tracer, entry.context.user
+                )
+                records += entry_records
+
+            if entry.context.org is not None and hasattr(entry.log, "org"):
+                for item in [entry.log, *entry_records]:
+                    links.setdefault(
+                        (entry.context.org.pk, type(item)), (entry.context, [])
+                    )[1].append(item)
+
+        TracingRecord.objects.bulk_create(records)
+
+        for context, items in links.values():
+            serializers.bulk_link_org(items, context)
+
+    logger.info(f"> {len(logs)} request logs saved...")
+
+
+def _bulk_create_logs(logs: typing.List[models.APILogIndex]):
+    if not db.connection.features.can_return_rows_from_bulk_insert:
+        for log in logs:
+            log.save()
+        return
+
+    # `bulk_create` does not support multi-table inheritance: the `APILog`
+    # rows are inserted first then the `APILogIndex` rows pointing to them.
+    parents = models.APILog.objects.bulk_create(
+        [
+            models.APILog(
+                **{
+                    field.attname: getattr(log, field.attname)
+                    for field in models.APILog._meta.concrete_fields
+                    if not field.primary_key
+                }
+            )
+            for log in logs
+        ]
+    )
+
+    for log, parent in zip(logs, parents):
+        log.id = log.apilog_ptr_id = parent.id
+
+    models.APILogIndex.objects._insert(
+        logs, fields=models.APILogIndex._meta.local_concrete_fields
+    )
+
+
+def _flush_interval() -> float:
+    return float(getattr(settings, "API_LOGS_FLUSH_INTERVAL", 2.0))
+
+
+buffer = LogBuffer()
+atexit.register(buffer.flush)
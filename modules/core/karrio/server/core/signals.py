@@ -4,6 +4,8 @@ from django.dispatch import receiver
 from constance import config
 from constance.signals import config_updated
 
+from karrio.server.core import utils
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,3 +37,24 @@ def update_settings(current):
             current.EMAIL_HOST_USER,
         ]
     )
+
+
+@utils.disable_for_loaddata
+def search_document_saving(sender, instance, *args, **kwargs):
+    """Compute the search document of a searchable entity before its save."""
+    document = instance.get_search_document()
+    instance._search_document_changed = document != instance.search_document
+    instance.search_document = document
+
+
+@utils.disable_for_loaddata
+def search_document_saved(sender, instance, update_fields=None, *args, **kwargs):
+    """Persist the changed search document of a partial save."""
+    if (
+        getattr(instance, "_search_document_changed", False)
+        and update_fields is not None
+        and "search_document" not in update_fields
+    ):
+        sender.objects.filter(pk=instance.pk).update(
+            search_document=instance.search_document
+        )
@@ -0,0 +1,455 @@
+"""Content-addressed storage for shipment documents (labels, invoices...).
+
+Documents are stored once per content (sha256) in the configured backend and
+referenced from the database rows.
+
+Settings:
+    DOCUMENT_STORAGE: "filesystem" (default) or "s3"
+    DOCUMENT_STORAGE_PATH: filesystem backend root directory
+    DOCUMENT_STORAGE_BUCKET: s3 backend bucket
+    DOCUMENT_STORAGE_PREFIX: s3 backend key prefix
+    DOCUMENT_STORAGE_ENDPOINT_URL: s3 compatible API endpoint (e.g. MinIO)
+    DOCUMENT_STORAGE_ACCESS_KEY / DOCUMENT_STORAGE_SECRET_KEY / DOCUMENT_STORAGE_REGION
+"""
+
+import io
+import os
+import abc
+import base64
+import typing
+import hashlib
+import binascii
+import shutil
+import tempfile
+import weakref
+import threading
+import importlib.util
+import django.apps as apps
+import django.conf as conf
+import django.db.transaction as transaction
+from django.core.exceptions import ImproperlyConfigured
+
+TEXT_DOCUMENT = "text"
+CHUNK_SIZE = 64 * 1024
+# (app label, model name, field) of the columns holding document references
+REFERENCE_FIELDS = [
+    ("manager", "Shipment", "label_file"),
+    ("manager", "Shipment", "invoice_file"),
+    ("documents", "PrintJob", "document_file"),
+]
+
+
+class DocumentStore(abc.ABC):
+    """Content-addressed document store backend."""
+
+    @abc.abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def write(self, key: str, content: bytes) -> None:
+        pass
+
+    @abc.abstractmethod
+    def open(self, key: str) -> typing.BinaryIO:
+        """Return a readable binary stream of the document content."""
+        pass
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    def put(self, content: bytes) -> str:
+        """Store the content (once) and return its key."""
+        key = content_key(content)
+
+        if not self.exists(key):
+            self.write(key, content)
+
+        return key
+
+    def get(self, key: str) -> bytes:
+        with self.open(key) as stream:
+            return stream.read()
+
+    def put_file(self, file: typing.BinaryIO) -> str:
+        """Store the content of a (seekable) file once and return its key."""
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+        key = digest.hexdigest()
+
+        if not self.exists(key):
+            file.seek(0)
+            self.write_file(key, file)
+
+        return key
+
+    def write_file(self, key: str, file: typing.BinaryIO) -> None:
+        self.write(key, file.read())
+
+    def size(self, key: str) -> int:
+        return len(self.get(key))
+
+    def open_range(self, key: str, start: int, end: int) -> typing.BinaryIO:
+        """Return a readable stream of the content from `start` to `end` (inclusive)."""
+        stream = self.open(key)
+
+        if stream.seekable():
+            stream.seek(start)
+        else:
+            stream.read(start)
+
+        return _LimitedStream(stream, end - start + 1)
+
+
+class FileSystemStore(DocumentStore):
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def write(self, key: str, content: bytes) -> None:
+        self.write_file(key, io.BytesIO(content))
+
+    def write_file(self, key: str, file: typing.BinaryIO) -> None:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # write to a temporary file first so readers never see partial documents.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as output:
+            shutil.copyfileobj(file, output, CHUNK_SIZE)
+        os.replace(tmp, path)
+
+    def open(self, key: str) -> typing.BinaryIO:
+        return open(self.path(key), "rb")
+
+    def delete(self, key: str) -> None:
+        if self.exists(key):
+            os.remove(self.path(key))
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self.path(key))
+
+
+class S3Store(DocumentStore):
+    """S3 compatible API backend (AWS S3, MinIO...). Requires `boto3`."""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str = None,
+        access_key: str = None,
+        secret_key: str = None,
+        region: str = None,
+    ) -> None:
+        if importlib.util.find_spec("boto3") is None:
+            raise ImproperlyConfigured("boto3 is required for the s3 document storage")
+
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name=region,
+        )
+
+    def exists(self, key: str) -> bool:
+        import botocore.exceptions
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=f"{self.prefix}{key}")
+            return True
+        except botocore.exceptions.ClientError:
+            return False
+
+    def write(self, key: str, content: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket, Key=f"{self.prefix}{key}", Body=content
+        )
+
+    def write_file(self, key: str, file: typing.BinaryIO) -> None:
+        self.client.upload_fileobj(file, self.bucket, f"{self.prefix}{key}")
+
+    def open(self, key: str) -> typing.BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=f"{self.prefix}{key}")[
+            "Body"
+        ]
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=f"{self.prefix}{key}")
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=f"{self.prefix}{key}")[
+            "ContentLength"
+        ]
+
+    def open_range(self, key: str, start: int, end: int) -> typing.BinaryIO:
+        return self.client.get_object(
+            Bucket=self.bucket,
+            Key=f"{self.prefix}{key}",
+            Range=f"bytes={start}-{end}",
+        )["Body"]
+
+
+_stores: typing.Dict[tuple, DocumentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_document_store() -> DocumentStore:
+    """Return the configured document store (created once per configuration)."""
+    settings = conf.settings
+    backend = getattr(settings, "DOCUMENT_STORAGE", "filesystem")
+    options = dict(
+        root=getattr(settings, "DOCUMENT_STORAGE_PATH", None)
+        or os.path.join(getattr(settings, "WORK_DIR", "") or ".", "documents"),
+        bucket=getattr(settings, "DOCUMENT_STORAGE_BUCKET", None),
+        prefix=getattr(settings, "DOCUMENT_STORAGE_PREFIX", None) or "",
+        endpoint_url=getattr(settings, "DOCUMENT_STORAGE_ENDPOINT_URL", None),
+        access_key=getattr(settings, "DOCUMENT_STORAGE_ACCESS_KEY", None),
+        secret_key=getattr(settings, "DOCUMENT_STORAGE_SECRET_KEY", None),
+        region=getattr(settings, "DOCUMENT_STORAGE_REGION", None),
+    )
+    options = {k: v for k, v in options.items() if v is not None}
+    key = (backend, *sorted(options.items()))
+
+    if key not in _stores:
+        with _stores_lock:
+            if key not in _stores:
+                _stores[key] = _create_store(backend, options)
+
+    return _stores[key]
+
+
+def content_key(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def save_document(
+    value: typing.Optional[str], on_commit: bool = False
+) -> typing.Optional[str]:
+    """Store a base64 encoded document and return its reference.
+
+    With `on_commit`, the document is only written once the current
+    transaction commits (and never if it rolls back).
+    """
+    if value is None:
+        return None
+
+    content = _decode(value)
+    kind = ""
+
+    # documents that are not valid base64 are kept verbatim.
+    if content is None:
+        content, kind = value.encode(), f":{TEXT_DOCUMENT}"
+
+    if not on_commit:
+        return f"{get_document_store().put(content)}{kind}"
+
+    write = _PendingWrite(content)
+    transaction.on_commit(write)
+
+    return f"{write.key}{kind}"
+
+
+def load_document(reference: typing.Optional[str]) -> typing.Optional[str]:
+    """Return the base64 encoded document of a reference."""
+    if reference is None:
+        return None
+
+    key, _, kind = reference.partition(":")
+    content = _get(key)
+
+    if kind == TEXT_DOCUMENT:
+        return content.decode()
+
+    return base64.b64encode(content).decode()
+
+
+def open_document(reference: str) -> typing.BinaryIO:
+    """Return a readable stream of the document (decoded) bytes."""
+    key, _, kind = reference.partition(":")
+
+    if kind == TEXT_DOCUMENT:
+        content = _get(key)
+        return io.BytesIO(_decode_lenient(content) or content)
+
+    pending = _pending_content(key)
+
+    if pending is not None:
+        return io.BytesIO(pending)
+
+    return get_document_store().open(key)
+
+
+def read_document(reference: str) -> bytes:
+    """Return the document (decoded) bytes."""
+    stream = open_document(reference)
+
+    try:
+        return stream.read()
+    finally:
+        stream.close()
+
+
+def release_document(reference: typing.Optional[str]) -> None:
+    """Delete a document once no row references its content anymore.
+
+    Documents are content-addressed so the same blob can be shared by many rows.
+    The references are checked again after the delete and the content restored
+    if a transaction referencing it committed in between.
+    """
+    if reference is None:
+        return
+
+    key, _, __ = reference.partition(":")
+    store = get_document_store()
+
+    if _is_referenced(key) or not store.exists(key):
+        return
+
+    content = store.get(key)
+    store.delete(key)
+
+    if _is_referenced(key):
+        store.write(key, content)
+
+
+def save_file(file: typing.BinaryIO) -> str:
+    """Store a (seekable) file content and return its reference."""
+    return get_document_store().put_file(file)
+
+
+def document_size(reference: str) -> int:
+    """Return the size in bytes of a binary document."""
+    key, _, __ = reference.partition(":")
+    return get_document_store().size(key)
+
+
+def open_document_range(reference: str, start: int, end: int) -> typing.BinaryIO:
+    """Return a readable stream of a binary document bytes range (inclusive)."""
+    key, _, __ = reference.partition(":")
+    return get_document_store().open_range(key, start, end)
+
+
+_pending = threading.local()
+
+
+class _PendingWrite:
+    """A document write run when the current transaction commits."""
+
+    def __init__(self, content: bytes) -> None:
+        self.key = content_key(content)
+        self.content = content
+        _pending_writes()[self.key] = self
+
+    def __call__(self) -> None:
+        # the content is always written (even if the blob exists) so that a
+        # concurrent release of the same content can't leave it deleted.
+        get_document_store().write(self.key, self.content)
+        _pending_writes().pop(self.key, None)
+
+
+def _pending_writes() -> "weakref.WeakValueDictionary[str, _PendingWrite]":
+    # the writes are only referenced strongly by the transaction commit
+    # callbacks, so they leave the registry once the transaction (or their
+    # savepoint) is rolled back.
+    if not hasattr(_pending, "writes"):
+        _pending.writes = weakref.WeakValueDictionary()
+
+    return _pending.writes
+
+
+def _pending_content(key: str) -> typing.Optional[bytes]:
+    # documents saved in the current transaction are not written yet.
+    write = _pending_writes().get(key)
+
+    return write.content if write is not None else None
+
+
+def _is_referenced(key: str) -> bool:
+    for app_label, model_name, field in REFERENCE_FIELDS:
+        try:
+            model = apps.apps.get_model(app_label, model_name)
+        except LookupError:
+            continue
+
+        if model.objects.filter(**{f"{field}__startswith": key}).exists():
+            return True
+
+    return False
+
+
+def _get(key: str) -> bytes:
+    pending = _pending_content(key)
+
+    return pending if pending is not None else get_document_store().get(key)
+
+
+class _LimitedStream(io.RawIOBase):
+    def __init__(self, stream: typing.BinaryIO, length: int) -> None:
+        self.stream = stream
+        self.remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        content = self.stream.read(size)
+        self.remaining -= len(content)
+
+        return content
+
+    def readinto(self, buffer) -> int:
+        content = self.read(len(buffer))
+        buffer[: len(content)] = content
+
+        return len(content)
+
+    def close(self) -> None:
+        self.stream.close()
+        super().close()
+
+
+def _create_store(backend: str, options: dict) -> DocumentStore:
+    if backend == "filesystem":
+        return FileSystemStore(options["root"])
+
+    if backend == "s3":
+        if "bucket" not in options:
+            raise ImproperlyConfigured("DOCUMENT_STORAGE_BUCKET is required")
+
+        return S3Store(**{k: v for k, v in options.items() if k != "root"})
+
+    raise ImproperlyConfigured(f"Unsupported document storage: {backend}")
+
+
+def _decode(value: str) -> typing.Optional[bytes]:
+    try:
+        content = base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+
+    # only keep the binary form when it round trips to the exact same text.
+    return content if base64.b64encode(content).decode() == value else None
+
+
+def _decode_lenient(content: bytes) -> typing.Optional[bytes]:
+    try:
+        return base64.b64decode(content)
+    except (binascii.Error, ValueError):
+        return None
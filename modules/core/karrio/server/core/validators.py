@@ -109,40 +109,41 @@ class OptionDefaultSerializer(serializers.Serializer):
     def __init__(self, instance=None, **kwargs):
         data = kwargs.get("data", {})
         if data:
-            # Get existing options from data and instance
-            options = {
-                **(
-                    getattr(instance, "options", None) or {}
-                ),  # Start with instance options
-                **(data.get("options") or {}),  # Override with new options
-            }
-
-            # Get shipping_date from options or default to next business day
-            shipping_date = options.get("shipping_date")
-            shipment_date = options.get("shipment_date")
-
-            if not shipping_date:
-                shipping_date = lib.fdatetime(
-                    lib.to_next_business_datetime(
-                        lib.to_date(shipment_date) or datetime.now()
-                    ),
-                    output_format="%Y-%m-%dT%H:%M",
-                )
+            # Update the data with merged options
+            kwargs["data"]["options"] = self.default_options(data, instance)
 
-            if not shipment_date:
-                shipment_date = lib.fdate(
-                    shipping_date, current_format="%Y-%m-%dT%H:%M"
-                )
+        super().__init__(instance, **kwargs)
 
-            # Update only the date fields in options
-            options.update(
-                {"shipping_date": shipping_date, "shipment_date": shipment_date}
+    @staticmethod
+    def default_options(data: dict, instance=None) -> dict:
+        """Return the data options merged with the instance ones and the
+        default shipping dates.
+        """
+        # Get existing options from data and instance
+        options = {
+            **(getattr(instance, "options", None) or {}),  # Start with instance options
+            **(data.get("options") or {}),  # Override with new options
+        }
+
+        # Get shipping_date from options or default to next business day
+        shipping_date = options.get("shipping_date")
+        shipment_date = options.get("shipment_date")
+
+        if not shipping_date:
+            shipping_date = lib.fdatetime(
+                lib.to_next_business_datetime(
+                    lib.to_date(shipment_date) or datetime.now()
+                ),
+                output_format="%Y-%m-%dT%H:%M",
             )
 
-            # Update the data with merged options
-            kwargs["data"]["options"] = options
+        if not shipment_date:
+            shipment_date = lib.fdate(shipping_date, current_format="%Y-%m-%dT%H:%M")
 
-        super().__init__(instance, **kwargs)
+        # Update only the date fields in options
+        options.update({"shipping_date": shipping_date, "shipment_date": shipment_date})
+
+        return options
 
 
 class PresetSerializer(serializers.Serializer):
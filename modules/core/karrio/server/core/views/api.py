@@ -9,7 +9,9 @@ from rest_framework_tracking import mixins
 from rest_framework import status
 
 from karrio.core.utils import DP
-from karrio.server.serializers import link_org
+import karrio.server.conf as conf
+import karrio.server.core.request_logs as request_logs
+from karrio.server.serializers import Context, link_org
 from karrio.server.tracing.utils import set_tracing_context
 from karrio.server.core.utils import failsafe
 from karrio.server.core.authentication import (
@@ -50,23 +52,45 @@ class LoggingMixin(mixins.LoggingMixin):
         if test_mode is None and '"test_mode": false' in (self.log["response"] or ""):
             test_mode = False
 
+        if not request_logs.should_log(
+            self.log.get("path"), self.log.get("status_code")
+        ):
+            return
+
         log = APILogIndex(
             **{
                 **self.log,
-                "data": data,
-                "response": response,
+                "data": request_logs.truncate_body(data),
+                "response": request_logs.truncate_body(response),
                 "entity_id": entity_id,
                 "test_mode": test_mode,
                 "query_params": query_params,
             }
         )
+        object_id = failsafe(lambda: (self.log.get("response") or {}).get("id"))
+
+        if settings.API_LOGS_BUFFERING:
+            request_logs.buffer.put(
+                request_logs.LogEntry(
+                    log=log,
+                    context=Context(
+                        user=getattr(self.request, "user", None),
+                        org=getattr(self.request, "org", None),
+                        test_mode=test_mode,
+                    ),
+                    tracer=getattr(self.request, "tracer", None),
+                    schema=conf.settings.schema,
+                )
+            )
+            set_tracing_context(object_id=object_id, request_log_buffered=True)
+            return
 
         log.save()
         link_org(log, self.request)
 
         set_tracing_context(
             request_log_id=getattr(log, "id", None),
-            object_id=failsafe(lambda: (self.log.get("response") or {}).get("id")),
+            object_id=object_id,
         )
 
 
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:10
+
+from django.db import migrations
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+    # the indexes are built concurrently out of a transaction
+    atomic = False
+
+    dependencies = [
+        ("providers", "0080_alter_aramexsettings_account_country_code_and_more"),
+    ]
+
+    operations = []
+
+    if "postgres" in settings.DB_ENGINE:
+        operations = [
+            migrations.RunSQL(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS "carrier_metadata_gin_idx" '
+                'ON "providers_carrier" USING gin ("metadata")',
+                reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "carrier_metadata_gin_idx"',
+            ),
+        ]
@@ -16,6 +16,7 @@ from karrio.server.providers.models.utils import (
 )
 from karrio.server.providers.models.carrier import (
     Carrier,
+    GATEWAYS,
     COUNTRIES,
     CURRENCIES,
     WEIGHT_UNITS,
@@ -1,5 +1,12 @@
+import attr
+import json
+import time
+import uuid
 import typing
+import hashlib
 import functools
+import threading
+import collections
 import django.conf as conf
 import django.forms as forms
 import django.db.models as models
@@ -19,6 +26,78 @@ CURRENCIES = [(c.name, c.name) for c in units.Currency]
 WEIGHT_UNITS = [(c.name, c.name) for c in units.WeightUnit]
 DIMENSION_UNITS = [(c.name, c.name) for c in units.DimensionUnit]
 CAPABILITIES_CHOICES = [(c, c) for c in units.CarrierCapabilities.get_capabilities()]
+GATEWAY_VERSION_KEY = "karrio:gateway:version:{}"
+
+
+class GatewayCache:
+    """A per-process LRU of the carrier connections gateways.
+
+    Entries are keyed by the carrier id, the request context (when the carrier
+    config resolution depends on it) and a version stamp of the connection
+    settings, config and rate sheet. `invalidate` evicts the local entries and
+    bumps the shared version so that the other processes rebuild them too.
+    Entries expire after `ttl` seconds for the changes missed by a process
+    (e.g. when the versions cache isn't shared).
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: (
+            "collections.OrderedDict[tuple, typing.Tuple[float, gateway.Gateway]]"
+        ) = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: typing.Optional[tuple]) -> typing.Optional[gateway.Gateway]:
+        if key is None:
+            return None
+
+        with self._lock:
+            expires_at, _gateway = self._entries.get(key, (None, None))
+
+            if _gateway is None:
+                return None
+
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+            return _gateway
+
+    def set(self, key: typing.Optional[tuple], _gateway: gateway.Gateway) -> None:
+        if key is None or self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, _gateway)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, carrier_id: str = None) -> None:
+        """Evict the gateways of a carrier connection (or all of them)."""
+        caching.cache.set(
+            GATEWAY_VERSION_KEY.format(carrier_id or "*"),
+            uuid.uuid4().hex,
+            timeout=None,
+        )
+
+        with self._lock:
+            for key in list(self._entries.keys()):
+                if carrier_id is None or key[0] == carrier_id:
+                    del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+GATEWAYS = GatewayCache(
+    getattr(conf.settings, "GATEWAY_CACHE_SIZE", 0),
+    getattr(conf.settings, "GATEWAY_CACHE_TTL", 300),
+)
 
 
 class Manager(models.Manager):
@@ -211,15 +290,64 @@ class Carrier(core.OwnedEntity):
         import karrio.server.core.middleware as middleware
 
         _context = middleware.SessionContext.get_current_request()
-        _tracer = getattr(_context, "tracer", lib.Tracer())
-        _cache = lib.Cache(caching.cache)
+        _tracer = getattr(_context, "tracer", None) or lib.Tracer()
+        _key = self.gateway_key(_context) if GATEWAYS.maxsize > 0 else None
+        _gateway = GATEWAYS.get(_key)
+
+        if _gateway is None:
+            _gateway = karrio.gateway[self.ext].create(
+                self.data.to_dict(),
+                lib.Tracer(),
+                lib.Cache(caching.cache),
+            )
+            GATEWAYS.set(_key, _gateway)
 
-        return karrio.gateway[self.ext].create(
-            self.data.to_dict(),
-            _tracer,
-            _cache,
+        # the cached gateway is shared: swap the request tracer in a copy.
+        return attr.evolve(
+            _gateway,
+            tracer=_tracer,
+            proxy=attr.evolve(_gateway.proxy, tracer=_tracer),
         )
 
+    def gateway_key(self, context=None) -> typing.Optional[tuple]:
+        """The gateways cache key of the carrier connection."""
+        if self.id is None:
+            return None
+
+        # the config resolution falls back to the request context for carriers without owner.
+        _context = lib.identity(
+            None
+            if self.created_by_id is not None
+            else (
+                getattr(getattr(context, "user", None), "id", None),
+                getattr(getattr(context, "org", None), "id", None),
+            )
+        )
+        # the shared versions are fetched once per carrier instance (i.e. per request).
+        if "_gateway_versions" not in self.__dict__:
+            self._gateway_versions = caching.cache.get_many(
+                [GATEWAY_VERSION_KEY.format(self.id), GATEWAY_VERSION_KEY.format("*")]
+            )
+
+        _stamp = hashlib.sha256(
+            json.dumps(
+                [
+                    self.ext,
+                    self.carrier_id,
+                    self.test_mode,
+                    self.is_system,
+                    self.rate_sheet_id,
+                    self.credentials,
+                    self.metadata,
+                    sorted(self._gateway_versions.items()),
+                ],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+
+        return (self.id, _context, _stamp)
+
     @staticmethod
     def resolve_config(
         carrier, is_user_config: bool = False, is_system_config: bool = False
@@ -10,6 +10,16 @@ logger = logging.getLogger(__name__)
 
 def register_signals():
     signals.post_save.connect(carrier_changed, sender=models.Carrier)
+    signals.post_delete.connect(carrier_deleted, sender=models.Carrier)
+    signals.post_save.connect(carrier_config_changed, sender=models.CarrierConfig)
+    signals.post_delete.connect(carrier_config_changed, sender=models.CarrierConfig)
+    signals.post_save.connect(rate_sheet_changed, sender=models.RateSheet)
+    signals.post_delete.connect(rate_sheet_changed, sender=models.RateSheet)
+    signals.post_save.connect(rate_sheet_changed, sender=models.ServiceLevel)
+    signals.post_delete.connect(rate_sheet_changed, sender=models.ServiceLevel)
+    signals.m2m_changed.connect(
+        rate_sheet_changed, sender=models.RateSheet.services.through
+    )
 
     logger.info("karrio.providers signals registered...")
 
@@ -25,3 +35,23 @@ def carrier_changed(
     if len(instance.capabilities or []) == 0:
         instance.capabilities = ref.get_carrier_capabilities(instance.carrier_code)
         instance.save()
+
+
+def carrier_deleted(sender, instance, *args, **kwargs):
+    """Evict the deleted carrier connection gateways."""
+    models.GATEWAYS.invalidate(instance.id)
+
+
+@utils.disable_for_loaddata
+def carrier_config_changed(sender, instance, *args, **kwargs):
+    """Rebuild the carrier connection gateways on config change."""
+    models.GATEWAYS.invalidate(instance.carrier_id)
+
+
+@utils.disable_for_loaddata
+def rate_sheet_changed(sender, instance, *args, **kwargs):
+    """Rebuild the gateways on rate sheets and services change.
+
+    A service can be shared by multiple rate sheets so all gateways are invalidated.
+    """
+    models.GATEWAYS.invalidate()
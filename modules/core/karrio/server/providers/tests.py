@@ -1,3 +1,74 @@
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# TODO: Write carriers API tests
+import karrio.server.providers.models as providers
+
+
+class TestCarrierGatewayCache(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_superuser(
+            "admin@example.com", "test"
+        )
+        self.carrier = providers.Carrier.objects.create(
+            carrier_code="canadapost",
+            carrier_id="canadapost",
+            test_mode=True,
+            created_by=self.user,
+            credentials=dict(
+                username="6e93d53968881714",
+                customer_number="2004381",
+                contract_id="42708517",
+                password="0bfa9fcb9853d1f51ee57a",
+            ),
+            capabilities=["rating"],
+        )
+        # the gateways cache is disabled by default without a shared cache
+        self.enabled = patch.multiple(providers.GATEWAYS, maxsize=8, ttl=300)
+        self.enabled.start()
+        self.addCleanup(self.enabled.stop)
+        self.addCleanup(providers.GATEWAYS.invalidate)
+
+    def test_gateway_is_reused_with_a_fresh_tracer(self):
+        gateway = self.carrier.gateway
+        reused = providers.Carrier.objects.get(pk=self.carrier.pk).gateway
+
+        self.assertIs(reused.mapper, gateway.mapper)
+        self.assertIsNot(reused.tracer, gateway.tracer)
+        self.assertIs(reused.proxy.tracer, reused.tracer)
+
+    def test_gateway_is_rebuilt_on_credentials_change(self):
+        gateway = self.carrier.gateway
+
+        self.carrier.credentials = {**self.carrier.credentials, "password": "new"}
+        self.carrier.save()
+
+        self.assertIsNot(self.carrier.gateway.mapper, gateway.mapper)
+        self.assertEqual(self.carrier.gateway.settings.password, "new")
+
+    def test_gateway_is_rebuilt_on_config_change(self):
+        gateway = self.carrier.gateway
+
+        providers.CarrierConfig.objects.create(
+            carrier=self.carrier,
+            config=dict(cost_center="ccenter"),
+            created_by=self.user,
+        )
+
+        rebuilt = self.carrier.gateway
+        self.assertIsNot(rebuilt.mapper, gateway.mapper)
+        self.assertDictEqual(rebuilt.settings.config, dict(cost_center="ccenter"))
+
+    def test_gateway_is_rebuilt_once_expired(self):
+        with patch.object(providers.GATEWAYS, "ttl", 0):
+            gateway = providers.Carrier.objects.get(pk=self.carrier.pk).gateway
+            rebuilt = providers.Carrier.objects.get(pk=self.carrier.pk).gateway
+
+        self.assertIsNot(rebuilt.mapper, gateway.mapper)
+
+    def test_gateway_is_not_cached_when_disabled(self):
+        with patch.object(providers.GATEWAYS, "maxsize", 0):
+            gateway = self.carrier.gateway
+            rebuilt = providers.Carrier.objects.get(pk=self.carrier.pk).gateway
+
+        self.assertIsNot(rebuilt.mapper, gateway.mapper)
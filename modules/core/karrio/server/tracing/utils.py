@@ -1,3 +1,4 @@
+import typing
 import logging
 
 import karrio.lib as lib
@@ -16,6 +17,10 @@ def save_tracing_records(context, tracer: lib.Tracer = None, schema: str = None)
 
     tracer = tracer or getattr(context, "tracer", lib.Tracer())
 
+    if tracer.context.get("request_log_buffered"):
+        # the records are saved with the buffered request log.
+        return
+
     # Process Karrio SDK tracing records to persist records of interest.
     @utils.async_wrapper
     @utils.tenant_aware
@@ -25,7 +30,6 @@ def save_tracing_records(context, tracer: lib.Tracer = None, schema: str = None)
             return
 
         try:
-            records = []
             exists = lib.identity(
                 models.TracingRecord.access_by(context)
                 .filter(
@@ -38,28 +42,7 @@ def save_tracing_records(context, tracer: lib.Tracer = None, schema: str = None)
             if exists:
                 return
 
-            for record in tracer.records:
-                connection: dict = record.metadata.get("connection")
-
-                records.append(
-                    models.TracingRecord(
-                        key=record.key,
-                        record=record.data,
-                        timestamp=record.timestamp,
-                        created_by_id=getattr(actor, "id", None),
-                        test_mode=connection.get("test_mode", False),
-                        meta=lib.to_dict(
-                            {
-                                "tracer_id": tracer.id,
-                                "object_id": tracer.context.get("object_id"),
-                                "carrier_account_id": connection.get("id"),
-                                "carrier_id": connection.get("carrier_id"),
-                                "carrier_name": connection.get("carrier_name"),
-                                "request_log_id": tracer.context.get("request_log_id"),
-                            }
-                        ),
-                    )
-                )
+            records = request_tracing_records(tracer, actor)
 
             saved_records = models.TracingRecord.objects.bulk_create(records)
 
@@ -73,6 +56,38 @@ def save_tracing_records(context, tracer: lib.Tracer = None, schema: str = None)
     persist_records(schema=schema)
 
 
+def request_tracing_records(
+    tracer: lib.Tracer, actor
+) -> typing.List[models.TracingRecord]:
+    """Return the (unsaved) tracing records of a request tracer."""
+    records = []
+
+    for record in tracer.records:
+        connection: dict = record.metadata.get("connection")
+
+        records.append(
+            models.TracingRecord(
+                key=record.key,
+                record=record.data,
+                timestamp=record.timestamp,
+                created_by_id=getattr(actor, "id", None),
+                test_mode=connection.get("test_mode", False),
+                meta=lib.to_dict(
+                    {
+                        "tracer_id": tracer.id,
+                        "object_id": tracer.context.get("object_id"),
+                        "carrier_account_id": connection.get("id"),
+                        "carrier_id": connection.get("carrier_id"),
+                        "carrier_name": connection.get("carrier_name"),
+                        "request_log_id": tracer.context.get("request_log_id"),
+                    }
+                ),
+            )
+        )
+
+    return records
+
+
 @utils.error_wrapper
 def bulk_save_tracing_records(tracer: lib.Tracer, context=None):
     if conf.settings.PERSIST_SDK_TRACING is False:
@@ -4,6 +4,7 @@ from import_export import resources
 import karrio.server.data.resources.shipments as shipments
 import karrio.server.data.resources.orders as orders
 import karrio.server.data.resources.trackers as trackers
+import karrio.server.data.resources.streaming as streaming
 import karrio.server.data.models as models
 
 User = get_user_model()
@@ -21,6 +22,24 @@ def export(
     return resource.export()
 
 
+def stream_export(
+    resource_type: str,
+    query_params: dict,
+    context,
+    export_format: str,
+    data_fields: dict = None,
+):
+    """Generate a file to export by parts without loading all its rows."""
+
+    resource = get_export_resource(
+        resource_type, query_params, context, data_fields=data_fields
+    )
+
+    return streaming.stream_rows(
+        streaming.iter_rows(resource), export_format, title=resource_type
+    )
+
+
 def get_export_resource(
     resource_type: str, params: dict, context, data_fields: dict = None
 ) -> resources.ModelResource:
@@ -90,10 +90,18 @@ def order_export_resource(query_params: dict, context, **kwargs):
 
         def get_queryset(self):
             orders = OrderFilters(query_params, models.Order.access_by(context)).qs
-            return queryset.filter(commodity_order__in=orders)
+            return (
+                queryset.filter(commodity_order__in=orders)
+                .select_related(
+                    "order_link__order__shipping_to",
+                    "order_link__order__shipping_from",
+                    "order_link__order__billing_address",
+                )
+                .prefetch_related("order_link__order__line_items")
+            )
 
-        def get_export_headers(self):
-            headers = super().get_export_headers()
+        def get_export_headers(self, *args, **kwargs):
+            headers = super().get_export_headers(*args, **kwargs)
             return [DEFAULT_HEADERS.get(k, k) for k in headers]
 
         if "id" not in _exclude:
@@ -393,8 +401,8 @@ def order_import_resource(
         def get_queryset(self):
             return queryset
 
-        def get_export_headers(self):
-            headers = super().get_export_headers()
+        def get_export_headers(self, *args, **kwargs):
+            headers = super().get_export_headers(*args, **kwargs)
             return [field_headers.get(k, k) for k in headers]
 
         def init_instance(self, row=None):
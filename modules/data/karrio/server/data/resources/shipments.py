@@ -81,16 +81,24 @@ def shipment_export_resource(query_params: dict, context, **kwargs):
             export_order = [k for k in DEFAULT_HEADERS.keys() if k not in _exclude]
 
         def get_queryset(self):
-            return ShipmentFilters(query_params, queryset).qs
+            return ShipmentFilters(query_params, queryset).qs.prefetch_related(
+                "parcels__items"
+            )
 
-        def get_export_headers(self):
-            headers = super().get_export_headers()
+        def get_export_headers(self, *args, **kwargs):
+            headers = super().get_export_headers(*args, **kwargs)
             return [DEFAULT_HEADERS.get(k, k) for k in headers]
 
         @staticmethod
         def packages(row):
-            parcels = core.Parcel(row.parcels, many=True).data
-            return Packages([lib.to_object(types.Parcel, p) for p in parcels])
+            # computed once per row for all the parcel columns
+            if not hasattr(row, "_export_packages"):
+                parcels = core.Parcel(row.parcels, many=True).data
+                row._export_packages = Packages(
+                    [lib.to_object(types.Parcel, p) for p in parcels]
+                )
+
+            return row._export_packages
 
         if "service" not in _exclude:
             service = resources.Field()
@@ -400,8 +408,8 @@ def shipment_import_resource(
         def get_queryset(self):
             return queryset
 
-        def get_export_headers(self):
-            headers = super().get_export_headers()
+        def get_export_headers(self, *args, **kwargs):
+            headers = super().get_export_headers(*args, **kwargs)
             return [field_headers.get(k, k) for k in headers]
 
         def init_instance(self, row=None):
@@ -0,0 +1,100 @@
+import csv
+import typing
+import decimal
+import datetime
+import tempfile
+from django.conf import settings
+from import_export import resources
+
+STREAM_CHUNK_SIZE = 64 * 1024
+DELIMITERS = {"csv": ",", "tsv": "\t"}
+STREAMING_FORMATS = [*DELIMITERS.keys(), "xlsx"]
+XLSX_TYPES = (
+    str,
+    int,
+    float,
+    bool,
+    decimal.Decimal,
+    datetime.date,
+    datetime.time,
+    type(None),
+)
+
+
+class _Echo:
+    """A file-like object returning what is written for `csv.writer`."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_rows(resource: resources.ModelResource) -> typing.Iterator[list]:
+    """Yield the export headers then the exported row of each object.
+
+    The queryset is read by chunks of `DATA_EXPORT_CHUNK_SIZE` rows with the
+    `prefetch_related` lookups of the resource queryset fetched per chunk.
+    """
+    chunk_size = getattr(settings, "DATA_EXPORT_CHUNK_SIZE", 500)
+    queryset = resource.filter_export(resource.get_queryset())
+
+    # rows are ordered as `Resource.export` paginates them
+    if queryset._prefetch_related_lookups and not queryset.query.order_by:
+        queryset = queryset.order_by("pk")
+
+    yield resource.get_export_headers()
+
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        yield resource.export_resource(instance)
+
+
+def stream_rows(
+    rows: typing.Iterable[list], export_format: str, title: str = "export"
+) -> typing.Iterator[typing.Union[str, bytes]]:
+    """Write the rows to the export format and yield the file content by parts."""
+    if export_format in DELIMITERS:
+        return _stream_delimited(rows, DELIMITERS[export_format])
+
+    if export_format == "xlsx":
+        return _stream_xlsx(rows, title)
+
+    raise Exception(f"Unsupported streaming format: {export_format}")
+
+
+def _stream_delimited(rows: typing.Iterable[list], delimiter: str):
+    chunk_size = getattr(settings, "DATA_EXPORT_CHUNK_SIZE", 500)
+    writer = csv.writer(_Echo(), delimiter=delimiter)
+    lines: typing.List[str] = []
+
+    for row in rows:
+        lines.append(writer.writerow(row))
+
+        if len(lines) >= chunk_size:
+            yield "".join(lines)
+            lines = []
+
+    if any(lines):
+        yield "".join(lines)
+
+
+def _stream_xlsx(rows: typing.Iterable[list], title: str):
+    import openpyxl
+
+    # a write only workbook serializes its rows to disk as they are appended
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title[:31])
+
+    for row in rows:
+        sheet.append([_xlsx_value(value) for value in row])
+
+    with tempfile.TemporaryFile() as file:
+        workbook.save(file)
+        file.seek(0)
+
+        yield from iter(lambda: file.read(STREAM_CHUNK_SIZE), b"")
+
+
+def _xlsx_value(value):
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+
+    return value if isinstance(value, XLSX_TYPES) else str(value)
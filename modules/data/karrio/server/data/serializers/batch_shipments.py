@@ -1,12 +1,21 @@
+import typing
+import logging
+from django.conf import settings
 from django.db import transaction
 
 import karrio.lib as lib
 import karrio.server.conf as conf
+import karrio.server.core.gateway as gateway
+import karrio.server.core.datatypes as datatypes
 import karrio.server.manager.models as manager
 import karrio.server.serializers as serializers
 import karrio.server.core.exceptions as exceptions
 import karrio.server.data.serializers.base as base
 import karrio.server.manager.serializers as manager_serializers
+from karrio.server.manager.serializers.shipment import DEFAULT_CARRIER_FILTER
+
+logger = logging.getLogger(__name__)
+ADDRESS_FIELDS = ["shipper", "recipient", "return_address", "billing_address"]
 
 
 class ShipmentDataReference(manager_serializers.ShipmentData):
@@ -38,22 +47,16 @@ class BatchShipmentData(serializers.Serializer):
             .instance
         )
 
-        sid = transaction.savepoint()
-        resources = BatchShipmentData.save_resources(
-            context=context,
-            data=validated_data,
-            batch_id=operation.id,
-            format_errors=False,
-        )
-        errors = [r["errors"] for r in resources if r.get("errors") is not None]
-        transaction.savepoint_rollback(sid)
+        rows = validate_shipments(validated_data, context)
+        errors = [row["errors"] for row in rows if row.get("errors") is not None]
 
         if any(errors):
             raise exceptions.APIExceptions(errors, code="invalid_data")
 
         tasks.save_batch_resources(
             operation.id,
-            data=validated_data,
+            data=dict(shipments=[row["data"] for row in rows]),
+            validated=True,
             schema=conf.settings.schema,
             ctx=dict(
                 test_mode=context.test_mode,
@@ -70,33 +73,309 @@ class BatchShipmentData(serializers.Serializer):
         batch_id: str,
         context: serializers.Context,
         format_errors: bool = True,
+        validated: bool = False,
     ):
-        shipments_data = data["shipments"]
-        resources = []
+        """Save the batch shipments and return their resources.
+
+        The shipments are validated first then inserted in bulk by chunks of
+        `BATCH_SHIPMENTS_IMPORT_CHUNK_SIZE` in one transaction per chunk. The
+        rows of a failing chunk are saved one by one to report their errors.
+        """
+        rows = validate_shipments(data, context, validated=validated)
+        chunk_size = getattr(settings, "BATCH_SHIPMENTS_IMPORT_CHUNK_SIZE", 500)
+        new_rows = [row for row in rows if row.get("new")]
+
+        for index in range(0, len(new_rows), chunk_size):
+            chunk = new_rows[index : index + chunk_size]
 
-        for index, shipment_data in enumerate(shipments_data):
             try:
-                shipment = (
-                    manager.Shipment.access_by(context).get(id=shipment_data["id"])
-                    if shipment_data.get("id") is not None
-                    else (
-                        manager_serializers.ShipmentSerializer.map(
-                            data=shipment_data, context=context
-                        )
-                        .save(fetch_rates=False)
-                        .instance
+                with transaction.atomic():
+                    save_shipments(chunk, context)
+            except Exception as e:
+                logger.warning(f"batch shipments chunk failed, saving per row: {e}")
+
+                for row in chunk:
+                    try:
+                        with transaction.atomic():
+                            save_shipments([row], context)
+                    except Exception as row_error:
+                        logger.exception(row_error)
+                        row.update(id=None, errors=row_error)
+
+        return [
+            (
+                dict(
+                    id=row["index"],
+                    status=base.ResourceStatus.has_errors.value,
+                    errors=(
+                        lib.to_dict(row["errors"]) if format_errors else row["errors"]
+                    ),
+                )
+                if row.get("errors") is not None
+                else dict(id=row["id"], status=base.ResourceStatus.queued.value)
+            )
+            for row in rows
+        ]
+
+
+def validate_shipments(
+    data: dict,
+    context: serializers.Context,
+    validated: bool = False,
+) -> typing.List[dict]:
+    """Validate the batch shipments without writing to the database.
+
+    Return a row per shipment with its validated `data` and `carriers`, the
+    `id` of an existing shipment or its validation `errors`. Already
+    `validated` data is only checked for its carriers.
+    """
+    shipments_data = data["shipments"]
+    carriers: typing.Dict[tuple, typing.Any] = {}
+    # a single serializer validates all the rows to build its fields only once
+    serializer = manager_serializers.ShipmentSerializer(context=context)
+    existing_ids = set(
+        manager.Shipment.access_by(context)
+        .filter(id__in=[_.get("id") for _ in shipments_data if _.get("id") is not None])
+        .values_list("id", flat=True)
+    )
+    rows = []
+
+    for index, shipment_data in enumerate(shipments_data):
+        row: dict = dict(index=index, data=shipment_data)
+
+        try:
+            if shipment_data.get("id") is not None:
+                if shipment_data["id"] not in existing_ids:
+                    raise manager.Shipment.DoesNotExist(
+                        "Shipment matching query does not exist."
                     )
+
+                row.update(id=shipment_data["id"])
+            else:
+                shipment_data = (
+                    shipment_data
+                    if validated
+                    else _validate_shipment_data(serializer, shipment_data, context)
                 )
-                resources.append(
-                    dict(id=shipment.id, status=base.ResourceStatus.queued.value)
+                row.update(
+                    new=True,
+                    data=shipment_data,
+                    carriers=_shipment_carriers(shipment_data, context, carriers),
                 )
-            except Exception as e:
-                resources.append(
-                    dict(
-                        id=index,
-                        status=base.ResourceStatus.has_errors.value,
-                        errors=(lib.to_dict(e) if format_errors else e),
-                    )
+        except Exception as e:
+            row.update(errors=e)
+
+        rows.append(row)
+
+    return rows
+
+
+def save_shipments(rows: typing.List[dict], context: serializers.Context):
+    """Insert the shipments of validated rows with one `bulk_create` per model.
+
+    The shipments with order line items are saved through `ShipmentSerializer`
+    for the order signals to link them.
+    """
+    created_by = dict(created_by=context.user)
+    objects: typing.Dict[typing.Any, list] = {
+        model: []
+        for model in [
+            manager.Address,
+            manager.Commodity,
+            manager.Customs,
+            manager.Parcel,
+            manager.Shipment,
+        ]
+    }
+    links: typing.Dict[typing.Any, list] = {
+        model: []
+        for model in [
+            manager.Parcel.items.through,
+            manager.Customs.commodities.through,
+            manager.Shipment.parcels.through,
+            manager.Shipment.carriers.through,
+        ]
+    }
+
+    def _create(model, data: typing.Optional[dict] = None, **kwargs):
+        instance = model(**{**(data or {}), **kwargs, **created_by})
+        objects[model].append(instance)
+        return instance
+
+    def _address(data: typing.Optional[dict]):
+        return None if data is None else _create(manager.Address, data)
+
+    def _commodity(data: dict):
+        return _create(
+            manager.Commodity,
+            {key: value for key, value in data.items() if key != "id"},
+        )
+
+    for row in rows:
+        data = row["data"]
+
+        if _has_order_items(data):
+            row.update(
+                id=manager_serializers.ShipmentSerializer.map(
+                    data=data, context=context
                 )
+                .save(fetch_rates=False)
+                .instance.id
+            )
+            continue
 
-        return resources
+        customs_data = data.get("customs")
+        customs = (
+            None
+            if customs_data is None
+            else _create(
+                manager.Customs,
+                {
+                    key: value
+                    for key, value in customs_data.items()
+                    if key in manager.Customs.DIRECT_PROPS
+                },
+                duty_billing_address=_address(customs_data.get("duty_billing_address")),
+            )
+        )
+        service = data.get("service")
+        services = [service] if service is not None else data.get("services")
+        shipment = _create(
+            manager.Shipment,
+            {
+                key: value
+                for key, value in data.items()
+                if key in manager.Shipment.DIRECT_PROPS and value is not None
+            },
+            customs=customs,
+            **{key: _address(data.get(key)) for key in ADDRESS_FIELDS},
+            rates=data.get("rates") or [],
+            payment=data.get("payment")
+            or lib.to_dict(
+                datatypes.Payment(currency=(data.get("options") or {}).get("currency"))
+            ),
+            services=services,
+            messages=data.get("messages") or [],
+            test_mode=context.test_mode,
+        )
+        row.update(id=shipment.id)
+
+        for commodity_data in (customs_data or {}).get("commodities") or []:
+            links[manager.Customs.commodities.through].append(
+                manager.Customs.commodities.through(
+                    customs_id=customs.id,
+                    commodity_id=_commodity(commodity_data).id,
+                )
+            )
+
+        for parcel_data in data.get("parcels") or []:
+            parcel = _create(
+                manager.Parcel,
+                {
+                    key: value
+                    for key, value in parcel_data.items()
+                    if key not in ["id", "items"]
+                },
+            )
+            links[manager.Shipment.parcels.through].append(
+                manager.Shipment.parcels.through(
+                    shipment_id=shipment.id, parcel_id=parcel.id
+                )
+            )
+            links[manager.Parcel.items.through].extend(
+                manager.Parcel.items.through(
+                    parcel_id=parcel.id,
+                    commodity_id=_commodity(item).id,
+                )
+                for item in parcel_data.get("items") or []
+            )
+
+        if any(data.get("carrier_ids") or []):
+            links[manager.Shipment.carriers.through].extend(
+                manager.Shipment.carriers.through(
+                    shipment_id=shipment.id, carrier_id=carrier.pk
+                )
+                for carrier in row["carriers"]
+            )
+
+    # parcels are numbered as the `parcel_updated` signal does after insert
+    parcels_count = manager.Parcel.objects.filter(
+        **({"org__id": context.org.id} if context.org is not None else {})
+    ).count()
+
+    for index, parcel in enumerate(objects[manager.Parcel]):
+        if parcel.reference_number is None:
+            parcel.reference_number = str(parcels_count + index + 2).zfill(10)
+
+    # `bulk_create` sends no `pre_save` signal, the addresses documents are
+    # computed first for the shipments documents to include them
+    for instance in [*objects[manager.Address], *objects[manager.Shipment]]:
+        instance.search_document = instance.get_search_document()
+
+    for model, instances in [*objects.items(), *links.items()]:
+        model.objects.bulk_create(instances, batch_size=1000)
+
+    if context.org is not None:
+        for model, instances in objects.items():
+            if hasattr(model, "org"):
+                serializers.bulk_link_org(instances, context)
+
+
+def _validate_shipment_data(
+    serializer: serializers.Serializer,
+    data: dict,
+    context: serializers.Context,
+) -> dict:
+    validated_data = serializer.run_validation(
+        {**data, "options": serializer.default_options(data)}
+    )
+
+    # addresses are validated by the address serializer on save
+    for address_data, key in [
+        *[(validated_data, key) for key in ADDRESS_FIELDS],
+        (validated_data.get("customs") or {}, "duty_billing_address"),
+    ]:
+        if (address_data.get(key) or {}).get("validate_location") is True:
+            address_data[key] = manager_serializers.AddressSerializer.map(
+                data=address_data[key], context=context
+            ).data
+
+    return validated_data
+
+
+def _shipment_carriers(
+    data: dict,
+    context: serializers.Context,
+    cache: typing.Dict[tuple, typing.Any],
+) -> list:
+    service = data.get("service")
+    carrier_ids = data.get("carrier_ids") or []
+    services = [service] if service is not None else data.get("services")
+    key = (tuple(carrier_ids), tuple(services or []))
+
+    if key not in cache:
+        try:
+            cache[key] = gateway.Carriers.list(
+                context=context,
+                carrier_ids=carrier_ids,
+                **({"services": services} if any(services) else {}),
+                **{"raise_not_found": True, **DEFAULT_CARRIER_FILTER},
+            )
+        except Exception as e:
+            cache[key] = e
+
+    if isinstance(cache[key], Exception):
+        raise cache[key]
+
+    return cache[key]
+
+
+def _has_order_items(data: dict) -> bool:
+    return any(
+        item.get("parent_id") is not None
+        for parcel in data.get("parcels") or []
+        for item in parcel.get("items") or []
+    ) or any(
+        item.get("parent_id") is not None
+        for item in (data.get("customs") or {}).get("commodities") or []
+    )
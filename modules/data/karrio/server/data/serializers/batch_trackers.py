@@ -125,6 +125,9 @@ class BatchTrackerData(serializers.Serializer):
                 ))
 
         if any(trackers):
+            for tracker in trackers:
+                tracker.search_document = tracker.get_search_document()
+
             models.Tracking.objects.bulk_create(trackers)
             serializers.bulk_link_org(trackers, context)
 
@@ -0,0 +1,7 @@
+import logging
+
+logging.disable(logging.CRITICAL)
+
+from karrio.server.data.tests.test_batch_shipments import *
+from karrio.server.data.tests.test_batch_resources import *
+from karrio.server.data.tests.test_data_export import *
@@ -0,0 +1,169 @@
+import copy
+from unittest.mock import ANY
+from karrio.server.core.tests import APITestCase
+import karrio.server.serializers as serializers
+import karrio.server.manager.models as manager
+import karrio.server.manager.serializers as manager_serializers
+from karrio.server.data.serializers.batch_shipments import BatchShipmentData
+
+
+class TestBatchShipmentsSaving(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.context = serializers.Context(org=None, user=self.user, test_mode=True)
+
+    def test_save_shipments_in_bulk(self):
+        resources = BatchShipmentData.save_resources(
+            dict(shipments=copy.deepcopy(SHIPMENTS_DATA)), "batch_id", self.context
+        )
+        bulk_shipments = [
+            manager.Shipment.objects.get(pk=res["id"]) for res in resources
+        ]
+        shipments = [
+            manager_serializers.ShipmentSerializer.map(
+                data=copy.deepcopy(data), context=self.context
+            )
+            .save(fetch_rates=False)
+            .instance
+            for data in SHIPMENTS_DATA
+        ]
+
+        self.assertListEqual([res["status"] for res in resources], ["queued", "queued"])
+        self.assertListEqual(
+            [serialize(shipment) for shipment in bulk_shipments],
+            [serialize(shipment) for shipment in shipments],
+        )
+
+    def test_save_shipments_with_invalid_rows(self):
+        resources = BatchShipmentData.save_resources(
+            dict(
+                shipments=[
+                    copy.deepcopy(SHIPMENTS_DATA[0]),
+                    {**copy.deepcopy(SHIPMENTS_DATA[1]), "recipient": None},
+                    {"id": "shp_unknown"},
+                ]
+            ),
+            "batch_id",
+            self.context,
+            format_errors=False,
+        )
+
+        self.assertListEqual(
+            resources,
+            [
+                dict(id=ANY, status="queued"),
+                dict(id=1, status="has_errors", errors=ANY),
+                dict(id=2, status="has_errors", errors=ANY),
+            ],
+        )
+        self.assertEqual(manager.Shipment.objects.count(), 1)
+        self.assertIn("recipient", resources[1]["errors"].detail)
+        self.assertIsInstance(resources[2]["errors"], manager.Shipment.DoesNotExist)
+
+
+def serialize(shipment: manager.Shipment) -> dict:
+    """Return the shipment data without its generated values."""
+    data = manager_serializers.Shipment(shipment).data
+
+    return _strip(data, ["id", "created_at", "updated_at", "reference_number"])
+
+
+def _strip(value, keys: list):
+    if isinstance(value, dict):
+        return {k: _strip(v, keys) for k, v in value.items() if k not in keys}
+    if isinstance(value, list):
+        return [_strip(v, keys) for v in value]
+    return value
+
+
+SHIPMENTS_DATA = [
+    {
+        "recipient": {
+            "address_line1": "125 Church St",
+            "person_name": "John Poop",
+            "company_name": "A corp.",
+            "phone_number": "514 000 0000",
+            "city": "Moncton",
+            "country_code": "CA",
+            "postal_code": "E1C4Z8",
+            "residential": False,
+            "state_code": "NB",
+        },
+        "shipper": {
+            "address_line1": "5840 Oak St",
+            "person_name": "Jane Doe",
+            "company_name": "B corp.",
+            "phone_number": "514 000 9999",
+            "city": "Vancouver",
+            "country_code": "CA",
+            "postal_code": "V6M2V9",
+            "residential": False,
+            "state_code": "BC",
+        },
+        "parcels": [
+            {
+                "weight": 1,
+                "weight_unit": "KG",
+                "package_preset": "canadapost_corrugated_small_box",
+                "items": [
+                    {
+                        "title": "Shirt",
+                        "quantity": 2,
+                        "weight": 0.5,
+                        "weight_unit": "KG",
+                        "sku": "SH-1",
+                    }
+                ],
+            }
+        ],
+        "options": {"currency": "CAD", "preferred_service": "canadapost_priority"},
+        "reference": "order-1001",
+        "carrier_ids": ["canadapost"],
+    },
+    {
+        "recipient": {
+            "address_line1": "1 Main St",
+            "person_name": "Jane Smith",
+            "phone_number": "514 000 1111",
+            "city": "Montreal",
+            "country_code": "CA",
+            "postal_code": "H2X1Y4",
+            "state_code": "QC",
+        },
+        "shipper": {
+            "address_line1": "5840 Oak St",
+            "person_name": "Jane Doe",
+            "city": "Vancouver",
+            "country_code": "CA",
+            "postal_code": "V6M2V9",
+            "state_code": "BC",
+        },
+        "parcels": [
+            {
+                "weight": 2.5,
+                "weight_unit": "KG",
+                "length": 10,
+                "width": 10,
+                "height": 10,
+                "dimension_unit": "CM",
+            },
+            {"weight": 1, "weight_unit": "KG", "packaging_type": "envelope"},
+        ],
+        "customs": {
+            "content_type": "merchandise",
+            "incoterm": "DDU",
+            "commodities": [
+                {
+                    "title": "Book",
+                    "quantity": 1,
+                    "weight": 1,
+                    "weight_unit": "KG",
+                    "value_amount": 20,
+                    "value_currency": "CAD",
+                    "origin_country": "CA",
+                }
+            ],
+        },
+        "metadata": {"source": "import"},
+    },
+]
@@ -0,0 +1,176 @@
+import datetime
+from unittest.mock import patch
+from django.utils import timezone
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITransactionTestCase
+from karrio.server.core.tests import APITestCase
+import karrio.server.manager.models as manager
+import karrio.server.data.models as models
+import karrio.server.events.task_definitions.data as tasks
+import karrio.server.events.task_definitions.data.batch as batch
+import karrio.server.events.task_definitions.data.shipments as shipments
+
+
+class TestBatchShipmentsFixture(APITransactionTestCase):
+    # the shipments are processed by threads with their own database
+    # connection so the test data is committed.
+    setUp = APITestCase.setUp
+
+    def create_batch_operation(self, count: int) -> models.BatchOperation:
+        self.shipments = [
+            manager.Shipment.objects.create(
+                shipper=manager.Address.objects.create(
+                    country_code="CA", created_by=self.user
+                ),
+                recipient=manager.Address.objects.create(
+                    country_code="US", created_by=self.user
+                ),
+                options=dict(preferred_service="canadapost_priority"),
+                status="draft",
+                test_mode=True,
+                created_by=self.user,
+            )
+            for _ in range(count)
+        ]
+        batch_operation = models.BatchOperation.objects.create(
+            resource_type="shipment",
+            resources=[dict(id=_.id, status="queued") for _ in self.shipments],
+            test_mode=True,
+            created_by=self.user,
+        )
+        # set as running without triggering its processing
+        models.BatchOperation.objects.filter(pk=batch_operation.pk).update(
+            status="running"
+        )
+
+        return models.BatchOperation.objects.get(pk=batch_operation.pk)
+
+
+def purchase(shipment):
+    manager.Shipment.objects.filter(pk=shipment.pk).update(status="purchased")
+
+
+class TestBatchShipments(TestBatchShipmentsFixture):
+    @override_settings(BATCH_SHIPMENTS_SHARD_SIZE=2)
+    def test_dispatch_shipments_by_shards(self):
+        batch_operation = self.create_batch_operation(5)
+        ids = [_.id for _ in self.shipments]
+
+        with patch.object(tasks, "process_batch_shipments") as process:
+            tasks._dispatch_shipments(batch_operation)
+
+        self.assertListEqual(
+            [call.args for call in process.call_args_list],
+            [
+                (batch_operation.id, ids[0:2]),
+                (batch_operation.id, ids[2:4]),
+                (batch_operation.id, ids[4:5]),
+            ],
+        )
+
+    @override_settings(BATCH_SHIPMENTS_CHECKPOINT_SIZE=1)
+    def test_checkpoint_after_partial_failure(self):
+        batch_operation = self.create_batch_operation(3)
+        failing = self.shipments[1]
+
+        def process_shipment(shipment):
+            if shipment.id == failing.id:
+                raise Exception("carrier unavailable")
+
+            purchase(shipment)
+
+        with patch.object(
+            shipments, "process_shipment", side_effect=process_shipment
+        ), patch.object(
+            batch, "checkpoint_batch_resources", wraps=batch.checkpoint_batch_resources
+        ) as checkpoint:
+            tasks.process_batch_shipments.call_local(
+                batch_operation.id, [_.id for _ in self.shipments]
+            )
+
+        batch_operation.refresh_from_db()
+
+        # one checkpoint per shipment then the completion one
+        self.assertEqual(checkpoint.call_count, 4)
+        self.assertEqual(batch_operation.status, "completed")
+        self.assertDictEqual(
+            {res["id"]: res["status"] for res in batch_operation.resources},
+            {
+                self.shipments[0].id: "processed",
+                failing.id: "incomplete",
+                self.shipments[2].id: "processed",
+            },
+        )
+
+    def test_resume_stale_batch_operations(self):
+        stale = self.create_batch_operation(1)
+        self.create_batch_operation(1)
+        models.BatchOperation.objects.filter(pk=stale.pk).update(
+            updated_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        dispatched = []
+
+        batch.resume_stale_batch_operations(dispatched.append)
+        stale.refresh_from_db()
+
+        self.assertListEqual(dispatched, [stale.id])
+        self.assertGreater(
+            stale.updated_at, timezone.now() - datetime.timedelta(minutes=1)
+        )
+
+        # the resumed batch operation is not dispatched again right away
+        batch.resume_stale_batch_operations(dispatched.append)
+        self.assertListEqual(dispatched, [stale.id])
+
+    def test_retry_shipments_locked_by_another_worker(self):
+        batch_operation = self.create_batch_operation(2)
+        locked, free = self.shipments
+        cache.add(f"batch:shipments:{locked.id}", 1)
+
+        try:
+            with patch.object(
+                shipments, "process_shipment", side_effect=purchase
+            ) as process, patch.object(
+                tasks.process_batch_shipments, "schedule"
+            ) as schedule:
+                tasks.process_batch_shipments.call_local(
+                    batch_operation.id, [locked.id, free.id]
+                )
+        finally:
+            cache.delete(f"batch:shipments:{locked.id}")
+
+        batch_operation.refresh_from_db()
+
+        self.assertListEqual(
+            [call.args[0].id for call in process.call_args_list], [free.id]
+        )
+        self.assertEqual(schedule.call_args.args[0], (batch_operation.id, [locked.id]))
+        self.assertEqual(batch_operation.status, "running")
+        self.assertDictEqual(
+            {res["id"]: res["status"] for res in batch_operation.resources},
+            {locked.id: "queued", free.id: "processed"},
+        )
+
+    def test_retry_shipments_claimed_by_another_worker(self):
+        batch_operation = self.create_batch_operation(1)
+        [claimed] = self.shipments
+
+        # the draft row is locked by another worker (skipped by `skip_locked`)
+        with patch.object(
+            type(manager.Shipment.objects),
+            "select_for_update",
+            return_value=manager.Shipment.objects.none(),
+        ), patch.object(
+            shipments, "process_shipment", side_effect=purchase
+        ) as process, patch.object(
+            tasks.process_batch_shipments, "schedule"
+        ) as schedule:
+            tasks.process_batch_shipments.call_local(batch_operation.id, [claimed.id])
+
+        batch_operation.refresh_from_db()
+
+        self.assertEqual(process.call_count, 0)
+        self.assertEqual(schedule.call_args.args[0], (batch_operation.id, [claimed.id]))
+        self.assertEqual(manager.Shipment.objects.get(pk=claimed.pk).status, "draft")
+        self.assertEqual(batch_operation.status, "running")
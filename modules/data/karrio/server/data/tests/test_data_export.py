@@ -0,0 +1,115 @@
+from django.urls import reverse
+from django.http import QueryDict
+from django.test import override_settings
+from rest_framework import status
+from karrio.server.core.tests import APITestCase
+import karrio.server.serializers as serializers
+import karrio.server.manager.models as manager
+import karrio.server.orders.models as orders
+import karrio.server.data.resources as resources
+
+
+@override_settings(DATA_EXPORT_CHUNK_SIZE=2)
+class TestDataExport(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.context = serializers.Context(org=None, user=self.user, test_mode=True)
+
+        for index in range(5):
+            shipment = manager.Shipment.objects.create(
+                shipper=self.address(f"Shipper {index}", "CA"),
+                recipient=self.address(f'Recipient "{index}", Jr.', "US"),
+                options=dict(currency="CAD", insurance=index * 10.5),
+                reference=f"ref\n{index}",
+                status="purchased" if index % 2 else "draft",
+                test_mode=True,
+                created_by=self.user,
+            )
+            shipment.parcels.add(
+                *[
+                    manager.Parcel.objects.create(
+                        weight=1 + parcel,
+                        weight_unit="KG",
+                        package_preset="canadapost_corrugated_small_box",
+                        created_by=self.user,
+                    )
+                    for parcel in range(index % 3 + 1)
+                ]
+            )
+            manager.Tracking.objects.create(
+                tracking_number=f"1Z12345E620527793{index}",
+                status="in_transit",
+                tracking_carrier=self.ups_carrier,
+                options={f"1Z12345E620527793{index}": dict(signed_by="Jane, Doe")},
+                test_mode=True,
+                created_by=self.user,
+            )
+            order = orders.Order.objects.create(
+                order_id=f"100{index}",
+                source="API",
+                status="fulfilled" if index % 2 else "delivered",
+                shipping_to=self.address(f"Customer {index}", "CA"),
+                test_mode=True,
+                created_by=self.user,
+            )
+
+            for item in range(index % 2 + 1):
+                orders.OrderLineItemLink.objects.create(
+                    order=order,
+                    item=orders.LineItem.objects.create(
+                        title=f"Item {item}",
+                        sku=f"SKU-{index}-{item}",
+                        quantity=item + 1,
+                        weight=0.5,
+                        weight_unit="KG",
+                        metadata=dict(color="red, blue"),
+                        created_by=self.user,
+                    ),
+                )
+
+    def address(self, name: str, country_code: str):
+        return manager.Address.objects.create(
+            person_name=name,
+            address_line1="125 Church St",
+            city="Moncton",
+            country_code=country_code,
+            created_by=self.user,
+        )
+
+    def stream_export(self, resource_type: str, query: str = "") -> str:
+        url = reverse(
+            "karrio.server.data:data-export",
+            kwargs=dict(resource_type=resource_type, export_format="csv"),
+        )
+        response = self.client.get(f"{url}?{query}")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_stream_shipments_export(self):
+        self.assertEqual(
+            self.stream_export("shipments"),
+            resources.export("shipments", {}, context=self.context).csv,
+        )
+
+    def test_stream_trackers_export(self):
+        self.assertEqual(
+            self.stream_export("trackers"),
+            resources.export("trackers", {}, context=self.context).csv,
+        )
+
+    def test_stream_orders_export(self):
+        self.assertEqual(
+            self.stream_export("orders"),
+            resources.export("orders", {}, context=self.context).csv,
+        )
+
+    def test_stream_empty_export(self):
+        content = self.stream_export("shipments", "tracking_number=unknown")
+        query = QueryDict("tracking_number=unknown")
+
+        self.assertEqual(
+            content, resources.export("shipments", query, context=self.context).csv
+        )
+        self.assertEqual(len(content.splitlines()), 1)
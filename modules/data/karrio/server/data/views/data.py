@@ -1,8 +1,12 @@
 import io
-from django.http import JsonResponse
+import itertools
+import mimetypes
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.urls import re_path, path
 from django.core.files.base import ContentFile
 from django_downloadview import VirtualDownloadView
+from django_downloadview.response import content_disposition
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
@@ -140,6 +144,9 @@ class DataExport(api.LoginRequiredView, VirtualDownloadView):
             self.resource = resource_type
             self.format = export_format
 
+            if export_format in resources.streaming.STREAMING_FORMATS:
+                return self.stream(request, resource_type, export_format)
+
             self.dataset = resources.export(
                 resource_type, query_params, context=request
             )
@@ -153,6 +160,29 @@ class DataExport(api.LoginRequiredView, VirtualDownloadView):
                 status=status.HTTP_409_CONFLICT,
             )
 
+    def stream(self, request: Request, resource_type: str, export_format: str):
+        content = resources.stream_export(
+            resource_type, request.GET, context=request, export_format=export_format
+        )
+        # the first part is generated here for query errors to be reported
+        parts = itertools.chain([next(content, "")], content)
+        filename = f"{resource_type}.{export_format}"
+        mime_type, _ = mimetypes.guess_type(filename)
+
+        response = StreamingHttpResponse(
+            parts,
+            content_type=(
+                f"{mime_type or 'application/octet-stream'}; "
+                f"charset={settings.DEFAULT_CHARSET}"
+            ),
+        )
+        response["X-Frame-Options"] = "ALLOWALL"
+
+        if self.attachment:
+            response["Content-Disposition"] = content_disposition(filename)
+
+        return response
+
     def get_file(self):
         content = getattr(self.dataset, self.format, "")
         buffer = io.StringIO() if type(content) == str else io.BytesIO()
@@ -2,7 +2,9 @@ __path__ = __import__("pkgutil").extend_path(__path__, __name__)  # type: ignore
 
 import typing
 import logging
-from huey.contrib.djhuey import db_task
+from django.conf import settings
+from huey import crontab
+from huey.contrib.djhuey import db_task, db_periodic_task
 
 import karrio.server.core.utils as utils
 import karrio.server.data.models as models
@@ -43,7 +45,10 @@ def process_batch_resources(batch_id, **kwargs):
             batch_operation.resources = _process_orders(batch_operation.resources)
 
         elif batch_operation.resource_type == serializers.ResourceType.shipment.value:
-            batch_operation.resources = _process_shipments(batch_operation.resources)
+            # shipments are processed by shards completing the batch operation
+            _dispatch_shipments(batch_operation, **kwargs)
+
+            return logger.info(f"> batch ({batch_id}) shipments dispatched...")
 
         elif batch_operation.resource_type == serializers.ResourceType.billing.value:
             pass
@@ -58,40 +63,85 @@ def process_batch_resources(batch_id, **kwargs):
     logger.info(f"> ending batch ({batch_id}) resources processing...")
 
 
-def _process_shipments(resources: typing.List[dict]):
-    from karrio.server.manager import models
-    from karrio.server.events.task_definitions.data import shipments
+@db_task()
+@utils.tenant_aware
+def process_batch_shipments(batch_id, shipment_ids, **kwargs):
+    from karrio.server.events.task_definitions.data import batch, shipments
 
-    resource_ids = [res["id"] for res in resources]
+    logger.info(
+        f"> start batch ({batch_id}) {len(shipment_ids)} shipments processing..."
+    )
+    try:
+        statuses = shipments.process_shipments(
+            shipment_ids=shipment_ids,
+            checkpoint=lambda statuses: batch.checkpoint_batch_resources(
+                batch_id, statuses
+            ),
+            schema=kwargs.get("schema"),
+        )
+        locked_ids = [id for id in shipment_ids if id not in statuses]
+
+        # shipments locked by another worker are retried once it is done.
+        if any(locked_ids):
+            logger.info(f"> batch ({batch_id}) {len(locked_ids)} shipments retried")
+            process_batch_shipments.schedule(
+                (batch_id, locked_ids),
+                kwargs,
+                delay=getattr(settings, "BATCH_SHIPMENTS_RETRY_DELAY", 30),
+            )
+    except Exception as e:
+        logger.exception(e)
+
+    batch.checkpoint_batch_resources(batch_id, {}, complete=True)
+    logger.info(f"> ending batch ({batch_id}) shipments processing...")
+
+
+@db_periodic_task(crontab(minute="*/5"))
+def resume_batch_operations():
+    from karrio.server.events.task_definitions.data import batch
+
+    @utils.run_on_all_tenants
+    def _run(**kwargs):
+        try:
+            batch.resume_stale_batch_operations(
+                lambda batch_id: process_batch_resources(
+                    batch_id, schema=kwargs.get("schema")
+                )
+            )
+        except Exception as e:
+            logger.error(f"An error occured during batch operations resume: {e}")
+
+    _run()
+
+
+def _dispatch_shipments(batch_operation, **kwargs):
+    from karrio.server.events.task_definitions.data import batch
+
+    shard_size = getattr(settings, "BATCH_SHIPMENTS_SHARD_SIZE", 200)
     shipment_ids = [
         res["id"]
-        for res in resources
+        for res in batch_operation.resources
         if res["status"] != serializers.ResourceStatus.processed.value
     ]
-    shipments.process_shipments(shipment_ids=shipment_ids)
-    # check results and update resource statuses
-    results = models.Shipment.objects.filter(id__in=resource_ids)
-
-    def _compute_state(shipment=None):
-        # shipment with service not purchased
-        if (
-            any(shipment.options.get("perferred_service") or "")
-            and shipment.status == "draft"
-        ):
-            return serializers.ResourceStatus.incomplete
-        # shipment has errors and no rates
-        if len(shipment.rates) == 0 and any(shipment.messages):
-            return serializers.ResourceStatus.has_errors
-        # shipment is at the right state
-        return serializers.ResourceStatus.processed.value
+    shards = [
+        shipment_ids[index : index + shard_size]
+        for index in range(0, len(shipment_ids), shard_size)
+    ]
 
-    return [
-        dict(
-            id=res["id"],
-            status=_compute_state(results.filter(id=res["id"]).first()),
+    # the shipments are queued until their shard checkpoints their status so
+    # that the batch operation is only completed once all shards are done.
+    batch.checkpoint_batch_resources(
+        batch_operation.id,
+        {id: serializers.ResourceStatus.queued.value for id in shipment_ids},
+    )
+
+    if len(shards) <= 1:
+        return process_batch_shipments.call_local(
+            batch_operation.id, shipment_ids, **kwargs
         )
-        for res in resources
-    ]
+
+    for shard in shards:
+        process_batch_shipments(batch_operation.id, shard, **kwargs)
 
 
 def _process_orders(resources: typing.List[dict]):
@@ -133,4 +183,6 @@ TASK_DEFINITIONS = [
     queue_batch_import,
     save_batch_resources,
     process_batch_resources,
+    process_batch_shipments,
+    resume_batch_operations,
 ]
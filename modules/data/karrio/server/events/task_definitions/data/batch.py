@@ -1,7 +1,10 @@
 import typing
 import tablib
 import logging
+import datetime
 from django.conf import settings
+from django.utils import timezone
+from django.db import transaction
 from django.contrib.auth import get_user_model
 from import_export.resources import ModelResource
 
@@ -67,7 +70,12 @@ def trigger_batch_saving(
             batch_seriazlizer = serializers.ResourceType.get_serialiazer(
                 batch_operation.resource_type
             )
-            batch_resources = batch_seriazlizer.save_resources(data, batch_id, context)
+            batch_resources = batch_seriazlizer.save_resources(
+                data,
+                batch_id,
+                context,
+                **({"validated": True} if kwargs.get("validated") else {}),
+            )
             update_batch_operation_resources(batch_operation, batch_resources)
         else:
             logger.info("batch operation not found")
@@ -115,6 +123,77 @@ def update_batch_operation_resources(
         logger.error(update_error, exc_info=True)
 
 
+def checkpoint_batch_resources(
+    batch_id: str,
+    statuses: typing.Dict[str, str],
+    complete: bool = False,
+):
+    """Merge the resources statuses into the batch operation.
+
+    The batch operation is locked during the merge so that concurrent shards
+    keep each other's statuses and it is updated without `save()` not to
+    trigger its processing again. With `complete`, a running batch operation
+    is completed once none of its resources is pending.
+    """
+    pending = [
+        serializers.ResourceStatus.queued.value,
+        serializers.ResourceStatus.created.value,
+    ]
+
+    with transaction.atomic():
+        batch_operation = (
+            models.BatchOperation.objects.select_for_update()
+            .filter(pk=batch_id)
+            .first()
+        )
+
+        if batch_operation is None:
+            return logger.info(f"batch operation {batch_id} not found")
+
+        resources = [
+            dict(res, status=statuses.get(res["id"], res["status"]))
+            for res in batch_operation.resources or []
+        ]
+        models.BatchOperation.objects.filter(pk=batch_id).update(
+            resources=resources, updated_at=timezone.now()
+        )
+
+        if (
+            complete
+            and batch_operation.status == serializers.BatchOperationStatus.running.value
+            and not any(res["status"] in pending for res in resources)
+        ):
+            batch_operation.resources = resources
+            batch_operation.status = serializers.BatchOperationStatus.completed.value
+            batch_operation.save(update_fields=["resources", "status"])
+
+            duration = (timezone.now() - batch_operation.created_at).total_seconds()
+            logger.info(
+                f"> batch operation {batch_id} completed: {len(resources)} resources "
+                f"in {duration:.0f}s ({len(resources) * 60 / max(duration, 1):.0f}/min)"
+            )
+
+
+def resume_stale_batch_operations(dispatch: typing.Callable[[str], typing.Any]):
+    """Dispatch again the running batch operations without checkpoint for
+    `BATCH_OPERATIONS_STALE_TIMEOUT` seconds (e.g. after a worker crash).
+    """
+    timeout = getattr(settings, "BATCH_OPERATIONS_STALE_TIMEOUT", 900)
+    batch_ids = list(
+        models.BatchOperation.objects.filter(
+            status=serializers.BatchOperationStatus.running.value,
+            updated_at__lt=timezone.now() - datetime.timedelta(seconds=timeout),
+        ).values_list("id", flat=True)
+    )
+    models.BatchOperation.objects.filter(id__in=batch_ids).update(
+        updated_at=timezone.now()
+    )
+
+    for batch_id in batch_ids:
+        logger.info(f"> resuming stale batch operation ({batch_id})")
+        dispatch(batch_id)
+
+
 def retrieve_context(info: dict) -> serializers.Context:
     org = None
 
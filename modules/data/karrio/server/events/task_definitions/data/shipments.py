@@ -1,8 +1,17 @@
+import time
+import typing
 import logging
+import threading
+import contextlib
+import django.db as db
+import concurrent.futures as futures
+from django.conf import settings
+from django.core.cache import cache
 
 import karrio.server.core.utils as utils
 import karrio.server.manager.models as models
 import karrio.server.serializers as serializers
+import karrio.server.data.serializers as data_serializers
 from karrio.server.manager.serializers import (
     fetch_shipment_rates,
     can_mutate_shipment,
@@ -10,21 +19,85 @@ from karrio.server.manager.serializers import (
 )
 
 logger = logging.getLogger(__name__)
+Checkpoint = typing.Callable[[typing.Dict[str, str]], typing.Any]
 
 
 @utils.error_wrapper
-def process_shipments(shipment_ids=[]):
+def process_shipments(
+    shipment_ids=[],
+    checkpoint: typing.Optional[Checkpoint] = None,
+    schema: typing.Optional[str] = None,
+) -> typing.Dict[str, str]:
+    """Rate and purchase the draft shipments and return their resource status.
+
+    Up to `BATCH_SHIPMENTS_CONCURRENCY` shipments are processed in parallel
+    with at most `BATCH_SHIPMENTS_CARRIER_CONCURRENCY` per carrier. The
+    statuses are passed to `checkpoint` every `BATCH_SHIPMENTS_CHECKPOINT_SIZE`
+    processed shipments. Shipments locked by another worker are left out of
+    the statuses for their processing to be retried.
+    """
     logger.info("> starting batch shipments processing")
+    start = time.monotonic()
+    statuses: typing.Dict[str, str] = {}
+    pending: typing.Dict[str, str] = {}
+    checkpoint_size = getattr(settings, "BATCH_SHIPMENTS_CHECKPOINT_SIZE", 25)
+
+    shipments = list(
+        models.Shipment.objects.filter(
+            id__in=shipment_ids, status="draft"
+        ).prefetch_related("carriers")
+    )
+    carriers = {shipment.id: carrier_key(shipment) for shipment in shipments}
+    semaphores = {
+        key: threading.Semaphore(
+            getattr(settings, "BATCH_SHIPMENTS_CARRIER_CONCURRENCY", 4)
+        )
+        for key in set(carriers.values())
+    }
+
+    with futures.ThreadPoolExecutor(
+        max_workers=getattr(settings, "BATCH_SHIPMENTS_CONCURRENCY", 8)
+    ) as executor:
+        jobs = {
+            executor.submit(
+                _process_batch_shipment,
+                id,
+                semaphores[key],
+                schema=schema,
+            ): id
+            for id, key in carriers.items()
+        }
+
+        for job in futures.as_completed(jobs):
+            status = job.result()
+
+            if status is None:
+                continue
+
+            pending[jobs[job]] = status
+
+            if checkpoint is not None and len(pending) >= checkpoint_size:
+                checkpoint(pending)
+                statuses.update(pending)
+                pending = {}
 
-    shipments = models.Shipment.objects.filter(id__in=shipment_ids, status="draft")
+    # shipments already processed or not found are only reported
+    pending.update(
+        compute_shipments_states([id for id in shipment_ids if id not in carriers])
+    )
+
+    if checkpoint is not None and any(pending):
+        checkpoint(pending)
 
-    if any(shipments):
-        for shipment in shipments:
-            process_shipment(shipment)
-    else:
-        logger.info("no shipment found")
+    statuses.update(pending)
 
-    logger.info("> ending batch shipments processing")
+    duration = time.monotonic() - start
+    logger.info(
+        f"> {len(shipments)} shipments processed in {duration:.1f}s "
+        f"({len(shipments) * 60 / max(duration, 0.001):.0f} shipments/min)"
+    )
+
+    return statuses
 
 
 @utils.error_wrapper
@@ -49,3 +122,105 @@ def process_shipment(shipment):
             context=context,
             service=preferred_service,
         )
+
+    return shipment
+
+
+def compute_shipment_state(shipment) -> str:
+    if shipment is None:
+        return data_serializers.ResourceStatus.incomplete.value
+    # shipment with service not purchased
+    if (
+        any(shipment.options.get("preferred_service") or "")
+        and shipment.status == "draft"
+    ):
+        return data_serializers.ResourceStatus.incomplete.value
+    # shipment has errors and no rates
+    if len(shipment.rates) == 0 and any(shipment.messages):
+        return data_serializers.ResourceStatus.has_errors.value
+    # shipment is at the right state
+    return data_serializers.ResourceStatus.processed.value
+
+
+def compute_shipments_states(shipment_ids: typing.List[str]) -> typing.Dict[str, str]:
+    shipments = {
+        shipment.id: shipment
+        for shipment in models.Shipment.objects.filter(id__in=shipment_ids)
+    }
+
+    return {id: compute_shipment_state(shipments.get(id)) for id in shipment_ids}
+
+
+def carrier_key(shipment) -> str:
+    """Return the carrier a batch shipment is rated and purchased with."""
+    carrier_ids = sorted(carrier.carrier_id for carrier in shipment.carriers.all())
+    preferred_service = shipment.options.get("preferred_service") or ""
+
+    return ",".join(carrier_ids) or preferred_service.split("_")[0] or "*"
+
+
+@utils.tenant_aware
+def _process_batch_shipment(
+    shipment_id: str, semaphore: threading.Semaphore, **kwargs
+) -> typing.Optional[str]:
+    # The draft row is locked in the database while the shipment is processed
+    # so that a resumed batch never buys it twice. The cache lock only spares
+    # the other workers of the same cache a database round trip (and is the
+    # only guard on SQLite which has no row locks).
+    lock = f"batch:shipments:{shipment_id}"
+    timeout = getattr(settings, "BATCH_OPERATIONS_STALE_TIMEOUT", 900)
+
+    if not cache.add(lock, 1, timeout=timeout):
+        logger.info(f"shipment {shipment_id} is already being processed")
+        return None
+
+    try:
+        with semaphore, _claim_transaction():
+            shipment = (
+                models.Shipment.objects.select_for_update(
+                    skip_locked=True, of=("self",)
+                )
+                .filter(id=shipment_id, status="draft")
+                .first()
+            )
+
+            if shipment is None and _is_draft(shipment_id):
+                logger.info(f"shipment {shipment_id} is already being processed")
+                return None
+
+            if shipment is not None:
+                _process_claimed_shipment(shipment)
+    except Exception:
+        logger.warning(f"failed to process batch shipment {shipment_id}")
+    finally:
+        cache.delete(lock)
+
+    try:
+        return compute_shipments_states([shipment_id])[shipment_id]
+    except Exception as e:
+        logger.exception(e)
+        # left queued for the batch operation to be resumed
+        return data_serializers.ResourceStatus.queued.value
+    finally:
+        db.connection.close()
+
+
+def _process_claimed_shipment(shipment) -> None:
+    # errors are caught within the claim transaction for the rates fetched
+    # before a failed purchase to be kept.
+    try:
+        process_shipment(shipment)
+    except Exception:
+        logger.warning(f"failed to process batch shipment {shipment.id}")
+
+
+def _claim_transaction():
+    # without row locks, a transaction would only block the other writers.
+    if db.connection.features.has_select_for_update_skip_locked:
+        return db.transaction.atomic()
+
+    return contextlib.nullcontext()
+
+
+def _is_draft(shipment_id: str) -> bool:
+    return models.Shipment.objects.filter(id=shipment_id, status="draft").exists()
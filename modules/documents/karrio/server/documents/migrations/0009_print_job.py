@@ -0,0 +1,99 @@
+# Generated by Django 4.2.16 on 2026-10-18 16:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import functools
+import karrio.server.core.models
+import karrio.server.core.models.base
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("documents", "0008_documenttemplate_options"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PrintJob",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "id",
+                    models.CharField(
+                        default=functools.partial(
+                            karrio.server.core.models.base.uuid,
+                            *(),
+                            **{"prefix": "print_"}
+                        ),
+                        editable=False,
+                        max_length=50,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(db_index=True, default="queued", max_length=25),
+                ),
+                ("resource_type", models.CharField(max_length=25)),
+                ("doc_type", models.CharField(default="label", max_length=25)),
+                ("doc_format", models.CharField(default="pdf", max_length=25)),
+                (
+                    "resources",
+                    models.JSONField(
+                        blank=True,
+                        default=functools.partial(
+                            karrio.server.core.models._identity, *(), **{"value": []}
+                        ),
+                        null=True,
+                    ),
+                ),
+                ("total", models.IntegerField(default=0)),
+                ("processed", models.IntegerField(default=0)),
+                (
+                    "digest",
+                    models.CharField(
+                        blank=True,
+                        db_index=True,
+                        help_text="content hash of the bundled documents",
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "document_file",
+                    models.CharField(blank=True, max_length=100, null=True),
+                ),
+                ("document_size", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "messages",
+                    models.JSONField(
+                        blank=True,
+                        default=functools.partial(
+                            karrio.server.core.models._identity, *(), **{"value": []}
+                        ),
+                        null=True,
+                    ),
+                ),
+                ("test_mode", models.BooleanField()),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Print Job",
+                "verbose_name_plural": "Print Jobs",
+                "db_table": "print-job",
+                "ordering": ["-created_at"],
+            },
+            bases=(karrio.server.core.models.base.ControlledAccessModel, models.Model),
+        ),
+    ]
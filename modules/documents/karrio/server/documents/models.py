@@ -1,4 +1,6 @@
+import typing
 import functools
+import django.urls as urls
 from django.db import models
 from django.core.validators import RegexValidator
 
@@ -51,3 +53,71 @@ class DocumentTemplate(core.OwnedEntity):
     @property
     def object_type(self):
         return "document-template"
+
+
+@core.register_model
+class PrintJob(core.OwnedEntity):
+    class Meta:
+        db_table = "print-job"
+        verbose_name = "Print Job"
+        verbose_name_plural = "Print Jobs"
+        ordering = ["-created_at"]
+
+    id = models.CharField(
+        max_length=50,
+        primary_key=True,
+        default=functools.partial(core.uuid, prefix="print_"),
+        editable=False,
+    )
+    status = models.CharField(max_length=25, default="queued", db_index=True)
+    resource_type = models.CharField(max_length=25)
+    doc_type = models.CharField(max_length=25, default="label")
+    doc_format = models.CharField(max_length=25, default="pdf")
+    resources = models.JSONField(
+        blank=True,
+        null=True,
+        default=core.field_default([]),
+    )
+    total = models.IntegerField(default=0)
+    processed = models.IntegerField(default=0)
+    digest = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="content hash of the bundled documents",
+    )
+    document_file = models.CharField(max_length=100, null=True, blank=True)
+    document_size = models.BigIntegerField(null=True, blank=True)
+    messages = models.JSONField(
+        blank=True,
+        null=True,
+        default=core.field_default([]),
+    )
+    test_mode = models.BooleanField(null=False)
+
+    @property
+    def object_type(self):
+        return "print_job"
+
+    @property
+    def progress(self) -> int:
+        if self.status == "completed":
+            return 100
+        if not self.total:
+            return 0
+
+        return int(self.processed * 100 / self.total)
+
+    @property
+    def document_url(self) -> typing.Optional[str]:
+        if self.document_file is None:
+            return None
+
+        return urls.reverse(
+            "karrio.server.documents:print-job-download", kwargs=dict(pk=self.pk)
+        )
+
+    @property
+    def document_name(self) -> str:
+        return f"{self.doc_type}s - {self.id}.{self.doc_format}"
@@ -0,0 +1,123 @@
+import typing
+import hashlib
+import logging
+
+import karrio.lib as lib
+import karrio.server.core.storage as storage
+import karrio.server.serializers as serializers
+import karrio.server.documents.models as models
+
+logger = logging.getLogger(__name__)
+PROGRESS_INTERVAL = 100
+
+
+def resource_document_references(
+    resource_type: str,
+    resource_ids: typing.List[str],
+    doc_type: str,
+    doc_format: str,
+    context: serializers.Context,
+) -> typing.List[str]:
+    """Return the unique document references of the resources in the given ids order."""
+    if resource_type == "orders":
+        from karrio.server.orders.models import Order
+
+        prefix = "shipments__"
+        queryset = Order.access_by(context).filter(
+            id__in=resource_ids, shipments__id__isnull=False
+        )
+    else:
+        from karrio.server.manager.models import Shipment
+
+        prefix = ""
+        queryset = Shipment.access_by(context).filter(id__in=resource_ids)
+
+    queryset = queryset.filter(**{f"{prefix}{doc_type}_file__isnull": False})
+
+    if doc_type == "label":
+        queryset = queryset.filter(
+            **{f"{prefix}label_type__contains": doc_format.upper()}
+        )
+
+    position = {id: index for index, id in enumerate(resource_ids)}
+    rows = sorted(
+        queryset.values_list("id", f"{prefix}{doc_type}_file"),
+        key=lambda row: position[row[0]],
+    )
+
+    return list(dict.fromkeys(reference for _, reference in rows))
+
+
+def documents_digest(references: typing.List[str], doc_format: str) -> str:
+    """Return the content hash of a bundle of (content addressed) documents."""
+    digest = hashlib.sha256(doc_format.upper().encode())
+
+    for reference in references:
+        digest.update(b"\n" + reference.encode())
+
+    return digest.hexdigest()
+
+
+def find_bundled_print_job(digest: str) -> typing.Optional[models.PrintJob]:
+    """Return a completed print job of the same documents if its bundle is still stored."""
+    job = (
+        models.PrintJob.objects.filter(
+            digest=digest, status="completed", document_file__isnull=False
+        )
+        .only("document_file", "document_size")
+        .first()
+    )
+
+    if job is None or not storage.get_document_store().exists(job.document_file):
+        return None
+
+    return job
+
+
+def bundle_print_job(job_id: str, context: serializers.Context):
+    job = models.PrintJob.objects.get(pk=job_id)
+    job.status = "running"
+    job.save(update_fields=["status", "updated_at"])
+
+    try:
+        references = resource_document_references(
+            job.resource_type,
+            job.resources,
+            job.doc_type,
+            job.doc_format,
+            context=context,
+        )
+        job.total = len(references)
+        job.digest = documents_digest(references, job.doc_format)
+        bundled = find_bundled_print_job(job.digest)
+
+        if bundled is not None:
+            job.document_file = bundled.document_file
+            job.document_size = bundled.document_size
+        else:
+            documents = _read_documents(job, references)
+
+            with lib.bundle_documents(documents, job.doc_format.upper()) as bundle:
+                job.document_file = storage.save_file(bundle)
+                job.document_size = bundle.seek(0, 2)
+
+        job.processed = job.total
+        job.status = "completed"
+    except Exception as e:
+        logger.exception(e)
+        job.status = "failed"
+        job.messages = [dict(message=str(e))]
+
+    job.save()
+
+    return job
+
+
+def _read_documents(
+    job: models.PrintJob, references: typing.List[str]
+) -> typing.Iterator[bytes]:
+    for index, reference in enumerate(references, start=1):
+        yield storage.read_document(reference)
+
+        if index % PROGRESS_INTERVAL == 0:
+            models.PrintJob.objects.filter(pk=job.pk).update(processed=index)
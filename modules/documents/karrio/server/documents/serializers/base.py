@@ -83,3 +83,86 @@ class GeneratedDocument(serializers.Serializer):
         help_text="A base64 file content",
         required=True,
     )
+
+
+class PrintJobStatus(lib.StrEnum):
+    queued = "queued"
+    running = "running"
+    failed = "failed"
+    completed = "completed"
+
+
+class PrintResourceType(lib.StrEnum):
+    shipments = "shipments"
+    orders = "orders"
+
+
+class PrintDocumentType(lib.StrEnum):
+    label = "label"
+    invoice = "invoice"
+
+
+PRINT_JOB_STATUS = [(c.value, c.value) for c in list(PrintJobStatus)]
+PRINT_RESOURCE_TYPE = [(c.value, c.value) for c in list(PrintResourceType)]
+PRINT_DOCUMENT_TYPE = [(c.value, c.value) for c in list(PrintDocumentType)]
+
+
+class PrintJobData(serializers.Serializer):
+    resource_type = serializers.ChoiceField(
+        choices=PRINT_RESOURCE_TYPE,
+        help_text="The type of the resources to print documents for",
+    )
+    resource_ids = serializers.StringListField(
+        help_text="The list of shipment or order ids",
+    )
+    doc_type = serializers.ChoiceField(
+        choices=PRINT_DOCUMENT_TYPE,
+        required=False,
+        default=PrintDocumentType.label.value,
+        help_text="The type of document to print",
+    )
+    doc_format = serializers.CharField(
+        max_length=25,
+        required=False,
+        default="pdf",
+        help_text="The format of the bundled document (e.g. pdf, zpl)",
+    )
+
+
+class PrintJob(serializers.EntitySerializer):
+    object_type = serializers.CharField(
+        default="print_job", help_text="Specifies the object type"
+    )
+    status = serializers.ChoiceField(
+        choices=PRINT_JOB_STATUS, help_text="The print job status"
+    )
+    resource_type = serializers.ChoiceField(
+        choices=PRINT_RESOURCE_TYPE,
+        help_text="The type of the resources to print documents for",
+    )
+    doc_type = serializers.ChoiceField(
+        choices=PRINT_DOCUMENT_TYPE, help_text="The type of document to print"
+    )
+    doc_format = serializers.CharField(help_text="The format of the bundled document")
+    total = serializers.IntegerField(help_text="The number of documents to bundle")
+    processed = serializers.IntegerField(help_text="The number of documents bundled")
+    progress = serializers.IntegerField(help_text="The completion percentage")
+    document_size = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="The bundled document size in bytes",
+    )
+    document_url = serializers.URLField(
+        required=False,
+        allow_null=True,
+        help_text="The bundled document download URL",
+    )
+    messages = serializers.ListField(
+        child=serializers.PlainDictField(),
+        required=False,
+        default=[],
+        help_text="The print job processing errors",
+    )
+    test_mode = serializers.BooleanField(required=True)
+    created_at = serializers.DateTimeField()
+    updated_at = serializers.DateTimeField()
@@ -1,5 +1,9 @@
+from rest_framework.exceptions import NotFound
+
 import karrio.server.serializers as serializers
 import karrio.server.documents.models as models
+import karrio.server.documents.printing as printing
+import karrio.server.documents.serializers.base as base
 
 
 @serializers.owned_model_serializer
@@ -7,3 +11,73 @@ class DocumentTemplateModelSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.DocumentTemplate
         exclude = ["created_at", "updated_at", "created_by"]
+
+
+@serializers.owned_model_serializer
+class PrintJobModelSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.PrintJob
+        exclude = ["created_at", "updated_at", "created_by"]
+
+
+@serializers.owned_model_serializer
+class PrintJobSerializer(base.PrintJobData):
+    def create(
+        self, validated_data: dict, context: serializers.Context, **kwargs
+    ) -> models.PrintJob:
+        import karrio.server.conf as conf
+        import karrio.server.events.tasks as tasks
+
+        doc_type = validated_data["doc_type"]
+        doc_format = validated_data["doc_format"].lower()
+        resource_type = validated_data["resource_type"]
+        resource_ids = list(dict.fromkeys(validated_data["resource_ids"]))
+        references = printing.resource_document_references(
+            resource_type, resource_ids, doc_type, doc_format, context=context
+        )
+
+        if not any(references):
+            raise NotFound(f"No {doc_type} found for the {resource_type}")
+
+        digest = printing.documents_digest(references, doc_format)
+        bundled = printing.find_bundled_print_job(digest)
+        job = (
+            PrintJobModelSerializer.map(
+                data=dict(
+                    resource_type=resource_type,
+                    doc_type=doc_type,
+                    doc_format=doc_format,
+                    resources=resource_ids,
+                    total=len(references),
+                    digest=digest,
+                    test_mode=context.test_mode,
+                    **(
+                        dict(
+                            status=base.PrintJobStatus.completed.value,
+                            processed=len(references),
+                            document_file=bundled.document_file,
+                            document_size=bundled.document_size,
+                        )
+                        if bundled is not None
+                        else {}
+                    ),
+                ),
+                context=context,
+            )
+            .save()
+            .instance
+        )
+
+        # the same documents were already bundled: the job is done.
+        if bundled is None:
+            tasks.bundle_print_job(
+                job.id,
+                ctx=dict(
+                    org_id=getattr(context.org, "id", None),
+                    user_id=getattr(context.user, "id", None),
+                    test_mode=context.test_mode,
+                ),
+                schema=conf.settings.schema,
+            )
+
+        return job
@@ -0,0 +1,5 @@
+import logging
+
+logging.disable(logging.CRITICAL)
+
+from karrio.server.documents.tests.test_print_jobs import *
@@ -0,0 +1,164 @@
+import json
+import base64
+from unittest.mock import patch
+from django.urls import reverse
+from rest_framework import status
+from karrio.server.core.tests import APITestCase
+import karrio.server.core.storage as storage
+import karrio.server.manager.models as manager
+import karrio.server.documents.models as models
+from karrio.server.events.task_definitions.documents import bundle_print_job
+
+LABELS = [b"^XA^FO50,50^FDlabel 1^FS^XZ", b"^XA^FO50,50^FDlabel 2^FS^XZ"]
+BUNDLE = b"^XA^FO50,50^FDlabel 1^FS^XZ\n^XA^FO50,50^FDlabel 2^FS^XZ\n"
+
+
+class TestPrintJobs(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.shipments = [
+            manager.Shipment.objects.create(
+                shipper=manager.Address.objects.create(
+                    country_code="CA", created_by=self.user
+                ),
+                recipient=manager.Address.objects.create(
+                    country_code="US", created_by=self.user
+                ),
+                created_by=self.user,
+                test_mode=True,
+                status="purchased",
+                label_type="ZPL",
+                label=base64.b64encode(label).decode(),
+            )
+            for label in LABELS
+        ]
+
+    def create_print_job(self):
+        url = reverse("karrio.server.documents:print-job-list")
+        data = dict(
+            resource_type="shipments",
+            resource_ids=[_.id for _ in self.shipments],
+            doc_type="label",
+            doc_format="zpl",
+        )
+
+        with patch("karrio.server.events.tasks.bundle_print_job") as task:
+            response = self.client.post(url, data)
+
+        return json.loads(response.content), response, task
+
+    def run_print_job(self, task):
+        # run the queued huey task in the test process
+        bundle_print_job.call_local(*task.call_args.args, **task.call_args.kwargs)
+
+    def test_create_and_poll_print_job(self):
+        job, response, task = self.create_print_job()
+        url = reverse(
+            "karrio.server.documents:print-job-details", kwargs=dict(pk=job["id"])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertDictEqual(
+            {k: job[k] for k in ["status", "total", "processed", "progress"]},
+            dict(status="queued", total=2, processed=0, progress=0),
+        )
+        self.assertEqual(task.call_count, 1)
+
+        self.run_print_job(task)
+        polled = json.loads(self.client.get(url).content)
+
+        self.assertDictEqual(
+            {k: polled[k] for k in ["status", "total", "processed", "progress"]},
+            dict(status="completed", total=2, processed=2, progress=100),
+        )
+        self.assertEqual(polled["document_size"], len(BUNDLE))
+        self.assertEqual(
+            polled["document_url"],
+            reverse(
+                "karrio.server.documents:print-job-download", kwargs=dict(pk=job["id"])
+            ),
+        )
+
+    def test_list_print_jobs(self):
+        jobs = [self.create_print_job()[0] for _ in range(3)]
+        url = reverse("karrio.server.documents:print-job-list")
+
+        first = json.loads(self.client.get(url, dict(limit=2)).content)
+        second = json.loads(self.client.get(first["next"]).content)
+
+        self.assertEqual(first["count"], 3)
+        self.assertCountEqual(
+            [_["id"] for _ in first["results"] + second["results"]],
+            [_["id"] for _ in jobs],
+        )
+        self.assertIsNone(second["next"])
+
+    def test_download_print_job_document(self):
+        job, _, task = self.create_print_job()
+        self.run_print_job(task)
+        url = reverse(
+            "karrio.server.documents:print-job-download", kwargs=dict(pk=job["id"])
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["Content-Length"], str(len(BUNDLE)))
+        self.assertEqual(b"".join(response.streaming_content), BUNDLE)
+
+    def test_download_print_job_document_range(self):
+        job, _, task = self.create_print_job()
+        self.run_print_job(task)
+        url = reverse(
+            "karrio.server.documents:print-job-download", kwargs=dict(pk=job["id"])
+        )
+
+        partial = self.client.get(url, HTTP_RANGE="bytes=4-9")
+        suffix = self.client.get(url, HTTP_RANGE="bytes=-5")
+        unsatisfiable = self.client.get(url, HTTP_RANGE=f"bytes={len(BUNDLE)}-")
+
+        self.assertEqual(partial.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(partial["Content-Range"], f"bytes 4-9/{len(BUNDLE)}")
+        self.assertEqual(b"".join(partial.streaming_content), BUNDLE[4:10])
+        self.assertEqual(suffix.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(suffix.streaming_content), BUNDLE[-5:])
+        self.assertEqual(
+            unsatisfiable.status_code,
+            status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        )
+        self.assertEqual(unsatisfiable["Content-Range"], f"bytes */{len(BUNDLE)}")
+
+    def test_reuse_bundle_of_identical_documents(self):
+        first, _, task = self.create_print_job()
+        self.run_print_job(task)
+
+        job, response, task = self.create_print_job()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(task.call_count, 0)
+        self.assertEqual(job["status"], "completed")
+        self.assertNotEqual(job["id"], first["id"])
+        self.assertEqual(
+            models.PrintJob.objects.get(pk=job["id"]).document_file,
+            models.PrintJob.objects.get(pk=first["id"]).document_file,
+        )
+
+    def test_failing_print_job(self):
+        job, _, task = self.create_print_job()
+
+        with patch.object(storage, "read_document", side_effect=IOError("gone")):
+            self.run_print_job(task)
+
+        failed = models.PrintJob.objects.get(pk=job["id"])
+        download = self.client.get(
+            reverse(
+                "karrio.server.documents:print-job-download", kwargs=dict(pk=job["id"])
+            )
+        )
+
+        self.assertEqual(failed.status, "failed")
+        self.assertListEqual(failed.messages, [dict(message="gone")])
+        self.assertIsNone(failed.document_file)
+        self.assertEqual(download.status_code, status.HTTP_409_CONFLICT)
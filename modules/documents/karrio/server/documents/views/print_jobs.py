@@ -0,0 +1,220 @@
+import re
+import typing
+import logging
+import mimetypes
+import django.urls as urls
+from django.http import FileResponse, HttpResponse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+import karrio.server.openapi as openapi
+import karrio.server.core.storage as storage
+import karrio.server.core.exceptions as exceptions
+from karrio.server.core.pagination import KeysetPagination
+import karrio.server.core.views.api as api
+import karrio.server.documents.models as models
+import karrio.server.documents.serializers as serializers
+
+ENDPOINT_ID = "&&&&$$$"  # This endpoint id is used to make operation ids unique make sure not to duplicate
+logger = logging.getLogger(__name__)
+PrintJobs = serializers.PaginatedResult("PrintJobList", serializers.PrintJob)
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class PrintJobList(api.GenericAPIView):
+    queryset = models.PrintJob.objects
+    pagination_class = KeysetPagination
+    serializer_class = PrintJobs
+
+    @openapi.extend_schema(
+        tags=["Documents"],
+        operation_id=f"{ENDPOINT_ID}list",
+        extensions={"x-operationId": "listPrintJobs"},
+        summary="List all print jobs",
+        responses={
+            200: PrintJobs(),
+            404: serializers.ErrorResponse(),
+            500: serializers.ErrorResponse(),
+        },
+    )
+    def get(self, request: Request):
+        """
+        Retrieve all print jobs.
+        """
+        jobs = self.paginate_queryset(models.PrintJob.access_by(request))
+        response = serializers.PrintJob(jobs, many=True).data
+
+        return self.get_paginated_response(response)
+
+    @openapi.extend_schema(
+        tags=["Documents"],
+        operation_id=f"{ENDPOINT_ID}create",
+        extensions={"x-operationId": "createPrintJob"},
+        summary="Create a print job",
+        request=serializers.PrintJobData(),
+        responses={
+            202: serializers.PrintJob(),
+            400: serializers.ErrorResponse(),
+            404: serializers.ErrorResponse(),
+            500: serializers.ErrorResponse(),
+        },
+    )
+    def post(self, request: Request):
+        """
+        Queue the bundling of the shipments or orders documents.
+        The documents of a wave that was already printed are bundled once.
+        """
+        job = (
+            serializers.PrintJobSerializer.map(data=request.data, context=request)
+            .save()
+            .instance
+        )
+
+        return Response(
+            serializers.PrintJob(job).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class PrintJobDetail(api.APIView):
+    @openapi.extend_schema(
+        tags=["Documents"],
+        operation_id=f"{ENDPOINT_ID}retrieve",
+        extensions={"x-operationId": "retrievePrintJob"},
+        summary="Retrieve a print job",
+        responses={
+            200: serializers.PrintJob(),
+            404: serializers.ErrorResponse(),
+            500: serializers.ErrorResponse(),
+        },
+    )
+    def get(self, request: Request, pk: str):
+        """
+        Retrieve a print job and its progress.
+        """
+        job = models.PrintJob.access_by(request).get(pk=pk)
+        return Response(serializers.PrintJob(job).data)
+
+
+class PrintJobDownload(api.APIView):
+    @openapi.extend_schema(
+        tags=["Documents"],
+        operation_id=f"{ENDPOINT_ID}download",
+        extensions={"x-operationId": "downloadPrintJob"},
+        summary="Download a print job document",
+        responses={
+            200: openapi.OpenApiTypes.BINARY,
+            206: openapi.OpenApiTypes.BINARY,
+            404: serializers.ErrorResponse(),
+            409: serializers.ErrorResponse(),
+            500: serializers.ErrorResponse(),
+        },
+    )
+    def get(self, request: Request, pk: str):
+        """
+        Download the bundled document of a completed print job.
+        Supports `Range` requests to resume large downloads.
+        """
+        job = models.PrintJob.access_by(request).get(pk=pk)
+
+        if job.document_file is None:
+            raise exceptions.APIException(
+                f"The print job is '{job.status}' and has no document to download",
+                code="state_error",
+                status_code=status.HTTP_409_CONFLICT,
+            )
+
+        return document_response(
+            job.document_file,
+            job.document_name,
+            request.headers.get("Range"),
+            size=job.document_size,
+        )
+
+
+def document_response(
+    reference: str,
+    name: str,
+    range_header: typing.Optional[str] = None,
+    size: typing.Optional[int] = None,
+) -> HttpResponse:
+    """Return a (range) streaming response of a stored document."""
+    size = storage.document_size(reference) if size is None else size
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    byte_range = parse_range(range_header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if byte_range is None:
+        response = FileResponse(
+            storage.open_document(reference),
+            filename=name,
+            content_type=content_type,
+        )
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            storage.open_document_range(reference, start, end),
+            filename=name,
+            content_type=content_type,
+            status=status.HTTP_206_PARTIAL_CONTENT,
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    response["Content-Length"] = str(
+        size if byte_range is None else byte_range[1] - byte_range[0] + 1
+    )
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def parse_range(
+    header: typing.Optional[str], size: int
+) -> typing.Union[typing.Tuple[int, int], None, bool]:
+    """Parse a single `Range` header value.
+
+    Returns the (inclusive) byte range, None for a full content response
+    (no or unsupported range) or False when the range is not satisfiable.
+    """
+    match = RANGE_RE.match((header or "").strip())
+
+    if match is None:
+        return None
+
+    first, last = match.groups()
+
+    if first == "" and last == "":
+        return None
+
+    if first == "":
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start, end = int(first), min(int(last or size - 1), size - 1)
+
+    if start > end or start >= size:
+        return False
+
+    return start, end
+
+
+urlpatterns = [
+    urls.path(
+        "documents/print_jobs",
+        PrintJobList.as_view(),
+        name="print-job-list",
+    ),
+    urls.path(
+        "documents/print_jobs/<str:pk>",
+        PrintJobDetail.as_view(),
+        name="print-job-details",
+    ),
+    urls.path(
+        "documents/print_jobs/<str:pk>/download",
+        PrintJobDownload.as_view(),
+        name="print-job-download",
+    ),
+]
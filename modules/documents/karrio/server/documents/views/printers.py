@@ -1,20 +1,23 @@
-import io
 import sys
+import typing
 import base64
 import logging
 from django.urls import re_path
 from django.utils import timezone
 from django.http import JsonResponse
-from django.core.files.base import ContentFile
-from django_downloadview import VirtualDownloadView
+from django.core.files.base import ContentFile, File
+from django_downloadview import VirtualDownloadView, VirtualFile
+from django_downloadview.io import BytesIteratorIO
 from rest_framework import status
 
 import karrio.lib as lib
 import karrio.server.openapi as openapi
+import karrio.server.core.storage as storage
 import karrio.server.documents.models as models
 import karrio.server.documents.generator as generator
 
 logger = logging.getLogger(__name__)
+CHUNK_SIZE = 100
 
 
 class TemplateDocsPrinter(VirtualDownloadView):
@@ -85,13 +88,19 @@ class ShipmentDocsPrinter(VirtualDownloadView):
 
         if doc == "label":
             _queryset = _queryset.filter(
-                label__isnull=False,
+                label_file__isnull=False,
                 label_type__contains=self.format.upper(),
             )
         if doc == "invoice":
-            _queryset = _queryset.filter(invoice__isnull=False)
+            _queryset = _queryset.filter(invoice_file__isnull=False)
 
-        self.documents = _queryset.values_list(doc, "label_type")
+        # the documents are read one at a time while the bundle is written.
+        self.documents = (
+            storage.read_document(reference)
+            for reference in _queryset.values_list(f"{doc}_file", flat=True).iterator(
+                chunk_size=CHUNK_SIZE
+            )
+        )
 
         response = super(ShipmentDocsPrinter, self).get(
             request, doc, self.format, **kwargs
@@ -100,13 +109,7 @@ class ShipmentDocsPrinter(VirtualDownloadView):
         return response
 
     def get_file(self):
-        content = base64.b64decode(
-            lib.bundle_base64([doc for doc, _ in self.documents], self.format.upper())
-        )
-        buffer = io.BytesIO()
-        buffer.write(content)
-
-        return ContentFile(buffer.getvalue(), name=self.name)
+        return bundle_file(self.documents, self.format, self.name)
 
 
 class OrderDocsPrinter(VirtualDownloadView):
@@ -139,15 +142,16 @@ class OrderDocsPrinter(VirtualDownloadView):
 
         if doc == "label":
             _queryset = _queryset.filter(
-                shipments__label__isnull=False,
+                shipments__label_file__isnull=False,
                 shipments__label_type__contains=self.format.upper(),
             )
         if doc == "invoice":
-            _queryset = _queryset.filter(shipments__invoice__isnull=False)
+            _queryset = _queryset.filter(shipments__invoice_file__isnull=False)
 
-        self.documents = list(
-            set(_queryset.values_list(f"shipments__{doc}", "shipments__label_type"))
+        references = dict.fromkeys(
+            _queryset.values_list(f"shipments__{doc}_file", flat=True)
         )
+        self.documents = (storage.read_document(_) for _ in references)
 
         response = super(OrderDocsPrinter, self).get(
             request, doc, self.format, **kwargs
@@ -156,13 +160,7 @@ class OrderDocsPrinter(VirtualDownloadView):
         return response
 
     def get_file(self):
-        content = base64.b64decode(
-            lib.bundle_base64([doc for doc, _ in self.documents], self.format.upper())
-        )
-        buffer = io.BytesIO()
-        buffer.write(content)
-
-        return ContentFile(buffer.getvalue(), name=self.name)
+        return bundle_file(self.documents, self.format, self.name)
 
 
 class ManifestDocsPrinter(VirtualDownloadView):
@@ -191,7 +189,12 @@ class ManifestDocsPrinter(VirtualDownloadView):
         self.name = f"{doc}s - {timezone.now()}.{self.format}"
         queryset = Manifest.objects.filter(id__in=ids, manifest__isnull=False)
 
-        self.documents = queryset.values_list(doc, "reference")
+        self.documents = (
+            base64.b64decode(document)
+            for document in queryset.values_list(doc, flat=True).iterator(
+                chunk_size=CHUNK_SIZE
+            )
+        )
 
         response = super(ManifestDocsPrinter, self).get(
             request, doc, self.format, **kwargs
@@ -200,13 +203,21 @@ class ManifestDocsPrinter(VirtualDownloadView):
         return response
 
     def get_file(self):
-        content = base64.b64decode(
-            lib.bundle_base64([doc for doc, _ in self.documents], self.format.upper())
+        return bundle_file(self.documents, self.format, self.name)
+
+
+def bundle_file(documents: typing.Iterable[bytes], format: str, name: str):
+    """Return the documents bundle as a file streamed to the response.
+
+    ZPL documents are streamed as they are read. Other formats are bundled in a
+    spooled temporary file first.
+    """
+    if "ZPL" in format.upper():
+        return VirtualFile(
+            BytesIteratorIO(lib.iter_bundle(documents, format.upper())), name=name
         )
-        buffer = io.BytesIO()
-        buffer.write(content)
 
-        return ContentFile(buffer.getvalue(), name=self.name)
+    return File(lib.bundle_documents(documents, format.upper()), name=name)
 
 
 urlpatterns = [
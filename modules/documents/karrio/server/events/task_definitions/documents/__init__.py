@@ -0,0 +1,40 @@
+import logging
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from huey.contrib.djhuey import db_task
+
+import karrio.server.core.utils as utils
+import karrio.server.serializers as serializers
+
+logger = logging.getLogger(__name__)
+
+
+@db_task()
+@utils.error_wrapper
+@utils.tenant_aware
+def bundle_print_job(job_id: str, ctx: dict, **kwargs):
+    from karrio.server.documents import printing
+
+    logger.info(f"> start print job ({job_id}) bundling...")
+    printing.bundle_print_job(job_id, context=retrieve_context(ctx))
+    logger.info(f"> ending print job ({job_id}) bundling...")
+
+
+def retrieve_context(info: dict) -> serializers.Context:
+    org = None
+
+    if settings.MULTI_ORGANIZATIONS and "org_id" in info:
+        import karrio.server.orgs.models as orgs_models
+
+        org = orgs_models.Organization.objects.filter(id=info["org_id"]).first()
+
+    return serializers.Context(
+        org=org,
+        user=get_user_model().objects.filter(id=info["user_id"]).first(),
+        test_mode=(info.get("test_mode") or False),
+    )
+
+
+TASK_DEFINITIONS = [
+    bundle_print_job,
+]
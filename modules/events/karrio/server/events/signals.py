@@ -1,3 +1,4 @@
+import typing
 import logging
 from django.db.models import signals
 
@@ -28,58 +29,13 @@ def shipment_updated(
     - shipment purchased (label purchased)
     - shipment fulfilled (shipped)
     """
-    is_bound = "created_at" in (update_fields or [])
-    status_updated = "status" in (update_fields or [])
-
     if created:
         return
-    if is_bound and instance.status == serializers.ShipmentStatus.purchased.value:
-        event = EventTypes.shipment_purchased.value
-    elif (
-        status_updated and instance.status == serializers.ShipmentStatus.purchased.value
-    ):
-        event = EventTypes.shipment_purchased.value
-    elif (
-        status_updated
-        and instance.status == serializers.ShipmentStatus.in_transit.value
-    ):
-        event = EventTypes.shipment_fulfilled.value
-    elif (
-        status_updated and instance.status == serializers.ShipmentStatus.cancelled.value
-    ):
-        event = EventTypes.shipment_cancelled.value
-    elif (
-        status_updated
-        and instance.status == serializers.ShipmentStatus.out_for_delivery.value
-    ):
-        event = EventTypes.shipment_out_for_delivery.value
-    elif (
-        status_updated
-        and instance.status == serializers.ShipmentStatus.needs_attention.value
-    ):
-        event = EventTypes.shipment_needs_attention.value
-    elif (
-        status_updated
-        and instance.status == serializers.ShipmentStatus.delivery_failed.value
-    ):
-        event = EventTypes.shipment_delivery_failed.value
-    else:
-        return
-
-    data = serializers.Shipment(instance).data
-    event_at = instance.updated_at
-    context = dict(
-        test_mode=instance.test_mode,
-        user_id=utils.failsafe(lambda: instance.created_by.id),
-        org_id=utils.failsafe(
-            lambda: instance.org.first().id if hasattr(instance, "org") else None
-        ),
-    )
 
-    if settings.MULTI_ORGANIZATIONS and context["org_id"] is None:
-        return
-
-    tasks.notify_webhooks(event, data, event_at, context, schema=settings.schema)
+    for notification in notifications(
+        [(instance, shipment_event(instance, update_fields))], serializers.Shipment
+    ):
+        tasks.notify_webhooks(*notification, schema=settings.schema)
 
 
 @utils.disable_for_loaddata
@@ -112,17 +68,91 @@ def tracker_updated(
     - tracker created (pending)
     - tracker status changed (in_transit, delivered or blocked)
     """
+    for notification in notifications(
+        [(instance, tracker_event(instance, created, update_fields))],
+        serializers.TrackingStatus,
+    ):
+        tasks.notify_webhooks(*notification, schema=settings.schema)
+
+
+def shipment_event(
+    instance: models.Shipment, update_fields: typing.Optional[typing.Iterable[str]]
+) -> typing.Optional[str]:
+    """Return the webhooks event of a shipment update if any."""
+    is_bound = "created_at" in (update_fields or [])
+    status_updated = "status" in (update_fields or [])
+
+    if is_bound and instance.status == serializers.ShipmentStatus.purchased.value:
+        return EventTypes.shipment_purchased.value
+    elif (
+        status_updated and instance.status == serializers.ShipmentStatus.purchased.value
+    ):
+        return EventTypes.shipment_purchased.value
+    elif (
+        status_updated
+        and instance.status == serializers.ShipmentStatus.in_transit.value
+    ):
+        return EventTypes.shipment_fulfilled.value
+    elif (
+        status_updated and instance.status == serializers.ShipmentStatus.cancelled.value
+    ):
+        return EventTypes.shipment_cancelled.value
+    elif (
+        status_updated
+        and instance.status == serializers.ShipmentStatus.out_for_delivery.value
+    ):
+        return EventTypes.shipment_out_for_delivery.value
+    elif (
+        status_updated
+        and instance.status == serializers.ShipmentStatus.needs_attention.value
+    ):
+        return EventTypes.shipment_needs_attention.value
+    elif (
+        status_updated
+        and instance.status == serializers.ShipmentStatus.delivery_failed.value
+    ):
+        return EventTypes.shipment_delivery_failed.value
+
+    return None
+
+
+def tracker_event(
+    instance: models.Tracking,
+    created: bool,
+    update_fields: typing.Optional[typing.Iterable[str]],
+) -> typing.Optional[str]:
+    """Return the webhooks event of a tracker update if any."""
     changes = update_fields or []
 
     if created or "created_at" in changes:
-        event = EventTypes.tracker_created.value
+        return EventTypes.tracker_created.value
     elif any(field in changes for field in ["status", "events"]):
-        event = EventTypes.tracker_updated.value
-    else:
-        return
+        return EventTypes.tracker_updated.value
 
-    data = serializers.TrackingStatus(instance).data
-    event_at = instance.updated_at
+    return None
+
+
+def notifications(
+    events: typing.List[typing.Tuple[typing.Any, typing.Optional[str]]],
+    serializer: typing.Type[serializers.Serializer],
+) -> typing.List[tuple]:
+    """Return the `(event, data, event_at, context)` webhooks notifications of
+    `(instance, event)` pairs with the instances data serialized at once."""
+    items = [
+        (instance, event, _notification_context(instance))
+        for instance, event in events
+        if event is not None
+    ]
+    items = [item for item in items if item[2] is not None]
+    data = serializer([instance for instance, *_ in items], many=True).data
+
+    return [
+        (event, item_data, instance.updated_at, context)
+        for (instance, event, context), item_data in zip(items, data)
+    ]
+
+
+def _notification_context(instance) -> typing.Optional[dict]:
     context = dict(
         user_id=utils.failsafe(lambda: instance.created_by.id),
         test_mode=instance.test_mode,
@@ -132,6 +162,6 @@ def tracker_updated(
     )
 
     if settings.MULTI_ORGANIZATIONS and context["org_id"] is None:
-        return
+        return None
 
-    tasks.notify_webhooks(event, data, event_at, context, schema=settings.schema)
+    return context
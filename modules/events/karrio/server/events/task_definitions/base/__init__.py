@@ -8,25 +8,37 @@ import karrio.server.core.utils as utils
 
 logger = logging.getLogger(__name__)
 DATA_ARCHIVING_SCHEDULE = int(getattr(settings, "DATA_ARCHIVING_SCHEDULE", 168))
-DEFAULT_TRACKERS_UPDATE_INTERVAL = int(
-    getattr(settings, "DEFAULT_TRACKERS_UPDATE_INTERVAL", 7200) / 60
+TRACKERS_SCHEDULER_INTERVAL = int(
+    getattr(settings, "TRACKERS_SCHEDULER_INTERVAL", 300) / 60
 )
 
 
-@db_periodic_task(crontab(minute=f"*/{DEFAULT_TRACKERS_UPDATE_INTERVAL}"))
+@db_periodic_task(crontab(minute=f"*/{TRACKERS_SCHEDULER_INTERVAL}"))
 def background_trackers_update():
     from karrio.server.events.task_definitions.base import tracking
 
     @utils.run_on_all_tenants
     def _run(**kwargs):
         try:
-            tracking.update_trackers()
+            tracking.dispatch_due_trackers(
+                lambda tracker_ids: update_trackers_page(
+                    tracker_ids, schema=kwargs.get("schema")
+                )
+            )
         except Exception as e:
             logger.error(f"An error occured during tracking statuses update: {e}")
 
     _run()
 
 
+@db_task()
+@utils.tenant_aware
+def update_trackers_page(tracker_ids, **kwargs):
+    from karrio.server.events.task_definitions.base import tracking
+
+    tracking.update_trackers(tracker_ids=tracker_ids)
+
+
 @db_task(retries=5, retry_delay=60)
 @utils.tenant_aware
 def notify_webhooks(*args, **kwargs):
@@ -40,6 +52,14 @@ def notify_webhooks(*args, **kwargs):
         raise e
 
 
+@db_task()
+@utils.tenant_aware
+def notify_trackers_updated(tracker_changes, shipment_ids, **kwargs):
+    from karrio.server.events.task_definitions.base import tracking
+
+    tracking.notify_trackers_updates(tracker_changes, shipment_ids, **kwargs)
+
+
 @db_periodic_task(crontab(hour=f"*/{DATA_ARCHIVING_SCHEDULE}"))
 def periodic_data_archiving(*args, **kwargs):
     from karrio.server.events.task_definitions.base import archiving
@@ -59,6 +79,8 @@ def periodic_data_archiving(*args, **kwargs):
 
 TASK_DEFINITIONS = [
     background_trackers_update,
+    update_trackers_page,
     periodic_data_archiving,
     notify_webhooks,
+    notify_trackers_updated,
 ]
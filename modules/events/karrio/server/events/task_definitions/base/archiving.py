@@ -1,9 +1,11 @@
+import time
+import typing
 import logging
 import datetime
+import django.db.models as models
 import django.utils.timezone as timezone
 
 import karrio.server.conf as conf
-import karrio.server.core.utils as utils
 import karrio.server.core.models as core
 import karrio.server.events.models as events
 import karrio.server.orders.models as orders
@@ -13,7 +15,7 @@ import karrio.server.manager.models as manager
 logger = logging.getLogger(__name__)
 
 
-def run_data_archiving(*args, **kwargs):
+def run_data_archiving(*args, **kwargs) -> typing.Dict[str, int]:
     now = timezone.now()
     log_retention = now - datetime.timedelta(days=conf.settings.API_LOGS_DATA_RETENTION)
     order_retention = now - datetime.timedelta(days=conf.settings.ORDER_DATA_RETENTION)
@@ -24,35 +26,77 @@ def run_data_archiving(*args, **kwargs):
         days=conf.settings.TRACKER_DATA_RETENTION
     )
 
-    shipping_data = manager.Shipment.objects.filter(created_at__lt=shipment_retention)
-    tracking_Data = manager.Tracking.objects.filter(created_at__lt=tracker_retention)
-    tracing_data = tracing.TracingRecord.objects.filter(created_at__lt=log_retention)
-    api_log_data = core.APILog.objects.filter(requested_at__lt=log_retention)
-    order_data = orders.Order.objects.filter(created_at__lt=order_retention)
-    event_data = events.Event.objects.filter(created_at__lt=log_retention)
+    backlogs = [
+        (
+            "SDK tracing",
+            tracing.TracingRecord.objects.filter(created_at__lt=log_retention),
+        ),
+        ("events", events.Event.objects.filter(created_at__lt=log_retention)),
+        (
+            "API request logs",
+            core.APILog.objects.filter(requested_at__lt=log_retention),
+        ),
+        (
+            "tracking data",
+            manager.Tracking.objects.filter(created_at__lt=tracker_retention),
+        ),
+        (
+            "shipping data",
+            manager.Shipment.objects.filter(created_at__lt=shipment_retention),
+        ),
+        ("order data", orders.Order.objects.filter(created_at__lt=order_retention)),
+    ]
+    archived = {}
 
-    if any(tracing_data):
-        logger.info(">> archiving SDK tracing backlog...")
-        utils.failsafe(lambda: tracing_data.delete())
+    for name, queryset in backlogs:
+        try:
+            archived[name] = archive_backlog(name, queryset, **kwargs)
+        except Exception as e:
+            logger.warning(f"failed to archive {name} backlog: {e}")
 
-    if any(event_data):
-        logger.info(">> archiving events backlog...")
-        utils.failsafe(lambda: event_data.delete())
+    logger.info("> ending scheduled backlog archiving!")
 
-    if any(api_log_data):
-        logger.info(">> archiving API request logs backlog...")
-        utils.failsafe(lambda: api_log_data.delete())
+    return archived
 
-    if any(tracking_Data):
-        logger.info(">> archiving tracking data backlog...")
-        utils.failsafe(lambda: tracking_Data.delete())
 
-    if any(shipping_data):
-        logger.info(">> archiving shipping data backlog...")
-        utils.failsafe(lambda: shipping_data.delete())
+def archive_backlog(
+    name: str,
+    queryset: models.QuerySet,
+    batch_size: int = None,
+    batch_sleep: float = None,
+    **kwargs,
+) -> int:
+    """Delete the rows of a queryset by primary key batches.
 
-    if any(order_data):
-        logger.info(">> archiving order data backlog...")
-        utils.failsafe(lambda: order_data.delete())
+    Each batch is deleted in its own short transaction and Django deletes it
+    with a single `DELETE` statement when the model has no delete signals nor
+    cascades to collect. `DATA_ARCHIVING_BATCH_SLEEP` seconds are waited between
+    batches to leave room to concurrent writes.
+    """
+    batch_size = batch_size or conf.settings.DATA_ARCHIVING_BATCH_SIZE
+    batch_sleep = (
+        conf.settings.DATA_ARCHIVING_BATCH_SLEEP if batch_sleep is None else batch_sleep
+    )
+    pks = queryset.order_by().values_list("pk", flat=True)
+    count = 0
 
-    logger.info("> ending scheduled backlog archiving!")
+    while True:
+        batch = list(pks[:batch_size])
+
+        if len(batch) == 0:
+            break
+
+        if count == 0:
+            logger.info(f">> archiving {name} backlog...")
+
+        queryset.model.objects.filter(pk__in=batch).delete()
+        count += len(batch)
+        logger.info(f"> {count} {name} archived...")
+
+        if len(batch) < batch_size:
+            break
+
+        if batch_sleep > 0:
+            time.sleep(batch_sleep)
+
+    return count
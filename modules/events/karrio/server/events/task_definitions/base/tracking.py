@@ -5,8 +5,11 @@ import datetime
 import functools
 from itertools import groupby
 
+import django.db.models as db
 from django.conf import settings
 from django.utils import timezone
+from django.core.cache import cache
+from django.db import transaction
 
 import karrio
 import karrio.lib as lib
@@ -14,72 +17,220 @@ from karrio.api.gateway import Gateway
 from karrio.api.interface import IRequestFrom
 from karrio.core.models import TrackingDetails, Message, TrackingEvent
 
+import karrio.server.conf as conf
 import karrio.server.core.utils as utils
 import karrio.server.manager.models as models
 import karrio.server.tracing.utils as tracing
 import karrio.server.core.datatypes as datatypes
 import karrio.server.manager.serializers as serializers
+import karrio.server.events.signals as signals
+import karrio.server.events.tasks as tasks
 
 logger = logging.getLogger(__name__)
-Delay = int
-RequestBatches = typing.Tuple[
-    Gateway, IRequestFrom, Delay, typing.List[models.Tracking]
-]
+RequestBatches = typing.Tuple[Gateway, IRequestFrom, typing.List[models.Tracking]]
 BatchResponse = typing.List[typing.Tuple[TrackingDetails, typing.List[Message]]]
 
 DEFAULT_TRACKERS_UPDATE_INTERVAL = getattr(
     settings, "DEFAULT_TRACKERS_UPDATE_INTERVAL", 7200
 )
+TRACKERS_UPDATE_PAGE_SIZE = getattr(settings, "TRACKERS_UPDATE_PAGE_SIZE", 500)
+TRACKERS_UPDATE_MAX_INTERVAL = getattr(settings, "TRACKERS_UPDATE_MAX_INTERVAL", 86400)
+TRACKERS_UPDATE_BATCH_SIZE = 10
+# (last event age in days, update interval factor)
+TRACKERS_UPDATE_BACKOFF = [(2, 1), (7, 2), (30, 6)]
+TRACKERS_UPDATE_MAX_BACKOFF = 12
 
 
 def update_trackers(
-    delta: datetime.timedelta = datetime.timedelta(
-        seconds=DEFAULT_TRACKERS_UPDATE_INTERVAL
-    ),
+    delta: typing.Optional[datetime.timedelta] = None,
     tracker_ids: typing.List[str] = [],
 ):
+    """Update the given trackers, the undelivered trackers not updated
+    since `delta` or (by default) the next page of due trackers."""
     logger.info("> starting scheduled trackers update")
 
-    active_trackers = lib.identity(
-        models.Tracking.objects.filter(id__in=tracker_ids)
-        if any(tracker_ids)
-        else models.Tracking.objects.filter(
-            delivered=False,
-            updated_at__lt=timezone.now() - delta,
+    if any(tracker_ids):
+        tracker_ids = list(tracker_ids)
+    elif delta is not None:
+        tracker_ids = list(
+            models.Tracking.objects.filter(
+                delivered=False,
+                updated_at__lt=timezone.now() - delta,
+            ).values_list("id", flat=True)
         )
+    else:
+        tracker_ids = claim_due_trackers()
+
+    if any(tracker_ids):
+        refresh_trackers(tracker_ids)
+    else:
+        logger.info("no active trackers found needing update")
+
+    logger.info("> ending scheduled trackers update")
+
+
+def refresh_trackers(tracker_ids: typing.List[str]):
+    """Fetch and save the tracking info of the trackers then schedule their next check."""
+    active_trackers = list(
+        models.Tracking.objects.filter(id__in=tracker_ids)
+        .defer(None)
+        .select_related("tracking_carrier", "shipment")
+        .order_by("tracking_carrier_id")
+    )
+    trackers_grouped_by_carrier = [
+        list(g)
+        for _, g in groupby(active_trackers, key=lambda t: t.tracking_carrier_id)
+    ]
+    carrier_batches = [create_request_batches(g) for g in trackers_grouped_by_carrier]
+
+    # Carriers are queried in parallel and each carrier with its own concurrency.
+    responses: BatchResponse = sum(
+        discard_failures(
+            lib.run_concurently(
+                fetch_carrier_tracking_info,
+                [batches for batches in carrier_batches if any(batches)],
+                getattr(settings, "TRACKERS_UPDATE_CONCURRENCY", 4),
+            )
+            or []
+        ),
+        [],
     )
+    request_batches: typing.List[RequestBatches] = sum(carrier_batches, [])
+
+    save_tracing_records(request_batches)
+    save_updated_trackers(responses, active_trackers)
+    schedule_trackers(active_trackers)
+
+
+def dispatch_due_trackers(dispatch: typing.Callable[[typing.List[str]], typing.Any]):
+    """Claim the due trackers by pages and dispatch each page for update."""
+    lag = trackers_update_lag()
+    pages = 0
+    logger.info(f"> {lag['due']} trackers due for update (lag: {lag['lag']:.0f}s)")
+
+    while True:
+        tracker_ids = claim_due_trackers()
+
+        if any(tracker_ids):
+            dispatch(tracker_ids)
+            pages += 1
+
+        if len(tracker_ids) < TRACKERS_UPDATE_PAGE_SIZE:
+            break
+
+    logger.info(f"> {pages} trackers update pages dispatched")
+
+    return pages
+
+
+def claim_due_trackers(
+    limit: int = TRACKERS_UPDATE_PAGE_SIZE,
+    now: typing.Optional[datetime.datetime] = None,
+) -> typing.List[str]:
+    """Lease a page of due trackers and return their ids.
+
+    Rows locked by a concurrent claim are skipped and the claimed trackers
+    `next_check_at` is pushed by an update interval so that they are claimed
+    again if their update never completes.
+    """
+    now = now or timezone.now()
+
+    with transaction.atomic():
+        tracker_ids = list(
+            models.Tracking.objects.select_for_update(skip_locked=True)
+            .filter(due_trackers_filter(now))
+            .order_by(db.F("next_check_at").asc(nulls_first=True))
+            .values_list("id", flat=True)[:limit]
+        )
+        models.Tracking.objects.filter(id__in=tracker_ids).update(
+            next_check_at=now
+            + datetime.timedelta(seconds=DEFAULT_TRACKERS_UPDATE_INTERVAL)
+        )
+
+    return tracker_ids
 
-    if any(active_trackers):
-        trackers_grouped_by_carrier = [
-            list(g) for _, g in groupby(active_trackers, key=lambda t: t.carrier_id)
-        ]
-        request_batches: typing.List[RequestBatches] = sum(
-            [create_request_batches(group) for group in trackers_grouped_by_carrier], []
+
+def due_trackers_filter(now: datetime.datetime) -> db.Q:
+    # trackers never scheduled are due an update interval after their last update.
+    return db.Q(delivered=False) & (
+        db.Q(next_check_at__lte=now)
+        | db.Q(
+            next_check_at__isnull=True,
+            updated_at__lt=now
+            - datetime.timedelta(seconds=DEFAULT_TRACKERS_UPDATE_INTERVAL),
         )
+    )
+
+
+def trackers_update_lag(now: typing.Optional[datetime.datetime] = None) -> dict:
+    """Return the number of due trackers and the delay (in seconds) of the oldest one."""
+    now = now or timezone.now()
+    due = models.Tracking.objects.filter(due_trackers_filter(now)).aggregate(
+        count=db.Count("id"),
+        oldest=db.Min("next_check_at"),
+    )
+    oldest = due["oldest"] if due["count"] else None
+
+    return dict(
+        due=due["count"],
+        lag=(now - oldest).total_seconds() if oldest is not None else 0,
+    )
+
+
+def schedule_trackers(
+    trackers: typing.List[models.Tracking],
+    now: typing.Optional[datetime.datetime] = None,
+):
+    now = now or timezone.now()
+
+    for tracker in trackers:
+        tracker.next_check_at = compute_next_check_at(tracker, now)
+
+    models.Tracking.objects.bulk_update(trackers, ["next_check_at"], batch_size=500)
+
+
+def compute_next_check_at(
+    tracker: models.Tracking, now: typing.Optional[datetime.datetime] = None
+) -> typing.Optional[datetime.datetime]:
+    """Return when a tracker should be updated next.
 
-        responses = lib.run_concurently(fetch_tracking_info, request_batches, 2)
-        save_tracing_records(request_batches)
-        save_updated_trackers(responses, active_trackers)
+    The update interval is shortened for shipments out for delivery and
+    increases with the age of the last tracking event.
+    """
+    now = now or timezone.now()
+
+    if tracker.delivered:
+        return None
+
+    if tracker.status == "out_for_delivery":
+        factor = 0.5
     else:
-        logger.info("no active trackers found needing update")
+        last_event_at = _last_event_date(tracker) or tracker.created_at or now
+        age = (now - last_event_at).days
+        factor = next(
+            (f for days, f in TRACKERS_UPDATE_BACKOFF if age < days),
+            TRACKERS_UPDATE_MAX_BACKOFF,
+        )
 
-    logger.info("> ending scheduled trackers update")
+    interval = min(
+        DEFAULT_TRACKERS_UPDATE_INTERVAL * factor, TRACKERS_UPDATE_MAX_INTERVAL
+    )
+
+    return now + datetime.timedelta(seconds=interval)
 
 
 def create_request_batches(
     trackers: typing.List[models.Tracking],
 ) -> typing.List[RequestBatches]:
-    start = 0
-    end = 10
     batches = []
 
-    while any(trackers[start:end]):
+    for start in range(0, len(trackers), TRACKERS_UPDATE_BATCH_SIZE):
+        end = start + TRACKERS_UPDATE_BATCH_SIZE
+
         try:
-            # Add a request delay to avoid sending two request batches to a carrier at the same time
-            delay = int(((end / 10) * 10) - 10)
             # Get the common tracking carrier
             carrier = trackers[0].tracking_carrier
-            # Collect the 5 trackers between the start and end indexes
+            # Collect the trackers between the start and end indexes
             batch_trackers = trackers[start:end]
             tracking_numbers = [t.tracking_number for t in batch_trackers]
             options: dict = functools.reduce(
@@ -96,22 +247,48 @@ def create_request_batches(
             )
             gateway: Gateway = carrier.gateway
 
-            batches.append((gateway, request, delay, batch_trackers))
+            batches.append((gateway, request, batch_trackers))
 
         except Exception as request_error:
             logger.warning(f"failed to prepare tracking batch ({start}, {end}) request")
             logger.error(request_error, exc_info=True)
 
-        end += 10
-        start += 10
-
     return batches
 
 
+def fetch_carrier_tracking_info(
+    request_batches: typing.List[RequestBatches],
+) -> BatchResponse:
+    """Fetch the request batches of a carrier with its concurrency limit."""
+    return discard_failures(
+        lib.run_concurently(
+            fetch_tracking_info,
+            request_batches,
+            getattr(settings, "TRACKERS_UPDATE_CARRIER_CONCURRENCY", 2),
+        )
+        or []
+    )
+
+
+def discard_failures(results: typing.List[typing.Any]) -> typing.List[typing.Any]:
+    """Return the results of a concurrent run without the raised exceptions.
+
+    `lib.run_concurently` returns the exceptions raised by the failed calls
+    among the results; they are logged so one failing carrier does not lose
+    the other carriers responses.
+    """
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning("tracking request batch failed")
+            logger.error(result, exc_info=result)
+
+    return [result for result in results if not isinstance(result, Exception)]
+
+
 def fetch_tracking_info(request_batch: RequestBatches) -> BatchResponse:
-    gateway, request, delay, trackers = request_batch
+    gateway, request, trackers = request_batch
     logger.debug(f"fetching batch {[t.tracking_number for t in trackers]}")
-    time.sleep(delay)  # apply delay before request
+    wait_for_carrier_rate_limit(trackers[0].tracking_carrier_id)
 
     try:
         return utils.identity(lambda: request.from_(gateway).parse())
@@ -122,13 +299,40 @@ def fetch_tracking_info(request_batch: RequestBatches) -> BatchResponse:
     return []
 
 
+def wait_for_carrier_rate_limit(carrier_pk: typing.Any):
+    """Wait until a request to a carrier account is allowed by
+    `TRACKERS_UPDATE_CARRIER_RATE_LIMIT` (requests per minute).
+
+    The requests are counted in the shared cache so that the limit applies
+    across all the workers.
+    """
+    limit = getattr(settings, "TRACKERS_UPDATE_CARRIER_RATE_LIMIT", 0)
+
+    while limit > 0:
+        window = int(time.time() // 60)
+        key = f"trackers:rate:{carrier_pk}:{window}"
+        cache.add(key, 0, timeout=120)
+
+        if cache.incr(key) <= limit:
+            return
+
+        time.sleep(60 - time.time() % 60)
+
+
+def _last_event_date(tracker: models.Tracking) -> typing.Optional[datetime.datetime]:
+    event = next(iter(tracker.events or []), None) or {}
+    date = utils.failsafe(lambda: lib.to_date(event.get("date")))
+
+    return timezone.make_aware(date) if date is not None else None
+
+
 @utils.error_wrapper
 def save_tracing_records(request_batches: typing.List[RequestBatches]):
     logger.info("> saving tracing records...")
 
     try:
         for request_batch in request_batches:
-            gateway, _, __, trackers = request_batch
+            gateway, _, trackers = request_batch
 
             if not any(trackers):
                 continue
@@ -144,84 +348,209 @@ def save_tracing_records(request_batches: typing.List[RequestBatches]):
 def save_updated_trackers(
     responses: typing.List[BatchResponse], trackers: typing.List[models.Tracking]
 ):
+    """Apply the tracking details to the trackers and persist the changes in bulk.
+
+    The changed trackers are saved with one `bulk_update` per set of changed
+    fields, then their shipments statuses. `bulk_update` sends no signals so
+    the webhooks notifications of the updates are enqueued as one batch.
+    """
     logger.info("> saving updated trackers")
 
+    now = timezone.now()
+    trackers_by_number: typing.Dict[str, typing.List[models.Tracking]] = {}
+    changed: typing.Dict[str, typing.Tuple[models.Tracking, typing.Set[str]]] = {}
+
+    for tracker in trackers:
+        trackers_by_number.setdefault(tracker.tracking_number, []).append(tracker)
+
     for tracking_details, _ in responses:
         for details in tracking_details or []:
-            try:
-                logger.debug(f"update tracking info for {details.tracking_number}")
-                related_trackers = [
-                    t for t in trackers if t.tracking_number == details.tracking_number
-                ]
-                for tracker in related_trackers:
-                    # update values only if changed; This is important for webhooks notification
-                    changes = []
-                    meta = details.meta or {}
-                    status = utils.compute_tracking_status(details).value
-                    events = utils.process_events(
-                        response_events=details.events,
-                        current_events=tracker.events,
+            for tracker in trackers_by_number.get(details.tracking_number, []):
+                try:
+                    changes = apply_tracking_details(tracker, details)
+                except Exception as update_error:
+                    logger.warning(
+                        f"failed to update tracker with tracking number: {details.tracking_number}"
                     )
-                    options = {
-                        **(tracker.options or {}),
-                        tracker.tracking_number: details.meta,
-                    }
-                    info = lib.to_dict(details.info or {})
-
-                    if events != tracker.events:
-                        tracker.events = events
-                        changes.append("events")
-
-                    if options != tracker.options:
-                        tracker.options = options
-                        changes.append("options")
-
-                    if details.meta != tracker.meta:
-                        tracker.meta = meta
-                        changes.append("meta")
-
-                    if details.delivered != tracker.delivered:
-                        tracker.delivered = details.delivered
-                        changes.append("delivered")
-
-                    if status != tracker.status:
-                        tracker.status = status
-                        changes.append("status")
-
-                    if details.estimated_delivery != tracker.estimated_delivery:
-                        tracker.estimated_delivery = details.estimated_delivery
-                        changes.append("estimated_delivery")
-
-                    if details.images is not None and (
-                        details.images.delivery_image != tracker.delivery_image
-                        or details.images.signature_image != tracker.signature_image
-                    ):
-                        changes.append("delivery_image")
-                        changes.append("signature_image")
-                        tracker.delivery_image = (
-                            details.images.delivery_image or tracker.delivery_image
-                        )
-                        tracker.signature_image = (
-                            details.images.signature_image or tracker.signature_image
-                        )
-
-                    if any(info.keys()) and info != tracker.info:
-                        tracker.info = serializers.process_dictionaries_mutations(
-                            ["info"], dict(info=info), tracker
-                        )["info"]
-                        changes.append("info")
-
-                    if any(changes):
-                        tracker.save(update_fields=changes)
-                        serializers.update_shipment_tracker(tracker)
-                        logger.debug(
-                            f"tracking info {details.tracking_number} updated successfully"
-                        )
-                    else:
-                        logger.debug(f"no changes detect")
-
-            except Exception as update_error:
-                logger.warning(
-                    f"failed to update tracker with tracking number: {details.tracking_number}"
+                    logger.error(update_error, exc_info=True)
+                    continue
+
+                if any(changes):
+                    changed.setdefault(tracker.id, (tracker, set()))[1].update(changes)
+                else:
+                    logger.debug(f"no changes detect")
+
+    if not any(changed):
+        return
+
+    updates: typing.Dict[tuple, typing.List[models.Tracking]] = {}
+
+    for tracker, changes in changed.values():
+        tracker.updated_at = now
+        updates.setdefault(tuple(sorted(changes)), []).append(tracker)
+
+    # `bulk_update` builds a `CASE` per row and field so the fields sharing
+    # the same value across rows are set with plain updates.
+    with transaction.atomic():
+        for fields, group in updates.items():
+            models.Tracking.objects.bulk_update(group, fields, batch_size=500)
+
+        models.Tracking.objects.filter(id__in=changed.keys()).update(updated_at=now)
+        shipments = update_trackers_shipments(
+            [tracker for tracker, _ in changed.values()], now
+        )
+
+    logger.info(f"> {len(changed)} trackers updated")
+
+    tracker_changes = {
+        tracker.id: sorted(changes)
+        for tracker, changes in changed.values()
+        if signals.tracker_event(tracker, False, changes) is not None
+    }
+    shipment_ids = [
+        shipment.id
+        for shipment in shipments
+        if signals.shipment_event(shipment, ["status"]) is not None
+    ]
+
+    if any(tracker_changes) or any(shipment_ids):
+        tasks.notify_trackers_updated(
+            tracker_changes, shipment_ids, schema=conf.settings.schema
+        )
+
+
+def notify_trackers_updates(
+    tracker_changes: typing.Dict[str, typing.List[str]],
+    shipment_ids: typing.List[str],
+    **kwargs,
+):
+    """Notify the webhook subscribers of trackers (and their shipments) updates.
+
+    The objects are loaded and serialized by batch. Failed notifications are
+    re-enqueued individually to be retried.
+    """
+    from karrio.server.events.task_definitions.base import webhook
+
+    trackers = models.Tracking.objects.filter(id__in=tracker_changes.keys()).defer(None)
+    shipments = models.Shipment.objects.filter(id__in=shipment_ids)
+    notifications = [
+        *signals.notifications(
+            [
+                (
+                    tracker,
+                    signals.tracker_event(tracker, False, tracker_changes[tracker.id]),
                 )
-                logger.error(update_error, exc_info=True)
+                for tracker in trackers
+            ],
+            serializers.TrackingStatus,
+        ),
+        *signals.notifications(
+            [
+                (shipment, signals.shipment_event(shipment, ["status"]))
+                for shipment in shipments
+            ],
+            serializers.Shipment,
+        ),
+    ]
+
+    for notification in notifications:
+        try:
+            webhook.notify_webhook_subscribers(*notification, **kwargs)
+        except Exception as e:
+            logger.error(f"An error occured during webhook notification: {e}")
+            tasks.notify_webhooks(*notification, **kwargs)
+
+
+def update_trackers_shipments(
+    trackers: typing.List[models.Tracking], now: datetime.datetime
+) -> typing.List[models.Shipment]:
+    """Update the status of the trackers shipments and return the updated shipments."""
+    shipments: typing.Dict[str, typing.List[models.Shipment]] = {}
+
+    for tracker in trackers:
+        shipment = tracker.shipment
+        status = utils.failsafe(lambda: serializers.compute_shipment_status(tracker))
+
+        if shipment is not None and status is not None and shipment.status != status:
+            shipment.status = status
+            shipment.updated_at = now
+            shipments.setdefault(status, []).append(shipment)
+
+    for status, group in shipments.items():
+        models.Shipment.objects.filter(id__in=[s.id for s in group]).update(
+            status=status, updated_at=now
+        )
+
+    updated = sum(shipments.values(), [])
+
+    # `update` doesn't send the `post_save` signal recomputing the orders status.
+    if any(updated) and conf.settings.ORDERS_MANAGEMENT:
+        import karrio.server.orders.serializers.order as orders
+
+        orders.update_shipments_orders_status([shipment.id for shipment in updated])
+
+    return updated
+
+
+def apply_tracking_details(
+    tracker: models.Tracking, details: TrackingDetails
+) -> typing.List[str]:
+    """Update the tracker with the tracking details and return the changed fields.
+
+    Values are only updated if changed; This is important for webhooks notification.
+    """
+    changes = []
+    meta = details.meta or {}
+    status = utils.compute_tracking_status(details).value
+    events = utils.process_events(
+        response_events=details.events,
+        current_events=tracker.events,
+    )
+    options = {
+        **(tracker.options or {}),
+        tracker.tracking_number: details.meta,
+    }
+    info = lib.to_dict(details.info or {})
+
+    if events != tracker.events:
+        tracker.events = events
+        changes.append("events")
+
+    if options != tracker.options:
+        tracker.options = options
+        changes.append("options")
+
+    if details.meta != tracker.meta:
+        tracker.meta = meta
+        changes.append("meta")
+
+    if details.delivered != tracker.delivered:
+        tracker.delivered = details.delivered
+        changes.append("delivered")
+
+    if status != tracker.status:
+        tracker.status = status
+        changes.append("status")
+
+    if details.estimated_delivery != tracker.estimated_delivery:
+        tracker.estimated_delivery = details.estimated_delivery
+        changes.append("estimated_delivery")
+
+    if details.images is not None and (
+        details.images.delivery_image != tracker.delivery_image
+        or details.images.signature_image != tracker.signature_image
+    ):
+        changes.append("delivery_image")
+        changes.append("signature_image")
+        tracker.delivery_image = details.images.delivery_image or tracker.delivery_image
+        tracker.signature_image = (
+            details.images.signature_image or tracker.signature_image
+        )
+
+    if any(info.keys()) and info != tracker.info:
+        tracker.info = serializers.process_dictionaries_mutations(
+            ["info"], dict(info=info), tracker
+        )["info"]
+        changes.append("info")
+
+    return changes
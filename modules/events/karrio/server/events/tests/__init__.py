@@ -5,3 +5,4 @@ logging.disable(logging.CRITICAL)
 from karrio.server.events.tests.test_tracking_tasks import *
 from karrio.server.events.tests.test_webhooks import *
 from karrio.server.events.tests.test_events import *
+from karrio.server.events.tests.test_archiving import *
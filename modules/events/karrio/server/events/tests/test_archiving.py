@@ -0,0 +1,55 @@
+import datetime
+from django.utils import timezone
+from karrio.server.core.tests import APITestCase
+from karrio.server.core.models import APILog, APILogIndex
+from karrio.server.tracing.models import TracingRecord
+from karrio.server.events.models import Event
+from karrio.server.events.task_definitions.base import archiving
+
+
+class TestDataArchiving(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        expired = timezone.now() - datetime.timedelta(days=100)
+
+        for index in range(5):
+            APILogIndex.objects.create(
+                user=self.user, path="/v1/shipments", requested_at=expired
+            )
+            TracingRecord.objects.create(
+                key="request",
+                record={},
+                timestamp=1.0,
+                test_mode=True,
+                created_by=self.user,
+            )
+            Event.objects.create(
+                type="shipment_purchased", test_mode=True, created_by=self.user
+            )
+
+        APILogIndex.objects.create(
+            user=self.user, path="/v1/shipments", requested_at=timezone.now()
+        )
+        TracingRecord.objects.filter(
+            pk__in=TracingRecord.objects.values_list("pk", flat=True)[:4]
+        ).update(created_at=expired)
+        Event.objects.update(created_at=expired)
+
+    def test_archive_expired_data_by_batches(self):
+        archived = archiving.run_data_archiving(batch_size=2, batch_sleep=0)
+
+        self.assertDictEqual(
+            archived,
+            {
+                "SDK tracing": 4,
+                "events": 5,
+                "API request logs": 5,
+                "tracking data": 0,
+                "shipping data": 0,
+                "order data": 0,
+            },
+        )
+        self.assertEqual(TracingRecord.objects.count(), 1)
+        self.assertEqual(Event.objects.count(), 0)
+        self.assertEqual(APILog.objects.count(), 1)
+        self.assertEqual(APILogIndex.objects.count(), 1)
@@ -1,12 +1,15 @@
 import json
+import attr
 import datetime
 from time import sleep
 from unittest.mock import patch, ANY
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from karrio.core.models import TrackingDetails, TrackingEvent
 from karrio.server.core.tests import APITestCase
 from karrio.server.manager import models
+import karrio.server.orders.models as orders
 from karrio.server.events.task_definitions.base import tracking
 
 
@@ -86,6 +89,178 @@ class TestTrackersBackgroundUpdate(APITestCase):
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertDictEqual(response_data, UPDATED_TRACKERS_LIST)
 
+    def test_compute_next_check_at_backoff(self):
+        now = timezone.now()
+        tracker = models.Tracking.objects.get(tracking_number="1Z12345E6205277936")
+        interval = tracking.DEFAULT_TRACKERS_UPDATE_INTERVAL
+
+        self.assertEqual(
+            tracking.compute_next_check_at(tracker, now),
+            now
+            + datetime.timedelta(
+                seconds=min(interval * 12, tracking.TRACKERS_UPDATE_MAX_INTERVAL)
+            ),
+        )
+
+        tracker.events = [dict(date=now.strftime("%Y-%m-%d"))]
+        self.assertEqual(
+            tracking.compute_next_check_at(tracker, now),
+            now + datetime.timedelta(seconds=interval),
+        )
+
+        tracker.status = "out_for_delivery"
+        self.assertEqual(
+            tracking.compute_next_check_at(tracker, now),
+            now + datetime.timedelta(seconds=interval / 2),
+        )
+
+        tracker.delivered = True
+        self.assertIsNone(tracking.compute_next_check_at(tracker, now))
+
+    def test_dispatch_due_trackers(self):
+        past = timezone.now() - datetime.timedelta(minutes=5)
+        models.Tracking.objects.filter(tracking_number="1Z12345E6205277936").update(
+            next_check_at=past
+        )
+        pages = []
+
+        with patch(
+            "karrio.server.events.task_definitions.base.tracking.utils.identity"
+        ) as mocks:
+            mocks.return_value = RETURNED_UPDATED_VALUE
+            dispatched = tracking.dispatch_due_trackers(
+                lambda tracker_ids: pages.append(tracker_ids)
+                or tracking.update_trackers(tracker_ids=tracker_ids)
+            )
+
+        tracker = models.Tracking.objects.get(tracking_number="1Z12345E6205277936")
+
+        self.assertEqual(dispatched, 1)
+        self.assertListEqual(pages, [[tracker.id]])
+        self.assertGreater(tracker.next_check_at, timezone.now())
+        self.assertListEqual(tracking.claim_due_trackers(), [])
+        self.assertDictEqual(tracking.trackers_update_lag(), dict(due=0, lag=0))
+
+    def test_save_updated_trackers_in_bulk(self):
+        tracker = models.Tracking.objects.get(tracking_number="00340434292135100124")
+        tracker.shipment = models.Shipment.objects.create(
+            shipper=models.Address.objects.create(
+                country_code="CA", created_by=self.user
+            ),
+            recipient=models.Address.objects.create(
+                country_code="US", created_by=self.user
+            ),
+            status="purchased",
+            test_mode=True,
+            created_by=self.user,
+        )
+        tracker.save(update_fields=["shipment"])
+
+        with patch(
+            "karrio.server.events.task_definitions.base.tracking.tasks"
+        ) as tasks:
+            tracking.save_updated_trackers(
+                [RETURNED_UPDATED_VALUE], list(models.Tracking.objects.defer(None))
+            )
+
+        tracker.refresh_from_db()
+        tracker_changes, shipment_ids = tasks.notify_trackers_updated.call_args.args
+
+        self.assertEqual(tracker.status, "in_transit")
+        self.assertEqual(len(tracker.events), 2)
+        self.assertEqual(tracker.shipment.status, "in_transit")
+        self.assertEqual(tasks.notify_trackers_updated.call_count, 1)
+        self.assertListEqual(list(tracker_changes.keys()), [tracker.id])
+        self.assertListEqual(shipment_ids, [tracker.shipment.id])
+
+        with patch(
+            "karrio.server.events.task_definitions.base.webhook.notify_webhook_subscribers"
+        ) as notify:
+            tracking.notify_trackers_updates(tracker_changes, shipment_ids)
+
+        self.assertListEqual(
+            [(call.args[0], call.args[1]["id"]) for call in notify.call_args_list],
+            [
+                ("tracker_updated", tracker.id),
+                ("shipment_fulfilled", tracker.shipment.id),
+            ],
+        )
+
+    def test_save_delivered_trackers_updates_orders_status(self):
+        tracker = models.Tracking.objects.get(tracking_number="00340434292135100124")
+        line_item = orders.LineItem.objects.create(
+            title="item", quantity=1, weight=1.0, created_by=self.user
+        )
+        order = orders.Order.objects.create(
+            order_id="1001",
+            source="API",
+            status="fulfilled",
+            shipping_to=models.Address.objects.create(
+                country_code="US", created_by=self.user
+            ),
+            test_mode=True,
+            created_by=self.user,
+        )
+        orders.OrderLineItemLink.objects.create(order=order, item=line_item)
+        parcel = models.Parcel.objects.create(
+            weight=1.0, weight_unit="KG", created_by=self.user
+        )
+        parcel.items.add(
+            models.Commodity.objects.create(
+                title="item", quantity=1, parent=line_item, created_by=self.user
+            )
+        )
+        tracker.shipment = models.Shipment.objects.create(
+            shipper=models.Address.objects.create(
+                country_code="CA", created_by=self.user
+            ),
+            recipient=models.Address.objects.create(
+                country_code="US", created_by=self.user
+            ),
+            status="in_transit",
+            test_mode=True,
+            created_by=self.user,
+        )
+        tracker.shipment.parcels.add(parcel)
+        tracker.save(update_fields=["shipment"])
+        order.shipments.add(tracker.shipment)
+        [details], messages = RETURNED_UPDATED_VALUE
+
+        with patch("karrio.server.events.task_definitions.base.tracking.tasks"):
+            tracking.save_updated_trackers(
+                [([attr.evolve(details, delivered=True)], messages)],
+                [models.Tracking.objects.get(pk=tracker.pk)],
+            )
+
+        order.refresh_from_db()
+
+        self.assertEqual(
+            models.Shipment.objects.get(pk=tracker.shipment.pk).status, "delivered"
+        )
+        self.assertEqual(order.status, "delivered")
+
+    def test_refresh_trackers_with_a_failing_carrier(self):
+        def fetch_carrier_tracking_info(request_batches):
+            gateway, _, __ = request_batches[0]
+
+            if gateway.settings.carrier_id == self.ups_carrier.carrier_id:
+                raise Exception("carrier unavailable")
+
+            return [RETURNED_UPDATED_VALUE]
+
+        with patch.object(
+            tracking,
+            "fetch_carrier_tracking_info",
+            side_effect=fetch_carrier_tracking_info,
+        ):
+            tracking.refresh_trackers(
+                list(models.Tracking.objects.values_list("id", flat=True))
+            )
+
+        tracker = models.Tracking.objects.get(tracking_number="00340434292135100124")
+
+        self.assertEqual(tracker.events[0]["date"], "2021-03-02")
+
 
 RETURNED_VALUE = (
     [
@@ -0,0 +1,31 @@
+import logging
+from django.conf import settings
+from huey import crontab
+from huey.contrib.djhuey import db_periodic_task
+
+import karrio.server.core.utils as utils
+
+logger = logging.getLogger(__name__)
+# in minutes (at least 1 as huey rejects a "*/0" crontab)
+USAGE_STATS_UPDATE_INTERVAL = max(
+    int(getattr(settings, "USAGE_STATS_UPDATE_INTERVAL", 900) / 60), 1
+)
+
+
+@db_periodic_task(crontab(minute=f"*/{USAGE_STATS_UPDATE_INTERVAL}"))
+def periodic_usage_stats_update(*args, **kwargs):
+    import karrio.server.graph.usage as usage
+
+    @utils.run_on_all_tenants
+    def _run(**kwargs):
+        try:
+            usage.refresh_recent_usage_stats()
+        except Exception as e:
+            logger.error(f"An error occured during usage stats update: {e}")
+
+    _run()
+
+
+TASK_DEFINITIONS = [
+    periodic_usage_stats_update,
+]
@@ -0,0 +1,154 @@
+"""Per request batch loaders of the graph types relations.
+
+The graph view executes synchronously so relations are not batched with
+(async) DataLoaders but per connection page: the nodes of a page are
+registered as peers and the first resolution of a relation on one node loads
+it for all of its peers at once. Loaded related objects are in turn registered
+as peers so nested relations are batched the same way.
+"""
+
+import typing
+import dataclasses
+import django.db.models as models
+from django.contrib.auth import get_user_model
+import strawberry.django.context as context
+
+import karrio.server.manager.models as manager
+import karrio.server.tracing.models as tracing
+import karrio.server.providers.models as providers
+
+T = typing.TypeVar("T")
+PEERS_ATTRIBUTE = "_graph_peers"
+
+
+def register(instances: typing.Iterable[T]) -> typing.List[T]:
+    """Register model instances loaded together as peers."""
+    group = list(instances)
+
+    for instance in group:
+        if isinstance(instance, models.Model):
+            setattr(instance, PEERS_ATTRIBUTE, group)
+
+    return group
+
+
+def peers(instance: models.Model) -> list:
+    return getattr(instance, PEERS_ATTRIBUTE, None) or [instance]
+
+
+class Loaders:
+    def __init__(self):
+        self._batches: typing.Dict[tuple, tuple] = {}
+        self._values: typing.Dict[tuple, typing.Any] = {}
+
+    def related(self, instance: models.Model, lookup: str) -> typing.Any:
+        """Return a relation (object or list of objects) of an instance.
+
+        The relation is prefetched for all the instance peers.
+        """
+        if not isinstance(instance, models.Model):
+            return getattr(instance, lookup, None)
+
+        group = peers(instance)
+        key = (id(group), lookup)
+
+        if key not in self._batches:
+            models.prefetch_related_objects(group, lookup)
+            self._batches[key] = (
+                group,
+                register(
+                    {
+                        id(item): item
+                        for peer in group
+                        for item in _related_objects(peer, lookup)
+                    }.values()
+                ),
+            )
+
+        value = getattr(instance, lookup, None)
+
+        return list(value.all()) if isinstance(value, models.Manager) else value
+
+    def batch(
+        self,
+        instance: models.Model,
+        name: str,
+        load: typing.Callable[[list], typing.Dict[typing.Any, typing.Any]],
+        default: typing.Any = None,
+    ) -> typing.Any:
+        """Return the value `load` returns (keyed by pk) for the instance.
+
+        `load` is called once with all the instance peers.
+        """
+        group = peers(instance)
+        key = (id(group), name)
+
+        if key not in self._batches:
+            values = load(group)
+            register(
+                item
+                for value in values.values()
+                for item in (value if isinstance(value, list) else [value])
+                if item is not None
+            )
+            self._batches[key] = (group, values)
+
+        return self._batches[key][1].get(instance.pk, default)
+
+    def cached(self, name: str, key: typing.Any, load: typing.Callable[[], T]) -> T:
+        """Return the value of `load` computed once per request for a key."""
+        if (name, key) not in self._values:
+            self._values[(name, key)] = load()
+
+        return self._values[(name, key)]
+
+
+@dataclasses.dataclass
+class Context(context.StrawberryDjangoContext):
+    loaders: Loaders = dataclasses.field(default_factory=Loaders)
+
+
+def tracker_shipments(trackers: typing.List[manager.Tracking]) -> dict:
+    shipment_ids = dict(
+        manager.Tracking.objects.filter(
+            pk__in=[tracker.pk for tracker in trackers]
+        ).values_list("pk", "shipment_id")
+    )
+    shipments = manager.Shipment.objects.in_bulk(
+        [id for id in shipment_ids.values() if id is not None]
+    )
+
+    return {pk: shipments.get(id) for pk, id in shipment_ids.items()}
+
+
+def log_records(logs: list, user) -> dict:
+    queryset = tracing.TracingRecord.objects.filter(
+        meta__request_log_id__in=[log.id for log in logs]
+    )
+
+    if (
+        get_user_model()
+        .objects.filter(id=getattr(user, "id", None), is_staff=False)
+        .exists()
+    ):
+        # exclude system carriers records if user is not staff
+        system_carriers = [
+            item["id"] for item in providers.Carrier.system_carriers.all().values("id")
+        ]
+        queryset = queryset.exclude(meta__carrier_account_id__in=system_carriers)
+
+    records: dict = {}
+
+    for record in queryset:
+        records.setdefault((record.meta or {}).get("request_log_id"), []).append(record)
+
+    return records
+
+
+def _related_objects(instance: models.Model, lookup: str) -> list:
+    value = getattr(instance, lookup, None)
+
+    if isinstance(value, models.Manager):
+        return list(value.all())
+
+    return [value] if isinstance(value, models.Model) else []
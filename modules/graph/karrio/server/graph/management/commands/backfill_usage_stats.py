@@ -0,0 +1,30 @@
+import datetime
+from django.utils import timezone
+from django.core.management import BaseCommand
+
+import karrio.server.graph.usage as usage
+
+
+class Command(BaseCommand):
+    help = "Computes the daily usage stats rollups of past days"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=365, help="number of past days to compute"
+        )
+        parser.add_argument(
+            "--chunk-days",
+            type=int,
+            default=30,
+            help="number of days aggregated per query",
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        count = usage.backfill_usage_stats(
+            today - datetime.timedelta(days=options["days"] - 1),
+            today,
+            chunk_days=options["chunk_days"],
+        )
+
+        self.stdout.write(f"{count} usage stats computed")
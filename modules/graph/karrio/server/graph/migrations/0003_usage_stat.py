@@ -0,0 +1,52 @@
+# Generated by Django 4.2.16 on 2026-10-18 17:31
+
+from django.db import migrations, models
+import functools
+import karrio.server.core.models.base
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("graph", "0002_auto_20210512_1353"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UsageStat",
+            fields=[
+                (
+                    "id",
+                    models.CharField(
+                        default=functools.partial(
+                            karrio.server.core.models.base.uuid,
+                            *(),
+                            **{"prefix": "stat_"}
+                        ),
+                        editable=False,
+                        max_length=50,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("metric", models.CharField(max_length=50)),
+                ("date", models.DateField()),
+                ("test_mode", models.BooleanField()),
+                ("value", models.FloatField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Usage Stat",
+                "verbose_name_plural": "Usage Stats",
+                "db_table": "usage-stat",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="usagestat",
+            constraint=models.UniqueConstraint(
+                fields=("test_mode", "date", "metric"),
+                name="usage_stat_metric_date_idx",
+            ),
+        ),
+    ]
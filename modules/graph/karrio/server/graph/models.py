@@ -1,3 +1,4 @@
+import functools
 from django.conf import settings
 from django.db import models
 
@@ -42,3 +43,35 @@ class Template(OwnedEntity):
     @property
     def object_type(self):
         return "template"
+
+
+class UsageStat(models.Model):
+    """Daily rollup of a usage metric (see `karrio.server.graph.usage`)."""
+
+    class Meta:
+        db_table = "usage-stat"
+        verbose_name = "Usage Stat"
+        verbose_name_plural = "Usage Stats"
+        ordering = ["-date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["test_mode", "date", "metric"],
+                name="usage_stat_metric_date_idx",
+            )
+        ]
+
+    id = models.CharField(
+        max_length=50,
+        primary_key=True,
+        default=functools.partial(uuid, prefix="stat_"),
+        editable=False,
+    )
+    metric = models.CharField(max_length=50)
+    date = models.DateField()
+    test_mode = models.BooleanField()
+    value = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def object_type(self):
+        return "usage_stat"
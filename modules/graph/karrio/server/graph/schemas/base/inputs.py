@@ -30,6 +30,7 @@ class TracingRecordFilter(utils.Paginated):
 
 @strawberry.input
 class TrackerFilter(utils.Paginated):
+    keyword: typing.Optional[str] = strawberry.UNSET
     tracking_number: typing.Optional[str] = strawberry.UNSET
     created_after: typing.Optional[datetime.datetime] = strawberry.UNSET
     created_before: typing.Optional[datetime.datetime] = strawberry.UNSET
@@ -3,7 +3,6 @@ import logging
 import datetime
 import strawberry
 import django.db.models as models
-import django.db.models.functions as functions
 from strawberry.types import Info
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
@@ -14,12 +13,12 @@ import karrio.server.user.models as auth
 import karrio.server.core.models as core
 import karrio.server.graph.utils as utils
 import karrio.server.graph.models as graph
+import karrio.server.graph.usage as usage
+import karrio.server.graph.loaders as loaders
 import karrio.server.core.filters as filters
-import karrio.server.orders.models as orders
 import karrio.server.manager.models as manager
 import karrio.server.tracing.models as tracing
 import karrio.server.providers.models as providers
-import karrio.server.orders.filters as order_filters
 import karrio.server.user.serializers as user_serializers
 import karrio.server.graph.schemas.base.inputs as inputs
 
@@ -181,104 +180,27 @@ class SystemUsageType:
         info,
         filter: typing.Optional[utils.UsageFilter] = strawberry.UNSET,
     ) -> "SystemUsageType":
-        _test_mode = info.context.request.test_mode
-        _test_filter = dict(test_mode=_test_mode)
         _filter = {
             "date_before": datetime.datetime.now(),
             "date_after": (datetime.datetime.now() - datetime.timedelta(days=30)),
             **(filter if not utils.is_unset(filter) else utils.UsageFilter()).to_dict(),
         }
-
-        api_requests = (
-            filters.LogFilter(
-                _filter,
-                core.APILogIndex.objects.filter(**_test_filter),
-            )
-            .qs.annotate(date=functions.TruncDay("requested_at"))
-            .values("date")
-            .annotate(count=models.Count("id"))
-            .order_by("-date")
-        )
-        api_errors = (
-            filters.LogFilter(
-                {**_filter, "status": "failed"},
-                core.APILogIndex.objects.filter(**_test_filter),
-            )
-            .qs.annotate(date=functions.TruncDay("requested_at"))
-            .values("date")
-            .annotate(count=models.Count("id"))
-            .order_by("-date")
-        )
-        order_volumes = (
-            order_filters.OrderFilters(
-                dict(
-                    created_before=_filter["date_before"],
-                    created_after=_filter["date_after"],
-                ),
-                orders.Order.objects.filter(**_test_filter).exclude(
-                    status__in=["cancelled", "unfulfilled"]
-                ),
-            )
-            .qs.annotate(date=functions.TruncDay("created_at"))
-            .values("date")
-            .annotate(
-                count=models.Sum(
-                    models.F("line_items__value_amount")
-                    * models.F("line_items__quantity")
-                )
-            )
-            .order_by("-date")
+        stats = usage.usage_stats(
+            _filter["date_after"],
+            _filter["date_before"],
+            test_mode=info.context.request.test_mode,
         )
-        shipment_count = (
-            filters.ShipmentFilters(
-                dict(
-                    created_before=_filter["date_before"],
-                    created_after=_filter["date_after"],
-                ),
-                manager.Shipment.objects.filter(**_test_filter),
-            )
-            .qs.annotate(date=functions.TruncDay("created_at"))
-            .values("date")
-            .annotate(count=models.Count("id"))
-            .order_by("-date")
-        )
-        shipping_spend = (
-            filters.ShipmentFilters(
-                dict(
-                    created_before=_filter["date_before"],
-                    created_after=_filter["date_after"],
-                ),
-                manager.Shipment.objects.filter(**_test_filter).exclude(
-                    status__in=["cancelled", "draft"]
-                ),
-            )
-            .qs.annotate(date=functions.TruncDay("created_at"))
-            .values("date")
-            .annotate(
-                count=models.Sum(
-                    functions.Cast("selected_rate__total_charge", models.FloatField())
-                )
-            )
-            .order_by("-date")
-        )
-        tracker_count = (
-            filters.TrackerFilters(
-                dict(
-                    created_before=_filter["date_before"],
-                    created_after=_filter["date_after"],
-                ),
-                manager.Tracking.objects.filter(**_test_filter),
-            )
-            .qs.annotate(date=functions.TruncDay("created_at"))
-            .values("date")
-            .annotate(count=models.Count("id"))
-            .order_by("-date")
-        )
-
-        total_errors = sum([item["count"] for item in api_errors], 0)
-        total_requests = sum([item["count"] for item in api_requests], 0)
-        total_trackers = sum([item["count"] for item in tracker_count], 0)
-        total_shipments = sum([item["count"] for item in shipment_count], 0)
+        api_errors = stats["api_errors"]
+        api_requests = stats["api_requests"]
+        order_volumes = stats["order_volumes"]
+        shipment_count = stats["shipment_count"]
+        shipping_spend = stats["shipping_spend"]
+        tracker_count = stats["tracker_count"]
+
+        total_errors = int(sum([item["count"] for item in api_errors], 0))
+        total_requests = int(sum([item["count"] for item in api_requests], 0))
+        total_trackers = int(sum([item["count"] for item in tracker_count], 0))
+        total_shipments = int(sum([item["count"] for item in shipment_count], 0))
         order_volume = lib.to_money(sum([item["count"] for item in order_volumes], 0.0))
         total_shipping_spend = lib.to_money(
             sum([item["count"] for item in shipping_spend], 0.0)
@@ -323,7 +245,6 @@ class MetafieldType:
 class LogType:
     object_type: str
     id: int
-    user: typing.Optional[UserType]
     requested_at: typing.Optional[datetime.datetime]
     response_ms: typing.Optional[int]
     path: typing.Optional[str]
@@ -333,6 +254,10 @@ class LogType:
     status_code: typing.Optional[int]
     test_mode: typing.Optional[bool]
 
+    @strawberry.field
+    def user(self: core.APILog, info: Info) -> typing.Optional[UserType]:
+        return info.context.loaders.related(self, "user")
+
     @strawberry.field
     def data(self: core.APILog) -> typing.Optional[utils.JSON]:
         try:
@@ -355,22 +280,13 @@ class LogType:
             return self.query_params
 
     @strawberry.field
-    def records(
-        self: tracing.TracingRecord, info: Info
-    ) -> typing.List["TracingRecordType"]:
-        queryset = tracing.TracingRecord.objects.filter(meta__request_log_id=self.id)
-
-        if User.objects.filter(
-            id=info.context.request.user.id, is_staff=False
-        ).exists():
-            # exclude system carriers records if user is not staff
-            system_carriers = [
-                item["id"]
-                for item in providers.Carrier.system_carriers.all().values("id")
-            ]
-            queryset = queryset.exclude(meta__carrier_account_id__in=system_carriers)
-
-        return queryset
+    def records(self: core.APILog, info: Info) -> typing.List["TracingRecordType"]:
+        return info.context.loaders.batch(
+            self,
+            "records",
+            lambda logs: loaders.log_records(logs, info.context.request.user),
+            default=[],
+        )
 
     @staticmethod
     @utils.authentication_required
@@ -397,10 +313,15 @@ class TracingRecordType:
     key: typing.Optional[str]
     timestamp: typing.Optional[float]
     test_mode: typing.Optional[bool]
-    created_by: typing.Optional[UserType]
     created_at: typing.Optional[datetime.datetime]
     updated_at: typing.Optional[datetime.datetime]
 
+    @strawberry.field
+    def created_by(
+        self: tracing.TracingRecord, info: Info
+    ) -> typing.Optional[UserType]:
+        return info.context.loaders.related(self, "created_by")
+
     @strawberry.field
     def record(self: tracing.TracingRecord) -> typing.Optional[utils.JSON]:
         try:
@@ -567,11 +488,14 @@ class CommodityType:
     value_currency: typing.Optional[utils.CurrencyCodeEnum]
     created_at: typing.Optional[datetime.datetime]
     updated_at: typing.Optional[datetime.datetime]
-    created_by: typing.Optional[UserType]
     parent_id: typing.Optional[str] = None
     parent: typing.Optional["CommodityType"] = None
     unfulfilled_quantity: typing.Optional[int] = None
 
+    @strawberry.field
+    def created_by(self: manager.Commodity, info: Info) -> typing.Optional[UserType]:
+        return info.context.loaders.related(self, "created_by")
+
 
 @strawberry.type
 class AddressType:
@@ -594,10 +518,13 @@ class AddressType:
     address_line2: typing.Optional[str]
     created_at: typing.Optional[datetime.datetime]
     updated_at: typing.Optional[datetime.datetime]
-    created_by: typing.Optional[UserType]
     validate_location: typing.Optional[bool]
     validation: typing.Optional[utils.JSON] = None
 
+    @strawberry.field
+    def created_by(self: manager.Address, info: Info) -> typing.Optional[UserType]:
+        return info.context.loaders.related(self, "created_by")
+
 
 @strawberry.type
 class ParcelType:
@@ -618,11 +545,14 @@ class ParcelType:
     reference_number: typing.Optional[str]
     created_at: datetime.datetime
     updated_at: datetime.datetime
-    created_by: UserType
 
     @strawberry.field
-    def items(self: manager.Parcel) -> typing.List[CommodityType]:
-        return self.items.all()
+    def created_by(self: manager.Parcel, info: Info) -> UserType:
+        return info.context.loaders.related(self, "created_by")
+
+    @strawberry.field
+    def items(self: manager.Parcel, info: Info) -> typing.List[CommodityType]:
+        return info.context.loaders.related(self, "items")
 
 
 @strawberry.type
@@ -648,9 +578,17 @@ class CustomsType:
     signer: typing.Optional[str] = strawberry.UNSET
     created_at: typing.Optional[datetime.datetime] = strawberry.UNSET
     updated_at: typing.Optional[datetime.datetime] = strawberry.UNSET
-    created_by: typing.Optional[UserType] = strawberry.UNSET
     options: typing.Optional[utils.JSON] = strawberry.UNSET
-    duty_billing_address: typing.Optional[AddressType] = strawberry.UNSET
+
+    @strawberry.field
+    def created_by(self: manager.Customs, info: Info) -> typing.Optional[UserType]:
+        return info.context.loaders.related(self, "created_by")
+
+    @strawberry.field
+    def duty_billing_address(
+        self: manager.Customs, info: Info
+    ) -> typing.Optional[AddressType]:
+        return info.context.loaders.related(self, "duty_billing_address")
 
     @strawberry.field
     def duty(self: manager) -> typing.Optional[DutyType]:
@@ -660,8 +598,8 @@ class CustomsType:
         return DutyType(**self.duty)
 
     @strawberry.field
-    def commodities(self: manager.Customs) -> typing.List[CommodityType]:
-        return self.commodities.all()
+    def commodities(self: manager.Customs, info: Info) -> typing.List[CommodityType]:
+        return info.context.loaders.related(self, "commodities")
 
 
 @strawberry.type
@@ -869,18 +807,26 @@ class TrackerType:
     signature_image_url: typing.Optional[str]
     options: typing.Optional[utils.JSON]
     meta: typing.Optional[utils.JSON]
-    shipment: typing.Optional["ShipmentType"]
     created_at: datetime.datetime
     updated_at: datetime.datetime
-    created_by: UserType
 
     @strawberry.field
-    def carrier_id(self: manager.Tracking) -> str:
-        return getattr(self.tracking_carrier, "carrier_id", None)
+    def created_by(self: manager.Tracking, info: Info) -> UserType:
+        return info.context.loaders.related(self, "created_by")
 
     @strawberry.field
-    def carrier_name(self: manager.Tracking) -> str:
-        return getattr(self.tracking_carrier, "carrier_name", None)
+    def shipment(self: manager.Tracking, info: Info) -> typing.Optional["ShipmentType"]:
+        return info.context.loaders.batch(self, "shipment", loaders.tracker_shipments)
+
+    @strawberry.field
+    def carrier_id(self: manager.Tracking, info: Info) -> str:
+        carrier = info.context.loaders.related(self, "tracking_carrier")
+        return getattr(carrier, "carrier_id", None)
+
+    @strawberry.field
+    def carrier_name(self: manager.Tracking, info: Info) -> str:
+        carrier = info.context.loaders.related(self, "tracking_carrier")
+        return getattr(carrier, "carrier_name", None)
 
     @strawberry.field
     def info(self: manager.Tracking) -> typing.Optional[TrackingInfoType]:
@@ -896,9 +842,9 @@ class TrackerType:
 
     @strawberry.field
     def tracking_carrier(
-        self: manager.Tracking,
+        self: manager.Tracking, info: Info
     ) -> typing.Optional["CarrierConnectionType"]:
-        return self.tracking_carrier
+        return info.context.loaders.related(self, "tracking_carrier")
 
     @staticmethod
     @utils.authentication_required
@@ -981,20 +927,15 @@ class ShipmentType:
     id: str
     object_type: str
     test_mode: bool
-    shipper: AddressType
-    recipient: AddressType
     options: utils.JSON
     metadata: utils.JSON
     status: utils.ShipmentStatusEnum
-    return_address: typing.Optional[AddressType]
-    billing_address: typing.Optional[AddressType]
     meta: typing.Optional[utils.JSON]
     label_type: typing.Optional[utils.LabelTypeEnum]
     tracking_number: typing.Optional[str]
     shipment_identifier: typing.Optional[str]
     tracking_url: typing.Optional[str]
     reference: typing.Optional[str]
-    customs: typing.Optional[CustomsType]
     services: typing.Optional[typing.List[str]]
     service: typing.Optional[str]
     carrier_ids: typing.List[str]
@@ -1002,10 +943,40 @@ class ShipmentType:
     tracker_id: typing.Optional[str]
     label_url: typing.Optional[str]
     invoice_url: typing.Optional[str]
-    tracker: typing.Optional[TrackerType]
     created_at: datetime.datetime
     updated_at: datetime.datetime
-    created_by: UserType
+
+    @strawberry.field
+    def shipper(self: manager.Shipment, info: Info) -> AddressType:
+        return info.context.loaders.related(self, "shipper")
+
+    @strawberry.field
+    def recipient(self: manager.Shipment, info: Info) -> AddressType:
+        return info.context.loaders.related(self, "recipient")
+
+    @strawberry.field
+    def return_address(
+        self: manager.Shipment, info: Info
+    ) -> typing.Optional[AddressType]:
+        return info.context.loaders.related(self, "return_address")
+
+    @strawberry.field
+    def billing_address(
+        self: manager.Shipment, info: Info
+    ) -> typing.Optional[AddressType]:
+        return info.context.loaders.related(self, "billing_address")
+
+    @strawberry.field
+    def customs(self: manager.Shipment, info: Info) -> typing.Optional[CustomsType]:
+        return info.context.loaders.related(self, "customs")
+
+    @strawberry.field
+    def tracker(self: manager.Shipment, info: Info) -> typing.Optional[TrackerType]:
+        return info.context.loaders.related(self, "shipment_tracker")
+
+    @strawberry.field
+    def created_by(self: manager.Shipment, info: Info) -> UserType:
+        return info.context.loaders.related(self, "created_by")
 
     @strawberry.field
     def carrier_id(self: manager.Shipment) -> typing.Optional[str]:
@@ -1016,8 +987,8 @@ class ShipmentType:
         return getattr(self.selected_rate_carrier, "carrier_name", None)
 
     @strawberry.field
-    def parcels(self: manager.Shipment) -> typing.List[ParcelType]:
-        return self.parcels.all()
+    def parcels(self: manager.Shipment, info: Info) -> typing.List[ParcelType]:
+        return info.context.loaders.related(self, "parcels")
 
     @strawberry.field
     def rates(self: manager.Shipment) -> typing.List[RateType]:
@@ -1029,9 +1000,9 @@ class ShipmentType:
 
     @strawberry.field
     def selected_rate_carrier(
-        self: manager.Shipment,
+        self: manager.Shipment, info: Info
     ) -> typing.Optional["CarrierConnectionType"]:
-        return self.selected_rate_carrier
+        return info.context.loaders.related(self, "selected_rate_carrier")
 
     @strawberry.field
     def payment(self: manager.Shipment) -> typing.Optional[PaymentType]:
@@ -1237,7 +1208,6 @@ class CarrierConnectionType:
     test_mode: bool
     credentials: utils.JSON
     capabilities: typing.List[str]
-    rate_sheet: typing.Optional[RateSheetType] = None
 
     @strawberry.field
     def metadata(self: providers.Carrier, info: Info) -> typing.Optional[utils.JSON]:
@@ -1245,12 +1215,15 @@ class CarrierConnectionType:
 
     @strawberry.field
     def config(self: providers.Carrier, info: Info) -> typing.Optional[utils.JSON]:
-        return getattr(self, "config", None)
+        return info.context.loaders.cached(
+            "carrier_config", self.pk, lambda: getattr(self, "config", None)
+        )
 
+    @strawberry.field
     def rate_sheet(
         self: providers.Carrier, info: Info
     ) -> typing.Optional[RateSheetType]:
-        return getattr(self, "rate_sheet", None)
+        return info.context.loaders.related(self, "rate_sheet")
 
     @staticmethod
     @utils.utils.error_wrapper
@@ -81,7 +81,13 @@ class AddressModelSerializer(
     class Meta:
         model = manager.Address
         extra_kwargs = {field: {"read_only": True} for field in ["id", "validation"]}
-        exclude = ["created_at", "updated_at", "created_by", "validation"]
+        exclude = [
+            "created_at",
+            "updated_at",
+            "created_by",
+            "validation",
+            "search_document",
+        ]
 
 
 @serializers.owned_model_serializer
@@ -6,3 +6,6 @@ from karrio.server.graph.tests.test_templates import *
 from karrio.server.graph.tests.test_carrier_connections import *
 from karrio.server.graph.tests.test_user_info import *
 from karrio.server.graph.tests.test_rate_sheets import *
+from karrio.server.graph.tests.test_trackers import *
+from karrio.server.graph.tests.test_shipments import *
+from karrio.server.graph.tests.test_usage import *
@@ -0,0 +1,134 @@
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from karrio.server.graph.tests.base import GraphTestCase
+import karrio.server.manager.models as manager
+import karrio.server.tracing.models as tracing
+import karrio.server.core.models as core
+
+
+class TestShipmentConnection(GraphTestCase):
+    def create_shipments(self, count: int):
+        for index in range(count):
+            parcel = manager.Parcel.objects.create(weight=1.0, created_by=self.user)
+            parcel.items.add(
+                manager.Commodity.objects.create(weight=1.0, created_by=self.user)
+            )
+            customs = manager.Customs.objects.create(
+                created_by=self.user,
+                duty_billing_address=manager.Address.objects.create(
+                    country_code="CA", created_by=self.user
+                ),
+            )
+            customs.commodities.add(
+                manager.Commodity.objects.create(weight=1.0, created_by=self.user)
+            )
+            shipment = manager.Shipment.objects.create(
+                shipper=manager.Address.objects.create(
+                    country_code="CA", created_by=self.user
+                ),
+                recipient=manager.Address.objects.create(
+                    country_code="US", created_by=self.user
+                ),
+                customs=customs,
+                created_by=self.user,
+                test_mode=False,
+                selected_rate_carrier=self.ups_carrier,
+            )
+            shipment.parcels.add(parcel)
+            manager.Tracking.objects.create(
+                tracking_number=f"1Z12345E62052779{count}{index}",
+                test_mode=False,
+                created_by=self.user,
+                tracking_carrier=self.dhl_carrier,
+                shipment=shipment,
+            )
+            log = core.APILogIndex.objects.create(
+                user=self.user,
+                path="/v1/shipments",
+                test_mode=False,
+                requested_at=timezone.now(),
+            )
+            tracing.TracingRecord.objects.create(
+                key="request",
+                record={},
+                timestamp=1.0,
+                meta=dict(request_log_id=log.id),
+                created_by=self.user,
+                test_mode=False,
+            )
+
+    def query_dashboard(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.query(DASHBOARD_QUERY, operation_name="get_dashboard")
+
+        self.assertResponseNoErrors(response)
+
+        return response.data["data"], len(queries)
+
+    def test_batch_load_connection_nodes_relations(self):
+        self.create_shipments(2)
+        _, queries = self.query_dashboard()
+        self.create_shipments(4)
+        data, page_queries = self.query_dashboard()
+
+        shipment = data["shipments"]["edges"][0]["node"]
+        tracker = data["trackers"]["edges"][0]["node"]
+        log = data["logs"]["edges"][0]["node"]
+
+        self.assertEqual(page_queries, queries)
+        self.assertEqual(len(data["shipments"]["edges"]), 6)
+        self.assertEqual(len(shipment["parcels"][0]["items"]), 1)
+        self.assertEqual(len(shipment["customs"]["commodities"]), 1)
+        self.assertIsNotNone(shipment["customs"]["duty_billing_address"])
+        self.assertEqual(
+            shipment["tracker"]["tracking_carrier"]["carrier_name"], "dhl_universal"
+        )
+        self.assertEqual(shipment["selected_rate_carrier"]["carrier_name"], "ups")
+        self.assertEqual(shipment["shipper"]["created_by"]["email"], self.user.email)
+        self.assertIsNotNone(tracker["shipment"]["id"])
+        self.assertEqual(len(log["records"]), 1)
+
+
+DASHBOARD_QUERY = """
+  query get_dashboard {
+    shipments(filter: { first: 20 }) {
+      edges {
+        node {
+          id
+          carrier_name
+          created_by { email }
+          shipper { id created_by { email } }
+          recipient { id created_by { email } }
+          parcels { id created_by { email } items { id created_by { email } } }
+          customs {
+            id
+            duty_billing_address { id }
+            commodities { id }
+          }
+          tracker { id tracking_carrier { id carrier_name } }
+          selected_rate_carrier { id carrier_name config rate_sheet { id } }
+        }
+      }
+    }
+    trackers(filter: { first: 20 }) {
+      edges {
+        node {
+          id
+          carrier_name
+          created_by { email }
+          shipment { id }
+        }
+      }
+    }
+    logs(filter: { first: 20 }) {
+      edges {
+        node {
+          id
+          user { email }
+          records { id created_by { email } }
+        }
+      }
+    }
+  }
+"""
@@ -0,0 +1,82 @@
+from karrio.server.graph.tests.base import GraphTestCase
+import karrio.server.manager.models as manager
+
+
+class TestTrackerConnection(GraphTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.trackers = [
+            manager.Tracking.objects.create(
+                tracking_number=f"0034043429213510012{index}",
+                test_mode=False,
+                created_by=self.user,
+                tracking_carrier=self.dhl_carrier,
+            )
+            for index in range(5)
+        ]
+
+    def test_paginate_trackers_with_cursors(self):
+        expected = list(
+            manager.Tracking.objects.order_by("-created_at", "-pk").values_list(
+                "pk", flat=True
+            )
+        )
+        first_page = self.query(
+            TRACKERS_QUERY,
+            operation_name="get_trackers",
+            variables=dict(filter=dict(first=3)),
+        ).data["data"]["trackers"]
+        second_page = self.query(
+            TRACKERS_QUERY,
+            operation_name="get_trackers",
+            variables=dict(
+                filter=dict(first=3, after=first_page["page_info"]["end_cursor"])
+            ),
+        ).data["data"]["trackers"]
+        previous_page = self.query(
+            TRACKERS_QUERY,
+            operation_name="get_trackers",
+            variables=dict(
+                filter=dict(last=2, before=second_page["page_info"]["start_cursor"])
+            ),
+        ).data["data"]["trackers"]
+
+        self.assertListEqual(
+            [_["node"]["id"] for _ in first_page["edges"]], expected[:3]
+        )
+        self.assertListEqual(
+            [_["node"]["id"] for _ in second_page["edges"]], expected[3:]
+        )
+        self.assertListEqual(
+            [_["node"]["id"] for _ in previous_page["edges"]], expected[1:3]
+        )
+        self.assertDictEqual(
+            {**second_page["page_info"], "start_cursor": None, "end_cursor": None},
+            {
+                "count": 5,
+                "has_next_page": False,
+                "has_previous_page": True,
+                "start_cursor": None,
+                "end_cursor": None,
+            },
+        )
+
+
+TRACKERS_QUERY = """
+  query get_trackers($filter: TrackerFilter) {
+    trackers(filter: $filter) {
+      page_info {
+        count
+        has_next_page
+        has_previous_page
+        start_cursor
+        end_cursor
+      }
+      edges {
+        node {
+          id
+        }
+      }
+    }
+  }
+"""
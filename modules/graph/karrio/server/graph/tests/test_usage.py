@@ -0,0 +1,82 @@
+import io
+import datetime
+from django.utils import timezone
+from django.core.management import call_command
+from karrio.server.graph.tests.base import GraphTestCase
+import karrio.server.manager.models as manager
+import karrio.server.graph.models as graph
+import karrio.server.graph.usage as usage
+
+
+class TestSystemUsage(GraphTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        for index, status in enumerate(["purchased", "delivered", "cancelled"]):
+            address = dict(country_code="CA", created_by=self.user)
+            manager.Shipment.objects.create(
+                shipper=manager.Address.objects.create(**address),
+                recipient=manager.Address.objects.create(**address),
+                created_by=self.user,
+                test_mode=False,
+                status=status,
+                selected_rate=dict(total_charge=10.5, currency="CAD"),
+            )
+            manager.Tracking.objects.create(
+                tracking_number=f"1Z12345E620527790{index}",
+                test_mode=index > 0,
+                created_by=self.user,
+                tracking_carrier=self.dhl_carrier,
+            )
+
+    def test_query_system_usage_rollups(self):
+        usage.refresh_recent_usage_stats()
+
+        response = self.query(USAGE_QUERY, operation_name="get_system_usage")
+        response_data = response.data["data"]["system_usage"]
+
+        self.assertResponseNoErrors(response)
+        self.assertDictEqual(
+            {**response_data, "shipment_count": len(response_data["shipment_count"])},
+            {
+                "total_shipments": 3,
+                "total_trackers": 1,
+                "total_shipping_spend": 21.0,
+                "shipment_count": 1,
+            },
+        )
+
+    def test_backfill_usage_stats(self):
+        past = timezone.now() - datetime.timedelta(days=40)
+        manager.Shipment.objects.update(created_at=past)
+
+        call_command(
+            "backfill_usage_stats", days=60, chunk_days=7, stdout=io.StringIO()
+        )
+
+        self.assertListEqual(
+            list(
+                graph.UsageStat.objects.filter(test_mode=False)
+                .order_by("date", "metric")
+                .values_list("metric", "date", "value")
+            ),
+            [
+                ("shipment_count", timezone.localtime(past).date(), 3.0),
+                ("shipping_spend", timezone.localtime(past).date(), 21.0),
+                ("tracker_count", timezone.localdate(), 1.0),
+            ],
+        )
+
+
+USAGE_QUERY = """
+  query get_system_usage {
+    system_usage {
+      total_shipments
+      total_trackers
+      total_shipping_spend
+      shipment_count {
+        date
+        count
+      }
+    }
+  }
+"""
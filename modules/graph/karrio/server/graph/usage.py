@@ -0,0 +1,175 @@
+"""Daily usage statistics rollups.
+
+The system usage dashboard reads `UsageStat` daily rows instead of
+aggregating the API logs, orders, shipments and trackers tables on every load.
+The last `USAGE_STATS_REFRESH_DAYS` days are recomputed by a periodic task
+and older days are computed once with the `backfill_usage_stats` command.
+"""
+
+import typing
+import logging
+import datetime
+import django.forms as forms
+import django.db.models as models
+import django.db.transaction as transaction
+import django.db.models.functions as functions
+from django.conf import settings
+from django.utils import timezone
+
+import karrio.server.core.models as core
+import karrio.server.graph.models as graph
+import karrio.server.orders.models as orders
+import karrio.server.manager.models as manager
+
+logger = logging.getLogger(__name__)
+USAGE_STATS_REFRESH_DAYS = int(getattr(settings, "USAGE_STATS_REFRESH_DAYS", 3))
+METRICS = [
+    "api_requests",
+    "api_errors",
+    "order_volumes",
+    "shipment_count",
+    "shipping_spend",
+    "tracker_count",
+]
+
+
+def metric_querysets(
+    start: datetime.datetime, end: datetime.datetime
+) -> typing.Dict[str, models.QuerySet]:
+    """Return the daily `(date, test_mode, count)` aggregation of each metric."""
+    api_logs = core.APILogIndex.objects.filter(
+        requested_at__gte=start, requested_at__lt=end, test_mode__isnull=False
+    )
+
+    return dict(
+        api_requests=_daily(api_logs, "requested_at", models.Count("id")),
+        api_errors=_daily(
+            api_logs.filter(status_code__range=[400, 599]),
+            "requested_at",
+            models.Count("id"),
+        ),
+        order_volumes=_daily(
+            orders.Order.objects.filter(
+                created_at__gte=start, created_at__lt=end
+            ).exclude(status__in=["cancelled", "unfulfilled"]),
+            "created_at",
+            models.Sum(
+                models.F("line_items__value_amount") * models.F("line_items__quantity")
+            ),
+        ),
+        shipment_count=_daily(
+            manager.Shipment.objects.filter(created_at__gte=start, created_at__lt=end),
+            "created_at",
+            models.Count("id"),
+        ),
+        shipping_spend=_daily(
+            manager.Shipment.objects.filter(
+                created_at__gte=start, created_at__lt=end
+            ).exclude(status__in=["cancelled", "draft"]),
+            "created_at",
+            models.Sum(
+                functions.Cast("selected_rate__total_charge", models.FloatField())
+            ),
+        ),
+        tracker_count=_daily(
+            manager.Tracking.objects.filter(created_at__gte=start, created_at__lt=end),
+            "created_at",
+            models.Count("id"),
+        ),
+    )
+
+
+def refresh_usage_stats(
+    date_after: datetime.date, date_before: typing.Optional[datetime.date] = None
+) -> int:
+    """Recompute the usage stats rows of the days between the given dates (inclusive)."""
+    date_before = date_before or timezone.localdate()
+    start = _day_start(date_after)
+    end = _day_start(date_before + datetime.timedelta(days=1))
+    stats = [
+        graph.UsageStat(
+            metric=metric,
+            date=timezone.localtime(row["date"]).date(),
+            test_mode=row["test_mode"],
+            value=row["count"] or 0,
+        )
+        for metric, queryset in metric_querysets(start, end).items()
+        for row in queryset
+    ]
+
+    with transaction.atomic():
+        graph.UsageStat.objects.filter(
+            date__gte=date_after, date__lte=date_before
+        ).delete()
+        graph.UsageStat.objects.bulk_create(stats, batch_size=1000)
+
+    logger.info(
+        f"> usage stats refreshed from {date_after} to {date_before} ({len(stats)} rows)"
+    )
+
+    return len(stats)
+
+
+def refresh_recent_usage_stats() -> int:
+    today = timezone.localdate()
+
+    return refresh_usage_stats(
+        today - datetime.timedelta(days=USAGE_STATS_REFRESH_DAYS - 1), today
+    )
+
+
+def backfill_usage_stats(
+    date_after: datetime.date,
+    date_before: typing.Optional[datetime.date] = None,
+    chunk_days: int = 30,
+) -> int:
+    """Compute the usage stats of a date range by chunks of days."""
+    date_before = date_before or timezone.localdate()
+    count = 0
+
+    while date_after <= date_before:
+        chunk_end = min(
+            date_after + datetime.timedelta(days=chunk_days - 1), date_before
+        )
+        count += refresh_usage_stats(date_after, chunk_end)
+        date_after = chunk_end + datetime.timedelta(days=1)
+
+    return count
+
+
+def usage_stats(
+    date_after: typing.Any, date_before: typing.Any, test_mode: bool
+) -> typing.Dict[str, typing.List[dict]]:
+    """Return the `{date, count}` daily stats of each metric (most recent first)."""
+    stats: typing.Dict[str, typing.List[dict]] = {metric: [] for metric in METRICS}
+    rows = graph.UsageStat.objects.filter(
+        test_mode=test_mode,
+        date__gte=_to_date(date_after),
+        date__lte=_to_date(date_before),
+    ).values_list("metric", "date", "value")
+
+    for metric, date, value in rows.order_by("-date"):
+        stats.setdefault(metric, []).append(dict(date=_day_start(date), count=value))
+
+    return stats
+
+
+def _daily(queryset: models.QuerySet, field: str, aggregate) -> models.QuerySet:
+    return (
+        queryset.annotate(date=functions.TruncDay(field))
+        .values("date", "test_mode")
+        .annotate(count=aggregate)
+        .order_by("-date")
+    )
+
+
+def _day_start(date: datetime.date) -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+
+def _to_date(value: typing.Any) -> datetime.date:
+    value = forms.DateTimeField().to_python(value)
+
+    return (
+        timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    )
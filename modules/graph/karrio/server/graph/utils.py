@@ -1,5 +1,4 @@
 import typing
-import base64
 import logging
 import functools
 import strawberry
@@ -11,6 +10,8 @@ from karrio.server.core.utils import *
 import karrio.lib as lib
 import karrio.server.core.utils as utils
 import karrio.server.core.models as core
+import karrio.server.core.pagination as pagination
+import karrio.server.graph.loaders as loaders
 import karrio.server.orders.models as orders
 import karrio.server.manager.models as manager
 import karrio.server.providers.models as providers
@@ -216,11 +217,16 @@ class PageInfo:
         - https://relay.dev/graphql/connections.htm
     """
 
-    count: int
     has_next_page: bool
     has_previous_page: bool
     start_cursor: typing.Optional[str]
     end_cursor: typing.Optional[str]
+    queryset: strawberry.Private[typing.Any] = None
+
+    @strawberry.field
+    def count(self) -> int:
+        # only counted when requested (see `pagination.count_queryset`).
+        return pagination.count_queryset(self.queryset)
 
 
 @dataclasses.dataclass
@@ -236,42 +242,45 @@ class Edge(typing.Generic[GenericType]):
 class Paginated(BaseInput):
     offset: typing.Optional[int] = strawberry.UNSET
     first: typing.Optional[int] = strawberry.UNSET
-
-
-def build_entity_cursor(entity: T):
-    """Adapt this method to build an *opaque* ID from an instance"""
-    entityid = f"{getattr(entity, 'id', id(entity))}".encode("utf-8")
-    return base64.b64encode(entityid).decode()
+    after: typing.Optional[str] = strawberry.UNSET
+    before: typing.Optional[str] = strawberry.UNSET
+    last: typing.Optional[int] = strawberry.UNSET
 
 
 def paginated_connection(
     queryset,
     first: int = 25,
     offset: int = 0,
+    after: typing.Optional[str] = None,
+    before: typing.Optional[str] = None,
+    last: typing.Optional[int] = None,
 ) -> Connection[T]:
-    """A non-trivial implementation should efficiently fetch only
-    the necessary books after the offset.
-    For simplicity, here we build the list and then slice it accordingly
+    """Return a page of the queryset.
+    Querysets ordered by `created_at` are paginated with `(created_at, id)`
+    keyset cursors (see `karrio.server.core.pagination`).
+    The page nodes are registered as peers for the batch loaders.
     """
+    page = pagination.paginate(
+        queryset,
+        first=first,
+        offset=offset,
+        after=after,
+        before=before,
+        last=last,
+    )
 
-    # Fetch the requested results plus one, just to calculate `has_next_page`
-    # fmt: off
-    results = queryset[offset:offset+first+1]
-    # fmt: on
-
-    edges: typing.List[typing.Any] = [
-        Edge(node=typing.cast(T, entity), cursor=build_entity_cursor(entity))
-        for entity in results
-    ]
     return Connection(
         page_info=PageInfo(
-            count=queryset.count(),
-            has_previous_page=False,
-            has_next_page=len(results) > first,
-            start_cursor=edges[0].cursor if edges else None,
-            end_cursor=edges[-2].cursor if len(edges) > 1 else None,
+            has_previous_page=page.has_previous_page,
+            has_next_page=page.has_next_page,
+            start_cursor=page.start_cursor,
+            end_cursor=page.end_cursor,
+            queryset=queryset,
         ),
-        edges=(edges[:-1] if len(edges) > first else edges),
+        edges=[
+            Edge(node=typing.cast(T, entity), cursor=cursor)
+            for entity, cursor in zip(loaders.register(page.items), page.cursors)
+        ],
     )
 
 
@@ -17,6 +17,7 @@ import strawberry.http as http
 import karrio.lib as lib
 import karrio.server.conf as conf
 import karrio.server.graph.schema as schema
+import karrio.server.graph.loaders as loaders
 
 logger = logging.getLogger(__name__)
 ACCESS_METHOD = getattr(
@@ -40,6 +41,9 @@ class GraphQLView(AccessMixin, views.GraphQLView):
 
         return super().dispatch(request, *args, **kwargs)
 
+    def get_context(self, request, response) -> loaders.Context:
+        return loaders.Context(request=request, response=response)
+
     def process_result(
         self, request, result: types.ExecutionResult
     ) -> http.GraphQLHTTPResponse:
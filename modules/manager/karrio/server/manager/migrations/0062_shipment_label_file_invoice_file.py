@@ -0,0 +1,52 @@
+from django.db import migrations, models
+
+import karrio.server.core.storage as storage
+
+BATCH_SIZE = 200
+
+
+def forwards_func(apps, schema_editor):
+    # the inline columns are kept (and dropped by a later migration) so this
+    # backfill can be reversed and re-run without losing documents.
+    db_alias = schema_editor.connection.alias
+    Shipment = apps.get_model("manager", "Shipment")
+    queryset = (
+        Shipment.objects.using(db_alias)
+        .filter(models.Q(label__isnull=False) | models.Q(invoice__isnull=False))
+        .only("id", "label", "invoice")
+    )
+    batch = []
+
+    for shipment in queryset.iterator(chunk_size=BATCH_SIZE):
+        shipment.label_file = storage.save_document(shipment.label)
+        shipment.invoice_file = storage.save_document(shipment.invoice)
+        batch.append(shipment)
+
+        if len(batch) >= BATCH_SIZE:
+            Shipment.objects.using(db_alias).bulk_update(
+                batch, ["label_file", "invoice_file"]
+            )
+            batch = []
+
+    Shipment.objects.using(db_alias).bulk_update(batch, ["label_file", "invoice_file"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manager", "0061_alter_customs_incoterm"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shipment",
+            name="label_file",
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name="shipment",
+            name="invoice_file",
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.RunPython(forwards_func, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.16 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manager", "0062_shipment_label_file_invoice_file"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="shipment",
+            index=models.Index(
+                fields=["created_at", "id"], name="shipment_created_at_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tracking",
+            index=models.Index(
+                fields=["created_at", "id"], name="tracking_created_at_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.16 on 2026-10-18 17:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manager", "0063_tracking_shipment_created_at_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tracking",
+            name="next_check_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="tracking",
+            index=models.Index(
+                condition=models.Q(("delivered", False)),
+                fields=["next_check_at"],
+                name="tracking_next_check_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:10
+
+from django.db import migrations
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+    # the indexes are built concurrently out of a transaction
+    atomic = False
+
+    dependencies = [
+        ("manager", "0064_tracking_next_check_at"),
+    ]
+
+    operations = []
+
+    if "postgres" in settings.DB_ENGINE:
+        operations = [
+            migrations.RunSQL(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS "shipment_metadata_gin_idx" '
+                'ON "shipment" USING gin ("metadata")',
+                reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "shipment_metadata_gin_idx"',
+            ),
+            migrations.RunSQL(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS "shipment_meta_gin_idx" '
+                'ON "shipment" USING gin ("meta")',
+                reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "shipment_meta_gin_idx"',
+            ),
+            migrations.RunSQL(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS "shipment_options_gin_idx" '
+                'ON "shipment" USING gin ("options")',
+                reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "shipment_options_gin_idx"',
+            ),
+        ]
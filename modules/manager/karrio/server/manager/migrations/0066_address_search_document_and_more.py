@@ -0,0 +1,104 @@
+# Generated by Django 4.2.16 on 2026-10-18 21:05
+
+from django.db import migrations, models
+from django.db.models.functions import Concat
+
+BATCH_SIZE = 1000
+
+
+def update_in_batches(queryset, **values):
+    # the rows are updated by batches of primary keys to keep each statement short.
+    ids = queryset.order_by("pk").values_list("pk", flat=True)
+    batch = []
+
+    for pk in ids.iterator(chunk_size=BATCH_SIZE):
+        batch.append(pk)
+
+        if len(batch) >= BATCH_SIZE:
+            queryset.filter(pk__in=batch).update(**values)
+            batch = []
+
+    if batch:
+        queryset.filter(pk__in=batch).update(**values)
+
+
+def compute_search_documents(apps, schema_editor):
+    Address = apps.get_model("manager", "Address")
+    Shipment = apps.get_model("manager", "Shipment")
+    Tracking = apps.get_model("manager", "Tracking")
+    db_alias = schema_editor.connection.alias
+
+    def _document(*fields):
+        values = []
+
+        for field in fields:
+            values += [models.Value("\n"), field] if any(values) else [field]
+
+        return Concat(*values, output_field=models.TextField())
+
+    update_in_batches(
+        Address.objects.using(db_alias),
+        search_document=_document(
+            *[
+                models.F(field)
+                for field in [
+                    "address_line1",
+                    "address_line2",
+                    "postal_code",
+                    "person_name",
+                    "company_name",
+                    "country_code",
+                    "city",
+                    "email",
+                    "phone_number",
+                ]
+            ]
+        ),
+    )
+    update_in_batches(
+        Shipment.objects.using(db_alias),
+        search_document=_document(
+            models.F("id"),
+            models.F("reference"),
+            models.F("tracking_number"),
+            models.Subquery(
+                Address.objects.using(db_alias)
+                .filter(pk=models.OuterRef("recipient_id"))
+                .values("search_document")[:1]
+            ),
+        ),
+    )
+    update_in_batches(
+        Tracking.objects.using(db_alias),
+        search_document=_document(
+            models.F("id"),
+            models.F("tracking_number"),
+            models.F("reference"),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manager", "0065_shipment_json_gin_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="address",
+            name="search_document",
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="shipment",
+            name="search_document",
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="tracking",
+            name="search_document",
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(compute_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,80 @@
+from django.db import migrations, models
+
+import karrio.server.core.storage as storage
+
+BATCH_SIZE = 200
+
+
+def forwards_func(apps, schema_editor):
+    # store the documents of any row left behind by the 0062 backfill.
+    db_alias = schema_editor.connection.alias
+    Shipment = apps.get_model("manager", "Shipment")
+    queryset = (
+        Shipment.objects.using(db_alias)
+        .filter(
+            models.Q(label__isnull=False, label_file__isnull=True)
+            | models.Q(invoice__isnull=False, invoice_file__isnull=True)
+        )
+        .only("id", "label", "invoice", "label_file", "invoice_file")
+    )
+    batch = []
+
+    for shipment in queryset.iterator(chunk_size=BATCH_SIZE):
+        shipment.label_file = shipment.label_file or storage.save_document(
+            shipment.label
+        )
+        shipment.invoice_file = shipment.invoice_file or storage.save_document(
+            shipment.invoice
+        )
+        batch.append(shipment)
+
+        if len(batch) >= BATCH_SIZE:
+            Shipment.objects.using(db_alias).bulk_update(
+                batch, ["label_file", "invoice_file"]
+            )
+            batch = []
+
+    Shipment.objects.using(db_alias).bulk_update(batch, ["label_file", "invoice_file"])
+
+
+def reverse_func(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Shipment = apps.get_model("manager", "Shipment")
+    queryset = (
+        Shipment.objects.using(db_alias)
+        .filter(
+            models.Q(label_file__isnull=False) | models.Q(invoice_file__isnull=False)
+        )
+        .only("id", "label_file", "invoice_file")
+    )
+    batch = []
+
+    for shipment in queryset.iterator(chunk_size=BATCH_SIZE):
+        shipment.label = storage.load_document(shipment.label_file)
+        shipment.invoice = storage.load_document(shipment.invoice_file)
+        batch.append(shipment)
+
+        if len(batch) >= BATCH_SIZE:
+            Shipment.objects.using(db_alias).bulk_update(batch, ["label", "invoice"])
+            batch = []
+
+    Shipment.objects.using(db_alias).bulk_update(batch, ["label", "invoice"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manager", "0066_address_search_document_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards_func, reverse_func),
+        migrations.RemoveField(
+            model_name="shipment",
+            name="label",
+        ),
+        migrations.RemoveField(
+            model_name="shipment",
+            name="invoice",
+        ),
+    ]
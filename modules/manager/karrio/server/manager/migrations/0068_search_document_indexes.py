@@ -0,0 +1,45 @@
+# Generated by Django 4.2.16 on 2026-10-18 21:05
+
+from django.db import migrations
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+    # the indexes are built concurrently out of a transaction
+    atomic = False
+
+    dependencies = [
+        ("manager", "0067_remove_shipment_label_invoice"),
+    ]
+
+    operations = []
+
+    if "postgres" in settings.DB_ENGINE:
+        operations = [
+            migrations.RunSQL(
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+                reverse_sql=migrations.RunSQL.noop,
+            ),
+            *[
+                migrations.RunSQL(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+                    f'ON "{table}" USING gin ({expression})',
+                    reverse_sql=f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"',
+                )
+                for table, prefix in [
+                    ("address", "address"),
+                    ("shipment", "shipment"),
+                    ("tracking-status", "tracking"),
+                ]
+                for name, expression in [
+                    (
+                        f"{prefix}_search_fts_idx",
+                        "to_tsvector('simple', \"search_document\")",
+                    ),
+                    (
+                        f"{prefix}_search_trgm_idx",
+                        '"search_document" gin_trgm_ops',
+                    ),
+                ]
+            ],
+        ]
@@ -3,10 +3,12 @@ import functools
 import django.conf as conf
 import django.urls as urls
 import django.db.models as models
+import django.db.transaction as transaction
 import django.db.models.fields as fields
 
 import karrio.server.core.utils as utils
 import karrio.server.core.models as core
+import karrio.server.core.storage as storage
 import karrio.server.providers.models as providers
 import karrio.server.core.serializers as serializers
 
@@ -115,7 +117,18 @@ class ManifestManager(models.Manager):
 
 
 @core.register_model
-class Address(core.OwnedEntity):
+class Address(core.OwnedEntity, core.SearchableEntity):
+    SEARCH_FIELDS = [
+        "address_line1",
+        "address_line2",
+        "postal_code",
+        "person_name",
+        "company_name",
+        "country_code",
+        "city",
+        "email",
+        "phone_number",
+    ]
     HIDDEN_PROPS = (
         "shipper_shipment",
         "recipient_shipment",
@@ -520,7 +533,8 @@ class Pickup(core.OwnedEntity):
 
 
 @core.register_model
-class Tracking(core.OwnedEntity):
+class Tracking(core.OwnedEntity, core.SearchableEntity):
+    SEARCH_FIELDS = ["id", "tracking_number", "reference"]
     DIRECT_PROPS = [
         "metadata",
         "info",
@@ -536,6 +550,14 @@ class Tracking(core.OwnedEntity):
         verbose_name = "Tracking Status"
         verbose_name_plural = "Tracking Statuses"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="tracking_created_at_idx"),
+            models.Index(
+                fields=["next_check_at"],
+                condition=models.Q(delivered=False),
+                name="tracking_next_check_idx",
+            ),
+        ]
 
     id = models.CharField(
         max_length=50,
@@ -561,6 +583,7 @@ class Tracking(core.OwnedEntity):
     )
     delivered = models.BooleanField(blank=True, null=True, default=False)
     estimated_delivery = models.DateField(null=True, blank=True)
+    next_check_at = models.DateTimeField(null=True, blank=True, editable=False)
     test_mode = models.BooleanField(null=False)
     messages = models.JSONField(
         blank=True, null=True, default=functools.partial(utils.identity, value=[])
@@ -627,7 +650,13 @@ class Tracking(core.OwnedEntity):
 
 
 @core.register_model
-class Shipment(core.OwnedEntity):
+class Shipment(core.OwnedEntity, core.SearchableEntity):
+    SEARCH_FIELDS = [
+        "id",
+        "reference",
+        "tracking_number",
+        "recipient__search_document",
+    ]
     DIRECT_PROPS = [
         "options",
         "services",
@@ -656,8 +685,8 @@ class Shipment(core.OwnedEntity):
     ]
     HIDDEN_PROPS = (
         "carriers",
-        "label",
-        "invoice",
+        "label_file",
+        "invoice_file",
         "shipment_pickup",
         "shipment_tracker",
         "selected_rate_carrier",
@@ -676,6 +705,7 @@ class Shipment(core.OwnedEntity):
                 condition=models.Q(meta__object_id__isnull=False),
                 name="shipment_service_idx",
             ),
+            models.Index(fields=["created_at", "id"], name="shipment_created_at_idx"),
         ]
 
     id = models.CharField(
@@ -724,8 +754,8 @@ class Shipment(core.OwnedEntity):
         related_name="customs_shipment",
     )
 
-    label = models.TextField(max_length=None, null=True, blank=True)
-    invoice = models.TextField(max_length=None, null=True, blank=True)
+    label_file = models.CharField(max_length=100, null=True, blank=True)
+    invoice_file = models.CharField(max_length=100, null=True, blank=True)
     reference = models.CharField(max_length=35, null=True, blank=True)
     selected_rate = models.JSONField(blank=True, null=True)
     payment = models.JSONField(
@@ -821,9 +851,50 @@ class Shipment(core.OwnedEntity):
 
         return None
 
+    @property
+    def label(self) -> typing.Optional[str]:
+        return self._load_document("label_file")
+
+    @label.setter
+    def label(self, value: typing.Optional[str]):
+        self._save_document("label_file", value)
+
+    @property
+    def invoice(self) -> typing.Optional[str]:
+        return self._load_document("invoice_file")
+
+    @invoice.setter
+    def invoice(self, value: typing.Optional[str]):
+        self._save_document("invoice_file", value)
+
+    def _save_document(self, field: str, value: typing.Optional[str]):
+        # the document is written to the store once the transaction commits and
+        # the replaced one is deleted if no other row references it anymore.
+        previous = getattr(self, field)
+        reference = storage.save_document(value, on_commit=True)
+
+        setattr(self, field, reference)
+        self.__dict__[f"_{field}"] = (reference, value)
+
+        if previous is not None and previous != reference:
+            transaction.on_commit(
+                functools.partial(storage.release_document, previous), robust=True
+            )
+
+    def _load_document(self, field: str) -> typing.Optional[str]:
+        # the documents are fetched from the store once per reference.
+        reference = getattr(self, field)
+        cached = self.__dict__.get(f"_{field}")
+
+        if cached is None or cached[0] != reference:
+            cached = (reference, storage.load_document(reference))
+            self.__dict__[f"_{field}"] = cached
+
+        return cached[1]
+
     @property
     def label_url(self) -> str:
-        if self.label is None:
+        if self.label_file is None:
             return None
 
         return urls.reverse(
@@ -835,7 +906,7 @@ class Shipment(core.OwnedEntity):
 
     @property
     def invoice_url(self) -> str:
-        if self.invoice is None:
+        if self.invoice_file is None:
             return None
 
         return urls.reverse(
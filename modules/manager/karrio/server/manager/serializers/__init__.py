@@ -21,6 +21,7 @@ from karrio.server.manager.serializers.tracking import (
     TrackingSerializer,
     TrackerUpdateData,
     update_shipment_tracker,
+    compute_shipment_status,
     can_mutate_tracker,
 )
 from karrio.server.manager.serializers.shipment import (
@@ -253,8 +253,8 @@ class ShipmentSerializer(ShipmentData):
             )
 
         if "docs" in validated_data:
-            changes.append("label")
-            changes.append("invoice")
+            changes.append("label_file")
+            changes.append("invoice_file")
             instance.label = validated_data["docs"].get("label") or instance.label
             instance.invoice = validated_data["docs"].get("invoice") or instance.invoice
 
@@ -849,7 +849,7 @@ def generate_custom_invoice(template: str, shipment: models.Shipment, **kwargs):
 
     if getattr(shipment, "tracking_number", None) is not None:
         shipment.invoice = document["doc_file"]
-        shipment.save(update_fields=["invoice"])
+        shipment.save(update_fields=["invoice_file"])
 
     logger.info("> custom document successfully generated.")
 
@@ -227,24 +227,29 @@ def can_mutate_tracker(
 
 def update_shipment_tracker(tracker: models.Tracking):
     try:
-        if tracker.status == TrackerStatus.delivered.value:
-            status = ShipmentStatus.delivered.value
-        elif tracker.status == TrackerStatus.pending.value:
-            status = tracker.shipment.status
-        elif tracker.status == TrackerStatus.out_for_delivery.value:
-            status = ShipmentStatus.out_for_delivery.value
-        elif tracker.status == TrackerStatus.delivery_failed.value:
-            status = ShipmentStatus.delivery_failed.value
-        elif tracker.status in [
-            TrackerStatus.on_hold.value,
-            TrackerStatus.delivery_delayed.value,
-        ]:
-            status = ShipmentStatus.needs_attention.value
-        else:
-            status = ShipmentStatus.in_transit.value
+        status = compute_shipment_status(tracker)
 
         if tracker.shipment is not None and tracker.shipment.status != status:
             tracker.shipment.status = status
             tracker.shipment.save(update_fields=["status"])
     except Exception as e:
         logger.exception("Failed to update the tracked shipment", e)
+
+
+def compute_shipment_status(tracker: models.Tracking) -> str:
+    """Return the status of a tracked shipment given its tracker status."""
+    if tracker.status == TrackerStatus.delivered.value:
+        return ShipmentStatus.delivered.value
+    elif tracker.status == TrackerStatus.pending.value:
+        return tracker.shipment.status
+    elif tracker.status == TrackerStatus.out_for_delivery.value:
+        return ShipmentStatus.out_for_delivery.value
+    elif tracker.status == TrackerStatus.delivery_failed.value:
+        return ShipmentStatus.delivery_failed.value
+    elif tracker.status in [
+        TrackerStatus.on_hold.value,
+        TrackerStatus.delivery_delayed.value,
+    ]:
+        return ShipmentStatus.needs_attention.value
+
+    return ShipmentStatus.in_transit.value
@@ -1,7 +1,11 @@
 import logging
+import functools
+from django.db import transaction
 from django.db.models import signals
 
 from karrio.server.core import utils
+import karrio.server.core.storage as storage
+import karrio.server.core.signals as core_signals
 import karrio.server.manager.models as models
 import karrio.server.manager.serializers as serializers
 
@@ -28,8 +32,13 @@ RATE_RELATED_CHANGES = [
 
 def register_signals():
     signals.post_save.connect(address_updated, sender=models.Address)
+
+    for model in [models.Address, models.Shipment, models.Tracking]:
+        signals.pre_save.connect(core_signals.search_document_saving, sender=model)
+        signals.post_save.connect(core_signals.search_document_saved, sender=model)
     signals.post_save.connect(parcel_updated, sender=models.Parcel)
     signals.post_delete.connect(parcel_deleted, sender=models.Parcel)
+    signals.post_delete.connect(shipment_deleted, sender=models.Shipment)
 
     logger.info("karrio.manager signals registered...")
 
@@ -44,6 +53,13 @@ def address_updated(
     if any([change in RATE_RELATED_CHANGES for change in changes]):
         serializers.reset_related_shipment_rates(instance.shipment)
 
+    # the shipment search document includes its recipient address document
+    if getattr(instance, "_search_document_changed", False):
+        shipment = utils.failsafe(lambda: instance.recipient_shipment)
+
+        if shipment is not None:
+            shipment.update_search_document()
+
 
 @utils.disable_for_loaddata
 def parcel_updated(
@@ -68,3 +84,12 @@ def parcel_updated(
 def parcel_deleted(sender, instance, *args, **kwargs):
     """ """
     serializers.reset_related_shipment_rates(instance.shipment)
+
+
+def shipment_deleted(sender, instance, *args, **kwargs):
+    """Delete the shipment documents no other row references once deleted."""
+    for reference in [instance.label_file, instance.invoice_file]:
+        if reference is not None:
+            transaction.on_commit(
+                functools.partial(storage.release_document, reference), robust=True
+            )
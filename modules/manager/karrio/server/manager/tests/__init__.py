@@ -8,3 +8,4 @@ from karrio.server.manager.tests.test_shipments import *
 from karrio.server.manager.tests.test_trackers import *
 from karrio.server.manager.tests.test_custom_infos import *
 from karrio.server.manager.tests.test_pickups import *
+from karrio.server.manager.tests.test_request_logs import *
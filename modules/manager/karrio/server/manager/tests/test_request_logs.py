@@ -0,0 +1,103 @@
+import json
+from unittest.mock import patch
+from django.urls import reverse
+from rest_framework import status
+from django.test import override_settings
+from karrio.server.core.tests import APITestCase
+from karrio.server.core.models import APILogIndex
+import karrio.server.core.request_logs as request_logs
+
+ADDRESS_DATA = {
+    "address_line1": "5205 rue riviera",
+    "person_name": "Old town Daniel",
+    "city": "Montreal",
+    "country_code": "CA",
+    "postal_code": "H8Z2Z3",
+    "state_code": "QC",
+}
+
+
+@override_settings(
+    API_LOGS_BUFFERING=True,
+    API_LOGS_BATCH_SIZE=100,
+    API_LOGS_FLUSH_INTERVAL=0,
+)
+class TestBufferedRequestLogs(APITestCase):
+    def test_buffer_request_logs_until_flush(self):
+        url = reverse("karrio.server.manager:address-list")
+
+        for _ in range(3):
+            response = self.client.post(url, ADDRESS_DATA)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertFalse(APILogIndex.objects.filter(path=url).exists())
+        self.assertEqual(request_logs.buffer.flush(), 3)
+        self.assertEqual(APILogIndex.objects.filter(path=url).count(), 3)
+        self.assertSetEqual(
+            set(APILogIndex.objects.filter(path=url).values_list("user", flat=True)),
+            {self.user.id},
+        )
+
+    @override_settings(API_LOGS_MAX_BODY_SIZE=20)
+    def test_truncate_large_bodies(self):
+        url = reverse("karrio.server.manager:address-list")
+
+        self.client.post(url, ADDRESS_DATA)
+        request_logs.buffer.flush()
+
+        log = APILogIndex.objects.get(path=url)
+        response = json.loads(log.response)
+
+        self.assertTrue(response["truncated"])
+        self.assertEqual(len(response["preview"]), 20)
+        self.assertEqual(len(response["sha256"]), 64)
+
+    @override_settings(API_LOGS_SAMPLING={"/v1/addresses": 0})
+    def test_sample_successful_requests(self):
+        url = reverse("karrio.server.manager:address-list")
+
+        self.client.post(url, ADDRESS_DATA)
+        self.client.post(url, {})
+        request_logs.buffer.flush()
+
+        self.assertListEqual(
+            list(
+                APILogIndex.objects.filter(path=url).values_list(
+                    "status_code", flat=True
+                )
+            ),
+            [status.HTTP_400_BAD_REQUEST],
+        )
+
+    def test_save_logs_one_by_one_when_the_batch_fails(self):
+        url = reverse("karrio.server.manager:address-list")
+        save_logs = request_logs._save_logs
+
+        def failing_batch(entries, **kwargs):
+            if len(entries) > 1:
+                raise Exception("batch insert failed")
+
+            return save_logs(entries, **kwargs)
+
+        for _ in range(3):
+            self.client.post(url, ADDRESS_DATA)
+
+        with patch.object(request_logs, "_save_logs", side_effect=failing_batch):
+            self.assertEqual(request_logs.buffer.flush(), 3)
+
+        self.assertEqual(APILogIndex.objects.filter(path=url).count(), 3)
+        self.assertEqual(len(request_logs.buffer), 0)
+
+    @override_settings(API_LOGS_MAX_BUFFER_SIZE=2)
+    def test_requeue_failed_logs_up_to_the_buffer_size(self):
+        url = reverse("karrio.server.manager:address-list")
+
+        for _ in range(3):
+            self.client.post(url, ADDRESS_DATA)
+
+        with patch.object(request_logs, "_save_logs", side_effect=Exception()):
+            self.assertEqual(request_logs.buffer.flush(), 0)
+
+        self.assertEqual(len(request_logs.buffer), 2)
+        self.assertEqual(request_logs.buffer.flush(), 2)
+        self.assertEqual(APILogIndex.objects.filter(path=url).count(), 2)
@@ -1,6 +1,9 @@
 import json
+import base64
+import hashlib
 from unittest.mock import ANY, patch
 from django.urls import reverse
+from django.db import transaction
 from rest_framework import status
 from karrio.core.models import (
     RateDetails,
@@ -9,6 +12,7 @@ from karrio.core.models import (
     ConfirmationDetails,
 )
 from karrio.server.core.tests import APITestCase
+import karrio.server.core.storage as storage
 import karrio.server.manager.models as models
 import karrio.server.providers.models as providers
 
@@ -213,6 +217,132 @@ class TestShipmentPurchase(TestShipmentFixture):
         )
 
 
+class TestShipmentDocuments(TestShipmentFixture):
+    def test_label_is_stored_out_of_row(self):
+        label = base64.b64encode(b"%PDF-1.4 label").decode()
+        self.shipment.label = label
+        self.shipment.label_type = "PDF"
+        self.shipment.save()
+
+        shipment = models.Shipment.objects.get(pk=self.shipment.pk)
+        response = self.client.get(shipment.label_url)
+
+        self.assertEqual(
+            shipment.label_file, hashlib.sha256(b"%PDF-1.4 label").hexdigest()
+        )
+        self.assertEqual(shipment.label, label)
+        self.assertIsNone(shipment.invoice_url)
+        self.assertEqual(b"".join(response.streaming_content), b"%PDF-1.4 label")
+
+    def test_documents_are_not_stored_on_rollback(self):
+        label = base64.b64encode(b"%PDF-1.4 rolled back").decode()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError), transaction.atomic():
+                self.shipment.label = label
+                self.shipment.save()
+                raise ValueError()
+
+        self.assertFalse(
+            storage.get_document_store().exists(
+                hashlib.sha256(b"%PDF-1.4 rolled back").hexdigest()
+            )
+        )
+        self.assertIsNone(
+            storage._pending_content(
+                hashlib.sha256(b"%PDF-1.4 rolled back").hexdigest()
+            )
+        )
+
+    def test_replaced_and_deleted_documents_are_released(self):
+        store = storage.get_document_store()
+        first = base64.b64encode(b"%PDF-1.4 first").decode()
+        second = base64.b64encode(b"%PDF-1.4 second").decode()
+        first_key = hashlib.sha256(b"%PDF-1.4 first").hexdigest()
+        second_key = hashlib.sha256(b"%PDF-1.4 second").hexdigest()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.shipment.label = first
+            self.shipment.invoice = second
+            self.shipment.save()
+
+        self.assertTrue(store.exists(first_key))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.shipment.label = second
+            self.shipment.save()
+
+        # the second document is still referenced by the invoice.
+        self.assertFalse(store.exists(first_key))
+        self.assertTrue(store.exists(second_key))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.shipment.delete()
+
+        self.assertFalse(store.exists(second_key))
+
+    def test_released_document_referenced_meanwhile_is_kept(self):
+        store = storage.get_document_store()
+        label = base64.b64encode(b"%PDF-1.4 shared").decode()
+        key = hashlib.sha256(b"%PDF-1.4 shared").hexdigest()
+        store.put(b"%PDF-1.4 shared")
+        delete = store.delete
+
+        # a concurrent transaction saving the same content commits while the
+        # released document is being deleted.
+        def concurrent_delete(key):
+            delete(key)
+            models.Shipment.objects.filter(pk=self.shipment.pk).update(label_file=key)
+
+        with patch.object(store, "delete", side_effect=concurrent_delete):
+            storage.release_document(key)
+
+        shipment = models.Shipment.objects.get(pk=self.shipment.pk)
+
+        self.assertTrue(store.exists(key))
+        self.assertEqual(shipment.label, label)
+
+
+class TestShipmentFilters(TestShipmentFixture):
+    def test_filter_shipments_by_json_values(self):
+        self.shipment.metadata = {"order": "A1", "count": 2}
+        self.shipment.meta = {"rate_provider": "canadapost", "count": 2}
+        self.shipment.options = {"currency": "CAD"}
+        self.shipment.save()
+        url = reverse("karrio.server.manager:shipment-list")
+
+        counts = [
+            len(json.loads(self.client.get(url, params).content)["results"])
+            for params in [
+                {"metadata_value": "A1"},
+                {"metadata_value": "2"},
+                {"meta_value": "2"},
+                {"option_value": "CAD"},
+                {"option_value": "USD"},
+            ]
+        ]
+
+        self.assertListEqual(counts, [1, 0, 1, 1, 0])
+
+    def test_filter_shipments_by_keyword(self):
+        self.shipment.tracking_number = "1Z12345E0205271688"
+        self.shipment.save(update_fields=["tracking_number"])
+        url = reverse("karrio.server.manager:shipment-list")
+
+        counts = [
+            len(json.loads(self.client.get(url, params).content)["results"])
+            for params in [
+                {"keyword": "1Z12345"},
+                {"keyword": "vancouver"},
+                {"address": "1Z12345"},
+                {"address": "Oak St"},
+                {"keyword": "montreal"},
+            ]
+        ]
+
+        self.assertListEqual(counts, [1, 1, 0, 1, 0])
+
+
 SHIPMENT_DATA = {
     "recipient": {
         "address_line1": "125 Church St",
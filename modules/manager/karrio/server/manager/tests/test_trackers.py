@@ -43,6 +43,46 @@ class TestTrackers(APITestCase):
         self.assertEqual(len(self.user.tracking_set.all()), 1)
 
 
+class TestTrackerList(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.trackers = [
+            models.Tracking.objects.create(
+                tracking_number=f"0034043429213510012{index}",
+                test_mode=True,
+                created_by=self.user,
+                tracking_carrier=self.dhl_carrier,
+            )
+            for index in range(5)
+        ]
+        # trackers created at the same time are ordered by id.
+        models.Tracking.objects.filter(pk__in=[_.pk for _ in self.trackers[:3]]).update(
+            created_at=self.trackers[0].created_at
+        )
+
+    def test_paginate_trackers_with_cursors(self):
+        url = reverse("karrio.server.manager:trackers-list")
+        expected = list(
+            models.Tracking.objects.order_by("-created_at", "-pk").values_list(
+                "pk", flat=True
+            )
+        )
+
+        pages = []
+        next_url = f"{url}?limit=2"
+        while next_url is not None:
+            response_data = json.loads(self.client.get(next_url).content)
+            pages.append([_["id"] for _ in response_data["results"]])
+            next_url = response_data["next"]
+
+        previous = json.loads(self.client.get(response_data["previous"]).content)
+
+        self.assertEqual(response_data["count"], 5)
+        self.assertListEqual([len(_) for _ in pages], [2, 2, 1])
+        self.assertListEqual(sum(pages, []), expected)
+        self.assertListEqual([_["id"] for _ in previous["results"]], pages[1])
+
+
 class TestTrackersUpdate(APITestCase):
     def setUp(self) -> None:
         super().setUp()
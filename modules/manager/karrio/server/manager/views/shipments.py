@@ -1,19 +1,19 @@
-import io
 import base64
 import logging
 
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.pagination import LimitOffsetPagination
+from karrio.server.core.pagination import KeysetPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from django_downloadview import VirtualDownloadView
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.urls import path, re_path
 
 import karrio.lib as lib
 import karrio.server.openapi as openapi
 import karrio.server.core.filters as filters
+import karrio.server.core.storage as storage
 import karrio.server.manager.models as models
 from karrio.server.core.views.api import GenericAPIView, APIView
 from karrio.server.core.filters import ShipmentFilters
@@ -42,9 +42,7 @@ Shipments = PaginatedResult("ShipmentList", Shipment)
 
 class ShipmentList(GenericAPIView):
     throttle_scope = "carrier_request"
-    pagination_class = type(
-        "CustomPagination", (LimitOffsetPagination,), dict(default_limit=20)
-    )
+    pagination_class = KeysetPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ShipmentFilters
     serializer_class = Shipments
@@ -66,8 +64,8 @@ class ShipmentList(GenericAPIView):
         """
         Retrieve all shipments.
         """
-        shipments = self.filter_queryset(self.get_queryset())
-        response = self.paginate_queryset(Shipment(shipments, many=True).data)
+        shipments = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        response = Shipment(shipments, many=True).data
 
         return self.get_paginated_response(response)
 
@@ -269,8 +267,8 @@ class ShipmentDocs(VirtualDownloadView):
         **kwargs,
     ):
         """Retrieve a shipment label."""
-        self.shipment = models.Shipment.objects.get(pk=pk, label__isnull=False)
-        self.document = getattr(self.shipment, doc, None)
+        self.shipment = models.Shipment.objects.get(pk=pk, label_file__isnull=False)
+        self.reference = getattr(self.shipment, f"{doc}_file", None)
         self.name = f"{doc}_{self.shipment.tracking_number}.{format}"
 
         query_params = request.GET.dict()
@@ -282,8 +280,8 @@ class ShipmentDocs(VirtualDownloadView):
         return response
 
     def get_file(self):
-        content = base64.b64decode(self.document or "")
-        buffer = io.BytesIO()
+        if self.reference is None:
+            return ContentFile(b"", name=self.name)
 
         if self.preview and "ZPL" in self.shipment.label_type or "":
             width, height, dpmm = (4, 6, 12)
@@ -291,9 +289,10 @@ class ShipmentDocs(VirtualDownloadView):
             if "8" in self.shipment.label_type:
                 width, height, dpmm = (8, 4, 12)
 
+            _document = storage.load_document(self.reference)
             _label = lib.failsafe(
                 lambda: lib.zpl_to_pdf(
-                    self.document,
+                    _document,
                     width,
                     height,
                     dpmm=dpmm,
@@ -301,12 +300,11 @@ class ShipmentDocs(VirtualDownloadView):
             )
 
             if _label is not None:
-                content = base64.b64decode(_label)
                 self.name = self.name.replace("zpl", "pdf")
+                return ContentFile(base64.b64decode(_label), name=self.name)
 
-        buffer.write(content)
-
-        return ContentFile(buffer.getvalue(), name=self.name)
+        # stream the document bytes from the store.
+        return File(storage.open_document(self.reference), name=self.name)
 
 
 router.urls.append(path("shipments", ShipmentList.as_view(), name="shipment-list"))
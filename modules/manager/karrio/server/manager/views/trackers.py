@@ -7,7 +7,7 @@ from django.db.models import Q
 from django.urls import path, re_path
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from rest_framework.pagination import LimitOffsetPagination
+from karrio.server.core.pagination import KeysetPagination
 from django.core.files.base import ContentFile
 from rest_framework.response import Response
 from rest_framework.request import Request
@@ -28,9 +28,7 @@ Trackers = serializers.PaginatedResult("TrackerList", serializers.TrackingStatus
 
 class TrackerList(GenericAPIView):
     throttle_scope = "carrier_request"
-    pagination_class = type(
-        "CustomPagination", (LimitOffsetPagination,), dict(default_limit=20)
-    )
+    pagination_class = KeysetPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = filters.TrackerFilters
     serializer_class = Trackers
@@ -63,10 +61,8 @@ class TrackerList(GenericAPIView):
         """
         Retrieve all shipment trackers.
         """
-        trackers = self.filter_queryset(self.get_queryset())
-        response = self.paginate_queryset(
-            serializers.TrackingStatus(trackers, many=True).data
-        )
+        trackers = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        response = serializers.TrackingStatus(trackers, many=True).data
         return self.get_paginated_response(response)
 
     @openapi.extend_schema(
@@ -1,5 +1,4 @@
 from django.db.models import Q
-from django.conf import settings
 
 import karrio.server.filters as filters
 import karrio.server.orders.serializers as serializers
@@ -136,66 +135,10 @@ class OrderFilters(filters.FilterSet):
         fields: list = []
 
     def keyword_filter(self, queryset, name, value):
-        if "postgres" in settings.DB_ENGINE:
-            from django.contrib.postgres.search import SearchVector
-
-            return queryset.annotate(
-                search=SearchVector(
-                    "shipping_to__address_line1",
-                    "shipping_to__address_line2",
-                    "shipping_to__postal_code",
-                    "shipping_to__person_name",
-                    "shipping_to__company_name",
-                    "shipping_to__city",
-                    "shipping_to__email",
-                    "shipping_to__phone_number",
-                    "order_id",
-                    "source",
-                    "id",
-                )
-            ).filter(search=value)
-
-        return queryset.filter(
-            Q(shipping_to__address_line1__icontains=value)
-            | Q(shipping_to__address_line2__icontains=value)
-            | Q(shipping_to__postal_code__icontains=value)
-            | Q(shipping_to__person_name__icontains=value)
-            | Q(shipping_to__company_name__icontains=value)
-            | Q(shipping_to__city__icontains=value)
-            | Q(shipping_to__email__icontains=value)
-            | Q(shipping_to__phone_number__icontains=value)
-            | Q(order_id__icontains=value)
-            | Q(source__icontains=value)
-            | Q(id__icontains=value)
-        )
+        return queryset.filter(search_document__matches=value)
 
     def address_filter(self, queryset, name, value):
-        if "postgres" in settings.DB_ENGINE:
-            from django.contrib.postgres.search import SearchVector
-
-            return queryset.annotate(
-                search=SearchVector(
-                    "shipping_to__address_line1",
-                    "shipping_to__address_line2",
-                    "shipping_to__postal_code",
-                    "shipping_to__person_name",
-                    "shipping_to__company_name",
-                    "shipping_to__city",
-                    "shipping_to__email",
-                    "shipping_to__phone_number",
-                )
-            ).filter(search=value)
-
-        return queryset.filter(
-            Q(shipping_to__address_line1__icontains=value)
-            | Q(shipping_to__address_line2__icontains=value)
-            | Q(shipping_to__postal_code__icontains=value)
-            | Q(shipping_to__person_name__icontains=value)
-            | Q(shipping_to__company_name__icontains=value)
-            | Q(shipping_to__city__icontains=value)
-            | Q(shipping_to__email__icontains=value)
-            | Q(shipping_to__phone_number__icontains=value)
-        )
+        return queryset.filter(shipping_to__search_document__matches=value)
 
     def order_id_filter(self, queryset, name, value):
         return queryset.filter(Q(order_id__in=value))
@@ -207,22 +150,10 @@ class OrderFilters(filters.FilterSet):
         return queryset.filter(options__has_keys=value)
 
     def option_value_filter(self, queryset, name, value):
-        return queryset.filter(
-            id__in=[
-                o["id"]
-                for o in queryset.values("id", "options")
-                if value in (o.get("options") or {}).values()
-            ]
-        )
+        return queryset.filter(options__has_value=value)
 
     def metadata_key_filter(self, queryset, name, value):
         return queryset.filter(metadata__has_keys=value)
 
     def metadata_value_filter(self, queryset, name, value):
-        return queryset.filter(
-            id__in=[
-                o["id"]
-                for o in queryset.values("id", "metadata")
-                if value in (o.get("metadata") or {}).values()
-            ]
-        )
+        return queryset.filter(metadata__has_value=value)
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:10
+
+from django.db import migrations
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+    # the indexes are built concurrently out of a transaction
+    atomic = False
+
+    dependencies = [
+        ("orders", "0016_order_shipments"),
+    ]
+
+    operations = []
+
+    if "postgres" in settings.DB_ENGINE:
+        operations = [
+            migrations.RunSQL(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS "order_metadata_gin_idx" '
+                'ON "order" USING gin ("metadata")',
+                reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "order_metadata_gin_idx"',
+            ),
+            migrations.RunSQL(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS "order_options_gin_idx" '
+                'ON "order" USING gin ("options")',
+                reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "order_options_gin_idx"',
+            ),
+        ]
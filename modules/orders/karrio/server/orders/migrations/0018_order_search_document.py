@@ -0,0 +1,58 @@
+# Generated by Django 4.2.16 on 2026-10-18 21:05
+
+from django.db import migrations, models
+from django.db.models.functions import Concat
+
+BATCH_SIZE = 1000
+
+
+def compute_search_documents(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    Address = apps.get_model("manager", "Address")
+    db_alias = schema_editor.connection.alias
+    separator = models.Value("\n")
+    queryset = Order.objects.using(db_alias)
+    ids = queryset.order_by("pk").values_list("pk", flat=True)
+    search_document = Concat(
+        models.F("id"),
+        separator,
+        models.F("order_id"),
+        separator,
+        models.F("source"),
+        separator,
+        models.Subquery(
+            Address.objects.using(db_alias)
+            .filter(pk=models.OuterRef("shipping_to_id"))
+            .values("search_document")[:1]
+        ),
+        output_field=models.TextField(),
+    )
+    batch = []
+
+    # the rows are updated by batches of primary keys to keep each statement short.
+    for pk in ids.iterator(chunk_size=BATCH_SIZE):
+        batch.append(pk)
+
+        if len(batch) >= BATCH_SIZE:
+            queryset.filter(pk__in=batch).update(search_document=search_document)
+            batch = []
+
+    if batch:
+        queryset.filter(pk__in=batch).update(search_document=search_document)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manager", "0066_address_search_document_and_more"),
+        ("orders", "0017_order_json_gin_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="search_document",
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(compute_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-18 21:05
+
+from django.db import migrations
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+    # the indexes are built concurrently out of a transaction
+    atomic = False
+
+    dependencies = [
+        ("manager", "0068_search_document_indexes"),
+        ("orders", "0018_order_search_document"),
+    ]
+
+    operations = []
+
+    if "postgres" in settings.DB_ENGINE:
+        operations = [
+            migrations.RunSQL(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS "order_search_fts_idx" '
+                'ON "order" USING gin (to_tsvector(\'simple\', "search_document"))',
+                reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "order_search_fts_idx"',
+            ),
+            migrations.RunSQL(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS "order_search_trgm_idx" '
+                'ON "order" USING gin ("search_document" gin_trgm_ops)',
+                reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "order_search_trgm_idx"',
+            ),
+        ]
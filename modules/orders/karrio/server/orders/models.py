@@ -4,7 +4,12 @@ from django.conf import settings
 from django.db import models
 
 from karrio.server.core.utils import identity
-from karrio.server.core.models import OwnedEntity, uuid, register_model
+from karrio.server.core.models import (
+    OwnedEntity,
+    SearchableEntity,
+    uuid,
+    register_model,
+)
 from karrio.server.manager import models as manager
 
 from karrio.server.orders.serializers.base import ORDER_STATUS
@@ -55,7 +60,8 @@ class OrderManager(models.Manager):
 
 
 @register_model
-class Order(OwnedEntity):
+class Order(OwnedEntity, SearchableEntity):
+    SEARCH_FIELDS = ["id", "order_id", "source", "shipping_to__search_document"]
     HIDDEN_PROPS = (*(("org",) if settings.MULTI_ORGANIZATIONS else tuple()),)
     DIRECT_PROPS = [
         "order_id",
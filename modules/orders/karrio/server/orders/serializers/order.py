@@ -1,3 +1,4 @@
+import typing
 import logging
 from django.db import transaction
 from rest_framework import status
@@ -163,6 +164,26 @@ def compute_order_status(order: models.Order) -> str:
     return serializers.OrderStatus.unfulfilled.value
 
 
+def update_shipments_orders_status(shipment_ids: typing.List[str]) -> None:
+    """Recompute the status of the orders of shipments updated in bulk
+    (e.g. by a tracker refresh) as `post_save` signals aren't sent.
+    """
+    related_orders = (
+        models.Order.objects.filter(
+            line_items__children__commodity_parcel__parcel_shipment__id__in=shipment_ids
+        )
+        .exclude(status="cancelled")
+        .distinct()
+    )
+
+    for order in related_orders:
+        status = compute_order_status(order)
+        if status != order.status:
+            order.status = status
+            order.save(update_fields=["status"])
+            logger.info("shipment related order successfully updated")
+
+
 def can_mutate_order(
     order: models.Order,
     update: bool = False,
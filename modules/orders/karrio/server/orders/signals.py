@@ -4,6 +4,7 @@ from django.db.models import signals
 from karrio.server.core import utils
 from karrio.server.conf import settings
 from karrio.server.core.utils import failsafe
+import karrio.server.core.signals as core_signals
 from karrio.server.events.serializers import EventTypes
 from karrio.server.orders.serializers.order import compute_order_status
 import karrio.server.orders.serializers as serializers
@@ -22,6 +23,9 @@ def register_signals():
     signals.post_save.connect(commodity_mutated, sender=manager.Commodity)
     signals.post_save.connect(shipment_updated, sender=manager.Shipment)
     signals.post_save.connect(order_updated, sender=models.Order)
+    signals.post_save.connect(shipping_address_updated, sender=manager.Address)
+    signals.pre_save.connect(core_signals.search_document_saving, sender=models.Order)
+    signals.post_save.connect(core_signals.search_document_saved, sender=models.Order)
 
     logger.info("karrio.order signals registered...")
 
@@ -144,6 +148,18 @@ def order_updated(sender, instance, *args, **kwargs):
     tasks.notify_webhooks(event, data, event_at, context, schema=settings.schema)
 
 
+@utils.disable_for_loaddata
+def shipping_address_updated(sender, instance, *args, **kwargs):
+    """The order search document includes its shipping address document"""
+    if not getattr(instance, "_search_document_changed", False):
+        return
+
+    order = failsafe(lambda: instance.recipient_order)
+
+    if order is not None:
+        order.update_search_document()
+
+
 @utils.disable_for_loaddata
 def shipments_updated(
     sender, instance, action, reverse, model, pk_set, *args, **kwargs
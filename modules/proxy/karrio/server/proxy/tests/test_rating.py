@@ -1,9 +1,12 @@
 import json
 from unittest.mock import patch, ANY
 from django.urls import reverse
+from django.core.cache import cache
+from django.test import override_settings
 from rest_framework import status
 from karrio.core.models import RateDetails, ChargeDetails
 from karrio.server.core.tests import APITestCase
+import karrio.server.core.caching as caching
 
 
 class TestRating(APITestCase):
@@ -19,6 +22,34 @@ class TestRating(APITestCase):
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertDictEqual(response_data, RATING_RESPONSE)
 
+    @override_settings(RATE_CACHE_TTL=60)
+    def test_fetch_cached_shipment_rates(self):
+        url = reverse("karrio.server.proxy:shipment-rates")
+        cache.clear()
+        caching.RATE_QUOTES.clear()
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock:
+            mock.return_value = RETURNED_VALUE
+            first = json.loads(self.client.post(f"{url}", RATING_DATA).content)
+            second = json.loads(
+                self.client.post(
+                    f"{url}",
+                    {
+                        **RATING_DATA,
+                        "reference": "order #1001",
+                        "services": list(reversed(RATING_DATA["services"])),
+                    },
+                ).content
+            )
+
+            self.assertEqual(mock.call_count, 1)
+            self.assertNotIn("cached", first["rates"][0]["meta"])
+            self.assertTrue(second["rates"][0]["meta"]["cached"])
+            self.assertEqual(
+                second["rates"][0]["total_charge"], first["rates"][0]["total_charge"]
+            )
+            self.assertNotEqual(second["rates"][0]["id"], first["rates"][0]["id"])
+
 
 RATING_DATA = {
     "shipper": {
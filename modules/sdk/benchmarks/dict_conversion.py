@@ -0,0 +1,75 @@
+"""Micro-benchmark of `lib.to_dict` / `lib.to_json` on the SDK test fixtures.
+
+Compares the direct converter with the legacy JSON round-trip and checks that
+both produce the same output.
+
+Usage (from modules/sdk):
+    python -m benchmarks.dict_conversion
+"""
+
+import json
+import timeit
+import karrio.lib as lib
+import karrio.core.models as models
+import karrio.core.utils.dict as dict_utils
+from karrio.universal.mappers.rating_proxy import RatingMixinSettings, RatingMixinProxy
+from karrio.universal.providers.rating.rate import parse_rate_response
+from tests.core.test_universal_rate import rate_request_data, settings_data
+from tests.core.test_universal_shipment import shipment_request_data
+
+NUMBER = 2000
+
+
+def legacy_to_dict(entity, clear_empty=None):
+    _clear_empty = clear_empty is not False
+    return json.loads(
+        dict_utils.DICTPARSE.jsonify(entity),
+        object_hook=lambda d: {
+            k: v
+            for k, v in d.items()
+            if (v not in (None, [], "") if _clear_empty else True)
+        },
+    )
+
+
+def fixtures() -> dict:
+    settings = RatingMixinSettings(**settings_data)
+    request = lib.to_object(models.RateRequest, rate_request_data)
+    response = RatingMixinProxy(settings).get_rates(lib.Serializable(request))
+    rates, _ = parse_rate_response(response, settings)
+
+    return {
+        "rate_request": request,
+        "shipment_request": lib.to_object(
+            models.ShipmentRequest, shipment_request_data
+        ),
+        "rate_details": rates,
+        "rate_details_x50": rates * 50,
+    }
+
+
+def bench(label: str, func) -> float:
+    duration = timeit.timeit(func, number=NUMBER) / NUMBER * 1e6
+    print(f"    {label:<24} {duration:>10.1f} µs")
+    return duration
+
+
+def main():
+    for name, entity in fixtures().items():
+        assert lib.to_dict(entity) == legacy_to_dict(entity), name
+
+        print(f"{name}:")
+        legacy = bench("to_dict (json round-trip)", lambda: legacy_to_dict(entity))
+        direct = bench("to_dict (direct)", lambda: lib.to_dict(entity))
+        bench("to_json (json)", lambda: dict_utils.DICTPARSE.jsonify(entity))
+
+        if dict_utils.orjson is not None:
+            dict_utils.JSON_ENCODER = "orjson"
+            bench("to_json (orjson)", lambda: dict_utils.DICTPARSE.jsonify(entity))
+            dict_utils.JSON_ENCODER = "json"
+
+        print(f"    to_dict speedup: x{legacy / direct:.1f}")
+
+
+if __name__ == "__main__":
+    main()
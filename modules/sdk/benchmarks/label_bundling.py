@@ -0,0 +1,94 @@
+"""Memory and latency benchmark of label bundling.
+
+Compares the in-memory base64 pipeline (`lib.bundle_base64` over a list of
+base64 labels, decoded again for the response) with the streaming pipeline
+(`lib.iter_bundle` over labels decoded one at a time). Each case runs in a fresh
+interpreter and reports the peak traced memory.
+
+Usage (from modules/sdk):
+    python -m benchmarks.label_bundling
+"""
+
+import io
+import sys
+import json
+import time
+import base64
+import subprocess
+import tracemalloc
+import PIL.Image
+
+SIZES = [100, 1000, 10000]
+
+
+def pdf_label() -> bytes:
+    buffer = io.BytesIO()
+    PIL.Image.effect_noise((400, 600), 64).convert("RGB").save(buffer, format="PDF")
+    return buffer.getvalue()
+
+
+def zpl_label() -> bytes:
+    return (
+        "^XA^FO50,50^A0N,50,50^FDKarrio^FS" + "^FO50,{0}^GB700,1,3^FS" * 400 + "^XZ"
+    ).encode()
+
+
+def run(pipeline: str, format: str, count: int) -> dict:
+    import karrio.lib as lib
+
+    label = pdf_label() if format == "PDF" else zpl_label()
+    stored = base64.b64encode(label).decode()  # documents as stored/read by rows
+
+    def legacy():
+        # one string per row, as loaded from the database.
+        documents = [(stored + " ")[:-1] for _ in range(count)]
+        content = base64.b64decode(lib.bundle_base64(documents, format))
+        return len(content)
+
+    def streaming():
+        documents = (base64.b64decode(stored) for _ in range(count))
+        return sum(len(chunk) for chunk in lib.iter_bundle(documents, format))
+
+    function = legacy if pipeline == "legacy" else streaming
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = function()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+
+    return dict(size=size, duration=duration, peak=peak)
+
+
+def main():
+    if len(sys.argv) == 4:
+        print(json.dumps(run(sys.argv[1], sys.argv[2], int(sys.argv[3]))))
+        return
+
+    for format in ["ZPL", "PDF"]:
+        print(f"{format} labels")
+
+        for count in SIZES:
+            for pipeline in ["legacy", "streaming"]:
+                process = subprocess.run(
+                    [sys.executable, "-m", __spec__.name, pipeline, format, str(count)],
+                    capture_output=True,
+                )
+
+                if process.returncode != 0:
+                    print(
+                        f"    {count:>6} x {pipeline:<10}"
+                        f"  failed (exit code {process.returncode}, likely out of memory)"
+                    )
+                    continue
+
+                result = json.loads(process.stdout.decode().strip().splitlines()[-1])
+                print(
+                    f"    {count:>6} x {pipeline:<10}"
+                    f"  time: {result['duration'] * 1000:>9.1f} ms"
+                    f"  peak memory: {result['peak'] / 1024 / 1024:>8.1f} MB"
+                    f"  bundle: {result['size'] / 1024 / 1024:>8.1f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Startup and per-lookup benchmark of the carrier extensions registry.
+
+Cold timings run in fresh interpreters so that module imports are measured.
+
+Usage (from modules/sdk):
+    python -m benchmarks.provider_registry
+"""
+
+import sys
+import timeit
+import subprocess
+import pkgutil
+import karrio
+import karrio.mappers as mappers
+import karrio.references as references
+
+NUMBER = 1000
+
+
+def cold(statement: str) -> float:
+    script = (
+        "import time; start = time.perf_counter(); "
+        f"{statement}; print(time.perf_counter() - start)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", script])
+    return float(output.decode().strip().splitlines()[-1]) * 1000
+
+
+def legacy_import_extensions() -> dict:
+    modules = {
+        name: __import__(f"{mappers.__name__}.{name}", fromlist=[name])
+        for _, name, _ in pkgutil.iter_modules(mappers.__path__)
+    }
+    return {name: module.METADATA for name, module in modules.items()}
+
+
+def main():
+    names = list(karrio.gateway.providers)
+    print(f"{len(names)} installed connectors")
+
+    print("cold start:")
+    for label, statement in [
+        ("import karrio", "import karrio"),
+        ("first lookup (lazy)", "import karrio; karrio.gateway.providers['fedex']"),
+        (
+            "import all connectors",
+            "import karrio.references as r; r.import_extensions()",
+        ),
+    ]:
+        print(f"    {label:<32} {cold(statement):>10.1f} ms")
+
+    references.import_extensions()
+    legacy = timeit.timeit(
+        lambda: legacy_import_extensions()["fedex"], number=NUMBER // 10
+    ) / (NUMBER // 10)
+    memoized = (
+        timeit.timeit(lambda: karrio.gateway.providers["fedex"], number=NUMBER) / NUMBER
+    )
+
+    print("per lookup (warm):")
+    print(f"    {'rescan + import (legacy)':<32} {legacy * 1e6:>10.1f} µs")
+    print(f"    {'memoized registry':<32} {memoized * 1e6:>10.3f} µs")
+
+
+if __name__ == "__main__":
+    main()
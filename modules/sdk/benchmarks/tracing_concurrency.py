@@ -0,0 +1,114 @@
+"""Stress benchmark of `Tracer.trace` and `Cache.set` under concurrent gateways.
+
+Compares the previous thread-per-call implementation with the shared
+worker pool / append buffer and reports peak thread count and latencies.
+
+Usage (from modules/sdk):
+    python -m benchmarks.tracing_concurrency
+"""
+
+import time
+import uuid
+import threading
+import statistics
+import concurrent.futures as futures
+import karrio.lib as lib
+
+GATEWAYS = 48
+CALLS = 200
+
+
+class LegacyTracer:
+    def __init__(self) -> None:
+        self.id = str(uuid.uuid4())
+        self.inner_recordings = {}
+
+    def trace(self, data, key, metadata={}, format=None):
+        def _save():
+            return lib.utils.Record(
+                key=key,
+                data={"format": format, **data},
+                timestamp=time.time(),
+                metadata=metadata,
+            )
+
+        promise = futures.ThreadPoolExecutor(max_workers=1)
+        self.inner_recordings.update({promise.submit(_save): data})
+        return data
+
+    @property
+    def records(self):
+        return [rec.result() for rec in futures.as_completed(self.inner_recordings)]
+
+
+class LegacyCache:
+    def __init__(self) -> None:
+        self._values = {}
+
+    def set(self, key, value, timeout=86400):
+        def _save():
+            return value() if callable(value) else value
+
+        executor = futures.ThreadPoolExecutor(max_workers=1)
+        self._values.update({key: executor.submit(_save)})
+
+    def get(self, key):
+        return self._values[key].result()
+
+
+def run(tracer_type, cache_type) -> dict:
+    latencies = []
+    peak = [threading.active_count()]
+    done = threading.Event()
+
+    def monitor():
+        while not done.is_set():
+            peak[0] = max(peak[0], threading.active_count())
+            time.sleep(0.001)
+
+    def gateway(index: int):
+        tracer, cache = tracer_type(), cache_type()
+        _latencies = []
+
+        for call in range(CALLS):
+            start = time.perf_counter()
+            tracer.trace({"request_id": call, "data": "{}"}, "request")
+            cache.set(f"{index}|{call}", lambda: {"access_token": "token"})
+            _latencies.append(time.perf_counter() - start)
+
+        assert len(tracer.records) == CALLS
+        assert cache.get(f"{index}|0") is not None
+        latencies.extend(_latencies)
+
+    threading.Thread(target=monitor, daemon=True).start()
+    start = time.perf_counter()
+    with futures.ThreadPoolExecutor(max_workers=GATEWAYS) as executor:
+        list(executor.map(gateway, range(GATEWAYS)))
+    duration = time.perf_counter() - start
+    done.set()
+
+    latencies.sort()
+    return dict(
+        peak_threads=peak[0],
+        total_ms=duration * 1000,
+        p50_us=statistics.median(latencies) * 1e6,
+        p99_us=latencies[int(len(latencies) * 0.99)] * 1e6,
+    )
+
+
+def main():
+    print(f"{GATEWAYS} concurrent gateways x {CALLS} trace + cache.set calls")
+    for label, tracer_type, cache_type in [
+        ("thread per call", LegacyTracer, LegacyCache),
+        ("shared worker pool", lib.Tracer, lib.Cache),
+    ]:
+        result = run(tracer_type, cache_type)
+        print(
+            f"    {label:<20} peak threads: {result['peak_threads']:>5}"
+            f"  total: {result['total_ms']:>8.1f} ms"
+            f"  p50: {result['p50_us']:>8.1f} µs  p99: {result['p99_us']:>8.1f} µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Zone resolution benchmark of the universal rating proxy on large rate sheets.
+
+Compares the previous linear zone scan with the compiled `ServiceIndex` on
+synthetic postal code and weight bracket rate sheets and checks that both
+resolve the same zones.
+
+Usage (from modules/sdk):
+    python -m benchmarks.universal_rating
+"""
+
+import random
+import timeit
+import karrio.lib as lib
+import karrio.core.units as units
+import karrio.core.models as models
+from karrio.universal.providers.rating import index as rating_index
+
+LOOKUPS = 50
+BRACKETS = [(0, 1), (1, 2), (2, 5), (5, 10), (10, 20), (20, 30), (30, 50)]
+
+
+def legacy_select_zone(service, recipient, package):
+    selected_zone = None
+
+    for zone in service.zones or []:
+        _cover_supported_cities = (
+            zone.cities is not None
+            and recipient.city is not None
+            and recipient.city.lower() in [_.lower() for _ in zone.cities]
+        ) or not any(zone.cities or [])
+        _cover_supported_countries = (
+            zone.country_codes is not None
+            and recipient.country_code in zone.country_codes
+        ) or not any(zone.country_codes or [])
+        _cover_supported_postal_codes = (
+            zone.postal_codes is not None
+            and recipient.postal_code is not None
+            and str(recipient.postal_code).lower()
+            in [str(_).lower() for _ in zone.postal_codes]
+        ) or not any(zone.postal_codes or [])
+        _match_zone_min_weight_requirements = (
+            zone.min_weight is not None
+            and package.weight[service.weight_unit]
+            >= units.Weight(zone.min_weight, service.weight_unit).value
+        ) or (zone.min_weight is None)
+        _match_zone_max_weight_requirements = (
+            zone.max_weight is not None
+            and package.weight[service.weight_unit]
+            <= units.Weight(zone.max_weight, service.weight_unit).value
+        ) or (zone.max_weight is None)
+
+        if (
+            _cover_supported_cities
+            and _cover_supported_countries
+            and _cover_supported_postal_codes
+            and _match_zone_min_weight_requirements
+            and _match_zone_max_weight_requirements
+            and rating_index.is_best_fit_zone_selected(selected_zone, zone) is False
+        ):
+            selected_zone = zone
+
+    return selected_zone
+
+
+def rate_sheet(postal_codes: int) -> models.ServiceLevel:
+    zones = [
+        models.ServiceZone(
+            rate=round(5 + index * 0.01 + max_weight, 2),
+            min_weight=min_weight,
+            max_weight=max_weight,
+            country_codes=["US"],
+            postal_codes=[f"{index:05d}", f"{index + postal_codes:05d}"],
+        )
+        for index in range(postal_codes)
+        for min_weight, max_weight in BRACKETS
+    ]
+    zones.append(models.ServiceZone(rate=99.0, country_codes=["CA"]))
+
+    return models.ServiceLevel(
+        service_name="Ground",
+        service_code="ground",
+        currency="USD",
+        weight_unit="LB",
+        zones=zones,
+    )
+
+
+def main():
+    random.seed(42)
+
+    for postal_codes in [100, 500, 2000]:
+        service = rate_sheet(postal_codes)
+        requests = [
+            (
+                lib.to_address(
+                    models.Address(
+                        country_code="US",
+                        postal_code=f"{random.randrange(postal_codes * 2):05d}",
+                    )
+                ),
+                units.Package(
+                    models.Parcel(weight=random.uniform(0.1, 49), weight_unit="LB")
+                ),
+            )
+            for _ in range(LOOKUPS)
+        ]
+
+        compile_time = timeit.timeit(
+            lambda: rating_index.ServiceIndex(service), number=1
+        )
+        compiled = rating_index.get_service_index(service)
+
+        for recipient, package in requests:
+            assert legacy_select_zone(
+                service, recipient, package
+            ) is compiled.select_zone(recipient, package.weight["LB"])
+
+        legacy = timeit.timeit(
+            lambda: [legacy_select_zone(service, *_) for _ in requests], number=1
+        )
+        indexed = timeit.timeit(
+            lambda: [
+                rating_index.get_service_index(service).select_zone(
+                    recipient, package.weight["LB"]
+                )
+                for recipient, package in requests
+            ],
+            number=1,
+        )
+
+        print(f"{len(service.zones)} zones ({postal_codes} postal codes)")
+        print(f"    {'compile index (once)':<24} {compile_time * 1e3:>10.2f} ms")
+        print(f"    {'linear scan':<24} {legacy / LOOKUPS * 1e6:>10.1f} µs/lookup")
+        print(f"    {'compiled index':<24} {indexed / LOOKUPS * 1e6:>10.1f} µs/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -164,8 +164,12 @@ class GatewayInitializer:
             raise errors.ShippingSDKError(f"Unknown provider '{key}'")
 
     @property
-    def providers(self):
-        return references.import_extensions()
+    def providers(self) -> references.ProviderRegistry:
+        return references.registry
+
+    def refresh(self) -> references.ProviderRegistry:
+        """Rescan the installed carrier extensions (e.g. after a plugin install)."""
+        return references.registry.refresh()
 
     @staticmethod
     def get_instance() -> "GatewayInitializer":
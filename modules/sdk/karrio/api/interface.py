@@ -2,6 +2,7 @@
 
 import attr
 import typing
+import asyncio
 import logging
 import functools
 import karrio.lib as lib
@@ -76,6 +77,87 @@ def fail_safe(gateway: gateway.Gateway):
     return catcher
 
 
+def fail_safe_async(gateway: gateway.Gateway):
+    """Decorate async operation calls to enrich any failure context
+
+    Args:
+        gateway (gateway.Gateway): The gateway in use
+
+    Returns:
+        Decorator
+    """
+
+    def catcher(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as error:
+                logger.exception(error)
+
+                return IDeserialize(
+                    functools.partial(abort, gateway=gateway, error=error)
+                )
+
+        return wrapper
+
+    return catcher
+
+
+async def gather_from(
+    process: typing.Callable[[gateway.Gateway], typing.Awaitable["IDeserialize"]],
+    gateways: typing.List[gateway.Gateway],
+    timeout: float = None,
+    deadline: float = None,
+) -> typing.List["IDeserialize"]:
+    """Run an async operation against many gateways concurrently
+
+    Args:
+        process: the async operation to run per gateway
+        gateways (List[gateway.Gateway]): the gateways to run the operation against
+        timeout (float): the max duration in seconds allowed per gateway
+        deadline (float): the max duration in seconds for the whole fan-out.
+            Gateways that did not complete by then are reported as timed out.
+
+    Returns:
+        List[IDeserialize]: the lazy deserializers in the gateways order
+    """
+
+    async def run(gateway: gateway.Gateway):
+        try:
+            return await asyncio.wait_for(
+                fail_safe_async(gateway)(process)(gateway), timeout
+            )
+        except asyncio.TimeoutError:
+            return IDeserialize(
+                functools.partial(
+                    abort, gateway=gateway, error=errors.RequestTimeoutError(timeout)
+                )
+            )
+
+    tasks = [asyncio.ensure_future(run(gateway)) for gateway in gateways]
+
+    if not any(tasks):
+        return []
+
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    return [
+        (
+            task.result()
+            if task not in pending
+            else IDeserialize(
+                functools.partial(
+                    abort, gateway=gateway, error=errors.RequestTimeoutError(deadline)
+                )
+            )
+        )
+        for task, gateway in zip(tasks, gateways)
+    ]
+
+
 def check_operation(gateway: gateway.Gateway, request: str, **kwargs):
     errors = gateway.check(request, **kwargs)
 
@@ -136,11 +218,51 @@ class IRequestFromMany:
     """A lazy request (from one or many) type class"""
 
     action: typing.Callable[[typing.List[gateway.Gateway]], IDeserialize]
+    async_action: typing.Optional[
+        typing.Callable[..., typing.Awaitable[IDeserialize]]
+    ] = None
+
+    def from_(
+        self,
+        *gateways: gateway.Gateway,
+        timeout: float = None,
+        deadline: float = None,
+    ) -> IDeserialize:
+        """Execute the request action(s) from the provided gateway(s)
+
+        When a timeout or deadline (in seconds) is given, the async path is used.
+        """
+        if self.async_action is not None and (timeout or deadline):
+            return lib.run_sync(
+                self.from_async(*gateways, timeout=timeout, deadline=deadline)
+            )
 
-    def from_(self, *gateways: gateway.Gateway) -> IDeserialize:
-        """Execute the request action(s) from the provided gateway(s)"""
         return self.action(list({_.settings.carrier_id: _ for _ in gateways}.values()))
 
+    async def from_async(
+        self,
+        *gateways: gateway.Gateway,
+        timeout: float = None,
+        deadline: float = None,
+    ) -> IDeserialize:
+        """Execute the request action(s) from the provided gateway(s) concurrently
+
+        Args:
+            timeout (float): the max duration in seconds allowed per gateway
+            deadline (float): return what finished after this duration in seconds
+
+        Example:
+            rates, messages = (
+                await karrio.Rating.fetch(request).from_async(*gateways, deadline=0.8)
+            ).parse()
+        """
+        _gateways = list({_.settings.carrier_id: _ for _ in gateways}.values())
+
+        if self.async_action is None:
+            return await lib.run_in_executor(self.action, _gateways)
+
+        return await self.async_action(_gateways, timeout=timeout, deadline=deadline)
+
 
 class Address:
     """The unified Address API fluent interface"""
@@ -286,64 +408,104 @@ class Rating:
 
         Returns:
             IRequestFromMany: a lazy request dataclass instance
+
+        Example:
+            rates, messages = karrio.Rating.fetch(request).from_(*gateways).parse()
+            rates, messages = (
+                await karrio.Rating.fetch(request).from_async(*gateways, timeout=5)
+            ).parse()
         """
         logger.debug(f"fetch shipment rates. payload: {lib.to_json(args)}")
         payload = lib.to_object(models.RateRequest, lib.to_dict(args))
 
+        def validate(gateway: gateway.Gateway):
+            return check_operation(
+                gateway,
+                "get_rates",
+                origin_country_code=payload.shipper.country_code,
+            )
+
+        def deserializer(gateway: gateway.Gateway, response: lib.Deserializable):
+            @fail_safe(gateway)
+            def deserialize():
+                return gateway.mapper.parse_rate_response(response)
+
+            return IDeserialize(deserialize)
+
+        def flatten(
+            gateways: typing.List[gateway.Gateway],
+            deserializable_collection: typing.List[IDeserialize],
+        ):
+            responses = [p.parse() for p in deserializable_collection]
+            flattened_rates = sum(
+                (
+                    (
+                        (lambda gateway: filter_rates(rates, gateway))(
+                            # find the gateway that matches the carrier_id of the rates
+                            next(
+                                (
+                                    g
+                                    for g in gateways
+                                    if (g.settings.carrier_id == rates[0].carrier_id)
+                                )
+                            )
+                        )
+                        if len(rates) > 0
+                        else rates
+                    )
+                    for rates, _ in responses
+                    if rates is not None
+                ),
+                [],
+            )
+            messages = sum((m for _, m in responses), [])
+            return flattened_rates, messages
+
         def action(gateways: typing.List[gateway.Gateway]):
             def process(gateway: gateway.Gateway):
-                is_valid, abortion = check_operation(
-                    gateway,
-                    "get_rates",
-                    origin_country_code=payload.shipper.country_code,
-                )
+                is_valid, abortion = validate(gateway)
                 if not is_valid:
                     return abortion
 
                 request: lib.Serializable = gateway.mapper.create_rate_request(payload)
                 response: lib.Deserializable = gateway.proxy.get_rates(request)
 
-                @fail_safe(gateway)
-                def deserialize():
-                    return gateway.mapper.parse_rate_response(response)
-
-                return IDeserialize(deserialize)
+                return deserializer(gateway, response)
 
             deserializable_collection: typing.List[IDeserialize] = (
                 lib.run_asynchronously(lambda g: fail_safe(g)(process)(g), gateways)
             )
 
-            def flatten(*args):
-                responses = [p.parse() for p in deserializable_collection]
-                flattened_rates = sum(
-                    (
-                        (
-                            (lambda gateway: filter_rates(rates, gateway))(
-                                # find the gateway that matches the carrier_id of the rates
-                                next(
-                                    (
-                                        g
-                                        for g in gateways
-                                        if (
-                                            g.settings.carrier_id == rates[0].carrier_id
-                                        )
-                                    )
-                                )
-                            )
-                            if len(rates) > 0
-                            else rates
-                        )
-                        for rates, _ in responses
-                        if rates is not None
-                    ),
-                    [],
+            return IDeserialize(
+                functools.partial(flatten, gateways, deserializable_collection)
+            )
+
+        async def async_action(
+            gateways: typing.List[gateway.Gateway],
+            timeout: float = None,
+            deadline: float = None,
+        ):
+            async def process(gateway: gateway.Gateway):
+                is_valid, abortion = validate(gateway)
+                if not is_valid:
+                    return abortion
+
+                request: lib.Serializable = gateway.mapper.create_rate_request(payload)
+                response: lib.Deserializable = await gateway.proxy.get_rates_async(
+                    request
                 )
-                messages = sum((m for _, m in responses), [])
-                return flattened_rates, messages
 
-            return IDeserialize(flatten)
+                return deserializer(gateway, response)
+
+            deserializable_collection = await gather_from(
+                process, gateways, timeout=timeout, deadline=deadline
+            )
+
+            return IDeserialize(
+                functools.partial(flatten, gateways, deserializable_collection)
+            )
 
-        return IRequestFromMany(action)
+        return IRequestFromMany(action, async_action)
 
 
 class Shipment:
@@ -46,6 +46,20 @@ class Proxy(abc.ABC):
             self.__class__.get_rates.__name__, self.settings.carrier_name
         )
 
+    async def get_rates_async(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async counterpart of `get_rates`
+
+        The default implementation runs `get_rates` in the shared executor.
+        Connectors can override it with a native implementation using `lib.request_async`.
+
+        Args:
+            request (Serializable): a carrier specific serializable request data type
+
+        Returns:
+            Deserializable: a Deserializable rate response (xml, json, text...)
+        """
+        return await lib.run_in_executor(self.get_rates, request)
+
     def get_tracking(self, request: lib.Serializable) -> lib.Deserializable:
         """Send one or many request(s) to get tracking details from a carrier webservice
 
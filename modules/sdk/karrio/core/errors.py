@@ -84,3 +84,12 @@ class MultiParcelNotSupportedError(ShippingSDKError):
 
     def __init__(self):
         super().__init__(f"Multi-parcel shipment not supported")
+
+
+class RequestTimeoutError(ShippingSDKError):
+    """Raised when a carrier request does not complete within the allowed time."""
+
+    code = "SHIPPING_SDK_REQUEST_TIMEOUT_ERROR"
+
+    def __init__(self, timeout: float):
+        super().__init__(f"Request timed out after {timeout} seconds")
@@ -1,5 +1,13 @@
+import os
+import time
 import typing
+import logging
+import datetime
+import threading
 import concurrent.futures as futures
+import karrio.core.utils.workers as workers
+
+logger = logging.getLogger(__name__)
 
 
 class AbstractCache:
@@ -35,21 +43,313 @@ class Cache:
 
         # sync value in cache if it only exist shallow cache
         if _cache_value is None and _value is not None and self._cache is not None:
-            self._cache.set(key, _cache_value)
+            self._cache.set(key, _result)
 
         return _result
 
     def set(self, key: str, value: typing.Any, timeout: int = 86400):
-        def _save():
-            if isinstance(value, typing.Callable):
-                return value()
-
-            return value
-
-        executor = futures.ThreadPoolExecutor(max_workers=1)
-        promise = executor.submit(_save)
+        # callable values (e.g. logins) are computed by the cache worker pool.
+        promise = (
+            workers.get_worker_pool("cache").submit(value)
+            if isinstance(value, typing.Callable)
+            else workers.completed(value)
+        )
         self._values.update({key: promise})
 
         # set value in cache if it exist
         if self._cache is not None:
-            promise.add_done_callback(lambda _: self._cache.set(key, _.result(), timeout=timeout))
+            promise.add_done_callback(lambda _: self._save(key, _, timeout=timeout))
+
+    def thread_safe(
+        self,
+        refresh_func: typing.Callable[[], dict],
+        cache_key: str,
+        buffer_minutes: float = 30,
+        token_field: str = "access_token",
+        expirable: bool = True,
+    ) -> "ThreadSafeTokenManager":
+        """Return a single-flight accessor of the auth token stored at `cache_key`."""
+        return ThreadSafeTokenManager(
+            self,
+            cache_key,
+            refresh_func,
+            buffer_minutes=buffer_minutes,
+            token_field=token_field,
+            expirable=expirable,
+        )
+
+    def _save(self, key: str, promise: futures.Future, timeout: int):
+        if promise.exception() is not None:
+            logger.warning(f"failed to compute cache value for {key}")
+            return
+
+        self._cache.set(key, promise.result(), timeout=timeout)
+
+
+class TokenManager:
+    """A process-wide manager of the carrier connections auth tokens.
+
+    Tokens are looked up in the connection cache (in-process values then the
+    system cache) and refreshed with a single flight per cache key: one thread
+    per process (and one process when the system cache supports `add`) calls
+    the refresh function while the others wait for its result.
+    Tokens expiring within `renewal_margin` seconds of the refresh threshold
+    are renewed in the background while the current token is still served.
+
+    Environment variables:
+        KARRIO_TOKEN_RENEWAL_MARGIN: background renewal margin in seconds (default 300)
+        KARRIO_TOKEN_LOCK_TIMEOUT: max seconds to wait for another process refresh (default 30)
+    """
+
+    def __init__(
+        self, renewal_margin: float = None, lock_timeout: float = None
+    ) -> None:
+        self.renewal_margin = renewal_margin or float(
+            os.environ.get("KARRIO_TOKEN_RENEWAL_MARGIN") or 300
+        )
+        self.lock_timeout = lock_timeout or float(
+            os.environ.get("KARRIO_TOKEN_LOCK_TIMEOUT") or 30
+        )
+        self._locks: typing.Dict[str, threading.Lock] = {}
+        self._renewing: typing.Set[str] = set()
+        self._lock = threading.Lock()
+        self._metrics = dict(hits=0, waits=0, refreshes=0, renewals=0, failures=0)
+
+    @property
+    def metrics(self) -> typing.Dict[str, int]:
+        with self._lock:
+            return {**self._metrics, "renewing": len(self._renewing)}
+
+    def get_state(
+        self,
+        cache: "Cache",
+        cache_key: str,
+        refresh_func: typing.Callable[[], dict],
+        buffer_minutes: float = 30,
+        token_field: str = "access_token",
+        expirable: bool = True,
+    ) -> dict:
+        """Return a valid token state, refreshing it if needed.
+
+        Args:
+            cache: the connection cache holding the token state
+            cache_key: the credentials cache key
+            refresh_func: the login function returning the new state (with an `expiry`)
+            buffer_minutes: refresh the token this many minutes before its expiry
+            token_field: the token field of the state
+            expirable: whether a state without `expiry` must be refreshed
+                (False for static session tokens)
+
+        Returns:
+            dict: the token state (e.g. {"access_token": "...", "expiry": "..."})
+        """
+        buffer = datetime.timedelta(minutes=buffer_minutes)
+        state = cache.get(cache_key) or {}
+        status = self._status(state, token_field, buffer, expirable)
+
+        if status != "expired":
+            self._count("hits")
+
+            if status == "renew":
+                self._renew(cache, cache_key, refresh_func)
+
+            return state
+
+        with self._key_lock(cache_key):
+            # the token may have been refreshed while waiting for the lock.
+            state = cache.get(cache_key) or {}
+
+            if self._status(state, token_field, buffer, expirable) != "expired":
+                self._count("waits")
+                return state
+
+            return self._refresh(
+                cache, cache_key, refresh_func, token_field, buffer, expirable
+            )
+
+    def _status(
+        self,
+        state: dict,
+        token_field: str,
+        buffer: datetime.timedelta,
+        expirable: bool = True,
+    ) -> str:
+        if state.get(token_field) is None:
+            return "expired"
+
+        # expirable states without expiry are refreshed as they can't be checked.
+        if state.get("expiry") is None:
+            return "expired" if expirable else "valid"
+
+        expiry = _parse_expiry(state["expiry"])
+        now = datetime.datetime.now()
+
+        if expiry is None or expiry <= now + buffer:
+            return "expired"
+
+        if expiry <= now + buffer + datetime.timedelta(seconds=self.renewal_margin):
+            return "renew"
+
+        return "valid"
+
+    def _refresh(
+        self,
+        cache: "Cache",
+        cache_key: str,
+        refresh_func: typing.Callable[[], dict],
+        token_field: str,
+        buffer: datetime.timedelta,
+        expirable: bool = True,
+    ) -> dict:
+        lock_key = f"{cache_key}|lock"
+        system_cache = cache._cache
+        acquired = shared_lock = callable(getattr(system_cache, "add", None))
+
+        # wait for another process to complete the refresh.
+        if shared_lock and not system_cache.add(lock_key, 1, timeout=self.lock_timeout):
+            acquired = False
+            deadline = time.monotonic() + self.lock_timeout
+
+            while time.monotonic() < deadline:
+                time.sleep(0.1)
+                state = system_cache.get(cache_key) or {}
+
+                if self._status(state, token_field, buffer, expirable) != "expired":
+                    self._count("waits")
+                    cache.set(cache_key, state)
+                    return state
+
+                # the other process refresh failed.
+                if system_cache.get(lock_key) is None:
+                    break
+
+        try:
+            state = refresh_func()
+            cache.set(cache_key, state)
+            self._count("refreshes")
+        except Exception:
+            self._count("failures")
+            raise
+        finally:
+            if acquired and callable(getattr(system_cache, "delete", None)):
+                system_cache.delete(lock_key)
+
+        return state
+
+    def _renew(
+        self,
+        cache: "Cache",
+        cache_key: str,
+        refresh_func: typing.Callable[[], dict],
+    ) -> None:
+        with self._lock:
+            if cache_key in self._renewing:
+                return
+
+            self._renewing.add(cache_key)
+
+        lock_key = f"{cache_key}|lock"
+        system_cache = cache._cache
+        shared_lock = callable(getattr(system_cache, "add", None))
+
+        def _run():
+            try:
+                with self._key_lock(cache_key):
+                    # another process is already refreshing the token.
+                    if shared_lock and not system_cache.add(
+                        lock_key, 1, timeout=self.lock_timeout
+                    ):
+                        return
+
+                    try:
+                        cache.set(cache_key, refresh_func())
+                        self._count("renewals")
+                    finally:
+                        if shared_lock and callable(
+                            getattr(system_cache, "delete", None)
+                        ):
+                            system_cache.delete(lock_key)
+            except Exception as e:
+                self._count("failures")
+                logger.warning(f"failed to renew token {cache_key.split('|')[0]}: {e}")
+            finally:
+                with self._lock:
+                    self._renewing.discard(cache_key)
+
+        workers.get_worker_pool("cache").submit(_run)
+
+    def _key_lock(self, cache_key: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(cache_key, threading.Lock())
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self._metrics[metric] += 1
+
+
+class ThreadSafeTokenManager:
+    """The auth token accessor of a carrier connection credentials.
+
+    Example:
+        @property
+        def access_token(self):
+            return self.connection_cache.thread_safe(
+                refresh_func=lambda: login(self),
+                cache_key=f"{self.carrier_name}|{self.client_id}|{self.client_secret}",
+            ).get_token()
+    """
+
+    def __init__(
+        self,
+        cache: Cache,
+        cache_key: str,
+        refresh_func: typing.Callable[[], dict],
+        buffer_minutes: float = 30,
+        token_field: str = "access_token",
+        expirable: bool = True,
+    ) -> None:
+        self.cache = cache
+        self.cache_key = cache_key
+        self.refresh_func = refresh_func
+        self.buffer_minutes = buffer_minutes
+        self.token_field = token_field
+        self.expirable = expirable
+
+    def get_state(self) -> dict:
+        return get_token_manager().get_state(
+            self.cache,
+            self.cache_key,
+            self.refresh_func,
+            buffer_minutes=self.buffer_minutes,
+            token_field=self.token_field,
+            expirable=self.expirable,
+        )
+
+    def get_token(self) -> str:
+        return self.get_state()[self.token_field]
+
+
+_token_manager: typing.Optional[TokenManager] = None
+_token_manager_lock = threading.Lock()
+
+
+def get_token_manager() -> TokenManager:
+    """Return the process-wide token manager, creating it on first use."""
+    global _token_manager
+
+    if _token_manager is None:
+        with _token_manager_lock:
+            if _token_manager is None:
+                _token_manager = TokenManager()
+
+    return _token_manager
+
+
+def _parse_expiry(value) -> typing.Optional[datetime.datetime]:
+    if isinstance(value, datetime.datetime):
+        return value
+
+    try:
+        return datetime.datetime.strptime(str(value), "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
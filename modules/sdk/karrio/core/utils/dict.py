@@ -1,12 +1,140 @@
+import os
 import re
 import enum
 import attr
 import json
 import types
+import operator
+import collections.abc
 import jstruct.utils as jstruct
-from typing import Union, Any, TypeVar, Callable, Type, Optional
+from typing import Union, Any, TypeVar, Callable, Type, Optional, Dict, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 T = TypeVar("T")
+JSON_ENCODER = os.environ.get("KARRIO_JSON_ENCODER", "json")
+
+
+class Unsupported(Exception):
+    """Raised when a value can't be converted without the JSON round-trip."""
+
+
+# per-type conversion plans: (kind, attrs field names)
+_plans: Dict[type, Tuple[str, Tuple[str, ...]]] = {}
+
+
+def _plan(cls: type) -> Tuple[str, Tuple[str, ...]]:
+    """Return how values of `cls` are converted, mirroring `json.dumps` + `jsonify._parser`."""
+    plan = _plans.get(cls)
+
+    if plan is None:
+        if issubclass(cls, str):
+            plan = ("str", ())
+        elif issubclass(cls, int):
+            plan = ("int", ())
+        elif issubclass(cls, float):
+            plan = ("float", ())
+        elif issubclass(cls, (list, tuple)):
+            plan = ("list", ())
+        elif issubclass(cls, dict):
+            plan = ("dict", ())
+        elif attr.has(cls):
+            plan = ("attrs", tuple(a.name for a in attr.fields(cls)))
+        elif issubclass(cls, types.FunctionType):
+            plan = ("none", ())
+        elif issubclass(cls, type):
+            plan = ("type", ())
+        elif issubclass(cls, collections.abc.Callable):
+            plan = ("callable", ())
+        elif issubclass(cls, enum.Enum):
+            plan = ("enum", ())
+        elif issubclass(cls, (set, frozenset)):
+            plan = ("set", ())
+        else:
+            plan = ("object", ())
+
+        _plans[cls] = plan
+
+    return plan
+
+
+def _is_empty(value: Any) -> bool:
+    return value in (None, [], "")
+
+
+def _convert_dict(items, clear_empty: bool, in_attrs: bool) -> dict:
+    pairs = []
+
+    for key, value in items:
+        if key.__class__ is not str:
+            if not isinstance(key, str):
+                raise Unsupported(key)
+            key = str.__str__(key)
+
+        pairs.append((key, to_serializable(value, clear_empty, in_attrs)))
+
+    pairs.sort(key=operator.itemgetter(0))
+
+    return {
+        key: value for key, value in pairs if not (clear_empty and _is_empty(value))
+    }
+
+
+def to_serializable(value: Any, clear_empty: bool = False, in_attrs: bool = False):
+    """Convert a value into JSON compatible python types.
+
+    The result is identical to `json.loads(DICTPARSE.jsonify(value))` (with the
+    `to_dict` empty values clearing applied when `clear_empty` is set) without
+    the string serialization round-trip.
+
+    :raise Unsupported: when the value can't be converted identically.
+    """
+    cls = value.__class__
+
+    if value is None or cls is str or cls is int or cls is float or cls is bool:
+        return value
+    if cls is list or cls is tuple:
+        return [to_serializable(item, clear_empty, in_attrs) for item in value]
+    if cls is dict:
+        return _convert_dict(value.items(), clear_empty, in_attrs)
+
+    kind, fields = _plan(cls)
+
+    if kind == "str":
+        return str.__str__(value)
+    if kind == "int":
+        return int(int.__repr__(value))
+    if kind == "float":
+        return float(float.__repr__(value))
+    if kind == "list":
+        return [to_serializable(item, clear_empty, in_attrs) for item in value]
+    if kind == "dict":
+        return _convert_dict(value.items(), clear_empty, in_attrs)
+    if kind == "attrs":
+        # attrs classes that are callable and named are serialized by name.
+        if not in_attrs and callable(value) and hasattr(value, "__name__"):
+            return value.__name__
+        return _convert_dict(
+            ((name, getattr(value, name)) for name in fields), clear_empty, True
+        )
+    # attr.asdict converts nested sets into lists.
+    if kind == "set" and in_attrs:
+        return [to_serializable(item, clear_empty, in_attrs) for item in value]
+    if kind == "none":
+        return None
+    if kind == "type":
+        return value.__name__ if attr.has(value) else str(value)
+    if kind == "callable":
+        return str(value)
+    if kind == "enum":
+        return to_serializable(value.value, clear_empty)
+    if kind == "object" and hasattr(value, "__dict__"):
+        return _convert_dict(value.__dict__.items(), clear_empty, False)
+
+    raise Unsupported(value)
 
 
 class DICTPARSE:
@@ -36,6 +164,15 @@ class DICTPARSE:
 
             return item
 
+        if JSON_ENCODER == "orjson" and orjson is not None:
+            try:
+                return orjson.dumps(
+                    to_serializable(entity),
+                    option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2,
+                ).decode("utf-8")
+            except (Unsupported, RecursionError, TypeError):
+                pass
+
         return json.dumps(
             entity,
             default=_parser,
@@ -51,6 +188,13 @@ class DICTPARSE:
         :return: a dictionary.
         """
         _clear_empty = clear_empty is not False
+
+        if not isinstance(entity, (str, bytes)):
+            try:
+                return to_serializable(entity, _clear_empty)
+            except (Unsupported, RecursionError):
+                pass  # fallback to the JSON round-trip
+
         if isinstance(entity, str):
             entity = re.sub(",[ \t\r\n]+}", "}", entity)
             entity = re.sub(",[ \t\r\n]+\]", "]", entity)
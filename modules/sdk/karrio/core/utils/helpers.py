@@ -1,25 +1,45 @@
 import io
+import os
 import re
 import ssl
 import uuid
 import string
+import tempfile
 import base64
 import PyPDF2
 import asyncio
 import logging
+import functools
+import threading
+import contextvars
 import urllib.parse
 import PIL.Image
 import PIL.ImageFile
 from urllib.error import HTTPError
-from urllib.request import urlopen, Request, ProxyHandler, build_opener, install_opener
-from typing import List, TypeVar, Callable, Optional, Any, cast
+from urllib.request import Request
+from typing import (
+    IO,
+    List,
+    TypeVar,
+    Callable,
+    Optional,
+    Any,
+    Awaitable,
+    Iterable,
+    Iterator,
+    cast,
+)
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from karrio.core.utils import transport
+from karrio.core.utils.pdf import PdfBundleWriter
 
 logger = logging.getLogger(__name__)
 ssl._create_default_https_context = ssl._create_unverified_context
 PIL.ImageFile.LOAD_TRUNCATED_IMAGES = True
 T = TypeVar("T")
 S = TypeVar("S")
+BUNDLE_CHUNK_SIZE = 64 * 1024
+BUNDLE_MAX_MEMORY_SIZE = 16 * 1024 * 1024
 NEW_LINE = """
 """
 
@@ -84,10 +104,11 @@ def bundle_pdfs(base64_strings: List[str]) -> PyPDF2.PdfMerger:
 
 
 def bundle_imgs(base64_strings: List[str]):
-    image_buffers = [
-        io.BytesIO(base64.b64decode(b64_str)) for b64_str in base64_strings
-    ]
-    images = [PIL.Image.open(buffer) for buffer in image_buffers]
+    return _bundle_images(base64.b64decode(b64_str) for b64_str in base64_strings)
+
+
+def _bundle_images(documents: Iterable[bytes]):
+    images = [PIL.Image.open(io.BytesIO(document)) for document in documents]
     widths, heights = zip(*(i.size for i in images))
 
     max_width = max(widths)
@@ -113,21 +134,78 @@ def bundle_zpls(base64_strings: List[str]) -> str:
 
 def bundle_base64(base64_strings: List[str], format: str = "PDF") -> str:
     """Return a base64 string from a list of base64 strings."""
-    result = io.BytesIO()
-
     if format == "PDF":
+        result = io.BytesIO()
         pdf_buffer = bundle_pdfs(base64_strings)
         pdf_buffer.write(result)
 
+        return base64.b64encode(result.getvalue()).decode("utf-8")
+
+    documents = (base64.b64decode(b64_str) for b64_str in base64_strings)
+
+    with bundle_documents(documents, format=format) as result:
+        return base64.b64encode(result.read()).decode("utf-8")
+
+
+def bundle_documents(
+    documents: Iterable[bytes],
+    format: str = "PDF",
+    max_memory_size: int = BUNDLE_MAX_MEMORY_SIZE,
+) -> IO[bytes]:
+    """Bundle decoded documents into a spooled temporary file.
+
+    The documents are consumed one at a time and the bundle rolls over to disk
+    once larger than `max_memory_size`. The returned file is rewound.
+    """
+    result = tempfile.SpooledTemporaryFile(max_size=max_memory_size)
+
+    if format == "PDF":
+        writer = PdfBundleWriter(result)
+
+        for document in documents:
+            writer.append(document)
+
+        writer.close()
+
     elif "ZPL" in format:
-        content = bundle_zpls(base64_strings)
-        result.write(content.encode("utf-8"))
+        for chunk in iter_bundle(documents, format=format):
+            result.write(chunk)
 
     else:
-        image = bundle_imgs(base64_strings)
+        image = _bundle_images(documents)
         image.save(result, format)
 
-    return base64.b64encode(result.getvalue()).decode("utf-8")
+    result.seek(0)
+    return result
+
+
+def iter_bundle(
+    documents: Iterable[bytes],
+    format: str = "PDF",
+    chunk_size: int = BUNDLE_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Yield a bundle of decoded documents by chunks.
+
+    ZPL documents are yielded as they are consumed. PDF and image documents are
+    bundled into a spooled temporary file first (see `bundle_documents`).
+    """
+    if "ZPL" in format:
+        separator = NEW_LINE.encode("utf-8")
+
+        for document in documents:
+            yield document
+            yield separator
+
+        return
+
+    with bundle_documents(documents, format=format) as result:
+        while True:
+            chunk = result.read(chunk_size)
+
+            if not chunk:
+                break
+
+            yield chunk
 
 
 def zpl_to_pdf(zpl_str: str, width: int, height: int, dpmm: int = 12) -> str:
@@ -183,20 +261,9 @@ def process_request(
 
     _request = Request(**{**kwargs, **payload})
 
-    # Apply proxy settings if provided: Proxy Example` 'username:password@IP_Address:Port'
+    # Proxy settings are applied per request by the transport: Proxy Example` 'username:password@IP_Address:Port'
     if proxy:
-        proxy_info = proxy.split("@")
-        auth_info, host_port = proxy_info[0], proxy_info[1]
-        auth_info = urllib.parse.unquote(auth_info)
-        auth_encoded = base64.b64encode(auth_info.encode()).decode()
-        proxy_url = f"http://{host_port}"
-
-        # Create a ProxyHandler
-        proxy_handler = ProxyHandler({"http": proxy_url, "https": proxy_url})
-        opener = build_opener(proxy_handler)
-        opener.addheaders = [("Proxy-Authorization", f"Basic {auth_encoded}")]
-        install_opener(opener)
-        logger.info(f"Proxy set to: {proxy_url} with credentials")
+        logger.info(f"Proxy set to: http://{proxy.split('@')[-1]} with credentials")
 
     logger.info(f"Request URL:: {_request.full_url}")
 
@@ -252,11 +319,13 @@ def request(
     on_error: Callable[[HTTPError], str] = None,
     trace: Callable[[Any, str], Any] = None,
     proxy: str = None,
+    timeout: float = None,
     **kwargs,
 ) -> str:
     """Return an HTTP response body.
 
     make a http request (wrapper around Request method from built in urllib)
+    sent through the shared pooled transport (see `karrio.core.utils.transport`).
     Proxy example: 'Username:Password@IP_Address:Port'
     """
 
@@ -266,7 +335,11 @@ def request(
     try:
         _request = process_request(_request_id, trace, proxy, **kwargs)
 
-        with urlopen(_request) as f:
+        with transport.get_transport().send(
+            _request,
+            timeout=(timeout if timeout is not None else transport.default_timeout()),
+            proxy=proxy,
+        ) as f:
             _response = process_response(
                 _request_id, f, decoder, on_ok=on_ok, trace=trace
             )
@@ -277,6 +350,142 @@ def request(
     return _response
 
 
+async def request_async(
+    decoder: Callable = decode_bytes,
+    on_ok: Callable[[Any], str] = None,
+    on_error: Callable[[HTTPError], str] = None,
+    trace: Callable[[Any, str], Any] = None,
+    proxy: str = None,
+    timeout: float = None,
+    **kwargs,
+) -> str:
+    """Return an HTTP response body without blocking the running event loop.
+
+    Async counterpart of `request` sent through the transport `send_async`.
+    """
+
+    _request_id = str(uuid.uuid4())
+    logger.debug(f"sending async request ({_request_id})...")
+
+    try:
+        _request = process_request(_request_id, trace, proxy, **kwargs)
+
+        with await transport.get_transport().send_async(
+            _request,
+            timeout=(timeout if timeout is not None else transport.default_timeout()),
+            proxy=proxy,
+        ) as f:
+            _response = process_response(
+                _request_id, f, decoder, on_ok=on_ok, trace=trace
+            )
+
+    except HTTPError as e:
+        _response = process_error(_request_id, e, on_error=on_error, trace=trace)
+
+    return _response
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_nested_executor: contextvars.ContextVar[Optional[ThreadPoolExecutor]] = (
+    contextvars.ContextVar("karrio_nested_executor", default=None)
+)
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    """Return the process-wide bounded thread pool used to offload blocking calls.
+
+    The pool size defaults to 32 and can be set with KARRIO_MAX_WORKERS.
+    """
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=int(os.environ.get("KARRIO_MAX_WORKERS") or 32),
+                    thread_name_prefix="karrio",
+                )
+
+    return _executor
+
+
+def is_shared_executor_thread() -> bool:
+    """Return True in a thread of the shared pool or of a nested executor."""
+    return threading.current_thread().name.startswith("karrio_")
+
+
+def event_loop() -> asyncio.AbstractEventLoop:
+    """Return the event loop running in a dedicated background thread.
+
+    It runs coroutines submitted by `run_sync` from threads that already run
+    a loop without taking a worker of the shared executor.
+    """
+    global _loop, _loop_thread
+
+    if _loop is None:
+        with _executor_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                _loop_thread = threading.Thread(
+                    target=loop.run_forever, name="karrio-loop", daemon=True
+                )
+                _loop_thread.start()
+                _loop = loop
+
+    return _loop
+
+
+async def run_in_executor(function: Callable[..., T], *args, **kwargs) -> T:
+    """Await a blocking function executed in the shared executor.
+
+    Coroutines run by `run_sync` from a pool thread use their own executor.
+    """
+    loop = asyncio.get_running_loop()
+    executor = _nested_executor.get() or shared_executor()
+
+    return await loop.run_in_executor(
+        executor, functools.partial(function, *args, **kwargs)
+    )
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous code.
+
+    When called from a thread that already runs an event loop, the coroutine
+    is executed on the dedicated `event_loop` thread instead. When called from
+    a pool thread, the coroutine gets its own executor so that it never waits
+    on the pool it is running in.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        if is_shared_executor_thread():
+            return _run_nested(awaitable)
+
+        return asyncio.run(awaitable)
+
+    if is_shared_executor_thread() or threading.current_thread() is _loop_thread:
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="karrio_nested"
+        ) as runner:
+            return runner.submit(_run_nested, awaitable).result()
+
+    return asyncio.run_coroutine_threadsafe(awaitable, event_loop()).result()
+
+
+def _run_nested(awaitable: Awaitable[T]) -> T:
+    with ThreadPoolExecutor(thread_name_prefix="karrio_nested") as executor:
+        token = _nested_executor.set(executor)
+
+        try:
+            return asyncio.run(awaitable)
+        finally:
+            _nested_executor.reset(token)
+
+
 def exec_parrallel(
     function: Callable, sequence: List[S], max_workers: int = None
 ) -> List[T]:
@@ -302,25 +511,20 @@ def exec_parrallel(
 
 
 def exec_async(action: Callable, sequence: List[S]) -> List[T]:
+    # Nested fan-outs (e.g. a proxy running per-package requests while itself
+    # executed in the shared pool) get their own pool to avoid exhausting it.
+    if is_shared_executor_thread():
+        with ThreadPoolExecutor(max_workers=max(len(sequence), 1)) as executor:
+            return list(executor.map(action, sequence))
+
     async def run_tasks():
-        # Use asyncio.to_thread instead of loop.run_in_executor
-        # This ensures proper task scheduling and prevents potential task dropping
+        # Blocking actions are offloaded to the shared bounded executor
+        # instead of a per-loop default executor spawning new threads per call.
         return await asyncio.gather(
-            *[asyncio.to_thread(action, args) for args in sequence]
+            *[run_in_executor(action, args) for args in sequence]
         )
 
-    async def run_loop():
-        # Simplified to just return the result of run_tasks
-        # No need for manual loop creation and closing
-        return await run_tasks()
-
-    # Use asyncio.run instead of ThreadPoolExecutor
-    # This properly sets up and tears down the event loop
-    # Preventing issues with loop closure and task cleanup
-    result = asyncio.run(run_loop())
-
-    # Cast the result to the expected type
-    return cast(List[T], result)
+    return cast(List[T], run_sync(run_tasks()))
 
 
 class Location:
@@ -0,0 +1,155 @@
+"""Incremental PDF bundling.
+
+`PdfBundleWriter` appends the pages of PDF documents to an output stream one
+document at a time. Each document objects are renumbered and written as soon
+as the document is appended so only the cross-reference offsets and the page
+ids are kept in memory.
+"""
+
+import io
+import typing
+import PyPDF2
+import PyPDF2.generic as generic
+
+INHERITABLE_PAGE_ATTRIBUTES = ["/Resources", "/MediaBox", "/CropBox", "/Rotate"]
+
+
+class PdfBundleWriter:
+    def __init__(self, stream: typing.IO[bytes]) -> None:
+        self.stream = stream
+        self.position = 0
+        self.offsets: typing.List[typing.Optional[int]] = []
+        self.pages: typing.List[int] = []
+
+        self._write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+        self.pages_id = self._reserve()
+
+    def append(self, document: bytes) -> None:
+        """Write the pages of a PDF document."""
+        reader = PyPDF2.PdfReader(io.BytesIO(document), strict=False)
+        references: typing.Dict[typing.Tuple[int, int], int] = {}
+        pending: typing.List[typing.Tuple[int, generic.IndirectObject]] = []
+
+        def reference(indirect: generic.IndirectObject) -> generic.IndirectObject:
+            key = (indirect.idnum, indirect.generation)
+
+            if key not in references:
+                references[key] = self._reserve()
+                pending.append((references[key], indirect))
+
+            return generic.IndirectObject(references[key], 0, None)
+
+        if reader.is_encrypted:
+            reader.decrypt("")
+
+        for page in reader.pages:
+            page_id = self._reserve()
+            source = getattr(page, "indirect_ref", None)
+
+            if source is not None:
+                references[(source.idnum, source.generation)] = page_id
+
+            content = _copy(
+                {k: v for k, v in page.items() if k != "/Parent"}, reference
+            )
+            for key in INHERITABLE_PAGE_ATTRIBUTES:
+                if key not in content:
+                    inherited = _inherited(page, key)
+
+                    if inherited is not None:
+                        content[generic.NameObject(key)] = _copy(inherited, reference)
+
+            content[generic.NameObject("/Parent")] = generic.IndirectObject(
+                self.pages_id, 0, None
+            )
+            self._write_object(page_id, content)
+            self.pages.append(page_id)
+
+            while any(pending):
+                object_id, indirect = pending.pop()
+                self._write_object(object_id, _copy(indirect.get_object(), reference))
+
+    def close(self) -> None:
+        """Write the pages tree, catalog and cross-reference table."""
+        pages = generic.DictionaryObject()
+        pages[generic.NameObject("/Type")] = generic.NameObject("/Pages")
+        pages[generic.NameObject("/Count")] = generic.NumberObject(len(self.pages))
+        pages[generic.NameObject("/Kids")] = generic.ArrayObject(
+            [generic.IndirectObject(_, 0, None) for _ in self.pages]
+        )
+        self._write_object(self.pages_id, pages)
+
+        catalog_id = self._reserve()
+        catalog = generic.DictionaryObject()
+        catalog[generic.NameObject("/Type")] = generic.NameObject("/Catalog")
+        catalog[generic.NameObject("/Pages")] = generic.IndirectObject(
+            self.pages_id, 0, None
+        )
+        self._write_object(catalog_id, catalog)
+
+        xref = self.position
+        self._write(f"xref\n0 {len(self.offsets) + 1}\n0000000000 65535 f \n".encode())
+        for offset in self.offsets:
+            self._write(f"{offset:010d} 00000 n \n".encode())
+        self._write(
+            (
+                f"trailer\n<< /Size {len(self.offsets) + 1} /Root {catalog_id} 0 R >>\n"
+                f"startxref\n{xref}\n%%EOF\n"
+            ).encode()
+        )
+
+    def _reserve(self) -> int:
+        self.offsets.append(None)
+        return len(self.offsets)
+
+    def _write(self, content: bytes) -> None:
+        self.stream.write(content)
+        self.position += len(content)
+
+    def _write_object(self, object_id: int, value: generic.PdfObject) -> None:
+        buffer = io.BytesIO()
+        value.write_to_stream(buffer, None)
+
+        self.offsets[object_id - 1] = self.position
+        self._write(f"{object_id} 0 obj\n".encode())
+        self._write(buffer.getvalue())
+        self._write(b"\nendobj\n")
+
+
+def _copy(value, reference: typing.Callable):
+    """Copy a PDF object replacing the indirect references."""
+    if isinstance(value, generic.IndirectObject):
+        return reference(value)
+
+    if isinstance(value, generic.StreamObject):
+        stream = value.__class__()
+        stream._data = value._data
+        for k, v in value.items():
+            if k != "/Length":
+                stream[generic.NameObject(k)] = _copy(v, reference)
+        return stream
+
+    if isinstance(value, dict):
+        dictionary = generic.DictionaryObject()
+        for k, v in value.items():
+            dictionary[generic.NameObject(k)] = _copy(v, reference)
+        return dictionary
+
+    if isinstance(value, list):
+        return generic.ArrayObject([_copy(_, reference) for _ in value])
+
+    return value
+
+
+def _inherited(page, key: str):
+    node = page.get("/Parent")
+
+    while node is not None:
+        node = node.get_object()
+
+        if key in node:
+            return node[key]
+
+        node = node.get("/Parent")
+
+    return None
@@ -1,11 +1,13 @@
+import os
 import uuid
 import attr
 import time
 import typing
 import functools
-import concurrent.futures as futures
+import threading
 
 Trace = typing.Callable[[typing.Any, str], typing.Any]
+MAX_RECORDS = int(os.environ.get("KARRIO_TRACER_MAX_RECORDS") or 10000)
 
 
 @attr.s(auto_attribs=True)
@@ -15,25 +17,32 @@ class Record:
     timestamp: float
     metadata: dict = {}
 
+
 class Tracer:
-    def __init__(self, id: str = None) -> None:
+    def __init__(self, id: str = None, max_records: int = None) -> None:
         self.id = id or str(uuid.uuid4())
+        self.max_records = max_records or MAX_RECORDS
+        self.dropped = 0
         self.inner_context: typing.Dict[str, typing.Any] = {}
-        self.inner_recordings: typing.Dict[futures.Future, dict] = {}
+        self.inner_records: typing.List[Record] = []
+        self._lock = threading.Lock()
 
     def trace(
         self, data: typing.Any, key: str, metadata: dict = {}, format: str = None
     ) -> typing.Any:
-        def _save():
-            return Record(
-                key=key,
-                data={"format": format, **data},
-                timestamp=time.time(),
-                metadata=metadata,
-            )
-
-        promise = futures.ThreadPoolExecutor(max_workers=1)
-        self.inner_recordings.update({promise.submit(_save): data})
+        record = Record(
+            key=key,
+            data={"format": format, **data},
+            timestamp=time.time(),
+            metadata=metadata,
+        )
+
+        with self._lock:
+            # records over the buffer capacity are dropped and counted.
+            if len(self.inner_records) >= self.max_records:
+                self.dropped += 1
+            else:
+                self.inner_records.append(record)
 
         return data
 
@@ -42,7 +51,8 @@ class Tracer:
 
     @property
     def records(self) -> typing.List[Record]:
-        return [rec.result() for rec in futures.as_completed(self.inner_recordings)]
+        with self._lock:
+            return list(self.inner_records)
 
     @property
     def context(self) -> typing.Dict[str, typing.Any]:
@@ -0,0 +1,546 @@
+"""Karrio HTTP transport layer.
+
+The transports defined here sit behind `lib.request` and are shared by every
+connector. The default `PooledTransport` keeps per-host pools of keep-alive
+connections so that consecutive calls to the same carrier reuse the TCP/TLS
+session instead of paying a new handshake per request.
+
+Environment variables:
+    KARRIO_HTTP_TRANSPORT: "pooled" (default), "urllib" or "http2" (requires httpx[http2])
+    KARRIO_HTTP_POOL_SIZE: max idle connections kept per host (default 10)
+    KARRIO_HTTP_TIMEOUT: default request timeout in seconds (default: no timeout)
+"""
+
+import io
+import os
+import abc
+import ssl
+import base64
+import select
+import asyncio
+import weakref
+import typing
+import logging
+import threading
+import http.client
+import urllib.error
+import urllib.parse
+import urllib.request
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 10
+RETRYABLE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+# methods sent again when a reused connection fails after the request was written.
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class Response(io.BytesIO):
+    """A fully read HTTP response exposing the `urlopen` response interface."""
+
+    def __init__(
+        self,
+        content: bytes,
+        status: int,
+        reason: str,
+        headers: typing.Any,
+        url: str,
+    ) -> None:
+        super().__init__(content)
+        self.status = status
+        self.code = status
+        self.reason = reason
+        self.headers = headers
+        self.url = url
+
+    def getcode(self) -> int:
+        return self.status
+
+    def geturl(self) -> str:
+        return self.url
+
+    def info(self):
+        return self.headers
+
+    def getheader(self, name: str, default: str = None) -> typing.Optional[str]:
+        return self.headers.get(name, default)
+
+    def raise_for_status(self) -> "Response":
+        """Raise a `urllib.error.HTTPError` like `urlopen` does for error statuses."""
+        if self.status >= 400:
+            raise urllib.error.HTTPError(
+                self.url,
+                self.status,
+                self.reason,
+                self.headers,
+                io.BytesIO(self.getvalue()),
+            )
+
+        return self
+
+
+class Proxy:
+    """Parsed proxy definition: 'username:password@IP_Address:Port'."""
+
+    def __init__(self, value: str) -> None:
+        auth_info, _, host_port = value.rpartition("@")
+        host, _, port = host_port.partition(":")
+
+        self.value = value
+        self.host = host
+        self.port = int(port or 80)
+        self.url = f"http://{host_port}"
+        self.headers = (
+            {
+                "Proxy-Authorization": "Basic "
+                + base64.b64encode(urllib.parse.unquote(auth_info).encode()).decode()
+            }
+            if any(auth_info)
+            else {}
+        )
+
+
+class Transport(abc.ABC):
+    """HTTP transport interface used by `lib.request`."""
+
+    @abc.abstractmethod
+    def send(
+        self,
+        request: urllib.request.Request,
+        timeout: float = None,
+        proxy: str = None,
+    ) -> Response:
+        """Send the request and return the response.
+
+        Raises `urllib.error.HTTPError` for error statuses like `urlopen`.
+        """
+        pass
+
+    async def send_async(
+        self,
+        request: urllib.request.Request,
+        timeout: float = None,
+        proxy: str = None,
+    ) -> Response:
+        """Send the request without blocking the running event loop.
+
+        Transports without a native async client run `send` in the shared executor.
+        """
+        from karrio.core.utils.helpers import run_in_executor
+
+        return await run_in_executor(self.send, request, timeout=timeout, proxy=proxy)
+
+    @property
+    def metrics(self) -> typing.Dict[str, int]:
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+class UrllibTransport(Transport):
+    """Legacy transport opening a new connection with `urllib` for every request.
+
+    The proxy handler is applied per call instead of being installed globally.
+    """
+
+    def send(self, request, timeout=None, proxy=None):
+        handlers = []
+
+        if proxy:
+            _proxy = Proxy(proxy)
+            handlers.append(
+                urllib.request.ProxyHandler({"http": _proxy.url, "https": _proxy.url})
+            )
+            request.headers.update(_proxy.headers)
+
+        opener = urllib.request.build_opener(*handlers)
+        options = dict(timeout=timeout) if timeout is not None else {}
+
+        with opener.open(request, **options) as response:
+            return Response(
+                response.read(),
+                response.status,
+                response.reason,
+                response.headers,
+                response.url,
+            )
+
+
+class _TrackedConnection:
+    """Record whether the current request was written to the connection.
+
+    A request failing before its first write can't have been received by the
+    server and is always safe to send again.
+    """
+
+    sent = False
+
+    def connect(self):
+        super().connect()
+        self.sent = False  # the proxy tunnel request isn't the request sent.
+
+    def send(self, data):
+        super().send(data)
+        self.sent = True
+
+
+class _HTTPConnection(_TrackedConnection, http.client.HTTPConnection):
+    pass
+
+
+class _HTTPSConnection(_TrackedConnection, http.client.HTTPSConnection):
+    pass
+
+
+class ConnectionPool:
+    """A thread-safe LIFO pool of idle keep-alive connections to a single origin."""
+
+    def __init__(
+        self,
+        scheme: str,
+        host: str,
+        port: int,
+        maxsize: int = DEFAULT_POOL_SIZE,
+        proxy: Proxy = None,
+    ) -> None:
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self.proxy = proxy
+        self._idle: typing.List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def new_connection(self, timeout: float = None) -> http.client.HTTPConnection:
+        options = dict(timeout=timeout) if timeout is not None else {}
+        target = (
+            dict(host=self.proxy.host, port=self.proxy.port)
+            if self.proxy
+            else dict(host=self.host, port=self.port)
+        )
+
+        if self.scheme == "https":
+            connection = _HTTPSConnection(
+                **target, context=ssl._create_default_https_context(), **options
+            )
+
+            if self.proxy:
+                connection.set_tunnel(self.host, self.port, headers=self.proxy.headers)
+
+            return connection
+
+        return _HTTPConnection(**target, **options)
+
+    def acquire(self) -> typing.Optional[http.client.HTTPConnection]:
+        """Return an idle connection, skipping the ones closed by the server."""
+        while True:
+            with self._lock:
+                connection = self._idle.pop() if any(self._idle) else None
+
+            if connection is None or not _is_dropped(connection):
+                return connection
+
+            connection.close()
+
+    def release(self, connection: http.client.HTTPConnection) -> bool:
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append(connection)
+                return True
+
+        connection.close()
+        return False
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for connection in idle:
+            connection.close()
+
+
+class PooledTransport(Transport):
+    """Transport reusing keep-alive connections from per-origin pools.
+
+    Pools are keyed by (scheme, host, port, proxy) so that gateways configured
+    with different proxies never share connections.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE) -> None:
+        self.pool_size = pool_size
+        self._pools: typing.Dict[tuple, ConnectionPool] = {}
+        self._lock = threading.Lock()
+        self._metrics = dict(hits=0, misses=0, discarded=0, retries=0)
+
+    @property
+    def metrics(self) -> typing.Dict[str, int]:
+        with self._lock:
+            return {**self._metrics, "pools": len(self._pools)}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._metrics[key] += 1
+
+    def get_pool(self, url: str, proxy: str = None) -> ConnectionPool:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port, proxy)
+
+        with self._lock:
+            if key not in self._pools:
+                self._pools[key] = ConnectionPool(
+                    scheme,
+                    parts.hostname,
+                    port,
+                    maxsize=self.pool_size,
+                    proxy=(Proxy(proxy) if proxy else None),
+                )
+
+            return self._pools[key]
+
+    def send(self, request, timeout=None, proxy=None):
+        url = request.full_url
+        method = request.get_method()
+        data = request.data
+        headers = {**request.headers, **request.unredirected_hdrs}
+
+        for _ in range(MAX_REDIRECTS):
+            response = self._send_once(url, method, data, headers, timeout, proxy)
+
+            if (
+                response.status not in REDIRECT_CODES
+                or "location" not in response.headers
+            ):
+                return response.raise_for_status()
+
+            url = urllib.parse.urljoin(url, response.headers["location"])
+            if response.status in (301, 302, 303) and method != "HEAD":
+                method, data = "GET", None
+                headers = {
+                    k: v
+                    for k, v in headers.items()
+                    if k.lower() not in ("content-length", "content-type")
+                }
+
+        return response.raise_for_status()
+
+    def _send_once(self, url, method, data, headers, timeout, proxy) -> Response:
+        pool = self.get_pool(url, proxy)
+        parts = urllib.parse.urlsplit(url)
+        path = (
+            url  # plain http requests through a proxy use the absolute form
+            if pool.proxy and pool.scheme == "http"
+            else urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        )
+        _headers = {
+            "Host": parts.netloc,
+            "User-Agent": "Python-urllib/%s.%s" % __import__("sys").version_info[:2],
+            **(pool.proxy.headers if pool.proxy and pool.scheme == "http" else {}),
+            **headers,
+        }
+        if data is not None and not any(k.lower() == "content-type" for k in _headers):
+            _headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        connection = pool.acquire()
+        reused = connection is not None
+        self._count("hits" if reused else "misses")
+
+        while True:
+            connection = connection or pool.new_connection(timeout)
+            if timeout is not None:
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+
+            try:
+                connection.sent = False
+                connection.request(method, path, body=data, headers=_headers)
+                _response = connection.getresponse()
+                content = _response.read()
+                break
+            except RETRYABLE_ERRORS:
+                connection.close()
+                # a pooled connection may have been closed by the server while idle
+                # but a written request may have been processed (e.g. label bought).
+                if not reused or (
+                    connection.sent and method.upper() not in IDEMPOTENT_METHODS
+                ):
+                    raise
+                self._count("retries")
+                connection, reused = None, False
+            except Exception:
+                connection.close()
+                raise
+
+        if _response.will_close or not pool.release(connection):
+            connection.close()
+            self._count("discarded")
+
+        return Response(
+            content, _response.status, _response.reason, _response.headers, url
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+
+        for pool in pools:
+            pool.close()
+
+
+def _is_dropped(connection: http.client.HTTPConnection) -> bool:
+    """Whether an idle connection was closed (or written to) by the server."""
+    if connection.sock is None:
+        return True
+
+    try:
+        readable, _, _ = select.select([connection.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+
+    return any(readable)
+
+
+class HTTPXTransport(Transport):
+    """Optional HTTP/2 capable transport backed by `httpx` (pip install httpx[http2])."""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, http2: bool = True) -> None:
+        import httpx
+
+        self.httpx = httpx
+        self.http2 = http2
+        self.limits = httpx.Limits(max_keepalive_connections=pool_size)
+        self._clients: typing.Dict[typing.Optional[str], typing.Any] = {}
+        # async clients are bound to the event loop they were created in.
+        self._async_clients: typing.MutableMapping[typing.Any, dict] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _client_options(self, proxy: str = None) -> dict:
+        _proxy = Proxy(proxy) if proxy else None
+
+        return dict(
+            http2=self.http2,
+            verify=False,
+            limits=self.limits,
+            follow_redirects=True,
+            timeout=None,
+            **(
+                dict(proxy=self.httpx.Proxy(_proxy.url, headers=_proxy.headers))
+                if _proxy
+                else {}
+            ),
+        )
+
+    def get_client(self, proxy: str = None):
+        with self._lock:
+            if proxy not in self._clients:
+                self._clients[proxy] = self.httpx.Client(**self._client_options(proxy))
+
+            return self._clients[proxy]
+
+    def get_async_client(self, proxy: str = None):
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            if proxy not in clients:
+                clients[proxy] = self.httpx.AsyncClient(**self._client_options(proxy))
+
+            return clients[proxy]
+
+    def _request_options(self, request: urllib.request.Request, timeout: float):
+        return dict(
+            method=request.get_method(),
+            url=request.full_url,
+            content=request.data,
+            headers={**request.headers, **request.unredirected_hdrs},
+            timeout=timeout,
+        )
+
+    def _to_response(self, response) -> Response:
+        return Response(
+            response.content,
+            response.status_code,
+            response.reason_phrase,
+            response.headers,
+            str(response.url),
+        ).raise_for_status()
+
+    def send(self, request, timeout=None, proxy=None):
+        return self._to_response(
+            self.get_client(proxy).request(**self._request_options(request, timeout))
+        )
+
+    async def send_async(self, request, timeout=None, proxy=None):
+        return self._to_response(
+            await self.get_async_client(proxy).request(
+                **self._request_options(request, timeout)
+            )
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+
+        for client in clients:
+            client.close()
+
+
+_transport: typing.Optional[Transport] = None
+_transport_lock = threading.Lock()
+
+
+def create_transport(kind: str = None, pool_size: int = None, **kwargs) -> Transport:
+    kind = kind or os.environ.get("KARRIO_HTTP_TRANSPORT") or "pooled"
+    pool_size = pool_size or int(
+        os.environ.get("KARRIO_HTTP_POOL_SIZE") or DEFAULT_POOL_SIZE
+    )
+
+    if kind == "urllib":
+        return UrllibTransport()
+
+    if kind == "http2":
+        return HTTPXTransport(pool_size=pool_size, **kwargs)
+
+    return PooledTransport(pool_size=pool_size)
+
+
+def get_transport() -> Transport:
+    """Return the process-wide transport, creating it from the environment on first use."""
+    global _transport
+
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = create_transport()
+
+    return _transport
+
+
+def set_transport(transport: Transport) -> Transport:
+    """Replace the process-wide transport and close the previous one."""
+    global _transport
+
+    with _transport_lock:
+        previous, _transport = _transport, transport
+
+    if previous is not None and previous is not transport:
+        previous.close()
+
+    return transport
+
+
+def default_timeout() -> typing.Optional[float]:
+    value = os.environ.get("KARRIO_HTTP_TIMEOUT")
+    return float(value) if value else None
@@ -0,0 +1,135 @@
+"""Process-wide bounded worker pools for SDK background work (e.g. cache values computation).
+
+Environment variables:
+    KARRIO_WORKER_POOL_SIZE: number of worker threads (default 8)
+    KARRIO_WORKER_POOL_MAX_PENDING: max queued + running tasks before
+        new tasks run inline in the caller thread (default 256)
+"""
+
+import os
+import typing
+import logging
+import threading
+import concurrent.futures as futures
+
+logger = logging.getLogger(__name__)
+T = typing.TypeVar("T")
+
+
+class WorkerPool:
+    """A size-bounded thread pool applying backpressure once saturated.
+
+    When `max_pending` tasks are already queued or running, `submit` executes
+    the task in the caller thread instead of growing the queue. Tasks submitted
+    from a thread of the pool also run inline so they never wait on the pool
+    they are running in.
+    """
+
+    def __init__(
+        self, max_workers: int = None, max_pending: int = None, name: str = "worker"
+    ) -> None:
+        self.max_workers = max_workers or int(
+            os.environ.get("KARRIO_WORKER_POOL_SIZE") or 8
+        )
+        self.max_pending = max_pending or int(
+            os.environ.get("KARRIO_WORKER_POOL_MAX_PENDING") or 256
+        )
+        self._prefix = f"karrio_{name}"
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=self._prefix
+        )
+        self._pending: typing.Set[futures.Future] = set()
+        self._lock = threading.Lock()
+        self._metrics = dict(submitted=0, inline=0, failed=0)
+        self._closed = False
+
+    @property
+    def metrics(self) -> typing.Dict[str, int]:
+        with self._lock:
+            return {**self._metrics, "pending": len(self._pending)}
+
+    def submit(
+        self, function: typing.Callable[..., T], *args, **kwargs
+    ) -> "futures.Future[T]":
+        with self._lock:
+            saturated = (
+                self._closed
+                or len(self._pending) >= self.max_pending
+                or self.is_worker_thread()
+            )
+            self._metrics["inline" if saturated else "submitted"] += 1
+
+            if not saturated:
+                promise = self._executor.submit(function, *args, **kwargs)
+                self._pending.add(promise)
+
+        if saturated:
+            return self._run_inline(function, *args, **kwargs)
+
+        promise.add_done_callback(self._done)
+        return promise
+
+    def is_worker_thread(self) -> bool:
+        return threading.current_thread().name.startswith(f"{self._prefix}_")
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait for the submitted tasks to complete.
+
+        Returns:
+            bool: whether all the tasks completed within the timeout
+        """
+        with self._lock:
+            pending = list(self._pending)
+
+        _, not_done = futures.wait(pending, timeout=timeout)
+        return len(not_done) == 0
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting background tasks (they run inline) and release the workers."""
+        with self._lock:
+            self._closed = True
+
+        self._executor.shutdown(wait=wait)
+
+    def _done(self, promise: futures.Future) -> None:
+        with self._lock:
+            self._pending.discard(promise)
+            if not promise.cancelled() and promise.exception() is not None:
+                self._metrics["failed"] += 1
+
+    def _run_inline(self, function, *args, **kwargs) -> futures.Future:
+        promise: futures.Future = futures.Future()
+
+        try:
+            promise.set_result(function(*args, **kwargs))
+        except Exception as e:
+            with self._lock:
+                self._metrics["failed"] += 1
+            promise.set_exception(e)
+
+        return promise
+
+
+_pools: typing.Dict[str, WorkerPool] = {}
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool(name: str = "worker") -> WorkerPool:
+    """Return the process-wide worker pool of that name, creating it on first use.
+
+    Auth token logins and renewals run on the "cache" pool so they never queue
+    behind unrelated background work.
+    """
+    if name not in _pools:
+        with _pool_lock:
+            if name not in _pools:
+                _pools[name] = WorkerPool(name=name)
+
+    return _pools[name]
+
+
+def completed(value: T) -> "futures.Future[T]":
+    """Return an already resolved future."""
+    promise: futures.Future = futures.Future()
+    promise.set_result(value)
+    return promise
@@ -766,6 +766,20 @@ def run_asynchronously(
     return utils.exec_async(predicate, sequence)
 
 
+async def run_in_executor(
+    predicate: typing.Callable[..., T],
+    *args,
+    **kwargs,
+) -> T:
+    """Await a blocking function executed in the shared bounded executor."""
+    return await utils.run_in_executor(predicate, *args, **kwargs)
+
+
+def run_sync(awaitable: typing.Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous code."""
+    return utils.run_sync(awaitable)
+
+
 # endregion
 
 # -----------------------------------------------------------
@@ -780,6 +794,7 @@ def request(
     on_error: typing.Callable = None,
     trace: typing.Callable[[typing.Any, str], typing.Any] = None,
     proxy: str = None,
+    timeout: float = None,
     **kwargs,
 ) -> str:
     return utils.request(
@@ -788,10 +803,63 @@ def request(
         on_error=on_error,
         trace=trace,
         proxy=proxy,
+        timeout=timeout,
+        **kwargs,
+    )
+
+
+async def request_async(
+    decoder: typing.Callable = utils.decode_bytes,
+    on_ok: typing.Callable = None,
+    on_error: typing.Callable = None,
+    trace: typing.Callable[[typing.Any, str], typing.Any] = None,
+    proxy: str = None,
+    timeout: float = None,
+    **kwargs,
+) -> str:
+    """Async counterpart of `lib.request`.
+
+    Example:
+        response = await lib.request_async(url=f"{settings.server_url}/rates", data=data)
+    """
+    return await utils.request_async(
+        decoder=decoder,
+        on_ok=on_ok,
+        on_error=on_error,
+        trace=trace,
+        proxy=proxy,
+        timeout=timeout,
         **kwargs,
     )
 
 
+def get_http_transport() -> utils.transport.Transport:
+    """Return the process-wide HTTP transport used by `lib.request`.
+
+    Example:
+        print(lib.get_http_transport().metrics)
+        # {"hits": 12, "misses": 3, "discarded": 0, "retries": 0, "pools": 3}
+    """
+    return utils.transport.get_transport()
+
+
+def set_http_transport(
+    transport: utils.transport.Transport,
+) -> utils.transport.Transport:
+    """Replace the process-wide HTTP transport used by `lib.request`."""
+    return utils.transport.set_transport(transport)
+
+
+def get_token_manager() -> utils.caching.TokenManager:
+    """Return the process-wide carrier auth tokens manager.
+
+    Example:
+        print(lib.get_token_manager().metrics)
+        # {"hits": 40, "waits": 7, "refreshes": 1, "renewals": 0, "failures": 0, "renewing": 0}
+    """
+    return utils.caching.get_token_manager()
+
+
 # endregion
 
 # -----------------------------------------------------------
@@ -843,6 +911,22 @@ def bundle_base64(
     return utils.bundle_base64(base64_strings, format=format)
 
 
+def bundle_documents(
+    documents: typing.Iterable[bytes],
+    format: str = "PDF",
+) -> typing.IO[bytes]:
+    """Bundle decoded documents into a (rewound) spooled temporary file."""
+    return utils.bundle_documents(documents, format=format)
+
+
+def iter_bundle(
+    documents: typing.Iterable[bytes],
+    format: str = "PDF",
+) -> typing.Iterator[bytes]:
+    """Yield a bundle of decoded documents by chunks."""
+    return utils.iter_bundle(documents, format=format)
+
+
 def to_buffer(
     base64_string: str,
     **kwargs,
@@ -1,16 +1,22 @@
 """Karrio Interface references."""
 
+import os
 import attr
+import json
 import pydoc
 import typing
 import pkgutil
+import logging
+import functools
+import importlib
+import threading
 
 import karrio.lib as lib
 import karrio.mappers as mappers
 import karrio.core.units as units
 import karrio.core.metadata as metadata
 
-
+logger = logging.getLogger(__name__)
 PROVIDERS = None
 PROVIDERS_DATA = None
 REFERENCES = None
@@ -23,18 +29,133 @@ COMMON_FIELDS = [
     "config",
     # "services",
 ]
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+USE_MANIFESTS = os.environ.get("KARRIO_USE_MANIFESTS", "true").lower() not in (
+    "false",
+    "0",
+)
+
+
+class ProviderRegistry(typing.Mapping[str, metadata.Metadata]):
+    """A memoized registry of the installed carrier extensions.
+
+    The `karrio.mappers` namespace is only scanned once and each extension
+    module is imported on its first lookup (e.g. `karrio.mappers.fedex` is
+    imported when `registry["fedex"]` is first accessed).
+    The extensions static references are read from their `manifest.json`
+    (see `generate_manifests`) so that they can be served without importing
+    the connectors code.
+    Call `refresh()` to pick up extensions installed at runtime.
+    """
+
+    def __init__(self) -> None:
+        self._names: typing.Optional[typing.List[str]] = None
+        self._paths: typing.Dict[str, typing.Optional[str]] = {}
+        self._providers: typing.Dict[str, metadata.Metadata] = {}
+        self._manifests: typing.Dict[str, dict] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def names(self) -> typing.List[str]:
+        """The installed extension names (no extension module is imported)."""
+        if self._names is None:
+            with self._lock:
+                if self._names is None:
+                    paths: typing.Dict[str, typing.Optional[str]] = {}
+                    for finder, name, _ in pkgutil.iter_modules(mappers.__path__):
+                        directory = getattr(finder, "path", None)
+                        paths.setdefault(
+                            name, directory and os.path.join(directory, name)
+                        )
+
+                    self._paths = paths
+                    self._names = sorted(paths.keys())
+
+        return self._names
+
+    def path(self, name: str) -> typing.Optional[str]:
+        """The directory of an extension mapper package (e.g. `.../karrio/mappers/fedex`)."""
+        if name not in self.names:
+            raise KeyError(name)
+
+        return self._paths.get(name)
+
+    def manifest(self, name: str) -> dict:
+        """The static references of an extension.
+
+        The extension is only imported when its manifest is missing or outdated.
+        """
+        manifest = self._manifests.get(name)
+
+        if manifest is not None:
+            return manifest
+
+        path = self.path(name)
+
+        with self._lock:
+            if name not in self._manifests:
+                self._manifests[name] = (
+                    load_manifest(path) if USE_MANIFESTS and path else None
+                ) or collect_manifest(self[name])
+
+            return self._manifests[name]
+
+    def __getitem__(self, name: str) -> metadata.Metadata:
+        provider = self._providers.get(name)
+
+        if provider is not None:
+            return provider
+
+        if name not in self.names:
+            raise KeyError(name)
+
+        with self._lock:
+            if name not in self._providers:
+                module = importlib.import_module(f"{mappers.__name__}.{name}")
+                self._providers[name] = module.METADATA
+
+            return self._providers[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.names
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def loaded(self) -> typing.List[str]:
+        """The extension names already imported."""
+        return list(self._providers.keys())
+
+    def refresh(self) -> "ProviderRegistry":
+        """Forget the discovered extensions and the computed references."""
+        global PROVIDERS, PROVIDERS_DATA, REFERENCES
+
+        with self._lock:
+            importlib.invalidate_caches()
+            mappers.__path__ = pkgutil.extend_path(mappers.__path__, mappers.__name__)
+            self._names = None
+            self._paths = {}
+            self._providers = {}
+            self._manifests = {}
+            PROVIDERS, PROVIDERS_DATA, REFERENCES = None, None, None
+
+        logger.info("carrier extensions registry refreshed")
+        return self
+
+
+registry = ProviderRegistry()
 
 
 def import_extensions() -> typing.Dict[str, metadata.Metadata]:
+    """Import all the installed extensions and return their metadata."""
     global PROVIDERS
-    modules = {
-        name: __import__(f"{mappers.__name__}.{name}", fromlist=[name])
-        for _, name, _ in pkgutil.iter_modules(mappers.__path__)
-    }
 
-    PROVIDERS = {
-        carrier_name: module.METADATA for carrier_name, module in modules.items()
-    }
+    PROVIDERS = dict(registry.items())
 
     return PROVIDERS
 
@@ -66,74 +187,200 @@ def detect_capabilities(proxy_methods: typing.List[str]) -> typing.List[str]:
 
 
 def detect_proxy_methods(proxy_type: object) -> typing.List[str]:
-    return [
+    return list(_proxy_methods(proxy_type))
+
+
+@functools.lru_cache(maxsize=None)
+def _proxy_methods(proxy_type: object) -> typing.Tuple[str, ...]:
+    return tuple(
         prop
         for prop in proxy_type.__dict__.keys()
         if "_" not in prop[0] and prop != "settings"
-    ]
+    )
+
+
+def collect_manifest(provider: metadata.Metadata) -> dict:
+    """Compute the static (JSON serializable) references of an extension."""
+    enum_values = lambda enum: lib.identity(
+        None if enum is None else {c.name: c.value for c in list(enum)}
+    )
+    manifest = dict(
+        version=MANIFEST_VERSION,
+        id=provider.id,
+        label=provider.label,
+        is_hub=provider.is_hub,
+        services=enum_values(provider.services),
+        options=collect_options(provider.options),
+        connection_configs=lib.identity(
+            None
+            if provider.connection_configs is None
+            else {
+                c.name: lib.to_dict(
+                    dict(
+                        name=c.name,
+                        code=c.value.code,
+                        required=False,
+                        type=parse_type(c.value.type),
+                        enum=lib.identity(
+                            None
+                            if "enum" not in str(c.value.type).lower()
+                            else [c.name for c in c.value.type]
+                        ),
+                    )
+                )
+                for c in list(provider.connection_configs)
+            }
+        ),
+        connection_fields=lib.identity(
+            None
+            if provider.Settings is None
+            else {
+                _.name: lib.to_dict(
+                    dict(
+                        name=_.name,
+                        type=parse_type(_.type),
+                        required="NOTHING" in str(_.default),
+                        default=lib.identity(
+                            lib.to_dict(lib.to_json(_.default))
+                            if ("NOTHING" not in str(_.default))
+                            else None
+                        ),
+                        enum=lib.identity(
+                            None
+                            if "enum" not in str(_.type).lower()
+                            else [c.name for c in _.type]
+                        ),
+                    )
+                )
+                for _ in provider.Settings.__attrs_attrs__
+                if (_.name not in COMMON_FIELDS)
+                or (provider.has_intl_accounts and _.name == "account_country_code")
+            }
+        ),
+        capabilities=lib.identity(
+            None
+            if provider.Proxy is None
+            else sorted(detect_capabilities(detect_proxy_methods(provider.Proxy)))
+        ),
+        packaging_types=enum_values(provider.packaging_types),
+        package_presets=lib.identity(
+            None
+            if provider.package_presets is None
+            else {c.name: lib.to_dict(c.value) for c in list(provider.package_presets)}
+        ),
+        service_levels=lib.identity(
+            None
+            if provider.service_levels is None
+            else lib.to_dict(provider.service_levels)
+        ),
+    )
+
+    return json.loads(json.dumps(manifest, default=str))
+
+
+def collect_options(options: typing.Optional[typing.Type]) -> typing.Optional[dict]:
+    if options is None:
+        return None
+
+    return {
+        c.name: dict(code=c.value.code, type=parse_type(c.value.type))
+        for c in list(options)
+    }
+
+
+def load_manifest(path: str) -> typing.Optional[dict]:
+    """Read the manifest of the extension mapper package at `path`.
+
+    Returns:
+        None if the manifest does not exist or is older than the extension code.
+    """
+    filename = os.path.join(path, MANIFEST_FILENAME)
+
+    try:
+        generated_at = os.stat(filename).st_mtime
+
+        with open(filename, "r") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+
+    # the connector ships karrio/mappers/<name> and karrio/providers/<name> side by side.
+    name = os.path.basename(path)
+    sources = [path, os.path.join(os.path.dirname(path), "..", "providers", name)]
+    outdated = any(
+        os.stat(os.path.join(root, file)).st_mtime > generated_at
+        for source in sources
+        for root, _, files in os.walk(source)
+        for file in files
+        if file != MANIFEST_FILENAME and file.endswith((".py", ".json"))
+    )
+
+    if outdated:
+        logger.info(f"outdated {name} extension manifest ignored")
+        return None
+
+    return manifest
+
+
+def generate_manifests(
+    names: typing.Optional[typing.List[str]] = None,
+) -> typing.Dict[str, str]:
+    """Write the `manifest.json` of the installed extensions.
+
+    Meant to run at build time once the connectors are installed, e.g.:
+        python -c "import karrio.references as r; r.generate_manifests()"
+
+    Returns:
+        the generated manifests path per extension name.
+    """
+    generated: typing.Dict[str, str] = {}
+
+    for name in names or registry.names:
+        path = registry.path(name)
+
+        if path is None:
+            continue
+
+        filename = os.path.join(path, MANIFEST_FILENAME)
+
+        try:
+            with open(filename, "w") as file:
+                json.dump(collect_manifest(registry[name]), file, indent=2)
+        except OSError as e:
+            logger.warning(f"failed to write {name} extension manifest: {e}")
+            continue
+
+        generated.update({name: filename})
+
+    return generated
 
 
 def collect_references() -> dict:
+    """Collect the karrio and installed extensions references.
+
+    The extensions references are read from their manifests when available
+    and the result is memoized until `registry.refresh()`.
+    """
     global REFERENCES
-    if PROVIDERS_DATA is None:
-        collect_providers_data()
+    if REFERENCES is not None:
+        return REFERENCES
 
-    services = {
-        key: {c.name: c.value for c in list(mapper["services"])}  # type: ignore
-        for key, mapper in PROVIDERS_DATA.items()
-        if mapper.get("services") is not None
+    manifests = {name: registry.manifest(name) for name in registry}
+    universal = dict(
+        options=collect_options(units.ShippingOption),
+        packaging_types={c.name: c.value for c in list(units.PackagingUnit)},
+    )
+    collect = lambda field, extensions: {
+        key: manifest[field]
+        for key, manifest in extensions.items()
+        if manifest.get(field) is not None
     }
-    options = {
-        key: {c.name: dict(code=c.value.code, type=parse_type(c.value.type)) for c in list(mapper["options"])}  # type: ignore
-        for key, mapper in PROVIDERS_DATA.items()
-        if mapper.get("options") is not None
-    }
-    connection_configs = {
-        key: {
-            c.name: lib.to_dict(
-                dict(
-                    name=c.name,
-                    code=c.value.code,
-                    required=False,
-                    type=parse_type(c.value.type),
-                    enum=lib.identity(
-                        None
-                        if "enum" not in str(c.value.type).lower()
-                        else [c.name for c in c.value.type]
-                    ),
-                )
-            )
-            for c in list(mapper["connection_configs"])
-        }
-        for key, mapper in PROVIDERS_DATA.items()
-        if mapper.get("connection_configs") is not None
-    }  # type: ignore
-    connection_fields = {
-        mapper["id"]: {
-            _.name: lib.to_dict(
-                dict(
-                    name=_.name,
-                    type=parse_type(_.type),
-                    required="NOTHING" in str(_.default),
-                    default=lib.identity(
-                        lib.to_dict(lib.to_json(_.default))
-                        if ("NOTHING" not in str(_.default))
-                        else None
-                    ),
-                    enum=lib.identity(
-                        None
-                        if "enum" not in str(_.type).lower()
-                        else [c.name for c in _.type]
-                    ),
-                )
-            )
-            for _ in mapper["Settings"].__attrs_attrs__
-            if (_.name not in COMMON_FIELDS)
-            or (mapper.get("has_intl_accounts") and _.name == "account_country_code")
-        }
-        for _, mapper in PROVIDERS_DATA.items()
-        if mapper.get("Settings") is not None
-    }  # type: ignore
+
+    services = collect("services", manifests)
+    options = collect("options", {"universal": universal, **manifests})
 
     REFERENCES = {
         "countries": {c.name: c.value for c in list(units.Country)},
@@ -150,32 +397,27 @@ def collect_references() -> dict:
         },
         "incoterms": {c.name: c.value for c in list(units.Incoterm)},
         "carriers": {
-            carrier_name: metadata.label for carrier_name, metadata in PROVIDERS.items()
+            carrier_name: manifest["label"]
+            for carrier_name, manifest in manifests.items()
         },
         "carrier_hubs": {
-            carrier_name: metadata.label
-            for carrier_name, metadata in PROVIDERS.items()
-            if metadata.is_hub
+            carrier_name: manifest["label"]
+            for carrier_name, manifest in manifests.items()
+            if manifest["is_hub"]
         },
         "services": services,
         "options": options,
-        "connection_fields": connection_fields,
-        "connection_configs": connection_configs,
-        "carrier_capabilities": {
-            key: detect_capabilities(detect_proxy_methods(mapper["Proxy"]))
-            for key, mapper in PROVIDERS_DATA.items()
-            if mapper.get("Proxy") is not None
-        },
-        "packaging_types": {
-            key: {c.name: c.value for c in list(mapper["packaging_types"])}  # type: ignore
-            for key, mapper in PROVIDERS_DATA.items()
-            if mapper.get("packaging_types") is not None
-        },
-        "package_presets": {
-            key: {c.name: lib.to_dict(c.value) for c in list(mapper["package_presets"])}  # type: ignore
-            for key, mapper in PROVIDERS_DATA.items()
-            if mapper.get("package_presets") is not None
+        "connection_fields": {
+            manifest["id"]: manifest["connection_fields"]
+            for manifest in manifests.values()
+            if manifest.get("connection_fields") is not None
         },
+        "connection_configs": collect("connection_configs", manifests),
+        "carrier_capabilities": collect("capabilities", manifests),
+        "packaging_types": collect(
+            "packaging_types", {"universal": universal, **manifests}
+        ),
+        "package_presets": collect("package_presets", manifests),
         "option_names": {
             name: {key: key.upper().replace("_", " ") for key, _ in value.items()}
             for name, value in options.items()
@@ -184,11 +426,7 @@ def collect_references() -> dict:
             name: {key: key.upper().replace("_", " ") for key, _ in value.items()}
             for name, value in services.items()
         },
-        "service_levels": {
-            key: lib.to_dict(mapper.get("service_levels"))
-            for key, mapper in PROVIDERS_DATA.items()
-            if mapper.get("service_levels") is not None
-        },
+        "service_levels": collect("service_levels", manifests),
     }
 
     return REFERENCES
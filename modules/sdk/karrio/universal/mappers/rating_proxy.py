@@ -7,6 +7,7 @@ import karrio.core.models as models
 from karrio.universal.providers.rating import (
     RatingMixinSettings,
     PackageRates,
+    get_service_index,
 )
 
 
@@ -119,93 +120,29 @@ def get_available_rates(
         )
 
         # Check if weight and dimensions fit restrictions
+        index = get_service_index(service)
+        weight = package.weight[service.weight_unit] if index.weighted else None
         match_length_requirements = (
-            service.max_length is not None
-            and package.length[service.dimension_unit]
-            <= units.Dimension(service.max_length or 0, service.dimension_unit).value
-        ) or (service.max_length is None)
+            index.max_length is None
+            or package.length[service.dimension_unit] <= index.max_length
+        )
         match_height_requirements = (
-            service.max_height is not None
-            and package.height[service.dimension_unit]
-            <= units.Dimension(service.max_height, service.dimension_unit).value
-        ) or (service.max_height is None)
+            index.max_height is None
+            or package.height[service.dimension_unit] <= index.max_height
+        )
         match_width_requirements = (
-            service.max_width is not None
-            and package.width[service.dimension_unit]
-            <= units.Dimension(service.max_width, service.dimension_unit).value
-        ) or (service.max_width is None)
+            index.max_width is None
+            or package.width[service.dimension_unit] <= index.max_width
+        )
         match_min_weight_requirements = (
-            service.min_weight is not None
-            and package.weight[service.weight_unit]
-            >= units.Weight(service.min_weight, service.weight_unit).value
-        ) or (service.min_weight is None)
+            index.min_weight is None or weight >= index.min_weight
+        )
         match_max_weight_requirements = (
-            service.max_weight is not None
-            and package.weight[service.weight_unit]
-            <= units.Weight(service.max_weight, service.weight_unit).value
-        ) or (service.max_weight is None)
+            index.max_weight is None or weight <= index.max_weight
+        )
 
         # resolve matching zone
-        selected_zone: typing.Optional[models.ServiceZone] = None
-
-        for zone in service.zones or []:
-            # Check Location inclusion
-            _cover_supported_cities = (
-                zone.cities is not None
-                and recipient.city is not None
-                and recipient.city.lower() in [_.lower() for _ in zone.cities]
-            ) or not any(zone.cities or [])
-            _cover_supported_countries = (
-                zone.country_codes is not None
-                and recipient.country_code in zone.country_codes
-            ) or not any(zone.country_codes or [])
-            _cover_supported_postal_codes = (
-                zone.postal_codes is not None
-                and recipient.postal_code is not None
-                and str(recipient.postal_code).lower()
-                in [str(_).lower() for _ in zone.postal_codes]
-            ) or not any(zone.postal_codes or [])
-
-            # Check if weight and dimensions fit restrictions
-            _match_zone_min_weight_requirements = (
-                zone.min_weight is not None
-                and package.weight[service.weight_unit]
-                >= units.Weight(zone.min_weight, service.weight_unit).value
-            ) or (zone.min_weight is None)
-            _match_zone_max_weight_requirements = (
-                zone.max_weight is not None
-                and package.weight[service.weight_unit]
-                <= units.Weight(zone.max_weight, service.weight_unit).value
-            ) or (zone.max_weight is None)
-
-            # Check if best fit zone is selected
-            _best_fit_zone_selected = (
-                selected_zone is not None
-                and selected_zone.max_weight is not None
-                and (
-                    selected_zone.rate < zone.rate
-                    or (
-                        selected_zone.max_weight is not None
-                        and zone.max_weight is not None
-                        and selected_zone.max_weight < zone.max_weight
-                    )
-                    or (
-                        selected_zone.min_weight is not None
-                        and zone.min_weight is not None
-                        and selected_zone.min_weight < zone.min_weight
-                    )
-                )
-            )
-
-            if (
-                _cover_supported_cities
-                and _cover_supported_countries
-                and _cover_supported_postal_codes
-                and _match_zone_min_weight_requirements
-                and _match_zone_max_weight_requirements
-                and _best_fit_zone_selected is False
-            ):
-                selected_zone = zone
+        selected_zone = index.select_zone(recipient, weight)
 
         # error validations
         if explicitly_requested and not explicit_destination_covered:
@@ -1,2 +1,3 @@
 from karrio.universal.providers.rating.utils import *
+from karrio.universal.providers.rating.index import ServiceIndex, get_service_index
 from karrio.universal.providers.rating.rate import parse_rate_response, rate_request
@@ -0,0 +1,228 @@
+"""Compiled rate sheet index used by the universal rating proxy.
+
+A `ServiceIndex` is compiled once per service level (rate sheet version) and
+cached for as long as the service level object lives. It replaces the linear
+scan of every zone with hash lookups on location and a bisect lookup on weight
+brackets while preserving the zone resolution order of the linear scan.
+"""
+
+import bisect
+import typing
+import weakref
+import threading
+import karrio.core.units as units
+import karrio.core.models as models
+
+_INF = float("inf")
+
+
+class ZoneEntry(typing.NamedTuple):
+    """Precomputed zone restrictions (`None` means unrestricted)."""
+
+    index: int
+    zone: models.ServiceZone
+    cities: typing.Optional[typing.FrozenSet[str]]
+    country_codes: typing.Optional[typing.FrozenSet[str]]
+    postal_codes: typing.Optional[typing.FrozenSet[str]]
+    min_weight: typing.Optional[float]
+    max_weight: typing.Optional[float]
+
+
+class LocationIndex:
+    """Map a location key to the zones restricted to it plus unrestricted zones."""
+
+    def __init__(self) -> None:
+        self.keys: typing.Dict[str, typing.List[int]] = {}
+        self.any: typing.List[int] = []
+
+    def add(self, index: int, values: typing.Optional[typing.FrozenSet[str]]):
+        if values is None:
+            self.any.append(index)
+            return
+
+        for value in values:
+            self.keys.setdefault(value, []).append(index)
+
+    def count(self, key: typing.Optional[str]) -> int:
+        return len(self.keys.get(key, [])) + len(self.any)
+
+    def lookup(self, key: typing.Optional[str]) -> typing.List[int]:
+        return self.keys.get(key, []) + self.any
+
+
+class ServiceIndex:
+    """Precompiled zones and restrictions of a service level."""
+
+    def __init__(self, service: models.ServiceLevel) -> None:
+        weight_unit = service.weight_unit
+        dimension_unit = service.dimension_unit
+
+        self.max_length = _bound(units.Dimension, service.max_length, dimension_unit)
+        self.max_height = _bound(units.Dimension, service.max_height, dimension_unit)
+        self.max_width = _bound(units.Dimension, service.max_width, dimension_unit)
+        self.min_weight = _bound(units.Weight, service.min_weight, weight_unit)
+        self.max_weight = _bound(units.Weight, service.max_weight, weight_unit)
+
+        self.zones: typing.List[ZoneEntry] = []
+        self.cities = LocationIndex()
+        self.country_codes = LocationIndex()
+        self.postal_codes = LocationIndex()
+
+        for index, zone in enumerate(service.zones or []):
+            entry = ZoneEntry(
+                index=index,
+                zone=zone,
+                cities=_restriction(zone.cities, lambda _: _.lower()),
+                country_codes=_restriction(zone.country_codes, lambda _: _),
+                postal_codes=_restriction(zone.postal_codes, lambda _: str(_).lower()),
+                min_weight=_bound(units.Weight, zone.min_weight, weight_unit),
+                max_weight=_bound(units.Weight, zone.max_weight, weight_unit),
+            )
+            self.zones.append(entry)
+            self.cities.add(index, entry.cities)
+            self.country_codes.add(index, entry.country_codes)
+            self.postal_codes.add(index, entry.postal_codes)
+
+        # weight brackets sorted by lower bound (unbounded first)
+        brackets = sorted(
+            self.zones,
+            key=lambda _: -_INF if _.min_weight is None else _.min_weight,
+        )
+        self.brackets = [_.index for _ in brackets]
+        self.bracket_bounds = [
+            -_INF if _.min_weight is None else _.min_weight for _ in brackets
+        ]
+        self.weighted = any(
+            _ is not None
+            for _ in (self.min_weight, self.max_weight)
+            + tuple(b for z in self.zones for b in (z.min_weight, z.max_weight))
+        )
+
+    def select_zone(
+        self,
+        recipient: units.ComputedAddress,
+        weight: typing.Optional[float],
+    ) -> typing.Optional[models.ServiceZone]:
+        """Resolve the best fit zone for the recipient and package weight."""
+        city = None if recipient.city is None else recipient.city.lower()
+        postal_code = (
+            None
+            if recipient.postal_code is None
+            else str(recipient.postal_code).lower()
+        )
+        country_code = recipient.country_code
+
+        # drive the lookup with the most selective restriction
+        bracket_count = (
+            len(self.brackets)
+            if weight is None
+            else bisect.bisect_right(self.bracket_bounds, weight)
+        )
+        lookups = [
+            (self.postal_codes.count(postal_code), self.postal_codes, postal_code),
+            (self.cities.count(city), self.cities, city),
+            (self.country_codes.count(country_code), self.country_codes, country_code),
+        ]
+        size, location, key = min(lookups, key=lambda _: _[0])
+        candidates = (
+            location.lookup(key)
+            if size < bracket_count
+            else self.brackets[:bracket_count]
+        )
+
+        selected_zone: typing.Optional[models.ServiceZone] = None
+
+        for index in sorted(candidates):
+            entry = self.zones[index]
+
+            if not (
+                (entry.cities is None or city in entry.cities)
+                and (entry.country_codes is None or country_code in entry.country_codes)
+                and (entry.postal_codes is None or postal_code in entry.postal_codes)
+                and (entry.min_weight is None or weight >= entry.min_weight)
+                and (entry.max_weight is None or weight <= entry.max_weight)
+            ):
+                continue
+
+            if not is_best_fit_zone_selected(selected_zone, entry.zone):
+                selected_zone = entry.zone
+
+        return selected_zone
+
+
+def is_best_fit_zone_selected(
+    selected_zone: typing.Optional[models.ServiceZone],
+    zone: models.ServiceZone,
+) -> bool:
+    return (
+        selected_zone is not None
+        and selected_zone.max_weight is not None
+        and (
+            selected_zone.rate < zone.rate
+            or (
+                selected_zone.max_weight is not None
+                and zone.max_weight is not None
+                and selected_zone.max_weight < zone.max_weight
+            )
+            or (
+                selected_zone.min_weight is not None
+                and zone.min_weight is not None
+                and selected_zone.min_weight < zone.min_weight
+            )
+        )
+    )
+
+
+_indexes: typing.Dict[int, typing.Tuple[weakref.ref, tuple, ServiceIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_service_index(service: models.ServiceLevel) -> ServiceIndex:
+    """Return the compiled index of a service level, compiling it on first use.
+
+    The index is recompiled when the service zones or restrictions change and
+    released with the service level object.
+    """
+    key = id(service)
+    stamp = (
+        id(service.zones),
+        len(service.zones or []),
+        service.weight_unit,
+        service.dimension_unit,
+        service.min_weight,
+        service.max_weight,
+        service.max_length,
+        service.max_height,
+        service.max_width,
+    )
+    cached = _indexes.get(key)
+
+    if cached is not None and cached[0]() is service and cached[1] == stamp:
+        return cached[2]
+
+    index = ServiceIndex(service)
+    reference = weakref.ref(service, lambda _: _evict(key, _))
+
+    with _indexes_lock:
+        _indexes[key] = (reference, stamp, index)
+
+    return index
+
+
+def _evict(key: int, reference: weakref.ref) -> None:
+    with _indexes_lock:
+        if key in _indexes and _indexes[key][0] is reference:
+            del _indexes[key]
+
+
+def _bound(unit_type, value, unit) -> typing.Optional[float]:
+    return None if value is None else unit_type(value, unit).value
+
+
+def _restriction(
+    values: typing.Optional[typing.List[str]], normalize: typing.Callable
+) -> typing.Optional[typing.FrozenSet[str]]:
+    if not any(values or []):
+        return None
+
+    return frozenset(normalize(_) for _ in values)
@@ -1,2 +1,9 @@
 from .test_universal_rate import *
 from .test_universal_shipment import *
+from .test_transport import *
+from .test_dict import *
+from .test_async_rating import *
+from .test_workers import *
+from .test_references import *
+from .test_tokens import *
+from .test_bundling import *
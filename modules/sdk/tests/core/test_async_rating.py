@@ -0,0 +1,140 @@
+import time
+import asyncio
+import threading
+import unittest
+import karrio
+import karrio.lib as lib
+import karrio.api.proxy as proxy
+import karrio.api.mapper as mapper
+import karrio.api.gateway as gateway
+import karrio.core.models as models
+import karrio.core.settings as settings
+
+
+class Settings(settings.Settings):
+    @property
+    def carrier_name(self):
+        return "delayed"
+
+
+class Proxy(proxy.Proxy):
+    def get_rates(self, request: lib.Serializable) -> lib.Deserializable:
+        time.sleep(self.settings.metadata["delay"])
+        return lib.Deserializable(request.serialize())
+
+
+class Mapper(mapper.Mapper):
+    def create_rate_request(self, payload: models.RateRequest) -> lib.Serializable:
+        return lib.Serializable(self.settings.carrier_id)
+
+    def parse_rate_response(self, response: lib.Deserializable):
+        return [
+            models.RateDetails(
+                carrier_name="delayed",
+                carrier_id=response.deserialize(),
+                service="standard",
+                total_charge=10.0,
+                currency="USD",
+            )
+        ], []
+
+
+def create_gateway(carrier_id: str, delay: float) -> gateway.Gateway:
+    _settings = Settings(carrier_id=carrier_id, metadata=dict(delay=delay))
+    tracer = lib.Tracer()
+
+    return gateway.Gateway(
+        is_hub=False,
+        tracer=tracer,
+        settings=_settings,
+        mapper=Mapper(_settings),
+        proxy=Proxy(_settings, tracer=tracer),
+    )
+
+
+class TestAsyncRating(unittest.TestCase):
+    def setUp(self):
+        self.gateways = [
+            create_gateway("fast", 0),
+            create_gateway("slow", 0.5),
+        ]
+
+    def test_fetch_rates_from_async(self):
+        async def fetch():
+            return await karrio.Rating.fetch(RateRequest).from_async(*self.gateways)
+
+        rates, messages = asyncio.run(fetch()).parse()
+
+        self.assertListEqual([rate.carrier_id for rate in rates], ["fast", "slow"])
+        self.assertListEqual(messages, [])
+
+    def test_fetch_rates_with_timeout(self):
+        rates, messages = (
+            karrio.Rating.fetch(RateRequest).from_(*self.gateways, timeout=0.1).parse()
+        )
+
+        self.assertListEqual([rate.carrier_id for rate in rates], ["fast"])
+        self.assertListEqual(
+            [(m.carrier_id, m.code) for m in messages],
+            [("slow", "SHIPPING_SDK_REQUEST_TIMEOUT_ERROR")],
+        )
+
+    def test_fetch_rates_with_deadline(self):
+        async def fetch():
+            return await karrio.Rating.fetch(RateRequest).from_async(
+                *self.gateways, deadline=0.1
+            )
+
+        rates, messages = asyncio.run(fetch()).parse()
+
+        self.assertListEqual([rate.carrier_id for rate in rates], ["fast"])
+        self.assertListEqual(
+            [m.code for m in messages], ["SHIPPING_SDK_REQUEST_TIMEOUT_ERROR"]
+        )
+
+
+class TestRunSync(unittest.TestCase):
+    def test_run_sync_from_every_shared_executor_thread(self):
+        executor = lib.utils.shared_executor()
+        barrier = threading.Barrier(executor._max_workers)
+
+        async def sleep_in_executor():
+            return await asyncio.gather(
+                *[lib.run_in_executor(time.sleep, 0.01) for _ in range(4)]
+            )
+
+        def nested_call():
+            # every worker of the shared pool waits on a nested run_sync call
+            barrier.wait(timeout=5)
+            return lib.run_sync(sleep_in_executor())
+
+        futures = [executor.submit(nested_call) for _ in range(executor._max_workers)]
+
+        self.assertEqual(len([_.result(timeout=5) for _ in futures]), len(futures))
+
+    def test_run_sync_from_a_running_loop(self):
+        async def answer():
+            await asyncio.sleep(0)
+            return 42
+
+        async def main():
+            return lib.run_sync(answer())
+
+        self.assertEqual(asyncio.run(main()), 42)
+
+    def test_exec_async_from_a_running_loop(self):
+        async def main():
+            return lib.run_asynchronously(lambda _: _ * 2, [1, 2, 3])
+
+        self.assertListEqual(asyncio.run(main()), [2, 4, 6])
+
+
+RateRequest = {
+    "shipper": {"postal_code": "H3N1S4", "country_code": "CA"},
+    "recipient": {"postal_code": "89109", "country_code": "US"},
+    "parcels": [{"weight": 1.0, "weight_unit": "KG"}],
+}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import io
+import base64
+import unittest
+import PyPDF2
+import PIL.Image
+import karrio.lib as lib
+
+
+class TestDocumentBundling(unittest.TestCase):
+    def test_bundle_pdf_documents(self):
+        documents = [pdf_document(1), pdf_document(3), pdf_document(2)]
+
+        with lib.bundle_documents(iter(documents), format="PDF") as bundle:
+            reader = PyPDF2.PdfReader(bundle, strict=True)
+
+            self.assertEqual(len(reader.pages), 6)
+            self.assertListEqual(
+                [page.mediabox.width for page in reader.pages],
+                [100, 100, 100, 100, 100, 100],
+            )
+
+    def test_iter_bundle_matches_base64_bundle(self):
+        labels = [pdf_document(1), pdf_document(2)]
+        zpls = [b"^XA^FO50,50^FDLabel 1^FS^XZ", b"^XA^FO50,50^FDLabel 2^FS^XZ"]
+        encoded = [base64.b64encode(_).decode() for _ in zpls]
+
+        self.assertEqual(
+            b"".join(lib.iter_bundle(iter(zpls), format="ZPL")),
+            base64.b64decode(lib.bundle_base64(encoded, format="ZPL")),
+        )
+        self.assertEqual(
+            len(
+                PyPDF2.PdfReader(
+                    io.BytesIO(b"".join(lib.iter_bundle(iter(labels), format="PDF")))
+                ).pages
+            ),
+            3,
+        )
+
+
+def pdf_document(pages: int) -> bytes:
+    images = [PIL.Image.new("RGB", (100, 150), "white") for _ in range(pages)]
+    buffer = io.BytesIO()
+    images[0].save(buffer, format="PDF", save_all=True, append_images=images[1:])
+
+    return buffer.getvalue()
+
+
+if __name__ == "__main__":
+    unittest.main()
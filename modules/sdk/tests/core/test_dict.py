@@ -0,0 +1,147 @@
+import enum
+import json
+import attr
+import decimal
+import datetime
+import unittest
+import karrio.lib as lib
+import karrio.core.units as units
+import karrio.core.models as models
+from karrio.core.utils.dict import DICTPARSE, Unsupported, to_serializable
+
+
+def legacy_to_dict(entity, clear_empty: bool = True) -> dict:
+    return json.loads(
+        DICTPARSE.jsonify(entity),
+        object_hook=lambda d: {
+            k: v
+            for k, v in d.items()
+            if (v not in (None, [], "") if clear_empty else True)
+        },
+    )
+
+
+class Priority(enum.Enum):
+    low = 1
+    high = "HIGH"
+
+
+class Code(str):
+    pass
+
+
+@attr.s(auto_attribs=True)
+class Leaf:
+    code: Code = None
+    priority: Priority = None
+    tags: set = None
+    values: tuple = None
+
+
+@attr.s(auto_attribs=True)
+class Node:
+    name: str = None
+    leaf: Leaf = None
+    children: list = None
+    extra: dict = None
+
+
+class TestToSerializable(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+
+    def test_nested_attrs_objects(self):
+        entity = Node(
+            name="root",
+            leaf=Leaf(code=Code("A1"), priority=Priority.high, tags={"x"}),
+            children=[
+                Node(name="child", leaf=Leaf(values=(1, 2.5, None))),
+                Node(extra={"z": Leaf(), "a": [Node()]}),
+            ],
+            extra={Code("key"): {"nested": Node(name="")}},
+        )
+
+        for clear_empty in (True, False):
+            self.assertDictEqual(
+                DICTPARSE.to_dict(entity, clear_empty=clear_empty),
+                legacy_to_dict(entity, clear_empty=clear_empty),
+            )
+
+    def test_sdk_models(self):
+        entity = models.RateRequest(
+            shipper=models.Address(postal_code="H3N1S4", country_code="CA"),
+            recipient=models.Address(postal_code="89109", country_code="US"),
+            parcels=[
+                models.Parcel(
+                    weight=1.0,
+                    weight_unit=units.WeightUnit.KG.value,
+                    items=[models.Commodity(title="item", quantity=2)],
+                )
+            ],
+            options=dict(insurance=100, signature_required=True, notes=None),
+            services=["standard", "express"],
+        )
+
+        self.assertDictEqual(DICTPARSE.to_dict(entity), legacy_to_dict(entity))
+        self.assertDictEqual(
+            lib.to_dict(dict(units=units.WeightUnit.KG, request=entity)),
+            legacy_to_dict(dict(units=units.WeightUnit.KG, request=entity)),
+        )
+
+    def test_enums(self):
+        entity = dict(
+            priorities=[Priority.low, Priority.high],
+            unit=units.WeightUnit.LB,
+            leaf=Leaf(priority=Priority.low),
+        )
+
+        self.assertDictEqual(DICTPARSE.to_dict(entity), legacy_to_dict(entity))
+
+    def test_empty_values_pruning(self):
+        entity = dict(
+            none=None,
+            empty_list=[],
+            empty_string="",
+            zero=0,
+            false=False,
+            empty_dict={},
+            nested=dict(value=None, items=[None, "", dict(value="")]),
+            leaf=Leaf(),
+        )
+
+        self.assertDictEqual(DICTPARSE.to_dict(entity), legacy_to_dict(entity))
+        self.assertDictEqual(
+            DICTPARSE.to_dict(entity, clear_empty=False),
+            legacy_to_dict(entity, clear_empty=False),
+        )
+
+    def test_datetimes_and_decimals(self):
+        for value in (
+            datetime.datetime(2024, 1, 1, 10, 30),
+            datetime.date(2024, 1, 1),
+            decimal.Decimal("10.50"),
+        ):
+            entity = dict(value=value, leaf=Leaf(values=(value,)))
+
+            with self.assertRaises(Unsupported):
+                to_serializable(entity)
+
+            # both paths fail the same way on values json can't encode
+            with self.assertRaises(ValueError) as legacy:
+                legacy_to_dict(entity)
+            with self.assertRaises(ValueError) as current:
+                DICTPARSE.to_dict(entity)
+
+            self.assertEqual(str(current.exception), str(legacy.exception))
+
+        entity = dict(
+            date=lib.fdate(datetime.date(2024, 1, 1)),
+            datetime=lib.fdatetime(datetime.datetime(2024, 1, 1, 10, 30)),
+            amount=lib.to_decimal(decimal.Decimal("10.505")),
+        )
+
+        self.assertDictEqual(DICTPARSE.to_dict(entity), legacy_to_dict(entity))
+
+
+if __name__ == "__main__":
+    unittest.main()
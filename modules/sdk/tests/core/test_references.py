@@ -0,0 +1,87 @@
+import os
+import json
+import tempfile
+import unittest
+import karrio
+import karrio.references as references
+
+
+class TestProviderRegistry(unittest.TestCase):
+    def test_lookup_imports_only_the_requested_extension(self):
+        registry = references.ProviderRegistry()
+        name = registry.names[0]
+
+        self.assertIn(name, registry)
+        self.assertListEqual(registry.loaded, [])
+        self.assertEqual(registry[name].id, name)
+        self.assertListEqual(registry.loaded, [name])
+        self.assertIs(registry[name], registry[name])
+
+    def test_unknown_extension(self):
+        registry = references.ProviderRegistry()
+
+        self.assertNotIn("unknown", registry)
+        self.assertIsNone(registry.get("unknown"))
+        with self.assertRaises(karrio.core.errors.ShippingSDKError):
+            karrio.gateway["unknown"]
+
+    def test_refresh_resets_discovered_extensions(self):
+        registry = references.ProviderRegistry()
+        registry[registry.names[0]]
+
+        registry.refresh()
+
+        self.assertListEqual(registry.loaded, [])
+        self.assertIsNone(references.REFERENCES)
+
+    def test_manifest_references_match_the_extension_metadata(self):
+        registry = references.ProviderRegistry()
+        name = registry.names[0]
+        manifest = references.collect_manifest(registry[name])
+
+        self.assertEqual(manifest["version"], references.MANIFEST_VERSION)
+        self.assertEqual(manifest["label"], registry[name].label)
+        self.assertDictEqual(manifest, json.loads(json.dumps(manifest)))
+        self.assertEqual(
+            references.collect_references()["carriers"][name], manifest["label"]
+        )
+
+
+class TestExtensionManifest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.mapper_path = os.path.join(self.root.name, "karrio", "mappers", "ext")
+        self.provider_path = os.path.join(self.root.name, "karrio", "providers", "ext")
+
+        for path in [self.mapper_path, self.provider_path]:
+            os.makedirs(path)
+            open(os.path.join(path, "__init__.py"), "w").close()
+
+        with open(os.path.join(self.mapper_path, "manifest.json"), "w") as file:
+            json.dump(dict(version=references.MANIFEST_VERSION, id="ext"), file)
+
+    def tearDown(self):
+        self.root.cleanup()
+
+    def test_load_manifest(self):
+        self.assertDictEqual(
+            references.load_manifest(self.mapper_path),
+            dict(version=references.MANIFEST_VERSION, id="ext"),
+        )
+
+    def test_outdated_manifest_is_ignored(self):
+        units = os.path.join(self.provider_path, "units.py")
+        open(units, "w").close()
+        generated_at = os.stat(os.path.join(self.mapper_path, "manifest.json"))
+        os.utime(units, (generated_at.st_mtime + 1, generated_at.st_mtime + 1))
+
+        self.assertIsNone(references.load_manifest(self.mapper_path))
+
+    def test_missing_manifest(self):
+        os.remove(os.path.join(self.mapper_path, "manifest.json"))
+
+        self.assertIsNone(references.load_manifest(self.mapper_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import time
+import datetime
+import unittest
+import threading
+import concurrent.futures as futures
+import karrio.lib as lib
+from karrio.core.utils import caching, workers
+
+
+class TestTokenManager(unittest.TestCase):
+    def setUp(self):
+        self.manager = caching.TokenManager(renewal_margin=300, lock_timeout=1)
+        self.calls = []
+
+    def login(self, minutes: int = 60):
+        self.calls.append(threading.current_thread())
+        time.sleep(0.05)
+        return dict(access_token=f"token_{len(self.calls)}", expiry=expiry(minutes))
+
+    def test_concurrent_refreshes_are_single_flight(self):
+        cache = lib.Cache()
+
+        with futures.ThreadPoolExecutor(max_workers=10) as executor:
+            tokens = list(
+                executor.map(
+                    lambda _: self.manager.get_state(cache, "key", self.login)[
+                        "access_token"
+                    ],
+                    range(10),
+                )
+            )
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertListEqual(tokens, ["token_1"] * 10)
+        self.assertEqual(self.manager.metrics["refreshes"], 1)
+        self.assertEqual(self.manager.metrics["waits"], 9)
+
+    def test_token_close_to_expiry_is_renewed_in_background(self):
+        cache = lib.Cache(key=dict(access_token="token_0", expiry=expiry(33)))
+
+        state = self.manager.get_state(cache, "key", self.login)
+        workers.get_worker_pool("cache").flush(timeout=1)
+
+        self.assertEqual(state["access_token"], "token_0")
+        self.assertEqual(cache.get("key")["access_token"], "token_1")
+        self.assertEqual(self.manager.metrics["renewals"], 1)
+
+    def test_expired_token_is_refreshed(self):
+        cache = lib.Cache(key=dict(access_token="token_0", expiry=expiry(10)))
+
+        token = cache.thread_safe(
+            refresh_func=self.login, cache_key="key", buffer_minutes=30
+        ).get_token()
+
+        self.assertEqual(token, "token_1")
+
+    def test_token_without_expiry_is_refreshed(self):
+        cache = lib.Cache(key=dict(access_token="token_0"))
+
+        state = self.manager.get_state(cache, "key", self.login)
+
+        self.assertEqual(state["access_token"], "token_1")
+
+    def test_background_renewal_takes_the_shared_lock(self):
+        system_cache = SystemCache()
+        system_cache.add("key|lock", 1)
+        system_cache.set("key", dict(access_token="token_0", expiry=expiry(33)))
+        cache = lib.Cache(system_cache)
+
+        state = self.manager.get_state(cache, "key", self.login)
+        workers.get_worker_pool("cache").flush(timeout=1)
+
+        # another process holds the lock: the renewal is left to it.
+        self.assertEqual(state["access_token"], "token_0")
+        self.assertEqual(len(self.calls), 0)
+
+        system_cache.delete("key|lock")
+        self.manager.get_state(cache, "key", self.login)
+        workers.get_worker_pool("cache").flush(timeout=1)
+
+        self.assertEqual(system_cache.get("key")["access_token"], "token_1")
+        self.assertIsNone(system_cache.get("key|lock"))
+
+    def test_wait_for_other_process_refresh(self):
+        system_cache = SystemCache()
+        system_cache.add("key|lock", 1)
+        cache = lib.Cache(system_cache)
+        threading.Timer(
+            0.2,
+            lambda: system_cache.set(
+                "key", dict(access_token="shared", expiry=expiry(60))
+            ),
+        ).start()
+
+        state = self.manager.get_state(cache, "key", self.login)
+
+        self.assertEqual(state["access_token"], "shared")
+        self.assertEqual(len(self.calls), 0)
+
+
+class SystemCache(caching.AbstractCache):
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, **kwargs):
+        self.values[key] = value
+
+    def add(self, key, value, **kwargs):
+        if key in self.values:
+            return False
+
+        self.values[key] = value
+        return True
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+def expiry(minutes: int) -> str:
+    return lib.fdatetime(datetime.datetime.now() + datetime.timedelta(minutes=minutes))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import json
+import time
+import unittest
+import http.client
+import threading
+import http.server
+import karrio.lib as lib
+from karrio.core.utils import transport
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    received: list = []
+
+    def do_GET(self):
+        self.received.append(("GET", self.path))
+
+        if self.path == "/drop":
+            return self._drop()
+
+        if self.path == "/close":
+            # closed without telling the client which keeps it idle
+            self._reply(200, b"{}")
+            self.close_connection = True
+            return
+
+        if self.path == "/redirect":
+            return self._reply(302, b"", location="/ok")
+
+        if self.path == "/error":
+            return self._reply(400, b'{"error": "invalid"}')
+
+        return self._reply(200, json.dumps({"path": self.path}).encode())
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.received.append(("POST", self.path))
+
+        if self.path == "/drop":
+            return self._drop()
+
+        return self._reply(200, body)
+
+    def _drop(self):
+        # the request is received but the connection closed without response
+        self.close_connection = True
+
+    def _reply(self, status: int, body: bytes, **headers):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPooledTransport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.transport = lib.set_http_transport(transport.PooledTransport(pool_size=2))
+        Handler.received.clear()
+
+    def tearDown(self):
+        lib.set_http_transport(transport.create_transport())
+
+    def test_keep_alive_connection_reuse(self):
+        responses = [lib.request(url=f"{self.url}/rates") for _ in range(3)]
+
+        self.assertListEqual(responses, ['{"path": "/rates"}'] * 3)
+        self.assertDictEqual(
+            self.transport.metrics,
+            {"hits": 2, "misses": 1, "discarded": 0, "retries": 0, "pools": 1},
+        )
+
+    def test_post_request_data(self):
+        response = lib.request(url=f"{self.url}/ship", data='{"id": 1}', method="POST")
+
+        self.assertEqual(response, '{"id": 1}')
+
+    def test_redirect_is_followed(self):
+        response = lib.request(url=f"{self.url}/redirect")
+
+        self.assertEqual(response, '{"path": "/ok"}')
+
+    def test_http_error_is_handled_by_on_error(self):
+        response = lib.request(
+            url=f"{self.url}/error",
+            on_error=lambda e: f"{e.code}: {lib.decode(e.read())}",
+        )
+
+        self.assertEqual(response, '400: {"error": "invalid"}')
+
+    def test_written_post_is_not_sent_again(self):
+        lib.request(url=f"{self.url}/rates")
+
+        with self.assertRaises(http.client.RemoteDisconnected):
+            lib.request(url=f"{self.url}/drop", data="{}", method="POST")
+
+        self.assertListEqual(Handler.received, [("GET", "/rates"), ("POST", "/drop")])
+        self.assertEqual(self.transport.metrics["retries"], 0)
+
+    def test_written_get_is_sent_again(self):
+        lib.request(url=f"{self.url}/rates")
+
+        with self.assertRaises(http.client.RemoteDisconnected):
+            lib.request(url=f"{self.url}/drop")
+
+        self.assertListEqual(
+            Handler.received, [("GET", "/rates"), ("GET", "/drop"), ("GET", "/drop")]
+        )
+        self.assertEqual(self.transport.metrics["retries"], 1)
+
+    def test_connection_closed_while_idle_is_not_reused(self):
+        lib.request(url=f"{self.url}/close")
+        time.sleep(0.1)
+        response = lib.request(url=f"{self.url}/ship", data='{"id": 1}', method="POST")
+
+        self.assertEqual(response, '{"id": 1}')
+        self.assertListEqual(Handler.received, [("GET", "/close"), ("POST", "/ship")])
+        self.assertEqual(self.transport.metrics["retries"], 0)
+
+    def test_pools_are_isolated_per_proxy(self):
+        pool = self.transport.get_pool(f"{self.url}/rates")
+        proxied_pool = self.transport.get_pool(
+            f"{self.url}/rates", proxy="user:pass@10.0.0.1:3128"
+        )
+
+        self.assertIsNot(pool, proxied_pool)
+        self.assertEqual(proxied_pool.proxy.host, "10.0.0.1")
+        self.assertEqual(proxied_pool.proxy.port, 3128)
+        self.assertDictEqual(
+            proxied_pool.proxy.headers, {"Proxy-Authorization": "Basic dXNlcjpwYXNz"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
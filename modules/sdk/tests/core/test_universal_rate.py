@@ -1,6 +1,14 @@
+import random
 import unittest
+import karrio.lib as lib
+import karrio.core.units as units
+import karrio.core.models as models
 from karrio.core.utils import DP, Serializable
 from karrio.core.models import RateRequest
+from karrio.universal.providers.rating.index import (
+    get_service_index,
+    is_best_fit_zone_selected,
+)
 from karrio.universal.mappers.rating_proxy import (
     RatingMixinSettings,
     RatingMixinProxy,
@@ -121,6 +129,76 @@ class TestUniversalRating(unittest.TestCase):
         )
 
 
+class TestRateSheetIndex(unittest.TestCase):
+    def test_index_resolves_same_zones_as_linear_scan(self):
+        rng = random.Random(7)
+        postal_codes = ["H8Z2V4", "h3a1b1", "10001", "90210", None]
+        service = models.ServiceLevel(
+            service_name="Ground",
+            service_code="ground",
+            weight_unit="LB",
+            zones=[
+                models.ServiceZone(
+                    rate=rng.choice([5.0, 7.5, 10.0]),
+                    min_weight=rng.choice([None, 0.0, 1.0, 5.0]),
+                    max_weight=rng.choice([None, 2.0, 5.0, 10.0]),
+                    cities=rng.choice([[], ["Montreal"], ["MONTREAL", "Laval"]]),
+                    country_codes=rng.choice([[], ["CA"], ["US", "CA"]]),
+                    postal_codes=rng.sample(postal_codes[:4], rng.randrange(3)),
+                )
+                for _ in range(200)
+            ],
+        )
+        index = get_service_index(service)
+
+        for _ in range(300):
+            recipient = lib.to_address(
+                models.Address(
+                    city=rng.choice([None, "montreal", "Laval", "Toronto"]),
+                    country_code=rng.choice(["CA", "US", "FR"]),
+                    postal_code=rng.choice(postal_codes),
+                )
+            )
+            weight = units.Package(
+                models.Parcel(weight=rng.uniform(0.1, 12), weight_unit="LB")
+            ).weight["LB"]
+
+            self.assertIs(
+                index.select_zone(recipient, weight),
+                linear_select_zone(service, recipient, weight),
+            )
+
+        self.assertIs(get_service_index(service), index)
+
+
+def linear_select_zone(service, recipient, weight):
+    selected_zone = None
+
+    for zone in service.zones:
+        covered = (
+            (
+                not any(zone.cities)
+                or (recipient.city or "").lower() in [_.lower() for _ in zone.cities]
+            )
+            and (
+                not any(zone.country_codes)
+                or recipient.country_code in zone.country_codes
+            )
+            and (
+                not any(zone.postal_codes)
+                or str(recipient.postal_code).lower()
+                in [_.lower() for _ in zone.postal_codes]
+            )
+            and (zone.min_weight is None or weight >= zone.min_weight)
+            and (zone.max_weight is None or weight <= zone.max_weight)
+        )
+
+        if covered and not is_best_fit_zone_selected(selected_zone, zone):
+            selected_zone = zone
+
+    return selected_zone
+
+
 if __name__ == "__main__":
     unittest.main()
 
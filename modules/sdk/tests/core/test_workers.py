@@ -0,0 +1,85 @@
+import threading
+import unittest
+import karrio.lib as lib
+from karrio.core.utils import workers
+
+
+class TestWorkerPool(unittest.TestCase):
+    def test_tasks_run_inline_when_saturated(self):
+        pool = workers.WorkerPool(max_workers=1, max_pending=1)
+        release = threading.Event()
+
+        blocked = pool.submit(release.wait)
+        inline = pool.submit(threading.current_thread)
+        release.set()
+
+        self.assertTrue(pool.flush(timeout=1))
+        self.assertTrue(blocked.result())
+        self.assertIs(inline.result(), threading.current_thread())
+        self.assertDictEqual(
+            pool.metrics, {"submitted": 1, "inline": 1, "failed": 0, "pending": 0}
+        )
+        pool.shutdown()
+
+    def test_tasks_submitted_from_a_pool_thread_run_inline(self):
+        pool = workers.WorkerPool(max_workers=1, name="test")
+
+        thread = pool.submit(
+            lambda: pool.submit(threading.current_thread).result()
+        ).result(timeout=1)
+
+        self.assertTrue(thread.name.startswith("karrio_test_"))
+        self.assertEqual(pool.metrics["inline"], 1)
+        pool.shutdown()
+
+    def test_tracer_drops_records_over_capacity(self):
+        tracer = lib.Tracer(max_records=2)
+
+        for index in range(3):
+            tracer.trace({"index": index}, "request")
+
+        self.assertListEqual(
+            [record.data["index"] for record in tracer.records], [0, 1]
+        )
+        self.assertEqual(tracer.dropped, 1)
+
+    def test_cache_computes_callable_values(self):
+        system_cache = SystemCache()
+        cache = lib.Cache(system_cache)
+
+        cache.set("token", lambda: {"access_token": "token"})
+
+        self.assertDictEqual(cache.get("token"), {"access_token": "token"})
+        self.assertDictEqual(system_cache.values, {"token": {"access_token": "token"}})
+
+    def test_cache_computes_callable_values_from_a_busy_worker_pool(self):
+        pool = workers.get_worker_pool()
+        cache = lib.Cache()
+
+        def login_from_every_worker(_):
+            cache.set(f"token_{_}", lambda: {"access_token": "token"})
+            return cache.get(f"token_{_}")
+
+        results = [
+            pool.submit(login_from_every_worker, _) for _ in range(pool.max_workers)
+        ]
+
+        self.assertListEqual(
+            [_.result(timeout=5) for _ in results],
+            [{"access_token": "token"}] * pool.max_workers,
+        )
+
+
+class SystemCache(lib.utils.caching.AbstractCache):
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, **kwargs):
+        self.values[key] = value
+
+
+if __name__ == "__main__":
+    unittest.main()